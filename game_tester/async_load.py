@@ -0,0 +1,136 @@
+"""Load test: many headless sessions on one asyncio event loop.
+
+Each session is a pyreborn AsyncClient, so N sessions cost N connections but
+no per-socket polling loop - the event loop only wakes the sessions that
+actually received bytes. Useful for seeing how a server copes with a crowd
+(login storms, a full level of players moving) from a single process.
+
+Every session connects and logs in concurrently (bounded by --concurrency so
+the server's accept queue is not flooded), optionally warps, then walks a
+small square while dispatching everything the server sends, until --duration
+elapses.
+
+Usage:
+    python -m game_tester.async_load [--host H] [--port P] [--bots N]
+                                     [--prefix loadbot] [--password P]
+                                     [--duration S] [--warp LEVEL]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import List, Optional
+
+from pyreborn import AsyncClient
+
+# Per-step offsets of the walk each session performs once logged in.
+_WALK = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+class SessionResult:
+    __slots__ = ("account", "login_s", "warped", "packets", "error")
+
+    def __init__(self, account: str):
+        self.account = account
+        self.login_s: Optional[float] = None
+        self.warped: Optional[bool] = None
+        self.packets = 0
+        self.error = ""
+
+
+async def _session(account: str, args, gate: asyncio.Semaphore) -> SessionResult:
+    result = SessionResult(account)
+    client = AsyncClient(args.host, args.port, args.version)
+    try:
+        async with gate:
+            t0 = time.monotonic()
+            if not await client.connect():
+                result.error = "connect failed"
+                return result
+            if not await client.login(account, args.password, timeout=15.0):
+                result.error = client.disconnect_reason or "login failed"
+                return result
+            result.login_s = time.monotonic() - t0
+
+        if args.warp:
+            result.warped = await client.warp(args.warp, 30.0, 30.0)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + args.duration
+        step = 0
+        while client.connected and loop.time() < deadline:
+            dx, dy = _WALK[step % len(_WALK)]
+            client.move(dx, dy)
+            step += 1
+            result.packets += len(await client.poll(args.tick))
+        if not client.connected:
+            result.error = client.disconnect_reason or "dropped"
+        return result
+    except Exception as exc:  # noqa: BLE001 - one broken session must not
+        # end the whole load test.
+        result.error = f"{type(exc).__name__}: {exc}"
+        return result
+    finally:
+        client.disconnect()
+
+
+async def run(args) -> List[SessionResult]:
+    gate = asyncio.Semaphore(args.concurrency)
+    return await asyncio.gather(*(
+        _session(f"{args.prefix}{i + 1}", args, gate) for i in range(args.bots)))
+
+
+def _summarize(results: List[SessionResult], wall: float) -> None:
+    logged_in = [r for r in results if r.login_s is not None]
+    print(f"{len(logged_in)}/{len(results)} sessions logged in "
+          f"({wall:.1f}s wall)")
+    if logged_in:
+        times = sorted(r.login_s for r in logged_in)
+        print(f"  login   median {statistics.median(times) * 1000:6.0f}ms  "
+              f"max {times[-1] * 1000:6.0f}ms")
+        total = sum(r.packets for r in logged_in)
+        print(f"  packets {total} dispatched, {total / max(wall, 1e-9):.0f}/s")
+    warps = [r.warped for r in logged_in if r.warped is not None]
+    if warps:
+        print(f"  warps   {sum(warps)}/{len(warps)} arrived")
+    errors = {}
+    for r in results:
+        if r.error:
+            errors[r.error] = errors.get(r.error, 0) + 1
+    for error, count in sorted(errors.items(), key=lambda kv: -kv[1]):
+        print(f"  {count:>4} x {error}")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m game_tester.async_load",
+        description="Drive many headless sessions from one event loop.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=14900)
+    parser.add_argument("--bots", type=int, default=100)
+    parser.add_argument("--prefix", default="loadbot",
+                        help="account name prefix; sessions are <prefix>1..N")
+    parser.add_argument("--password", default="loadbot")
+    parser.add_argument("--version", default="2.22")
+    parser.add_argument("--concurrency", type=int, default=50,
+                        help="logins in flight at once (default 50)")
+    parser.add_argument("--duration", type=float, default=30.0,
+                        help="seconds each session stays on after login")
+    parser.add_argument("--tick", type=float, default=0.1,
+                        help="seconds between moves (default 0.1)")
+    parser.add_argument("--warp", default="",
+                        help="level every session warps to after login")
+    args = parser.parse_args(argv)
+
+    t0 = time.monotonic()
+    results = asyncio.run(run(args))
+    _summarize(results, time.monotonic() - t0)
+    return 0 if any(r.login_s is not None for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
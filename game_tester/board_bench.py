@@ -0,0 +1,88 @@
+"""Board decoder microbenchmark: per-tile loop vs one-pass array decode.
+
+parse_board_packet runs on every level entry and on every gmap segment that
+streams in, so a gmap crawl decodes hundreds of boards back to back. This
+times the original decoder (one Python iteration per byte pair, append-padded)
+against the current one (mask the high bytes in one translate, load with
+array('H').frombytes), both returning a list and returning the array itself.
+
+Usage:
+    python -m game_tester.board_bench [--boards N] [--rounds N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+from pyreborn.packet_codec.level import parse_board_packet
+
+
+def _legacy_parse(data: bytes) -> list:
+    """The pre-array decoder, kept verbatim for comparison."""
+    tiles = []
+    for i in range(0, min(len(data), 8192), 2):
+        byte1 = data[i] if i < len(data) else 0
+        byte2 = data[i + 1] if i + 1 < len(data) else 0
+        tile_id = byte1 + (byte2 << 8)
+        tiles.append(tile_id & 0xFFF)
+    while len(tiles) < 4096:
+        tiles.append(0)
+    return tiles[:4096]
+
+
+def build_boards(count: int, seed: int = 1) -> List[bytes]:
+    """Raw PLO_BOARDPACKET payloads with a realistic spread of tile ids."""
+    rng = random.Random(seed)
+    palette = [rng.randrange(4096) for _ in range(96)]
+    return [b"".join(palette[rng.randrange(96)].to_bytes(2, "little")
+                     for _ in range(4096)) for _ in range(count)]
+
+
+def bench(decode: Callable[[bytes], object], boards: List[bytes],
+          rounds: int) -> List[float]:
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for data in boards:
+            decode(data)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _report(label: str, samples: List[float], boards: int) -> None:
+    best = min(samples)
+    print(f"  {label:<8} median {statistics.median(samples) * 1000:8.2f}ms  "
+          f"best {best * 1000:8.2f}ms  {best / boards * 1e6:7.1f}us/board")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m game_tester.board_bench",
+        description="Benchmark PLO_BOARDPACKET decoding.")
+    parser.add_argument("--boards", type=int, default=256,
+                        help="boards decoded per round (default 256, a 16x16 "
+                             "gmap)")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    boards = build_boards(args.boards)
+    for data in boards:
+        if parse_board_packet(data) != _legacy_parse(data):
+            print("decoders disagree")
+            return 1
+
+    print(f"{args.boards} boards x {args.rounds} round(s)\n")
+    _report("legacy", bench(_legacy_parse, boards, args.rounds), args.boards)
+    _report("list", bench(parse_board_packet, boards, args.rounds), args.boards)
+    _report("array", bench(lambda data: parse_board_packet(data, as_array=True),
+                           boards, args.rounds), args.boards)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,111 @@
+"""Download-cache index benchmark: rewrite index.json per store vs journal.
+
+The first visit to an asset-heavy server stores thousands of files through
+Client._store_cached_file. The original implementation re-serialized and
+atomically rewrote the whole index.json after each one (quadratic in the
+number of files); the current one appends a line to index.journal and folds
+it back into index.json only occasionally. Both write the same asset bytes,
+so the difference is the index maintenance alone. A cold load of the
+resulting index is timed too.
+
+Usage:
+    python -m game_tester.cache_index_bench [--files N] [--size BYTES]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+from pyreborn import Client
+from pyreborn.asset_paths import normalize_asset_name, server_cache_dir
+
+
+def _legacy_store(client: Client, index: dict, filename: str,
+                  file_data: bytes, mod_time: int) -> None:
+    """The pre-journal _store_cached_file body, kept verbatim for comparison
+    (index stands in for the session's _load_cache_index() dict)."""
+    key = normalize_asset_name(filename)
+    if not key or not file_data:
+        return
+    try:
+        directory = server_cache_dir(client.host, client.port)
+        directory.mkdir(parents=True, exist_ok=True)
+        client._atomic_cache_write(directory / key, file_data)
+        index[key] = {
+            "modtime": int(mod_time),
+            "size": len(file_data),
+            "sha256": hashlib.sha256(file_data).hexdigest(),
+        }
+        encoded = json.dumps(index, sort_keys=True).encode("utf-8")
+        client._atomic_cache_write(directory / "index.json", encoded)
+    except (OSError, ValueError, TypeError):
+        pass
+
+
+def _names(count: int) -> List[str]:
+    return [f"asset{number:05d}.png" for number in range(count)]
+
+
+def bench_legacy(files: int, payload: bytes) -> float:
+    client = Client("legacy.invalid", 14900)
+    index: dict = {}
+    t0 = time.perf_counter()
+    for name in _names(files):
+        _legacy_store(client, index, name, payload, 1)
+    return time.perf_counter() - t0
+
+
+def bench_journal(files: int, payload: bytes) -> float:
+    client = Client("journal.invalid", 14900)
+    t0 = time.perf_counter()
+    for name in _names(files):
+        client._store_cached_file(name, payload, 1)
+    return time.perf_counter() - t0
+
+
+def bench_load(host: str) -> float:
+    client = Client(host, 14900)
+    t0 = time.perf_counter()
+    client._load_cache_index()
+    return time.perf_counter() - t0
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m game_tester.cache_index_bench",
+        description="Benchmark download-cache index maintenance.")
+    parser.add_argument("--files", type=int, default=5000,
+                        help="files stored (default 5000)")
+    parser.add_argument("--size", type=int, default=2048,
+                        help="bytes per file (default 2048)")
+    args = parser.parse_args(argv)
+
+    payload = os.urandom(args.size)
+    with tempfile.TemporaryDirectory(prefix="pyreborn-cache-bench-") as root:
+        os.environ["PYREBORN_CACHE_DIR"] = root
+        print(f"{args.files} files x {args.size} bytes into {root}\n")
+        legacy = bench_legacy(args.files, payload)
+        journal = bench_journal(args.files, payload)
+        print(f"  legacy   store {legacy * 1000:9.1f}ms  "
+              f"{legacy / args.files * 1e6:8.1f}us/file  "
+              f"load {bench_load('legacy.invalid') * 1000:7.1f}ms")
+        print(f"  journal  store {journal * 1000:9.1f}ms  "
+              f"{journal / args.files * 1e6:8.1f}us/file  "
+              f"load {bench_load('journal.invalid') * 1000:7.1f}ms")
+        print(f"\n  speedup  {legacy / journal:.1f}x")
+        loaded = Client("journal.invalid", 14900)._load_cache_index()
+        if len(loaded) != args.files:
+            print(f"journal index holds {len(loaded)}/{args.files} entries")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
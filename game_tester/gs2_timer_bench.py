@@ -0,0 +1,156 @@
+"""GS2 timer bookkeeping benchmark: per-step countdown vs deadline heap.
+
+ClientGS2 advances script timers in fixed TIMER_RESOLUTION steps. The
+original step decremented every settimer() entry and every scheduleevent()
+arm, then rebuilt the scheduled list, so each step cost O(armed timers)
+even when nothing was due. The current one keeps both on deadline heaps
+(gs2_client.registry._TimeoutTable / _ScheduledEvents) and only touches
+what fires. Handlers are replaced by a re-arm, so this times the
+bookkeeping alone and checks both fire the same timers in the same order.
+
+Usage:
+    python -m game_tester.gs2_timer_bench [--timers N] [--events N]
+                                          [--seconds S]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from pyreborn.gs2_client.registry import (
+    TIMER_RESOLUTION,
+    _ScheduledEvents,
+    _TimeoutTable,
+)
+
+Fired = List[Tuple[int, tuple]]
+
+
+def _intervals(count: int, seed: int) -> List[float]:
+    rng = random.Random(seed)
+    return [rng.uniform(0.05, 2.0) for _ in range(count)]
+
+
+def _legacy_scheduled_step(scheduled: List[dict], dt: float) -> Tuple[
+        List[dict], List[dict]]:
+    """The pre-heap _process_scheduled_events body, kept verbatim apart from
+    returning (remaining list, due) instead of running handlers."""
+    due = []
+    for item in scheduled:
+        item["left"] -= dt
+        if item["left"] <= 0:
+            due.append(item)
+    if not due:
+        return scheduled, due
+    fired = {id(item) for item in due}
+    scheduled = [item for item in scheduled
+                 if id(item) not in fired]
+    return scheduled, due
+
+
+def _legacy_timeout_step(timeouts: Dict[tuple, float], dt: float,
+                         rearm: Callable[[tuple], None]) -> List[tuple]:
+    """The pre-heap _process_timeout_step walk over _timeouts."""
+    fired = []
+    for vm_key in list(timeouts):
+        left = timeouts.get(vm_key)
+        if left is None:
+            continue
+        t = left - dt
+        if t > 0:
+            timeouts[vm_key] = t
+            continue
+        del timeouts[vm_key]      # handler may re-arm
+        fired.append(vm_key)
+        rearm(vm_key)
+    return fired
+
+
+def bench_legacy(timers: int, events: int, steps: int) -> Tuple[float, Fired]:
+    periods = _intervals(timers, 1)
+    delays = _intervals(events, 2)
+    timeouts: Dict[tuple, float] = {
+        ("npc", n): periods[n] for n in range(timers)}
+    scheduled: List[dict] = [
+        {"key": ("npc", n), "left": delays[n], "event": "onTick",
+         "params": []} for n in range(events)]
+    log: Fired = []
+
+    def rearm(vm_key):
+        timeouts[vm_key] = periods[vm_key[1]]
+
+    t0 = time.perf_counter()
+    for step in range(steps):
+        scheduled, due = _legacy_scheduled_step(scheduled, TIMER_RESOLUTION)
+        for item in due:
+            n = item["key"][1]
+            log.append((step, ("event", n)))
+            scheduled.append({"key": item["key"], "left": delays[n],
+                              "event": "onTick", "params": []})
+        for vm_key in _legacy_timeout_step(timeouts, TIMER_RESOLUTION, rearm):
+            log.append((step, vm_key))
+    return time.perf_counter() - t0, log
+
+
+def bench_heap(timers: int, events: int, steps: int) -> Tuple[float, Fired]:
+    periods = _intervals(timers, 1)
+    delays = _intervals(events, 2)
+    timeouts = _TimeoutTable()
+    for n in range(timers):
+        timeouts[("npc", n)] = periods[n]
+    scheduled = _ScheduledEvents()
+    for n in range(events):
+        scheduled.add(("npc", n), delays[n], "onTick", [])
+    log: Fired = []
+
+    t0 = time.perf_counter()
+    for step in range(steps):
+        for item in scheduled.advance(TIMER_RESOLUTION):
+            n = item["key"][1]
+            log.append((step, ("event", n)))
+            scheduled.add(item["key"], delays[n], "onTick", [])
+        for vm_key, seq in timeouts.advance(TIMER_RESOLUTION):
+            if not timeouts.take(vm_key, seq):
+                continue
+            log.append((step, vm_key))
+            timeouts[vm_key] = periods[vm_key[1]]
+    return time.perf_counter() - t0, log
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m game_tester.gs2_timer_bench",
+        description="Benchmark GS2 settimer/scheduleevent bookkeeping.")
+    parser.add_argument("--timers", type=int, default=10000,
+                        help="settimer() arms (default 10000)")
+    parser.add_argument("--events", type=int, default=10000,
+                        help="scheduleevent() arms (default 10000)")
+    parser.add_argument("--seconds", type=float, default=5.0,
+                        help="simulated script time (default 5)")
+    args = parser.parse_args(argv)
+
+    steps = int(args.seconds / TIMER_RESOLUTION)
+    print(f"{args.timers} timers + {args.events} scheduled events, "
+          f"{steps} steps of {TIMER_RESOLUTION * 1000:.2f}ms\n")
+    legacy, legacy_log = bench_legacy(args.timers, args.events, steps)
+    heap, heap_log = bench_heap(args.timers, args.events, steps)
+    for name, wall, log in (("legacy", legacy, legacy_log),
+                            ("heap", heap, heap_log)):
+        print(f"  {name:<7} {wall * 1000:9.1f}ms  "
+              f"{wall / steps * 1e6:8.1f}us/step  {len(log):>8} fired")
+    print(f"\n  speedup  {legacy / heap:.1f}x")
+    if legacy_log != heap_log:
+        # The countdown drifts an ulp per subtraction, so a timer on an
+        # exact multiple of the step may fire one step late there.
+        late = sum(1 for a, b in zip(legacy_log, heap_log) if a != b)
+        print(f"  firing logs differ in {late} places "
+              f"({len(legacy_log)} vs {len(heap_log)} entries)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,200 @@
+"""Inbound parser microbenchmark: how fast does a level-entry burst drain?
+
+Level entry is the worst case for Protocol.recv_packets: the server streams
+the board, NPC props and every missing asset back to back, and one update()
+may drain the whole MAX_SOCKET_DRAIN_BYTES budget. This feeds such a burst
+through the parser twice:
+
+    split   frame splitting alone, on bytes already in memory. Compares the
+            old re-slicing loop (every frame copied the rest of the buffer)
+            against protocol._consume_frames (offset walk, one compaction)
+    recv    the full Protocol.recv_packets path over a socketpair: recv_into,
+            frame split, GEN_5 decrypt, bundle split and PLO_RAWDATA
+            reassembly
+
+By default the burst is synthesized from representative level-entry traffic
+(PLO_LEVELNAME, a raw board, NPC props, raw PLO_FILE chunks) encrypted with a
+real Gen5Codec. --wire replays a recorded socket dump instead: the bytes as
+they came off the wire, length prefixes included, with --key being the
+encryption key that session logged in with.
+
+Usage:
+    python -m game_tester.recv_bench [--mib N] [--rounds N]
+                                     [--wire PATH --key K]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+from typing import Callable, List, Tuple
+
+from reborn_protocol import Gen5Codec
+
+from pyreborn import protocol as protocol_module
+from pyreborn.protocol import Protocol
+
+# Uncompressed bytes per server bundle. Keeps every encrypted frame well under
+# the 2-byte length prefix's 65535 ceiling, like a real server's bundling.
+_BUNDLE_BYTES = 16 * 1024
+_FILE_CHUNK_BYTES = 32 * 1024
+
+
+def _line(packet_id: int, body: bytes) -> bytes:
+    return bytes([packet_id + 32]) + body + b"\n"
+
+
+def _raw(packet_id: int, body: bytes) -> List[bytes]:
+    """PLO_RAWDATA header plus the raw block it announces."""
+    block = bytes([packet_id + 32]) + body + b"\n"
+    size = len(block)
+    header = bytes([32 + ((size >> 14) & 0x7F), 32 + ((size >> 7) & 0x7F),
+                    32 + (size & 0x7F)])
+    return [_line(100, header), block]
+
+
+def build_burst(total_bytes: int, key: int, seed: int = 1) -> Tuple[bytes, int]:
+    """Encrypted wire bytes for a synthetic level entry, and its packet count."""
+    rng = random.Random(seed)
+    # Tile data and assets are neither all-zero nor incompressible noise.
+    palette = bytes(rng.randrange(256) for _ in range(64))
+
+    def payload(size: int) -> bytes:
+        return bytes(palette[rng.randrange(64)] for _ in range(size))
+
+    stream: List[bytes] = [_line(6, b"entrylevel.nw")]
+    stream += _raw(101, payload(8192))
+    stream += [_line(3, bytes([32 + n % 90]) + payload(40)) for n in range(200)]
+    packets = 1 + 2 + 200
+    produced = sum(len(part) for part in stream)
+    file_no = 0
+    while produced < total_bytes:
+        name = f"asset{file_no}.png".encode()
+        body = bytes([32 + len(name)]) + name + payload(_FILE_CHUNK_BYTES)
+        parts = _raw(102, body)
+        stream += parts
+        packets += 2
+        produced += sum(len(part) for part in parts)
+        file_no += 1
+
+    codec = Gen5Codec(key)
+    wire = bytearray()
+    plain = b"".join(stream)
+    for start in range(0, len(plain), _BUNDLE_BYTES):
+        wire += codec.send_packet(plain[start:start + _BUNDLE_BYTES])
+    return bytes(wire), packets
+
+
+def _legacy_consume(buf: bytes, handle_frame: Callable[[bytes], None]) -> bytes:
+    """The pre-ring frame loop: re-slices the whole buffer per frame."""
+    while len(buf) >= 2:
+        length = (buf[0] << 8) | buf[1]
+        if len(buf) < 2 + length:
+            break
+        handle_frame(buf[2:2 + length])
+        buf = buf[2 + length:]
+    return buf
+
+
+def bench_split(wire: bytes, rounds: int) -> Tuple[List[float], List[float]]:
+    legacy, ring = [], []
+    for _ in range(rounds):
+        frames: List[bytes] = []
+        t0 = time.perf_counter()
+        _legacy_consume(wire, frames.append)
+        legacy.append(time.perf_counter() - t0)
+
+        frames = []
+        buf = bytearray(wire)
+        t0 = time.perf_counter()
+        protocol_module._consume_frames(buf, frames.append)
+        ring.append(time.perf_counter() - t0)
+    return legacy, ring
+
+
+def bench_recv(wire: bytes, key: int, expected: int,
+               rounds: int) -> List[float]:
+    samples = []
+    for _ in range(rounds):
+        receiver, sender = socket.socketpair()
+        proto = Protocol("127.0.0.1", 0, version="6.037")
+        proto.socket = receiver
+        proto.connected = True
+        proto.first_packet = False
+        proto.codec = Gen5Codec(key)
+        writer = threading.Thread(target=sender.sendall, args=(wire,),
+                                  daemon=True)
+        try:
+            got = 0
+            t0 = time.perf_counter()
+            writer.start()
+            while got < expected and proto.connected:
+                got += len(proto.recv_packets(timeout=0.5))
+            samples.append(time.perf_counter() - t0)
+            if got != expected:
+                print(f"  warning: parsed {got}/{expected} packets")
+        finally:
+            writer.join(timeout=5)
+            receiver.close()
+            sender.close()
+    return samples
+
+
+def _report(label: str, samples: List[float], size: int) -> None:
+    best = min(samples)
+    print(f"  {label:<10} median {statistics.median(samples) * 1000:8.1f}ms  "
+          f"best {best * 1000:8.1f}ms  {size / best / (1 << 20):7.1f} MiB/s")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m game_tester.recv_bench",
+        description="Benchmark the inbound frame parser on a level-entry burst.")
+    parser.add_argument("--mib", type=float, default=4.0,
+                        help="size of the synthetic burst (default 4, the "
+                             "per-update drain budget)")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--wire", default="",
+                        help="recorded wire dump to replay instead")
+    parser.add_argument("--key", type=int, default=7,
+                        help="encryption key the recorded session used")
+    parser.add_argument("--packets", type=int, default=0,
+                        help="packet count in --wire (default: count on the "
+                             "first pass)")
+    args = parser.parse_args(argv)
+
+    if args.wire:
+        with open(args.wire, "rb") as f:
+            wire = f.read()
+        expected = args.packets
+        if not expected:
+            proto = Protocol("127.0.0.1", 0, version="6.037")
+            proto.first_packet = False
+            proto.codec = Gen5Codec(args.key)
+            packets: List[Tuple[int, bytes]] = []
+            protocol_module._consume_frames(
+                bytearray(wire),
+                lambda frame: proto._split_bundle(
+                    proto._decrypt_frame(frame) or b"", packets))
+            expected = len(packets)
+    else:
+        wire, expected = build_burst(int(args.mib * (1 << 20)), args.key)
+
+    print(f"burst: {len(wire) / (1 << 20):.2f} MiB on the wire, "
+          f"{expected} packets, {args.rounds} round(s)\n")
+    legacy, ring = bench_split(wire, args.rounds)
+    print("frame split only")
+    _report("re-slice", legacy, len(wire))
+    _report("ring", ring, len(wire))
+    print("\nrecv_packets (recv_into + split + decrypt + bundle parse)")
+    _report("recv", bench_recv(wire, args.key, expected, args.rounds), len(wire))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
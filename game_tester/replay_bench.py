@@ -0,0 +1,140 @@
+"""Record a live session once, then benchmark the client on it offline.
+
+    record  log in, optionally warp, walk around for --duration seconds and
+            write every decoded inbound packet to a capture file
+            (pyreborn.capture)
+    replay  feed a capture into a fresh Client as fast as it will go (or at
+            --speed times the recorded pace) and report dispatch throughput
+            plus the slowest packet ids by total handler time (from
+            Client.enable_packet_timing)
+
+The replayed Client runs with no socket and no server, so runs are repeatable:
+record a level-entry burst or a busy gmap once and compare handler and script
+cost before and after a change.
+
+Usage:
+    python -m game_tester.replay_bench record OUT [--host H] [--port P]
+                                       [--account A] [--password P]
+                                       [--duration S] [--warp LEVEL]
+    python -m game_tester.replay_bench replay CAPTURE [--rounds N]
+                                       [--speed X] [--top N] [--json OUT]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import List, Tuple
+
+from pyreborn import Client
+from pyreborn.capture import iter_capture, read_capture_version
+
+_WALK = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+def record(args) -> int:
+    client = Client(args.host, args.port, version=args.version)
+    writer = client.start_capture(args.out)
+    try:
+        if not client.connect():
+            print("connect failed")
+            return 1
+        if not client.login(args.account, args.password, timeout=15.0):
+            print(f"login failed: {client.disconnect_reason or 'timeout'}")
+            return 1
+        if args.warp:
+            client.warp_to_level(args.warp, 30.0, 30.0)
+        deadline = time.monotonic() + args.duration
+        step = 0
+        while client.connected and time.monotonic() < deadline:
+            client.update(timeout=0.05)
+            if step % 10 == 0:
+                client.move(*_WALK[(step // 10) % len(_WALK)])
+            step += 1
+    finally:
+        client.disconnect()
+    print(f"wrote {writer.packets} packets ({writer.bytes / 1024:.0f} KiB) "
+          f"to {args.out}")
+    return 0
+
+
+def replay_once(path: str, speed: float) -> Tuple[float, int, dict]:
+    """One full playback. Returns (wall seconds, packets dispatched, the
+    client's packet timing report)."""
+    client = Client(version=read_capture_version(path))
+    client.replay(path, speed=speed)
+    client.enable_packet_timing()
+    client.connect()
+    dispatched = 0
+    t0 = time.perf_counter()
+    while client.connected:
+        dispatched += len(client.update(timeout=0.01))
+    return time.perf_counter() - t0, dispatched, client.packet_timing_report()
+
+
+def replay(args) -> int:
+    records = sum(1 for _ in iter_capture(args.capture))
+    print(f"{args.capture}: {records} packets, version "
+          f"{read_capture_version(args.capture)}, {args.rounds} round(s)\n")
+    walls = []
+    report: dict = {}
+    for _ in range(args.rounds):
+        wall, dispatched, report = replay_once(args.capture, args.speed)
+        walls.append(wall)
+        if dispatched != records:
+            print(f"  warning: dispatched {dispatched}/{records} packets")
+    best = min(walls)
+    print(f"  replay   median {statistics.median(walls) * 1000:8.1f}ms  "
+          f"best {best * 1000:8.1f}ms  {records / best:9.0f} packets/s")
+
+    # Handler table from the last round, largest total first.
+    ranked = list(report.get("packets", {}).items())[:args.top]
+    if ranked:
+        print(f"\n  {'packet':<24} {'count':>7} {'total ms':>9} "
+              f"{'p50 us':>8} {'p99 us':>8} {'KiB':>7}")
+    for name, entry in ranked:
+        print(f"  {name:<24} {entry['count']:>7} {entry['total_ms']:>9.1f} "
+              f"{entry['p50_us']:>8.0f} {entry['p99_us']:>8.0f} "
+              f"{entry['bytes'] / 1024:>7.0f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m game_tester.replay_bench",
+        description="Record a session and benchmark the client on it offline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="capture a live session")
+    rec.add_argument("out")
+    rec.add_argument("--host", default="localhost")
+    rec.add_argument("--port", type=int, default=14900)
+    rec.add_argument("--version", default="2.22")
+    rec.add_argument("--account", default="replaybot")
+    rec.add_argument("--password", default="replaybot")
+    rec.add_argument("--duration", type=float, default=30.0)
+    rec.add_argument("--warp", default="",
+                     help="level to warp to after login")
+
+    rep = sub.add_parser("replay", help="benchmark dispatch on a capture")
+    rep.add_argument("capture")
+    rep.add_argument("--rounds", type=int, default=3)
+    rep.add_argument("--speed", type=float, default=0.0,
+                     help="multiple of the recorded pace (default 0: as "
+                          "fast as possible)")
+    rep.add_argument("--top", type=int, default=10,
+                     help="packet ids to list by handler time")
+    rep.add_argument("--json", default="",
+                     help="also write the last round's timing report here")
+    args = parser.parse_args(argv)
+    return record(args) if args.command == "record" else replay(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,160 @@
+"""Segment bake benchmark: per-tile surfaces vs atlas source rects.
+
+WorldRenderMixin._render_single_level bakes one 64x64-tile segment. The
+original bake resolved each distinct id through get_tile_or_color, whose
+first use of an id cuts a 16x16 copy out of the tileset sheet, then blitted
+those copies. The current one blits straight from the sheet with each tile's
+rect as the source area (TilesetManager.get_tile_sources). A level change or
+tiledef edit clears the tile cache, so the COLD column (cache cleared before
+every bake) is the warp stutter; WARM is a rebake with every tile already
+cut. Each segment's pixels and water/lava index are checked for parity
+between the two.
+
+Usage:
+    python -m game_tester.segment_bake_bench [--segments N] [--rounds N]
+                                             [--distinct N] [--paste]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from array import array
+from typing import Callable, List, Sequence, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from pyreborn.game.constants import TILE_SIZE
+from pyreborn.game.render_world import WorldRenderMixin
+from pyreborn.sprites import SpriteManager, TilesetManager
+from pyreborn.tiletypes import get_tile_type
+
+
+class _Baker(WorldRenderMixin):
+    def __init__(self, tileset_mgr: TilesetManager):
+        self.tileset_mgr = tileset_mgr
+
+
+def _legacy_bake(self, surface: pygame.Surface, tiles: Sequence[int],
+                 animated_out: List[Tuple[int, int, int]]):
+    """The per-tile-surface _render_single_level, kept verbatim."""
+    if not tiles:
+        return
+    resolved = {}
+    get_tile = self.tileset_mgr.get_tile_or_color
+    animated_types = self._ANIMATED_TILE_TYPES
+    blits = []
+    for ty in range(64):
+        row = ty * 64
+        for tx in range(64):
+            tile_id = tiles[row + tx]
+            entry = resolved.get(tile_id)
+            if entry is None:
+                entry = (get_tile(tile_id),
+                         get_tile_type(tile_id) in animated_types)
+                resolved[tile_id] = entry
+            blits.append((entry[0], (tx * TILE_SIZE, ty * TILE_SIZE)))
+            if entry[1]:
+                animated_out.append((tx, ty, tile_id))
+    surface.blits(blits, doreturn=False)
+
+
+def build_tileset(paste: bool, seed: int = 1) -> TilesetManager:
+    """A noise-filled 2048x512 tileset (and optionally an addtiledef2 paste,
+    which routes every tile through the composed sheet)."""
+    rng = random.Random(seed)
+    sprites = SpriteManager([])
+    sheet = pygame.Surface((2048, 512))
+    for y in range(0, 512, 4):
+        for x in range(0, 2048, 4):
+            sheet.fill((rng.randrange(256), rng.randrange(256),
+                        rng.randrange(256)), (x, y, 4, 4))
+    sprites.sheet_cache["dustynewpics1.png"] = sheet
+    mgr = TilesetManager(sprites)
+    if paste:
+        overlay = pygame.Surface((256, 128))
+        overlay.fill((200, 40, 90))
+        sprites.sheet_cache["bench_paste.png"] = overlay
+        mgr.set_tiledef("bench_paste.png", "", 512, 256)
+    return mgr
+
+
+def build_boards(count: int, distinct: int, seed: int = 2) -> List[array]:
+    """Boards with a realistic few hundred distinct ids in short runs."""
+    rng = random.Random(seed)
+    palette = [rng.randrange(4096) for _ in range(distinct)]
+    boards = []
+    for _ in range(count):
+        cells: List[int] = []
+        while len(cells) < 4096:
+            cells.extend([rng.choice(palette)] * rng.randrange(1, 6))
+        boards.append(array('H', cells[:4096]))
+    return boards
+
+
+def bench(bake: Callable, mgr: TilesetManager, boards: List[array],
+          rounds: int, cold: bool) -> Tuple[List[float], list]:
+    """Per-round mean ms/segment, plus each segment's pixels and animated
+    index from the last round for the parity check."""
+    baker = _Baker(mgr)
+    samples = []
+    baked: list = []
+    for _ in range(rounds):
+        baked = []
+        total = 0.0
+        for tiles in boards:
+            if cold:
+                mgr.clear_cache()
+                mgr.sprite_mgr.sprite_cache.clear()
+            surf = pygame.Surface((64 * TILE_SIZE, 64 * TILE_SIZE))
+            surf.fill((0, 0, 0))
+            animated: List[Tuple[int, int, int]] = []
+            t0 = time.perf_counter()
+            bake(baker, surf, tiles, animated)
+            total += time.perf_counter() - t0
+            baked.append((pygame.image.tobytes(surf, "RGB"), animated))
+        samples.append(total / len(boards))
+    return samples, baked
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m game_tester.segment_bake_bench",
+        description="Benchmark 64x64 segment bakes.")
+    parser.add_argument("--segments", type=int, default=9,
+                        help="segments per round (default 9)")
+    parser.add_argument("--rounds", type=int, default=15,
+                        help="timed rounds (default 15)")
+    parser.add_argument("--distinct", type=int, default=260,
+                        help="distinct tile ids in play (default 260)")
+    parser.add_argument("--paste", action="store_true",
+                        help="bake through an addtiledef2-composed sheet")
+    args = parser.parse_args(argv)
+
+    mgr = build_tileset(args.paste)
+    boards = build_boards(args.segments, args.distinct)
+    print(f"{args.segments} segments x {args.rounds} rounds, "
+          f"{args.distinct} distinct ids"
+          f"{', composed sheet' if args.paste else ''}\n")
+    atlas_bake = WorldRenderMixin._render_single_level
+    for cold in (True, False):
+        legacy, legacy_out = bench(_legacy_bake, mgr, boards, args.rounds, cold)
+        atlas, atlas_out = bench(atlas_bake, mgr, boards, args.rounds, cold)
+        print(f"  {'cold' if cold else 'warm'}")
+        for name, samples in (("legacy", legacy), ("atlas", atlas)):
+            print(f"    {name:<7} median {statistics.median(samples) * 1000:7.2f}"
+                  f"ms/segment  best {min(samples) * 1000:7.2f}ms")
+        print(f"    speedup {statistics.median(legacy) / statistics.median(atlas):.1f}x"
+              f"  output {'matches' if legacy_out == atlas_out else 'DIFFERS'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
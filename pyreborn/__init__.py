@@ -25,6 +25,15 @@ Or quick connect:
         client.move(1, 0)
         client.disconnect()
 
+Or many sessions on one asyncio event loop:
+    from pyreborn import AsyncClient
+
+    async def bot(name):
+        async with AsyncClient("localhost", 14900) as client:
+            if await client.connect() and await client.login(name, "password"):
+                await client.warp("level2.nw", 30, 30)
+                await client.run(duration=60)
+
 Or via listserver:
     from pyreborn import ListServerClient, connect_via_listserver
 
@@ -63,6 +72,7 @@ RC (Remote Control) for server administration:
 __version__ = "1.0.0"
 
 from .client import Client, connect
+from .async_client import AsyncClient
 from .player import Player
 from .listserver import (
     ListServerClient,
@@ -77,6 +87,7 @@ from .nc_client import NCClient, nc_connect
 
 __all__ = [
     "Client",
+    "AsyncClient",
     "Player",
     "connect",
     "ListServerClient",
@@ -0,0 +1,254 @@
+"""
+pyreborn - Asset fetch scheduling
+Prioritised, windowed file requests for whatever draws the world.
+
+The renderer discovers missing sheets, ganis and sounds one blit at a time and
+used to ask for each the moment it missed. A level entry either trickled its
+assets in over many frames or dumped every request on the server at once,
+with tileset-sized music downloads queued ahead of the NPC sheets on screen.
+The scheduler keeps a priority queue instead (visible images and ganis first,
+then sounds, then music), keeps at most `window` requests outstanding, and
+dedups by normalize_asset_name, so "Body.PNG" and "body.png" are one download.
+
+Refusals go through the client's own strike count (Client.file_attempts,
+PLO_FILESENDFAILED): a refused name is retried after an exponential backoff
+until the client writes it off (Client.did_file_fail).
+
+It also measures time to first complete frame after a warp: from begin_warp()
+to the first frame_rendered() with the board in hand and no visible asset
+still outstanding.
+
+Usage:
+    fetch = AssetFetchScheduler(client, window=8)
+    fetch.request("npc_sheet.png")      # on a render miss
+    ...
+    fetch.pump()                        # once per frame, after client.update()
+    fetch.frame_rendered(board_ready)   # after drawing
+    fetch.report()
+"""
+
+import heapq
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .asset_paths import normalize_asset_name
+from .packet_timing import LatencyHistogram
+
+PRIORITY_VISIBLE = 0    # images and ganis something on screen is waiting for
+PRIORITY_OTHER = 1      # anything else (.txt, .nw, ...)
+PRIORITY_SOUND = 2      # one-shot samples
+PRIORITY_MUSIC = 3      # streamed tracks, usually the largest downloads
+
+_VISIBLE_EXTS = ('.png', '.gif', '.bmp', '.mng', '.jpg', '.jpeg', '.gani')
+_SOUND_EXTS = ('.wav', '.aiff', '.aif', '.flac')
+# Same split as SoundManager.MUSIC_EXTS (.ogg streams as music).
+_MUSIC_EXTS = ('.mid', '.midi', '.ogg', '.mp3', '.mod', '.it', '.xm', '.s3m')
+
+
+def asset_priority(filename: str) -> int:
+    """Default priority for a file, from its extension."""
+    name = filename.lower()
+    if name.endswith(_VISIBLE_EXTS):
+        return PRIORITY_VISIBLE
+    if name.endswith(_SOUND_EXTS):
+        return PRIORITY_SOUND
+    if name.endswith(_MUSIC_EXTS):
+        return PRIORITY_MUSIC
+    return PRIORITY_OTHER
+
+
+def fetch_or_request(fetch, client, filename: str,
+                     priority: Optional[int] = None) -> bool:
+    """Request a file through `fetch` when a scheduler is wired in.
+
+    Without one (headless runtimes, test harnesses) the request goes straight
+    to client.request_file, as it did before the scheduler existed.
+    """
+    if fetch is not None:
+        return fetch.request(filename, priority)
+    return bool(client.request_file(filename))
+
+
+class AssetFetchScheduler:
+    """Priority queue plus in-flight window in front of Client.request_file.
+
+    An accepted request is sent immediately if the window has room, so an
+    idle client sees no added latency. Everything else waits in the queue
+    for pump(). A request that is still pending after request_timeout seconds
+    gives up its slot and goes to the back of the queue.
+    """
+
+    def __init__(self, client, window: int = 8, retry_delay: float = 1.0,
+                 max_retry_delay: float = 30.0, request_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.client = client
+        self.window = window
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.request_timeout = request_timeout
+        self.clock = clock
+
+        # (priority, sequence, key). An entry is stale once _queued holds a
+        # different priority for its key; it is skipped when it surfaces.
+        self._heap: List[Tuple[int, int, str]] = []
+        self._sequence = 0
+        # key -> (priority, filename as first requested)
+        self._queued: Dict[str, Tuple[int, str]] = {}
+        # key -> (filename, sent at, client strikes at send time, priority)
+        self._in_flight: Dict[str, Tuple[str, float, int, int]] = {}
+        # key -> (due, priority, filename): refused, waiting out the backoff
+        self._retrying: Dict[str, Tuple[float, int, str]] = {}
+
+        self.stats: Dict[str, int] = {
+            'requested': 0,     # distinct names accepted
+            'deduped': 0,       # requests for a name already in the pipeline
+            'sent': 0,          # request_file calls, retries included
+            'completed': 0,     # answered with the file or "up to date"
+            'retried': 0,       # refusals scheduled for another attempt
+            'abandoned': 0,     # refusals the client wrote off
+            'timed_out': 0,     # pending longer than request_timeout
+            'peak_in_flight': 0,
+        }
+        # Seconds from begin_warp() to the first complete frame.
+        self.warp_complete = LatencyHistogram()
+        self.last_warp_complete: Optional[float] = None
+        self._warp_started: Optional[float] = None
+
+    # -- intake --------------------------------------------------------------
+
+    def request(self, filename: str, priority: Optional[int] = None) -> bool:
+        """Queue a file. Returns False if the name is empty or written off."""
+        key = normalize_asset_name(filename) if filename else ''
+        if not key:
+            return False
+        if priority is None:
+            priority = asset_priority(key)
+        if key in self._in_flight:
+            self.stats['deduped'] += 1
+            return True
+        retrying = self._retrying.get(key)
+        if retrying is not None:
+            self.stats['deduped'] += 1
+            if priority < retrying[1]:
+                self._retrying[key] = (retrying[0], priority, retrying[2])
+            return True
+        queued = self._queued.get(key)
+        if queued is not None:
+            self.stats['deduped'] += 1
+            if priority >= queued[0]:
+                return True
+            filename = queued[1]
+        elif self.client.did_file_fail(filename):
+            return False
+        else:
+            self.stats['requested'] += 1
+        self._enqueue(key, priority, filename)
+        self._dispatch(self.clock())
+        return True
+
+    def _enqueue(self, key: str, priority: int, filename: str) -> None:
+        self._queued[key] = (priority, filename)
+        self._sequence += 1
+        heapq.heappush(self._heap, (priority, self._sequence, key))
+
+    # -- per frame -----------------------------------------------------------
+
+    def pump(self) -> None:
+        """Settle answered requests, then refill the window."""
+        now = self.clock()
+        client = self.client
+        stats = self.stats
+        for key, (filename, sent_at, strikes, priority) in list(
+                self._in_flight.items()):
+            if client.is_file_pending(filename):
+                if now - sent_at >= self.request_timeout:
+                    del self._in_flight[key]
+                    stats['timed_out'] += 1
+                    self._enqueue(key, priority, filename)
+                continue
+            del self._in_flight[key]
+            # Only a refusal (PLO_FILESENDFAILED) adds a strike; PLO_FILE
+            # clears them and PLO_FILEUPTODATE leaves them alone.
+            attempts = client.file_attempts(filename)
+            if attempts <= strikes:
+                stats['completed'] += 1
+            elif client.did_file_fail(filename):
+                stats['abandoned'] += 1
+            else:
+                stats['retried'] += 1
+                delay = min(self.max_retry_delay,
+                            self.retry_delay * 2 ** (attempts - 1))
+                self._retrying[key] = (now + delay, priority, filename)
+        self._dispatch(now)
+
+    def _dispatch(self, now: float) -> None:
+        if self._retrying:
+            for key, (due, priority, filename) in list(self._retrying.items()):
+                if due <= now:
+                    del self._retrying[key]
+                    self._enqueue(key, priority, filename)
+        heap = self._heap
+        client = self.client
+        while heap and len(self._in_flight) < self.window:
+            priority, _, key = heap[0]
+            queued = self._queued.get(key)
+            if queued is None or queued[0] != priority:
+                heapq.heappop(heap)
+                continue
+            filename = queued[1]
+            if client.did_file_fail(filename):
+                heapq.heappop(heap)
+                del self._queued[key]
+                self.stats['abandoned'] += 1
+                continue
+            strikes = client.file_attempts(filename)
+            # Offline or not logged in yet: leave the queue for a later pump.
+            if not client.request_file(filename):
+                break
+            heapq.heappop(heap)
+            del self._queued[key]
+            self._in_flight[key] = (filename, now, strikes, priority)
+            self.stats['sent'] += 1
+        if len(self._in_flight) > self.stats['peak_in_flight']:
+            self.stats['peak_in_flight'] = len(self._in_flight)
+
+    # -- time to first complete frame ---------------------------------------
+
+    def begin_warp(self) -> None:
+        """Start timing a level change (call when the new level is confirmed)."""
+        self._warp_started = self.clock()
+
+    def visible_outstanding(self) -> int:
+        """Visible-priority names queued, in flight or waiting to retry."""
+        return (
+            sum(1 for priority, _ in self._queued.values()
+                if priority == PRIORITY_VISIBLE)
+            + sum(1 for entry in self._in_flight.values()
+                  if entry[3] == PRIORITY_VISIBLE)
+            + sum(1 for entry in self._retrying.values()
+                  if entry[1] == PRIORITY_VISIBLE)
+        )
+
+    def frame_rendered(self, board_ready: bool = True) -> None:
+        """Report a drawn frame. The first one after begin_warp() that had its
+        board and no visible asset outstanding ends the measurement."""
+        if self._warp_started is None or not board_ready:
+            return
+        if self.visible_outstanding():
+            return
+        elapsed = self.clock() - self._warp_started
+        self._warp_started = None
+        self.last_warp_complete = elapsed
+        self.warp_complete.add(elapsed)
+
+    # -- reporting -----------------------------------------------------------
+
+    def report(self) -> dict:
+        """JSON-ready counters, current queue depths and warp timings."""
+        report = dict(self.stats)
+        report['queued'] = len(self._queued)
+        report['in_flight'] = len(self._in_flight)
+        report['retrying'] = len(self._retrying)
+        report['window'] = self.window
+        report['warp_complete'] = self.warp_complete.as_dict()
+        return report
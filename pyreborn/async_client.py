@@ -0,0 +1,110 @@
+"""
+pyreborn - AsyncClient
+asyncio facade over Client for running many sessions in one process.
+
+Client owns a socket and polls it with select() on every update(), so a
+process driving N bots ends up polling N sockets in a Python loop. AsyncClient
+rides an AsyncProtocol instead: the event loop feeds bytes in as they arrive,
+and connect/login/warp become awaitable. Packet dispatch is exactly Client's -
+update() still runs handlers.PACKET_HANDLERS - so every piece of client state,
+callback and script host behaves the same as in the synchronous client.
+
+Usage:
+    async def bot(name):
+        async with AsyncClient("localhost", 14900) as client:
+            if await client.connect() and await client.login(name, "pw"):
+                client.say("Hello!")
+                await client.warp("level2.nw", 30, 30)
+                await client.run(duration=60)
+
+    async def main():
+        await asyncio.gather(*(bot(f"loadbot{i}") for i in range(500)))
+
+    asyncio.run(main())
+"""
+
+import asyncio
+from typing import List, Optional, Tuple
+
+from .client import Client
+from .protocol import AsyncProtocol
+
+
+class AsyncClient(Client):
+    """Client whose network I/O runs on the asyncio event loop.
+
+    Everything that only sends (move, say, sword_attack, ...) is inherited
+    unchanged and stays synchronous: it just queues bytes on the transport.
+    What waits for the server is a coroutine here.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 14900,
+                 version: str = "2.22", **kwargs):
+        """Same arguments as Client (batch_sends, level_cache_bytes,
+        file_cache_bytes, ...); threaded_io and proxy_url do not apply."""
+        super().__init__(host, port, version, **kwargs)
+        batch_sends = self.batch_sends
+        self._protocol = AsyncProtocol(host, port, version)
+        self._protocol.batch_sends = batch_sends
+
+    async def connect(self) -> bool:
+        """Connect to the server. Returns True if successful."""
+        self._reset_for_connect()
+        return await self._protocol.connect_async()
+
+    async def login(self, username: str, password: str,
+                    timeout: float = 5.0) -> bool:
+        """Log in and wait for the server to accept (see Client.login)."""
+        if not self._begin_login(username, password):
+            return False
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline:
+            await self.poll(0.1)
+            if self._authenticated:
+                return True
+            if not self.connected:
+                return False
+        return False
+
+    async def poll(self, timeout: float = 0.01) -> List[Tuple[int, bytes]]:
+        """Wait up to timeout for packets, then dispatch them (the awaitable
+        counterpart of update())."""
+        await self._protocol.wait_packets(timeout)
+        return self.update(timeout=0)
+
+    async def warp(self, level_name: str, x: float = 30.0, y: float = 30.0,
+                   timeout: float = 5.0) -> bool:
+        """Warp and wait until the player stands in level_name.
+
+        Arrival is judged from position (get_current_level_from_position), not
+        _current_level_name, which follows whichever gmap segment streamed in
+        last rather than where the player is.
+        """
+        if not self.warp_to_level(level_name, x, y):
+            return False
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline and self.connected:
+            await self.poll(0.1)
+            if self.get_current_level_from_position() == level_name:
+                return True
+        return False
+
+    async def run(self, duration: Optional[float] = None,
+                  tick: float = 0.05) -> None:
+        """Keep dispatching packets until disconnected (or for duration
+        seconds)."""
+        loop = asyncio.get_running_loop()
+        deadline = None if duration is None else loop.time() + duration
+        while self.connected and (deadline is None or loop.time() < deadline):
+            await self.poll(tick)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.disconnect()
+        return False
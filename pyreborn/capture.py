@@ -0,0 +1,191 @@
+"""
+pyreborn - Packet capture and replay
+Record a session's decoded inbound packets, then play them back into a
+Client without a server.
+
+A capture is the (timestamp, packet id, body) stream recv_packets() handed to
+Client.update(), after decryption, bundle splitting and PLO_RAWDATA
+reassembly. Replaying it therefore exercises exactly what a live session
+exercises above the socket: handlers, client state, the script hosts and
+whatever a game loop draws from them. That makes a capture a repeatable
+workload for profiling and regression benchmarks on a machine with no server.
+
+File layout (little-endian):
+    header  MAGIC, u8 version length, version (ascii)
+    record  f64 seconds since capture start, u16 packet id, u32 body length,
+            body
+
+Usage:
+    client.start_capture("session.rcap")    # while connected and playing
+    ...
+    client.stop_capture()
+
+    replay = Client(version=read_capture_version("session.rcap"))
+    replay.replay("session.rcap", speed=0)   # 0 = as fast as possible
+    replay.connect()
+    while replay.connected:
+        replay.update()
+"""
+
+import struct
+import time
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from .protocol import Protocol
+
+MAGIC = b"PYRBCAP1"
+_RECORD = struct.Struct("<dHI")
+
+CaptureRecord = Tuple[float, int, bytes]
+
+
+class CaptureWriter:
+    """Appends decoded inbound packets to a capture file.
+
+    Assign one to Protocol.capture (or use Client.start_capture); every
+    recv_packets() then writes the packets it returns.
+    """
+
+    def __init__(self, path: str, version: str = "2.22"):
+        self.path = path
+        self.packets = 0
+        self.bytes = 0
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        encoded = version.encode("ascii")
+        self._file.write(MAGIC + bytes([len(encoded)]) + encoded)
+        self._start = time.monotonic()
+
+    def write(self, packets: List[Tuple[int, bytes]],
+              timestamp: Optional[float] = None) -> None:
+        """Record one recv_packets() result. timestamp (time.monotonic())
+        defaults to now; ThreadedProtocol passes the decode time instead."""
+        if self._file is None or not packets:
+            return
+        offset = (time.monotonic() if timestamp is None else timestamp) - self._start
+        out = bytearray()
+        for packet_id, data in packets:
+            out += _RECORD.pack(offset, packet_id, len(data))
+            out += data
+        self._file.write(out)
+        self.packets += len(packets)
+        self.bytes += len(out)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _read_header(f: BinaryIO, path: str) -> str:
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{path}: not a pyreborn capture")
+    size = f.read(1)
+    if not size:
+        raise ValueError(f"{path}: truncated capture header")
+    return f.read(size[0]).decode("ascii")
+
+
+def read_capture_version(path: str) -> str:
+    """The client version the capture was recorded with."""
+    with open(path, "rb") as f:
+        return _read_header(f, path)
+
+
+def iter_capture(path: str) -> Iterator[CaptureRecord]:
+    """Yield (seconds, packet_id, body) records. A record cut short by a
+    crash mid-write ends the iteration instead of raising."""
+    with open(path, "rb") as f:
+        _read_header(f, path)
+        while True:
+            head = f.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                return
+            offset, packet_id, size = _RECORD.unpack(head)
+            data = f.read(size)
+            if len(data) < size:
+                return
+            yield offset, packet_id, data
+
+
+class ReplayProtocol(Protocol):
+    """Protocol that plays a capture back instead of reading a socket.
+
+    speed scales the recorded timing: 1.0 is real time, 2.0 twice as fast,
+    0 hands every remaining packet to the first recv_packets() call that
+    asks (max_per_call bounds that, so one update() stays one tick's worth
+    of work). Sends are accepted and, if sent_payloads is set, recorded, but
+    go nowhere. Once the capture is exhausted the protocol reports itself
+    disconnected, like a server closing the link.
+    """
+
+    def __init__(self, records: List[CaptureRecord], version: str = "2.22",
+                 speed: float = 1.0, max_per_call: int = 0):
+        super().__init__("replay", 0, version)
+        self.records = records
+        self.speed = speed
+        self.max_per_call = max_per_call
+        self.position = 0
+        self._clock_start: Optional[float] = None
+
+    @classmethod
+    def open(cls, path: str, speed: float = 1.0,
+             max_per_call: int = 0) -> "ReplayProtocol":
+        return cls(list(iter_capture(path)), read_capture_version(path),
+                   speed, max_per_call)
+
+    def connect(self) -> bool:
+        self.connected = True
+        self.position = 0
+        self._clock_start = None
+        return True
+
+    def disconnect(self):
+        self.connected = False
+
+    def send_login(self, username: str, password: str) -> bool:
+        return self.connected
+
+    def send_packet(self, packet_id: int, data: bytes = b"",
+                    append_newline: bool = True) -> bool:
+        if not self.connected:
+            return False
+        if self.sent_payloads is not None:
+            self.sent_payloads.setdefault(packet_id, []).append(data)
+        return True
+
+    def flush(self) -> bool:
+        return True
+
+    def _due_until(self) -> float:
+        """Capture time that has elapsed on the replay clock."""
+        if self.speed <= 0:
+            return float("inf")
+        now = time.monotonic()
+        if self._clock_start is None:
+            self._clock_start = now - self.records[self.position][0] / self.speed
+        return (now - self._clock_start) * self.speed
+
+    def recv_packets(self, timeout: float = 0.01) -> List[Tuple[int, bytes]]:
+        if not self.connected:
+            return []
+        records = self.records
+        if self.position >= len(records):
+            self.connected = False
+            return []
+
+        due = self._due_until()
+        if records[self.position][0] > due and timeout > 0:
+            wait = (records[self.position][0] - due) / self.speed
+            time.sleep(min(timeout, wait))
+            due = self._due_until()
+
+        end = self.position
+        limit = len(records)
+        if self.max_per_call > 0:
+            limit = min(limit, self.position + self.max_per_call)
+        while end < limit and records[end][0] <= due:
+            end += 1
+        packets = [(packet_id, data)
+                   for _, packet_id, data in records[self.position:end]]
+        self.position = end
+        return packets
@@ -6,6 +6,7 @@ Supports both TCP (native Python) and WebSocket (browser via Pyodide).
 In browser, use proxy_url parameter to connect via WebSocket proxy.
 """
 
+import json
 import logging
 import time
 import traceback
@@ -20,12 +21,15 @@ from reborn_protocol.coords import (
     LEVEL_SIZE, in_level_bounds, level_index, segment_at,
 )
 
-from .protocol import Protocol, WebSocketProtocol, IS_BROWSER
+from .protocol import Protocol, ThreadedProtocol, WebSocketProtocol, IS_BROWSER
+from .capture import CaptureWriter, ReplayProtocol
+from .packet_timing import PacketTiming
 from .player import Player
 # BoundedLRU / MAX_CACHED_* keep their old client.py names for callers and
 # tests that reach for them there (tests/unit/test_security_correctness.py).
 from .client_state import (  # noqa: F401  (BoundedLRU/MAX_CACHED_* re-exported)
     BoundedLRU,
+    MAX_CACHED_FILE_BYTES,
     MAX_CACHED_FILES,
     MAX_CACHED_LEVELS,
     Callbacks,
@@ -40,9 +44,10 @@ from .client_state import (  # noqa: F401  (BoundedLRU/MAX_CACHED_* re-exported)
     WarpState,
 )
 from .packets import (
+    ColorsWidth,
     PacketID,
-    parse_player_props,
 )
+from .tiletypes import get_tile_type, tile_type_map
 # Importing the package registers every @handles handler; PACKET_HANDLERS is
 # the complete inbound-packet dispatch table (see _handle_packet).
 from .handlers import PACKET_HANDLERS, STOP
@@ -53,6 +58,10 @@ from .handlers import PACKET_HANDLERS, STOP
 # (it used to be a hand-maintained name list).
 HANDLED_PLO_IDS = set(PACKET_HANDLERS)
 
+# Packet id -> PLO_* name, for the packet timing report.
+_PLO_NAMES = {value: name for name, value in vars(PacketID).items()
+              if name.startswith('PLO_')}
+
 
 from .client_actions import ActionsMixin
 from .client_appearance import AppearanceMixin
@@ -82,7 +91,9 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
     _last_sent_position = None
 
     def __init__(self, host: str = "localhost", port: int = 14900, version: str = "2.22",
-                 proxy_url: Optional[str] = None):
+                 proxy_url: Optional[str] = None, threaded_io: bool = False,
+                 batch_sends: bool = False, level_cache_bytes: int = 0,
+                 file_cache_bytes: int = MAX_CACHED_FILE_BYTES):
         """
         Create a new client.
 
@@ -92,24 +103,37 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
             version: Protocol version ("2.22" or "6.037")
             proxy_url: WebSocket proxy URL for browser (e.g., "ws://localhost:14901")
                        Required when running in browser, ignored otherwise.
+            threaded_io: Read and decode the socket on a background thread
+                         (ThreadedProtocol); update() then only dispatches
+                         already-decoded packets. Ignored in the browser.
+            batch_sends: Queue outgoing packets and write them with one
+                         syscall per update() (see batch_sends/flush).
+            level_cache_bytes: Byte ceiling for the cached boards in
+                               self.levels (8 KB each), on top of the
+                               MAX_CACHED_LEVELS entry limit. 0 = no ceiling.
+            file_cache_bytes: Byte ceiling for downloaded files held in
+                              memory (_received_files). Evicted files are
+                              re-read from the disk cache by get_file, so
+                              the ceiling only applies while
+                              persist_downloads is on. 0 = no ceiling.
         """
         self.host = host
         self.port = port
         self.version = version
         self.proxy_url = proxy_url
-        self.persist_downloads = True
 
         # Grouped state (see client_state.py). Every field on these components
         # is also reachable under its historical flat name on the client
         # itself - _STATE_ALIASES at the bottom of this module installs the
         # delegating properties.
         self.session = SessionState(version)
-        self.level_state = LevelState()
+        self.level_state = LevelState(level_cache_bytes)
         self.gmap_state = GmapState()
         self.warp_state = WarpState()
         self.entities = EntityState()
         self.combat_state = CombatState()
-        self.file_transfers = FileTransfers()
+        self.file_transfers = FileTransfers(file_cache_bytes)
+        self.persist_downloads = True
         self.scripts = ScriptTransport()
         self.callbacks = Callbacks()
         self.instrumentation = Instrumentation(HANDLED_PLO_IDS)
@@ -119,8 +143,12 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
             if not proxy_url:
                 raise ValueError("proxy_url is required when running in browser")
             self._protocol = WebSocketProtocol(proxy_url, host, port, version)
+        elif threaded_io:
+            self._protocol = ThreadedProtocol(host, port, version)
         else:
             self._protocol = Protocol(host, port, version)
+        if batch_sends:
+            self.batch_sends = True
 
         self.player = Player()
         self._login_appearance_applied = False
@@ -131,6 +159,11 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
 
     def connect(self) -> bool:
         """Connect to the server. Returns True if successful."""
+        self._reset_for_connect()
+        return self._protocol.connect()
+
+    def _reset_for_connect(self) -> None:
+        """Clear client-side session state ahead of a new connection."""
         # Per-session decode state (codec, buffers) is reset inside
         # Protocol.connect(); this instance also gets reset here for the case
         # a Client is reused across connect() calls without an intervening
@@ -139,6 +172,8 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
         # defensive, not load-bearing).
         self._authenticated = False
         self._login_appearance_applied = False
+        self._player_colors = ColorsWidth(self._colors_len)
+        self._npc_colors = ColorsWidth(self._colors_len)
         self._reset_file_transfer_state()
         if self.gs2_host is not None:
             self.gs2_host.reset_session()
@@ -146,7 +181,6 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
             self.input_frozen = False
             if self.on_fullstop:
                 self.on_fullstop(False)
-        return self._protocol.connect()
 
     def _reset_file_transfer_state(self, full_reset: bool = True) -> None:
         """Clear active download state and, for a new session, retry history."""
@@ -163,12 +197,73 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
             self.gs2_host.reset_session()
         self._protocol.disconnect()
         self._authenticated = False
+        self.stop_capture()
 
     @property
     def connected(self) -> bool:
         """Check if connected to server."""
         return self._protocol.connected
 
+    @property
+    def persist_downloads(self) -> bool:
+        """Whether completed downloads are written to the disk cache.
+
+        Turning it off (RCClient, NCClient) also lifts the file_cache_bytes
+        ceiling: a file evicted from memory would have no disk copy for
+        get_file to fall back to.
+        """
+        return self.file_transfers.persist
+
+    @persist_downloads.setter
+    def persist_downloads(self, enabled: bool) -> None:
+        transfers = self.file_transfers
+        transfers.persist = bool(enabled)
+        transfers.received_files.max_bytes = (
+            transfers.max_file_bytes if enabled else 0)
+
+    @property
+    def batch_sends(self) -> bool:
+        """Whether outgoing packets are batched until the next flush.
+
+        When on, every send is encrypted immediately (so ordering is exactly
+        the call order) but written to the socket only by flush(), which
+        update() calls once per tick after dispatching, or early once the
+        transport's batch_flush_bytes threshold is reached. Turning it off
+        flushes whatever is pending.
+        """
+        return bool(getattr(self._protocol, 'batch_sends', False))
+
+    @batch_sends.setter
+    def batch_sends(self, enabled: bool) -> None:
+        self._protocol.batch_sends = bool(enabled)
+        if not enabled:
+            self.flush()
+
+    def flush(self) -> bool:
+        """Write any batched outgoing packets now."""
+        flush = getattr(self._protocol, 'flush', None)
+        return flush() if flush is not None else True
+
+    def start_capture(self, path: str) -> CaptureWriter:
+        """Record every inbound packet to path (see capture.py)."""
+        self.stop_capture()
+        writer = CaptureWriter(path, self.version)
+        self._protocol.capture = writer
+        return writer
+
+    def stop_capture(self) -> None:
+        writer = getattr(self._protocol, 'capture', None)
+        if writer is not None:
+            writer.close()
+            self._protocol.capture = None
+
+    def replay(self, path: str, speed: float = 1.0,
+               max_per_call: int = 0) -> ReplayProtocol:
+        """Read packets from a capture instead of a server from now on;
+        connect() then starts the playback (see ReplayProtocol)."""
+        self._protocol = ReplayProtocol.open(path, speed, max_per_call)
+        return self._protocol
+
     @property
     def authenticated(self) -> bool:
         """Check if logged in."""
@@ -221,17 +316,9 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
         Returns:
             True if login successful
         """
-        if not self.connected:
+        if not self._begin_login(username, password):
             return False
 
-        # Send login packet
-        if not self._protocol.send_login(username, password):
-            return False
-
-        self.player.account = username
-        self._login_time = time.time()
-        self.disconnect_reason = ""
-
         # Wait for authentication response
         start = time.time()
         while time.time() - start < timeout:
@@ -246,6 +333,20 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
 
         return False
 
+    def _begin_login(self, username: str, password: str) -> bool:
+        """Send the login packet and note who we are logging in as."""
+        if not self.connected:
+            return False
+
+        # Send login packet
+        if not self._protocol.send_login(username, password):
+            return False
+
+        self.player.account = username
+        self._login_time = time.time()
+        self.disconnect_reason = ""
+        return True
+
 
 
 
@@ -269,7 +370,15 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
         Returns:
             List of (packet_id, data) tuples received
         """
+        timing = self.packet_timing
+        if timing is not None:
+            recv_start = time.perf_counter()
         packets = self._protocol.recv_packets(timeout)
+        if timing is not None:
+            frame_start = time.perf_counter()
+            recv_time = getattr(self._protocol, 'last_decode_time', None)
+            if recv_time is None:
+                recv_time = frame_start - recv_start
 
         # Flagged so re-entrant callers (a GS2 script sleep() pumping update
         # from inside a packet-fired handler) can detect they're already in
@@ -282,6 +391,8 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
                     stats = {'received': 0, 'handled': 0, 'errors': 0, 'last_error': ''}
                     self.packet_stats[packet_id] = stats
                 stats['received'] += 1
+                if timing is not None:
+                    timing.record_packet(packet_id, len(data))
                 try:
                     self._handle_packet(packet_id, data)
                     if packet_id in self._handled_plo_ids:
@@ -301,8 +412,37 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
 
         self._tick_arrow_sims()
 
+        # One write per tick for everything sent since the last update,
+        # including the handlers' replies above.
+        if self.batch_sends:
+            self._protocol.flush()
+
+        if timing is not None:
+            timing.end_frame(recv_time,
+                             recv_time + time.perf_counter() - frame_start)
         return packets
 
+    # =========================================================================
+    # Packet timing
+    # =========================================================================
+
+    def enable_packet_timing(self, enabled: bool = True) -> None:
+        """Start (or stop and discard) per-packet handler timing; see
+        packet_timing.py. Starting again resets the numbers."""
+        self.packet_timing = PacketTiming() if enabled else None
+
+    def packet_timing_report(self) -> dict:
+        """Handler latency per packet id (p50/p99/max, bytes) plus the
+        per-frame recv/dispatch/hooks breakdown. Empty while timing is off."""
+        if self.packet_timing is None:
+            return {}
+        return self.packet_timing.report(_PLO_NAMES)
+
+    def dump_packet_timing(self, path: str) -> None:
+        """Write packet_timing_report() to path as JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.packet_timing_report(), f, indent=2)
+
     def _handle_packet(self, packet_id: int, data: bytes):
         """Handle a received packet.
 
@@ -311,21 +451,31 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
         A handler returning handlers.STOP consumes the packet outright and
         suppresses that hook.
         """
-        login_appearance = None
-        if packet_id == PacketID.PLO_PLAYERPROPS and not self._authenticated:
-            # The handler performs the authoritative parse and records any
-            # width fallback/error diagnostics; this look-ahead is only for
-            # deciding which appearance fields the server supplied.
-            login_appearance = parse_player_props(data, self._colors_len)
+        timing = self.packet_timing
         handler = PACKET_HANDLERS.get(packet_id)
-        if handler is not None and handler(self, data) is STOP:
-            return
-        if login_appearance is not None and self._authenticated:
-            self._apply_login_appearance(login_appearance)
+        if handler is not None:
+            if timing is None:
+                result = handler(self, data)
+            else:
+                start = time.perf_counter()
+                try:
+                    result = handler(self, data)
+                finally:
+                    timing.record_handler(
+                        packet_id, time.perf_counter() - start)
+            if result is STOP:
+                return
 
         # Custom handler
         if packet_id in self.on_packet:
-            self.on_packet[packet_id](data)
+            if timing is None:
+                self.on_packet[packet_id](data)
+            else:
+                start = time.perf_counter()
+                try:
+                    self.on_packet[packet_id](data)
+                finally:
+                    timing.record_hook(time.perf_counter() - start)
 
     def get_tile(self, x: int, y: int) -> int:
         """Get tile ID at position (0-63, 0-63). Returns 0 if out of bounds."""
@@ -346,24 +496,54 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
         if w <= 0 or h <= 0 or len(tiles) < w * h:
             return
 
-        def _patch(board: List[int]) -> None:
-            i = 0
-            for row in range(h):
-                ty = y + row
-                if ty < 0 or ty >= LEVEL_SIZE:
-                    i += w
-                    continue
-                for col in range(w):
-                    tx = x + col
-                    if 0 <= tx < LEVEL_SIZE:
-                        board[level_index(tx, ty)] = tiles[i]
-                    i += 1
-
+        cells = []  # (board index, tile id)
+        i = 0
+        for row in range(h):
+            ty = y + row
+            if ty < 0 or ty >= LEVEL_SIZE:
+                i += w
+                continue
+            for col in range(w):
+                tx = x + col
+                if 0 <= tx < LEVEL_SIZE:
+                    cells.append((level_index(tx, ty), tiles[i]))
+                i += 1
+
+        patched = []
         board = self.levels.get(level_name)
         if board is not None and len(board) >= 4096:
-            _patch(board)
+            patched.append(board)
         if level_name == self._tiles_level_name and self.tiles and len(self.tiles) >= 4096:
-            _patch(self.tiles)
+            patched.append(self.tiles)
+        for board in patched:
+            for index, tile in cells:
+                board[index] = tile
+
+        # Keep the level's type map in step with its board (tile_types).
+        cached = self._tile_type_maps.get(level_name)
+        if cached is not None:
+            owner, tilestype, types = cached
+            if any(owner is board for board in patched):
+                for index, _tile in cells:
+                    types[index] = get_tile_type(owner[index], tilestype)
+            else:
+                del self._tile_type_maps[level_name]
+
+    def tile_types(self, level_name: str, board, tilestype: int) -> bytearray:
+        """Tile TYPES of `board` (level_name's 4096-tile board) under
+        `tilestype`, one byte per tile in board order (tile_type_map).
+
+        Built once per board and tilestype and patched by
+        _apply_board_modify, so collision and script probes index a byte
+        instead of resolving tile -> type on every sample. A new board for
+        the level, or a tiledef change that picks another tilestype,
+        rebuilds it."""
+        cached = self._tile_type_maps.get(level_name)
+        if cached is not None and cached[0] is board and cached[1] == tilestype:
+            return cached[2]
+        types = tile_type_map(board, tilestype)
+        self._tile_type_maps[level_name] = (board, tilestype, types)
+        return types
 
     def get_current_level_from_position(self) -> str:
         """
@@ -490,6 +670,8 @@ class Client(MovementMixin, CombatMixin, AppearanceMixin, ActionsMixin, WarpMixi
 _STATE_ALIASES: Dict[str, Tuple[str, str]] = {
     # --- session / handshake ------------------------------------------------
     '_colors_len': ('session', 'colors_len'),
+    '_player_colors': ('session', 'player_colors'),
+    '_npc_colors': ('session', 'npc_colors'),
     '_file_no_modtime': ('session', 'file_no_modtime'),
     '_use_pixel_props': ('session', 'use_pixel_props'),
     '_authenticated': ('session', 'authenticated'),
@@ -530,6 +712,8 @@ _STATE_ALIASES: Dict[str, Tuple[str, str]] = {
     'active_level': ('level_state', 'active_level'),
     'level_modtimes': ('level_state', 'level_modtimes'),
     'links': ('level_state', 'links'),
+    '_link_grids': ('level_state', 'link_grids'),
+    '_tile_type_maps': ('level_state', 'tile_type_maps'),
     'chests': ('level_state', 'chests'),
     'chest_items': ('level_state', 'chest_items'),
     'chest_signs': ('level_state', 'chest_signs'),
@@ -595,6 +779,13 @@ _STATE_ALIASES: Dict[str, Tuple[str, str]] = {
     '_file_attempts': ('file_transfers', 'file_attempts'),
     '_uptodate_files': ('file_transfers', 'uptodate_files'),
     '_cache_index': ('file_transfers', 'cache_index'),
+    '_cache_journal_offset': ('file_transfers', 'cache_journal_offset'),
+    '_cache_journal_records': ('file_transfers', 'cache_journal_records'),
+    '_cache_journal_id': ('file_transfers', 'cache_journal_id'),
+    'cache_verify': ('file_transfers', 'cache_verify'),
+    '_cache_verify_results': ('file_transfers', 'cache_verify_results'),
+    '_cache_verify_thread': ('file_transfers', 'cache_verify_thread'),
+    '_file_cache_stats': ('file_transfers', 'file_cache_stats'),
     '_large_file_transfers': ('file_transfers', 'large_file_transfers'),
 
     # --- script / bytecode transport ---------------------------------------
@@ -610,6 +801,7 @@ _STATE_ALIASES: Dict[str, Tuple[str, str]] = {
     '_warned_packet_errors': ('instrumentation', 'warned_packet_errors'),
     '_handled_plo_ids': ('instrumentation', 'handled_plo_ids'),
     'prop_parse_diagnostics': ('instrumentation', 'prop_parse_diagnostics'),
+    'packet_timing': ('instrumentation', 'packet_timing'),
 
     # --- callbacks ---------------------------------------------------------
     'on_packet': ('callbacks', 'on_packet'),
@@ -163,10 +163,9 @@ class CombatMixin:
         fx, fy = dir_vec
         seg_off_x = seg_off_y = 0
         if self.gmap_grid:
-            seg = next((g for g, n in self.gmap_grid.items()
-                        if n == self._current_level_name), None)
-            if seg:
-                seg_off_x, seg_off_y = segment_origin(*seg)
+            origin = self.gmap_grid.origin_of(self._current_level_name)
+            if origin is not None:
+                seg_off_x, seg_off_y = origin
         # Half a heart per sword power level, matching the classic client.
         damage = 0.5 * max(1, int(getattr(self.player, 'sword_power', 1) or 1))
         baddies = self.baddies_in_level(self._current_level_name)
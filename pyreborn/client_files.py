@@ -6,8 +6,10 @@ import hashlib
 import json
 import os
 import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .asset_paths import normalize_asset_name, server_cache_dir
 from .packets import (
@@ -15,6 +17,106 @@ from .packets import (
     build_update_gani, build_update_script, build_wantfile,
 )
 
+# Cache index layout in server_cache_dir: index.json is a compacted snapshot
+# and index.journal an append-only log of JSON lines replayed over it, one
+# {"key", "modtime", "size", "sha256"} record per store and {"key",
+# "deleted": true} per invalidation. Rewriting the whole index.json after
+# every download made a first visit to an asset-heavy server quadratic.
+_CACHE_INDEX = "index.json"
+_CACHE_JOURNAL = "index.journal"
+# The journal is folded back into index.json once it holds more than this
+# many records and more than half as many as the index has entries. Each
+# compaction then follows at least as many appends as the snapshot it
+# rewrites, so storing n files costs O(n) in total.
+_CACHE_JOURNAL_COMPACT_MIN = 1024
+# Snapshots one compaction writes before giving up on a journal other clients
+# keep appending to (see _compact_cache_index).
+_CACHE_COMPACT_ATTEMPTS = 3
+
+# A recorded (size, mtime_ns, inode) only vouches for a file's bytes if it was
+# taken well after the file's last write. Filesystem timestamps tick far more
+# coarsely than time.time_ns() (jiffies on Linux, 2 s on FAT), so a same-size
+# overwrite inside one tick keeps the old mtime; git calls such entries
+# "racily clean". Stats younger than this window are re-hashed instead.
+_CACHE_RACY_WINDOW_NS = 2_000_000_000
+_CACHE_STAT_FIELDS = ("mtime_ns", "inode", "checked_ns")
+
+
+def _cache_index_entry(value):
+    """Validate one stored metadata value; None means drop it."""
+    try:
+        if isinstance(value, dict):
+            modtime = int(value["modtime"])
+            size = int(value["size"])
+            digest = value["sha256"]
+            if (
+                size < 0
+                or not isinstance(digest, str)
+                or len(digest) != 64
+                or any(c not in "0123456789abcdef" for c in digest)
+            ):
+                return None
+            entry = {"modtime": modtime, "size": size, "sha256": digest}
+            # Optional stat stamp (see _cache_stat_trusted). A malformed one
+            # only costs a re-hash, so drop it rather than the entry.
+            try:
+                stamp = {field: int(value[field])
+                         for field in _CACHE_STAT_FIELDS}
+            except (KeyError, ValueError, TypeError):
+                stamp = None
+            if stamp is not None:
+                entry.update(stamp)
+            return entry
+        # Retain legacy metadata only so loading old indexes is harmless.
+        # get_file() refuses it, preventing upgrade from blessing bytes that
+        # may already be poisoned.
+        if not isinstance(value, bool):
+            return int(value)
+    except (KeyError, ValueError, TypeError):
+        pass
+    return None
+
+
+def _cache_stat_trusted(metadata: dict, stat: os.stat_result) -> bool:
+    """True when a file still has the size, mtime and inode recorded after
+    its digest was last verified, and that record is not racily clean."""
+    try:
+        return (
+            stat.st_size == metadata["size"]
+            and stat.st_mtime_ns == metadata["mtime_ns"]
+            and stat.st_ino == metadata["inode"]
+            and metadata["checked_ns"] - stat.st_mtime_ns
+            >= _CACHE_RACY_WINDOW_NS
+        )
+    except KeyError:
+        return False
+
+
+def _verify_cache_entries(
+    directory: Path, entries: List[Tuple[str, dict]], results
+) -> None:
+    """Background worker for start_cache_verification.
+
+    Appends (key, sha256 it was checked against, stat) for files that still
+    match, and (key, sha256, None) for corrupt ones. Files that are already
+    trusted by stat or have vanished are skipped.
+    """
+    for key, metadata in entries:
+        try:
+            with open(directory / key, "rb") as cached:
+                stat = os.fstat(cached.fileno())
+                if _cache_stat_trusted(metadata, stat):
+                    continue
+                data = cached.read()
+        except OSError:
+            continue
+        intact = (
+            len(data) == metadata["size"]
+            and hashlib.sha256(data).hexdigest() == metadata["sha256"]
+        )
+        results.append((key, metadata["sha256"], stat if intact else None))
+
+
 class FileTransferMixin:
     def modify_board(self, x: int, y: int, width: int, height: int, tiles) -> bool:
         """
@@ -149,22 +251,37 @@ class FileTransferMixin:
         Returns:
             File data as bytes, or None if not downloaded
         """
+        if self._cache_verify_results:
+            self._apply_cache_verification()
+        stats = self._file_cache_stats
         data = self._received_files.get(filename)
         if data is not None:
+            stats['hits'] += 1
             return data
 
         key = normalize_asset_name(filename)
         if not key:
+            stats['misses'] += 1
             return None
         data = self._received_files.get(key)
         if data is not None:
+            stats['hits'] += 1
             return data
+        # Not in memory: never downloaded, or pushed out of the byte budget
+        # (MAX_CACHED_FILE_BYTES). Either way the disk store is the fallback.
         try:
-            data = (server_cache_dir(self.host, self.port) / key).read_bytes()
+            directory = server_cache_dir(self.host, self.port)
+            with open(directory / key, "rb") as cached:
+                stat = os.fstat(cached.fileno())
+                data = cached.read()
         except (OSError, ValueError, TypeError):
+            stats['misses'] += 1
             return None
         try:
-            metadata = self._load_cache_index().get(key)
+            index = self._load_cache_index()
+            if key not in index:
+                self._replay_cache_journal(directory)
+            metadata = index.get(key)
             # The server modtime only describes what SHOULD be in this path.
             # A truncated pics1.png once remained at modtime 0 forever and,
             # because the download tier wins path lookup, hid a good user
@@ -174,20 +291,55 @@ class FileTransferMixin:
             if (
                 not isinstance(metadata, dict)
                 or len(data) != metadata.get("size")
-                or hashlib.sha256(data).hexdigest() != metadata.get("sha256")
             ):
                 self._invalidate_cached_file(filename)
+                stats['misses'] += 1
                 return None
+            # A warm-cache login touches hundreds of assets; hashing each one
+            # again cost seconds. The stat stamp stands in for the digest
+            # until the file changes (cache_verify = "hash" restores the
+            # always-hash behavior).
+            if not (
+                self.cache_verify == "stat"
+                and _cache_stat_trusted(metadata, stat)
+            ):
+                if hashlib.sha256(data).hexdigest() != metadata.get("sha256"):
+                    self._invalidate_cached_file(filename)
+                    stats['misses'] += 1
+                    return None
+                self._stamp_cached_file(directory, key, metadata, stat)
         except (OSError, ValueError, TypeError):
             self._invalidate_cached_file(filename)
+            stats['misses'] += 1
             return None
         # This is both the byte cache and the verification verdict. Later hot
         # SpriteManager/GaniParser reads return above without touching disk or
         # hashing again; bytes placed here by a wire handler are trusted too.
-        self._received_files[filename] = data
+        # Only the normalized key is stored: the raw spelling resolves to it
+        # above, and storing both counted every file twice against the budget.
         self._received_files[key] = data
+        stats['disk_hits'] += 1
         return data
 
+    def file_cache_stats(self) -> Dict[str, int]:
+        """
+        Counters for the in-memory download cache.
+
+        Returns:
+            get_file hits (memory), disk_hits (re-read from the disk store)
+            and misses, plus the cache's current entries/bytes, its byte
+            budget (0 = none) and how many files/bytes the budget evicted.
+        """
+        cache = self._received_files
+        stats = dict(self._file_cache_stats)
+        stats['entries'] = len(cache)
+        stats['bytes'] = getattr(
+            cache, 'total_bytes', sum(len(data) for data in cache.values()))
+        stats['max_bytes'] = getattr(cache, 'max_bytes', 0)
+        stats['evictions'] = getattr(cache, 'evictions', 0)
+        stats['evicted_bytes'] = getattr(cache, 'evicted_bytes', 0)
+        return stats
+
     def has_file(self, filename: str) -> bool:
         """Check if a file has been downloaded."""
         return self.get_file(filename) is not None
@@ -198,46 +350,201 @@ class FileTransferMixin:
             return self._cache_index
 
         index = {}
+        directory = None
         try:
+            directory = server_cache_dir(self.host, self.port)
             raw = json.loads(
-                (server_cache_dir(self.host, self.port) / "index.json").read_text(
-                    encoding="utf-8"
-                )
+                (directory / _CACHE_INDEX).read_text(encoding="utf-8")
             )
             if isinstance(raw, dict):
                 for key, value in raw.items():
                     key = str(key)
                     if normalize_asset_name(key) != key:
                         continue
-                    try:
-                        if isinstance(value, dict):
-                            modtime = int(value["modtime"])
-                            size = int(value["size"])
-                            digest = value["sha256"]
-                            if (
-                                size < 0
-                                or not isinstance(digest, str)
-                                or len(digest) != 64
-                                or any(c not in "0123456789abcdef" for c in digest)
-                            ):
-                                continue
-                            index[key] = {
-                                "modtime": modtime,
-                                "size": size,
-                                "sha256": digest,
-                            }
-                        # Retain legacy metadata only so loading old indexes is
-                        # harmless. get_file() refuses it, preventing upgrade
-                        # from blessing bytes that may already be poisoned.
-                        elif not isinstance(value, bool):
-                            index[key] = int(value)
-                    except (KeyError, ValueError, TypeError):
-                        continue
+                    entry = _cache_index_entry(value)
+                    if entry is not None:
+                        index[key] = entry
         except (OSError, ValueError, TypeError):
             pass
         self._cache_index = index
+        self._cache_journal_offset = 0
+        self._cache_journal_records = 0
+        self._cache_journal_id = None
+        if directory is not None:
+            self._replay_cache_journal(directory)
         return index
 
+    def _replay_cache_journal(self, directory: Path) -> None:
+        """Apply journal records written since the last replay.
+
+        Another client on the same server (a bot swarm shares one cache
+        directory) may have appended since this session loaded, so get_file
+        calls this again before giving up on an unknown key. A journal that
+        is a different file than the one the offset was taken in (compaction
+        os.replace()s it), or is shorter than that offset, was compacted
+        meanwhile; start over from the snapshot. The size check alone misses
+        a compacted journal that has since grown past the old offset.
+        """
+        index = self._cache_index
+        try:
+            with open(directory / _CACHE_JOURNAL, "rb") as journal:
+                stat = os.fstat(journal.fileno())
+                journal_id = (stat.st_dev, stat.st_ino)
+                if ((self._cache_journal_id is not None
+                        and journal_id != self._cache_journal_id)
+                        or stat.st_size < self._cache_journal_offset):
+                    self._cache_index = None
+                    self._load_cache_index()
+                    index.clear()
+                    index.update(self._cache_index)
+                    self._cache_index = index
+                    return
+                self._cache_journal_id = journal_id
+                journal.seek(self._cache_journal_offset)
+                for line in journal:
+                    # A record cut short by a crash mid-append has no newline;
+                    # leave it (and the offset) for a later replay.
+                    if not line.endswith(b"\n"):
+                        break
+                    self._cache_journal_offset += len(line)
+                    self._cache_journal_records += 1
+                    try:
+                        record = json.loads(line)
+                        key = str(record.pop("key"))
+                    except (ValueError, TypeError, KeyError, AttributeError):
+                        continue
+                    if normalize_asset_name(key) != key:
+                        continue
+                    if record.get("deleted"):
+                        index.pop(key, None)
+                        continue
+                    entry = _cache_index_entry(record)
+                    if entry is not None:
+                        index[key] = entry
+        except (OSError, ValueError):
+            pass
+
+    def _journal_cache_index(self, directory: Path, record: dict) -> None:
+        """Append one index change, compacting once the journal is long."""
+        index = self._load_cache_index()
+        line = json.dumps(record, sort_keys=True).encode("utf-8") + b"\n"
+        with open(directory / _CACHE_JOURNAL, "ab") as journal:
+            journal.write(line)
+        # Read forward rather than bumping the offset: other clients may have
+        # appended before this line, and re-applying our own record is a no-op.
+        self._replay_cache_journal(directory)
+        records = self._cache_journal_records
+        if records > _CACHE_JOURNAL_COMPACT_MIN and records * 2 > len(index):
+            self._compact_cache_index(directory)
+
+    def _compact_cache_index(self, directory: Path) -> None:
+        """Fold the journal into a fresh index.json snapshot.
+
+        The snapshot lands first. A crash before the journal is emptied
+        only replays records the snapshot already holds. Another client may
+        append while the snapshot is written, so the journal is only emptied
+        once its size matches what was replayed; records that arrived
+        meanwhile go into another snapshot, and a journal that keeps
+        growing is left for a later compaction.
+        """
+        index = self._load_cache_index()
+        journal_path = directory / _CACHE_JOURNAL
+        for _ in range(_CACHE_COMPACT_ATTEMPTS):
+            self._replay_cache_journal(directory)
+            encoded = json.dumps(index, sort_keys=True).encode("utf-8")
+            self._atomic_cache_write(directory / _CACHE_INDEX, encoded)
+            try:
+                if journal_path.stat().st_size == self._cache_journal_offset:
+                    break
+            except OSError:
+                return
+        else:
+            return
+        self._atomic_cache_write(journal_path, b"")
+        self._cache_journal_offset = 0
+        self._cache_journal_records = 0
+        self._cache_journal_id = None
+
+    def _stamp_cached_file(
+        self, directory: Path, key: str, metadata: dict, stat: os.stat_result
+    ) -> None:
+        """Record the stat of a file whose digest was just verified, once its
+        mtime is old enough to be trusted (see _CACHE_RACY_WINDOW_NS)."""
+        now = time.time_ns()
+        if (
+            not self.persist_downloads
+            or now - stat.st_mtime_ns < _CACHE_RACY_WINDOW_NS
+            or _cache_stat_trusted(metadata, stat)
+        ):
+            return
+        entry = dict(
+            metadata,
+            mtime_ns=stat.st_mtime_ns,
+            inode=stat.st_ino,
+            checked_ns=now,
+        )
+        try:
+            self._load_cache_index()[key] = entry
+            self._journal_cache_index(directory, dict(entry, key=key))
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def start_cache_verification(self) -> Optional[threading.Thread]:
+        """
+        Re-hash every indexed file on a background thread.
+
+        Opt-in: get_file already checks each file it reads. This pass covers
+        files the session never reads. It also stamps verified files, so
+        the next session can trust their stats without hashing. The worker
+        only reads. Its verdicts are queued and applied on the client's own
+        thread by the next get_file: corrupt entries are invalidated, which
+        makes the next request_file download them in full.
+
+        Returns:
+            The worker thread, or None if a pass is already running.
+        """
+        worker = self._cache_verify_thread
+        if worker is not None and worker.is_alive():
+            return None
+        try:
+            directory = server_cache_dir(self.host, self.port)
+        except (OSError, ValueError, TypeError):
+            return None
+        entries = [
+            (key, dict(metadata))
+            for key, metadata in self._load_cache_index().items()
+            if isinstance(metadata, dict)
+        ]
+        worker = threading.Thread(
+            target=_verify_cache_entries,
+            args=(directory, entries, self._cache_verify_results),
+            name="pyreborn-cache-verify",
+            daemon=True,
+        )
+        self._cache_verify_thread = worker
+        worker.start()
+        return worker
+
+    def _apply_cache_verification(self) -> None:
+        """Apply verdicts queued by the background verification pass."""
+        results = self._cache_verify_results
+        index = self._load_cache_index()
+        try:
+            directory = server_cache_dir(self.host, self.port)
+        except (OSError, ValueError, TypeError):
+            results.clear()
+            return
+        while results:
+            key, digest, stat = results.popleft()
+            metadata = index.get(key)
+            # Stored again or invalidated since the pass snapshotted it.
+            if not isinstance(metadata, dict) or metadata["sha256"] != digest:
+                continue
+            if stat is None:
+                self._invalidate_cached_file(key)
+            else:
+                self._stamp_cached_file(directory, key, metadata, stat)
+
     def _cached_file_modtime(self, filename: str) -> Optional[int]:
         """Return stored server metadata for a cached file, when available."""
         key = normalize_asset_name(filename)
@@ -283,14 +590,17 @@ class FileTransferMixin:
             directory = server_cache_dir(self.host, self.port)
             directory.mkdir(parents=True, exist_ok=True)
             self._atomic_cache_write(directory / key, file_data)
-            index = self._load_cache_index()
-            index[key] = {
+            stat = os.stat(directory / key)
+            entry = {
                 "modtime": int(mod_time),
                 "size": len(file_data),
                 "sha256": hashlib.sha256(file_data).hexdigest(),
+                "mtime_ns": stat.st_mtime_ns,
+                "inode": stat.st_ino,
+                "checked_ns": time.time_ns(),
             }
-            encoded = json.dumps(index, sort_keys=True).encode("utf-8")
-            self._atomic_cache_write(directory / "index.json", encoded)
+            self._load_cache_index()[key] = entry
+            self._journal_cache_index(directory, dict(entry, key=key))
         except (OSError, ValueError, TypeError):
             pass
 
@@ -312,8 +622,7 @@ class FileTransferMixin:
                 return
             index.pop(key, None)
             directory = server_cache_dir(self.host, self.port)
-            encoded = json.dumps(index, sort_keys=True).encode("utf-8")
-            self._atomic_cache_write(directory / "index.json", encoded)
+            self._journal_cache_index(directory, {"key": key, "deleted": True})
         except (OSError, ValueError, TypeError):
             pass
 
@@ -341,6 +650,15 @@ class FileTransferMixin:
         """
         return self._file_attempts.get(filename, 0) > 0
 
+    def file_attempts(self, filename: str) -> int:
+        """How many times the server has refused a file since it last arrived.
+
+        PLO_FILESENDFAILED adds one, PLO_FILE resets it and PLO_FILEUPTODATE
+        leaves it alone; the asset fetch scheduler compares it across a
+        request to tell a refusal from an answer.
+        """
+        return self._file_attempts.get(filename, 0)
+
     @property
     def failed_files(self) -> set:
         """Filenames written off after exhausting their retry budget."""
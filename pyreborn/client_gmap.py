@@ -46,14 +46,14 @@ class GmapMixin:
         The transition hold correctly refuses to release into that interim
         frame (see `_maybe_release_local_transition`), so the screen stays
         frozen for the whole round trip - measured at 240 ms on hastur for a
-        door we had already used. The .gmap file is unchanged and already in
-        `_received_files`, so rebuild from it now instead.
+        door we had already used. The .gmap file is unchanged and already
+        cached (`get_file`), so rebuild from it now instead.
 
         Returns True if the grid was restored.
         """
         if self.gmap_width or spawn_level not in self._known_gmap_segments:
             return False
-        blob = self._received_files.get(self._last_gmap_name)
+        blob = self.get_file(self._last_gmap_name)
         if not blob:
             return False
         try:
@@ -123,10 +123,7 @@ class GmapMixin:
         # If we have a spawn grid position, use it; otherwise fall back to calculating from coords
         spawn_pos = None
         if spawn_level:
-            for grid_pos, seg in self.gmap_grid.items():
-                if seg == spawn_level:
-                    spawn_pos = grid_pos
-                    break
+            spawn_pos = self.gmap_grid.cell_of(spawn_level)
         if spawn_pos is not None:
             pass
         elif self._gmap_spawn_x != 0 or self._gmap_spawn_y != 0:
@@ -191,26 +188,25 @@ class GmapMixin:
             if not npc_level:
                 continue  # No level info
             # Find the level's grid position
-            for (gx, gy), level_name in self.gmap_grid.items():
-                if level_name == npc_level:
-                    # Same guard as the PLO_NPCPROPS handler (BUG 4): only
-                    # fold in the segment offset for a still-local value, so
-                    # a re-run of this (e.g. gmap grid arriving/reloading
-                    # after an NPC's coords were already normalized to
-                    # world) can't double-offset it.
-                    seg_ox, seg_oy = segment_origin(gx, gy)
-                    if 'x' in npc:
-                        raw_x = npc['x']
-                        npc['world_x'] = (raw_x if (raw_x >= LEVEL_SIZE or raw_x < 0)
-                                           else raw_x + seg_ox)
-                    if 'y' in npc:
-                        raw_y = npc['y']
-                        npc['world_y'] = (raw_y if (raw_y >= LEVEL_SIZE or raw_y < 0)
-                                           else raw_y + seg_oy)
-                    # Re-attribution, not movement - see the snap comment on
-                    # the gmaplevelx/y branch above.
-                    self._mark_npc_pos_snap(npc)
-                    break
+            origin = self.gmap_grid.origin_of(npc_level)
+            if origin is not None:
+                # Same guard as the PLO_NPCPROPS handler (BUG 4): only
+                # fold in the segment offset for a still-local value, so
+                # a re-run of this (e.g. gmap grid arriving/reloading
+                # after an NPC's coords were already normalized to
+                # world) can't double-offset it.
+                seg_ox, seg_oy = origin
+                if 'x' in npc:
+                    raw_x = npc['x']
+                    npc['world_x'] = (raw_x if (raw_x >= LEVEL_SIZE or raw_x < 0)
+                                       else raw_x + seg_ox)
+                if 'y' in npc:
+                    raw_y = npc['y']
+                    npc['world_y'] = (raw_y if (raw_y >= LEVEL_SIZE or raw_y < 0)
+                                       else raw_y + seg_oy)
+                # Re-attribution, not movement - see the snap comment on
+                # the gmaplevelx/y branch above.
+                self._mark_npc_pos_snap(npc)
 
     def get_adjacent_levels(self, level_name: str) -> List[str]:
         """
@@ -222,28 +218,8 @@ class GmapMixin:
         Returns:
             List of adjacent level names
         """
-        # Find current level's grid position
-        current_pos = None
-        for pos, name in self.gmap_grid.items():
-            if name == level_name:
-                current_pos = pos
-                break
-
-        if not current_pos:
-            return []
-
-        # Get all 8 adjacent positions
-        x, y = current_pos
-        adjacent = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                adj_pos = (x + dx, y + dy)
-                if adj_pos in self.gmap_grid:
-                    adjacent.append(self.gmap_grid[adj_pos])
-
-        return adjacent
+        # All 8 surrounding cells, cached per level by the grid index.
+        return list(self.gmap_grid.neighbours(level_name))
 
     def request_adjacent_levels(self) -> int:
         """
@@ -9,21 +9,53 @@ unaffected.
 Nothing here talks to the network or to Client: these are plain state holders.
 """
 
-from collections import OrderedDict
+from array import array
+from collections import OrderedDict, deque
 from typing import Callable, Dict, List, Optional, Tuple
 
+from reborn_protocol.coords import segment_origin
+
 from . import tiletypes as _tiletypes
+from .packet_codec.common import ColorsWidth
 
 MAX_CACHED_LEVELS = 512
+# Optional byte ceiling for LevelState.levels on top of the entry count; 0
+# leaves only MAX_CACHED_LEVELS in force. 8 KB per array('H') board.
+MAX_CACHED_LEVEL_BYTES = 0
 MAX_CACHED_FILES = 512
+# Byte ceiling for FileTransfers.received_files. Completed downloads are
+# already persisted to the server_cache_dir store, so an evicted file is not
+# lost: Client.get_file re-reads (and re-verifies) it from disk on next use.
+MAX_CACHED_FILE_BYTES = 64 * 1024 * 1024
+
+
+_MISSING = object()
+
+
+def board_nbytes(board) -> int:
+    """Memory held by one board: 2 bytes per tile for array('H'), a pointer
+    per tile for a plain list."""
+    return len(board) * getattr(board, "itemsize", 8)
 
 
 class BoundedLRU(OrderedDict):
-    """Dictionary-compatible LRU cache with a fixed entry limit."""
+    """Dictionary-compatible LRU cache with a fixed entry limit.
+
+    Given a sizeof callable, total_bytes tracks the values' combined size, and
+    with max_bytes set entries are also evicted (oldest first) until that
+    fits the budget. The newest entry is always kept, even if it alone
+    exceeds the budget.
+    """
 
-    def __init__(self, max_entries: int):
+    def __init__(self, max_entries: int, max_bytes: int = 0,
+                 sizeof: Optional[Callable[[object], int]] = None):
         super().__init__()
         self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.total_bytes = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
 
     def __getitem__(self, key):
         value = super().__getitem__(key)
@@ -43,10 +75,46 @@ class BoundedLRU(OrderedDict):
         return present
 
     def __setitem__(self, key, value):
+        if super().__contains__(key):
+            self.total_bytes -= self.sizeof(super().__getitem__(key))
         super().__setitem__(key, value)
+        self.total_bytes += self.sizeof(value)
         self.move_to_end(key)
+        self._evict()
+
+    def __delitem__(self, key):
+        self.total_bytes -= self.sizeof(super().__getitem__(key))
+        super().__delitem__(key)
+
+    def pop(self, key, default=_MISSING):
+        if super().__contains__(key):
+            value = super().pop(key)
+            self.total_bytes -= self.sizeof(value)
+            return value
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def popitem(self, last=True):
+        key, value = super().popitem(last=last)
+        self.total_bytes -= self.sizeof(value)
+        return key, value
+
+    def clear(self):
+        super().clear()
+        self.total_bytes = 0
+
+    def _evict(self) -> None:
         while len(self) > self.max_entries:
-            self.popitem(last=False)
+            self._evict_oldest()
+        while (self.max_bytes and self.total_bytes > self.max_bytes
+               and len(self) > 1):
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        _, value = self.popitem(last=False)
+        self.evictions += 1
+        self.evicted_bytes += self.sizeof(value)
 
 
 class SessionState:
@@ -58,6 +126,11 @@ class SessionState:
         # v2/v5 clients get 5. Wrong width misaligns the whole player-props
         # packet (garbled level name, spawn stuck at 0,0). See parse_player_props.
         self.colors_len = 8 if str(version).startswith("6") else 5
+        # The width props streams actually arrive in, learned per connection
+        # starting from that guess (players and NPCs separately). See
+        # ColorsWidth.
+        self.player_colors = ColorsWidth(self.colors_len)
+        self.npc_colors = ColorsWidth(self.colors_len)
         # Clients older than 2.1 receive PLO_FILE without the 5-byte modtime
         # header (GServer Player.cpp sendFile: "Older client versions didn't
         # send the modTime"). Only the 1.x entries qualify.
@@ -116,13 +189,15 @@ class SessionState:
 class LevelState:
     """The current level and every per-level thing keyed by level name."""
 
-    def __init__(self):
-        # Level data: 4096 tile IDs (64x64 grid) for current level
-        self.tiles: List[int] = []
+    def __init__(self, max_level_bytes: int = MAX_CACHED_LEVEL_BYTES):
+        # Level data: 4096 tile IDs (64x64 grid) for current level, stored as
+        # array('H') - see packets.parse_board_packet(as_array=True)
+        self.tiles: array = array('H')
         self.tiles_level_name = ""     # which level self.tiles currently holds
 
         # GMAP support: multiple levels keyed by level name
-        self.levels: Dict[str, List[int]] = BoundedLRU(MAX_CACHED_LEVELS)
+        self.levels: Dict[str, array] = BoundedLRU(
+            MAX_CACHED_LEVELS, max_bytes=max_level_bytes, sizeof=board_nbytes)
         self.current_level_name = ""   # The player's actual level (set once at login)
         self.pending_level_name = ""   # Track which level data is being received
         self.pending_board_level_name = ""  # Adjacent preload board owner
@@ -132,6 +207,12 @@ class LevelState:
 
         # Links: maps level_name -> list of link dicts
         self.links: Dict[str, List[dict]] = {}
+        # level_name -> (links list, its length, gmap neighbours, tile ->
+        # link table): check_link_collision's lookup (WarpMixin._link_grid).
+        self.link_grids: Dict[str, tuple] = BoundedLRU(MAX_CACHED_LEVELS)
+        # level_name -> (board, tilestype, tile_type_map bytes): the per-level
+        # type map collision reads (Client.tile_types).
+        self.tile_type_maps: Dict[str, tuple] = BoundedLRU(MAX_CACHED_LEVELS)
 
         # Level chests: maps level name -> {(x, y): opened (bool)}
         self.chests: Dict[str, Dict[Tuple[int, int], bool]] = {}
@@ -180,12 +261,152 @@ class LevelState:
         _tiletypes.set_current_level(value)
 
 
+class _GmapLevelNames:
+    """GmapIndex.values(): iterates like dict.values(), but `name in` is a
+    lookup in the reverse map instead of a scan."""
+
+    __slots__ = ('_index',)
+
+    def __init__(self, index: "GmapIndex"):
+        self._index = index
+
+    def __contains__(self, level_name) -> bool:
+        return level_name in self._index._cells
+
+    def __iter__(self):
+        return iter(dict.values(self._index))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return "GmapIndex.values(%r)" % list(self)
+
+
+class GmapIndex(dict):
+    """The gmap grid, (gx, gy) -> level name, plus the reverse lookups.
+
+    Readers still treat it as a plain dict. It also keeps a level -> cell map
+    (the first cell holding that name, in insertion order), so "where is this
+    level", "is this a segment" (`name in grid.values()`) and "which levels
+    border it" no longer scan the grid. On a 32x32 world that scan ran for
+    every NPC in a props packet and for every door link on every frame.
+    load_gmap fills it one cell at a time, and callers and tests assign
+    cells directly, so every mutation keeps the reverse map current. The
+    neighbour and origin tables are dropped on any change and rebuilt per
+    level on demand.
+    """
+
+    def __init__(self, cells=()):
+        super().__init__()
+        self._cells: Dict[str, Tuple[int, int]] = {}
+        self._neighbours: Dict[str, Tuple[str, ...]] = {}
+        self._origins: Dict[str, Tuple[int, int]] = {}
+        self.update(cells)
+
+    def _changed(self) -> None:
+        if self._neighbours:
+            self._neighbours.clear()
+        if self._origins:
+            self._origins.clear()
+
+    def _reindex(self) -> None:
+        cells: Dict[str, Tuple[int, int]] = {}
+        for cell, level_name in self.items():
+            cells.setdefault(level_name, cell)
+        self._cells = cells
+        self._changed()
+
+    def __setitem__(self, cell, level_name) -> None:
+        replacing = super().__contains__(cell)
+        super().__setitem__(cell, level_name)
+        if replacing:
+            self._reindex()
+        else:
+            self._cells.setdefault(level_name, cell)
+            self._changed()
+
+    def __delitem__(self, cell) -> None:
+        super().__delitem__(cell)
+        self._reindex()
+
+    def pop(self, cell, *default):
+        value = super().pop(cell, *default)
+        self._reindex()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._reindex()
+        return item
+
+    def setdefault(self, cell, level_name=None):
+        if cell not in self:
+            self[cell] = level_name
+        return self[cell]
+
+    def update(self, *args, **kwargs) -> None:
+        for cell, level_name in dict(*args, **kwargs).items():
+            self[cell] = level_name
+
+    def clear(self) -> None:
+        super().clear()
+        self._cells.clear()
+        self._changed()
+
+    def values(self) -> _GmapLevelNames:
+        return _GmapLevelNames(self)
+
+    def cell_of(self, level_name: str) -> Optional[Tuple[int, int]]:
+        """Grid cell of a segment, or None if the level is not on the grid."""
+        return self._cells.get(level_name)
+
+    def origin_of(self, level_name: str) -> Optional[Tuple[int, int]]:
+        """World-tile origin of a segment (segment_origin of its cell)."""
+        origin = self._origins.get(level_name)
+        if origin is None:
+            cell = self._cells.get(level_name)
+            if cell is None:
+                return None
+            origin = self._origins[level_name] = segment_origin(*cell)
+        return origin
+
+    def neighbours(self, level_name: str) -> Tuple[str, ...]:
+        """Levels in the 8 cells around a segment, column by column from the
+        top-left (the order get_adjacent_levels has always returned)."""
+        neighbours = self._neighbours.get(level_name)
+        if neighbours is None:
+            cell = self._cells.get(level_name)
+            if cell is None:
+                return ()
+            x, y = cell
+            found = []
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    if dx or dy:
+                        name = self.get((x + dx, y + dy))
+                        if name is not None:
+                            found.append(name)
+            neighbours = self._neighbours[level_name] = tuple(found)
+        return neighbours
+
+
+def gmap_cell(grid, level_name: str) -> Optional[Tuple[int, int]]:
+    """Grid cell of level_name in a gmap grid. Takes GmapIndex or, for test
+    fakes and other plain-dict holders, any cell -> name mapping."""
+    cell_of = getattr(grid, 'cell_of', None)
+    if cell_of is not None:
+        return cell_of(level_name)
+    return next((cell for cell, name in grid.items() if name == level_name),
+                None)
+
+
 class GmapState:
     """The loaded .gmap world: its grid, dimensions and coordinate framing."""
 
     def __init__(self):
-        # GMAP grid: maps (x, y) -> level_name
-        self.gmap_grid: Dict[Tuple[int, int], str] = {}
+        # GMAP grid: maps (x, y) -> level_name (see GmapIndex)
+        self.gmap_grid = GmapIndex()
         self.gmap_width = 0
         self.gmap_height = 0
         self.gmap_name = ""            # name of the loaded .gmap (e.g. chicken.gmap)
@@ -208,6 +429,16 @@ class GmapState:
         # frame is re-established (see _maybe_release_local_transition).
         self.known_gmap_segments: set = set()
 
+    @property
+    def gmap_grid(self) -> GmapIndex:
+        return self._gmap_grid
+
+    @gmap_grid.setter
+    def gmap_grid(self, cells) -> None:
+        # Whole-grid assignment (tests, bots) still gets the reverse indexes.
+        self._gmap_grid = (cells if isinstance(cells, GmapIndex)
+                           else GmapIndex(cells))
+
 
 class WarpState:
     """In-flight level change: what we optimistically flipped to, what the
@@ -246,13 +477,125 @@ class WarpState:
         self.warp_echo: Optional[Tuple[str, float]] = None
 
 
+# NPC fields npc_image_rect (gs1_client) derives a footprint from: a write to
+# any of them can move the NPC's blocking footprint.
+NPC_FOOTPRINT_KEYS = frozenset(('x', 'y', 'image', 'imagepart', 'is_character'))
+
+
+class NpcRecord(dict):
+    """One NPC's props, as stored in an NpcTable. Writes to its footprint
+    fields (NPC_FOOTPRINT_KEYS) are reported to the table the record is
+    filed in, so ClientGS1's footprint grid re-files just this NPC. Readers
+    and writers keep treating it as a plain dict."""
+
+    __slots__ = ('_table', '_npc_id')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._table = None
+        self._npc_id = None
+
+    def _moved(self) -> None:
+        table = self._table
+        if table is not None:
+            table.footprint_changes.add(self._npc_id)
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        if key in NPC_FOOTPRINT_KEYS:
+            self._moved()
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        if key in NPC_FOOTPRINT_KEYS:
+            self._moved()
+
+    def pop(self, key, *default):
+        value = super().pop(key, *default)
+        if key in NPC_FOOTPRINT_KEYS:
+            self._moved()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._moved()
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self._moved()
+
+    def clear(self) -> None:
+        super().clear()
+        self._moved()
+
+    def copy(self) -> "NpcRecord":
+        return NpcRecord(self)
+
+
+class NpcTable(dict):
+    """client.npcs: npc_id -> props. footprint_changes collects the ids added,
+    replaced or removed, plus those whose NpcRecord footprint fields were
+    written, until ClientGS1 takes them (take_footprint_changes). Plain-dict
+    records work as before; they are just not tracked."""
+
+    def __init__(self):
+        super().__init__()
+        self.footprint_changes: set = set()
+
+    def __setitem__(self, npc_id, npc) -> None:
+        super().__setitem__(npc_id, npc)
+        if isinstance(npc, NpcRecord):
+            npc._table = self
+            npc._npc_id = npc_id
+        self.footprint_changes.add(npc_id)
+
+    def __delitem__(self, npc_id) -> None:
+        super().__delitem__(npc_id)
+        self.footprint_changes.add(npc_id)
+
+    def pop(self, npc_id, *default):
+        value = super().pop(npc_id, *default)
+        self.footprint_changes.add(npc_id)
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.footprint_changes.add(item[0])
+        return item
+
+    def setdefault(self, npc_id, default=None):
+        if npc_id not in self:
+            self[npc_id] = default
+        return self[npc_id]
+
+    def update(self, *args, **kwargs) -> None:
+        for npc_id, npc in dict(*args, **kwargs).items():
+            self[npc_id] = npc
+
+    def clear(self) -> None:
+        self.footprint_changes.update(self)
+        super().clear()
+
+    def take_footprint_changes(self) -> set:
+        changes = self.footprint_changes
+        self.footprint_changes = set()
+        return changes
+
+
 class EntityState:
     """Everything living in the world: NPCs, players, baddies, items and the
     transient bomb/arrow/horse entities."""
 
     def __init__(self):
-        # NPCs: maps npc_id -> npc dict with x, y, image, etc.
-        self.npcs: Dict[int, dict] = {}
+        # NPCs: maps npc_id -> npc dict with x, y, image, etc. (NpcRecord
+        # when the packet handlers created it; see NpcTable)
+        self.npcs: Dict[int, dict] = NpcTable()
         # Per-level NPC snapshots so re-entering a level we've already visited
         # repopulates its NPCs even when the server only streams them on first
         # entry. Maps level_name -> {npc_id: props}.
@@ -347,14 +690,42 @@ class CombatState:
 class FileTransfers:
     """Download bookkeeping, including the large-file chunk protocol."""
 
-    def __init__(self):
+    def __init__(self, max_file_bytes: int = MAX_CACHED_FILE_BYTES):
         # File download tracking
         self.pending_files: set = set()  # Files we're waiting for
-        self.received_files: Dict[str, bytes] = BoundedLRU(MAX_CACHED_FILES)
+        # A session that pulls tilesets, MNG animations and music used to pin
+        # every one of them here (512 entries, no size limit). Bound the bytes
+        # too; Client.get_file falls back to the disk store for evictees.
+        # Without that store (persist off) only the entry limit applies - see
+        # Client.persist_downloads.
+        self.persist = True
+        self.max_file_bytes = max_file_bytes
+        self.received_files: Dict[str, bytes] = BoundedLRU(
+            MAX_CACHED_FILES, max_bytes=max_file_bytes, sizeof=len)
+        # get_file outcomes: served from memory, re-read from the disk store,
+        # or not available at all. See Client.file_cache_stats.
+        self.file_cache_stats: Dict[str, int] = {
+            'hits': 0, 'disk_hits': 0, 'misses': 0,
+        }
         self.failed_files: set = set()  # Files that failed to download
         self.file_attempts: Dict[str, int] = {}
         self.uptodate_files: set = set()  # Files confirmed unchanged by the server
         self.cache_index: Optional[Dict[str, object]] = None
+        # How far into the disk cache's index.journal cache_index has been
+        # replayed, and how many records that covered (compaction trigger).
+        self.cache_journal_offset = 0
+        self.cache_journal_records = 0
+        # (st_dev, st_ino) of the journal that offset points into; compaction
+        # replaces the file, so a new identity means replay from byte 0.
+        self.cache_journal_id: Optional[tuple] = None
+        # How get_file vouches for disk cache bytes: "stat" trusts the size,
+        # mtime and inode recorded when the digest was last checked and only
+        # re-hashes when they change; "hash" re-hashes on every first read.
+        self.cache_verify = "stat"
+        # Verdicts from start_cache_verification's worker thread, applied on
+        # the client thread by get_file.
+        self.cache_verify_results: deque = deque()
+        self.cache_verify_thread = None
 
         # One server interleaved pics1.png with another large download and the
         # old single buffer silently replaced pics1.png's first half; its tail
@@ -415,6 +786,9 @@ class Instrumentation:
         self.prop_parse_diagnostics = {
             'warnings': 0, 'errors': 0, 'width_fallbacks': 0,
         }
+        # Handler latency histograms and the per-frame cost breakdown
+        # (packet_timing.PacketTiming). None = off, the default.
+        self.packet_timing = None
 
 
 class Callbacks:
@@ -6,10 +6,10 @@ import logging
 import math
 import re
 import time
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from reborn_protocol.coords import (
-    local_to_world, world_to_local,
+    LEVEL_SIZE, local_to_world, world_to_local,
 )
 
 from .packets import PacketID, build_level_warp
@@ -22,6 +22,41 @@ WARP_COORD_MIN = -16.0
 WARP_COORD_MAX = 111.5
 
 
+def _link_trigger_grid(links: Sequence[dict],
+                       adjacent: Sequence[str]) -> List[Optional[dict]]:
+    """Flatten a level's links into a LEVEL_SIZE x LEVEL_SIZE tile -> link
+    table (row-major), with the gmap edge links already dropped.
+
+    Each tile holds the first link, in arrival order, whose inclusive rect
+    covers it: the link check_link_collision's linear scan would have
+    returned for a probe on that tile.
+    """
+    grid: List[Optional[dict]] = [None] * (LEVEL_SIZE * LEVEL_SIZE)
+    last = LEVEL_SIZE - 1
+    for link in reversed(links):
+        lx = link.get('x', 0)
+        ly = link.get('y', 0)
+        lw = link.get('width', 1)
+        lh = link.get('height', 1)
+
+        # Edge links to adjacent GMAP levels are seamless walking, not doors.
+        is_edge = (lx <= 1 or lx + lw >= 63 or ly <= 1 or ly + lh >= 63)
+        if is_edge and link.get('dest_level', '') in adjacent:
+            continue
+
+        x0 = max(0, math.ceil(lx))
+        x1 = min(last, math.floor(lx + lw))
+        y0 = max(0, math.ceil(ly))
+        y1 = min(last, math.floor(ly + lh))
+        if x0 > x1:
+            continue
+        row = [link] * (x1 - x0 + 1)
+        for ty in range(y0, y1 + 1):
+            base = ty * LEVEL_SIZE
+            grid[base + x0:base + x1 + 1] = row
+    return grid
+
+
 def _eval_warp_coord(expr, player_x: float, player_y: float) -> Optional[float]:
     """Resolve a level-link destination coordinate.
 
@@ -109,10 +144,9 @@ class WarpMixin:
         self.player.x = x
         self.player.y = y
         if self.gmap_width > 0:
-            for (gx, gy), seg in self.gmap_grid.items():
-                if seg == level_name:
-                    self.player.x, self.player.y = local_to_world(x, y, gx, gy)
-                    break
+            cell = self.gmap_grid.cell_of(level_name)
+            if cell is not None:
+                self.player.x, self.player.y = local_to_world(x, y, *cell)
         # Leaving a standalone (non-GMAP) level: drop the other players from it.
         # The server streams the new level's players fresh; without this, players
         # from old levels linger and inflate playerscount (e.g. the Bomber arena
@@ -413,7 +447,8 @@ class WarpMixin:
         if not self._current_level_name:
             return None
 
-        links = self.links.get(self._current_level_name, [])
+        level_name = self._current_level_name
+        links = self.links.get(level_name, [])
         if not links:
             return None
 
@@ -428,28 +463,24 @@ class WarpMixin:
                          (1.5, 3.5), (3.0, 2.0))
         dx, dy = probe_offsets[int(self.player.direction) & 3]
         tile_x, tile_y = world_to_local(math.floor(px + dx), math.floor(py + dy))
-
-        for link in links:
-            lx = link.get('x', 0)
-            ly = link.get('y', 0)
-            lw = link.get('width', 1)
-            lh = link.get('height', 1)
-
-            # Check if this is an edge link (GMAP adjacency, ignore)
-            is_edge = (lx <= 1 or lx + lw >= 63 or ly <= 1 or ly + lh >= 63)
-
-            # Also check if destination is an adjacent GMAP level
-            dest_level = link.get('dest_level', '')
-            is_adjacent = dest_level in self.get_adjacent_levels(self._current_level_name)
-
-            # Skip edge links to adjacent levels (GMAP seamless walking)
-            if is_edge and is_adjacent:
-                continue
-
-            if lx <= tile_x <= lx + lw and ly <= tile_y <= ly + lh:
-                return link
-
-        return None
+        tile_x, tile_y = int(tile_x), int(tile_y)
+        if not (0 <= tile_x < LEVEL_SIZE and 0 <= tile_y < LEVEL_SIZE):
+            return None
+        return self._link_grid(level_name, links)[tile_y * LEVEL_SIZE + tile_x]
+
+    def _link_grid(self, level_name: str,
+                   links: List[dict]) -> List[Optional[dict]]:
+        """The level's tile -> link table (_link_trigger_grid), rebuilt when
+        the link list is replaced or grows (PLO_LEVELLINK only appends) or
+        the gmap neighbours around the level change."""
+        adjacent = self.gmap_grid.neighbours(level_name)
+        cached = self._link_grids.get(level_name)
+        if (cached is not None and cached[0] is links
+                and cached[1] == len(links) and cached[2] == adjacent):
+            return cached[3]
+        grid = _link_trigger_grid(links, adjacent)
+        self._link_grids[level_name] = (links, len(links), adjacent, grid)
+        return grid
 
     def use_link(self, link: dict) -> bool:
         """
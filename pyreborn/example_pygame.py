@@ -82,6 +82,7 @@ def main():
     content_values = []
     remaining_args = []
     clear_content_dirs = False
+    dirty_rendering = False
     index = 0
     while index < len(launch_args):
         argument = launch_args[index]
@@ -89,6 +90,10 @@ def main():
             clear_content_dirs = True
             index += 1
             continue
+        if argument == "--dirty-render":
+            dirty_rendering = True
+            index += 1
+            continue
         if argument == "--content-dir":
             if index + 1 >= len(launch_args):
                 print("Error: --content-dir requires a PATH.")
@@ -157,7 +162,7 @@ def main():
     else:
         # No credentials - show login screen
         print("Starting login screen...")
-        print("Usage (optional): python -m pyreborn.example_pygame [user] [pass] [host] [port] [--version VER] [--listserver [host]] [--content-dir PATH] [--clear-content-dirs]")
+        print("Usage (optional): python -m pyreborn.example_pygame [user] [pass] [host] [port] [--version VER] [--listserver [host]] [--content-dir PATH] [--clear-content-dirs] [--dirty-render]")
 
         login_screen = LoginScreen(prefs=prefs)
         login_result = login_screen.run()
@@ -243,7 +248,10 @@ def main():
 
     def connect_and_login(ver):
         print(f"Connecting to {host}:{port} (version {ver})...")
-        cl = Client(host, port, version=ver)
+        # PYREBORN_THREADED_IO=1 moves socket reads and packet decoding off
+        # the render thread (see protocol.ThreadedProtocol).
+        cl = Client(host, port, version=ver,
+                    threaded_io=bool(os.environ.get("PYREBORN_THREADED_IO")))
         cl.server_name = server_name_for(host, port)
         if not cl.connect():
             # Don't hard-exit: an unreachable host (e.g. a listserver entry with
@@ -313,6 +321,7 @@ def main():
               "F7=Players, F8=Servers, F10=RC tools")
         game = GameClient(client, password=password)
         game.servers = servers      # populate the in-game F8 server switcher
+        game.dirty_rendering = dirty_rendering
         switch = game.run()
 
         if not switch:
@@ -10,7 +10,7 @@ from pygame.locals import (
     K_UP, K_DOWN, K_LEFT, K_RIGHT,
 )
 
-from reborn_protocol.coords import level_index, segment_at, world_to_local
+from reborn_protocol.coords import segment_at, world_to_local
 
 from ..gani import direction_from_delta
 from ..liftobjects import match_lift_object
@@ -599,7 +599,11 @@ class ActionsMixin:
             if level_name == standing:
                 self.client.modify_board(lx, ly, 1, 1, [replacement])
             elif tiles:
-                tiles[level_index(lx, ly)] = replacement
+                # Local-only patch, through the same path as a server edit
+                # so the level's type map follows it.
+                self.client._apply_board_modify(level_name, {
+                    'x': lx, 'y': ly, 'width': 1, 'height': 1,
+                    'tiles': [replacement]})
 
     def _throw_object(self):
         """Throw the carried object: it flies ahead in an arc and breaks on
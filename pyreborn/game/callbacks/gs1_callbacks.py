@@ -3,6 +3,7 @@
 import os
 import time
 
+from ...asset_fetch import PRIORITY_VISIBLE, fetch_or_request
 from ...sprites import strip_tiledef_image
 
 def wire_gs1_callbacks(game):
@@ -302,7 +303,8 @@ def wire_gs1_callbacks(game):
         game._invalidate_tile_derived_caches()
         if not game.sprite_mgr.has_sheet(image):
             try:
-                game.client.request_file(image)
+                fetch_or_request(getattr(game, 'asset_fetch', None),
+                                 game.client, image, PRIORITY_VISIBLE)
             except Exception:
                 pass
 
@@ -327,6 +329,9 @@ def wire_gs1_callbacks(game):
     # (guarded: unit harnesses mix SetupMixin in without CollisionMixin,
     # and the GS1 host's own single-level fallback is right for them.)
     game.gs1.tile_source = getattr(game, "_get_tile_at", None)
+    # ...and onwall/onwater/tiletype read the tile TYPE straight off the level's
+    # type map (Client.tile_types) where that segment's board is loaded.
+    game.gs1.tile_type_source = getattr(game, "_board_tile_type", None)
 
     # Image-NPC footprints (blocking + touch) size themselves off the
     # actual art and are refined by per-pixel transparency where it is
@@ -11,7 +11,7 @@ from reborn_protocol.coords import (
 )
 
 from ..tiletypes import (
-    TileType, get_tile_type, type_is_blocking,
+    TileType, active_tilestype, get_tile_type, type_is_blocking,
 )
 from .constants import (
     MOVE_STEP, CORNER_ASSIST_MAX,
@@ -66,6 +66,9 @@ class CollisionMixin:
                 ttype = 0
             if ttype > 1:
                 return ttype
+        ttype = self._board_tile_type(x, y)
+        if ttype is not None:
+            return ttype
         return self._tile_type(self._get_tile_at(x, y))
     # Ground sampling uses the standing point between the feet. It is distinct
     # from the collision box's centre after the box's half-tile upward shift.
@@ -130,6 +133,28 @@ class CollisionMixin:
         name = self.client._current_level_name
         return name, (self.client.levels.get(name) or self.client.tiles)
 
+    def _board_tile_type(self, x: float, y: float,
+                         tilestype: Optional[int] = None) -> Optional[int]:
+        """Board tile TYPE at world (x, y), read from the client's per-level
+        type map (Client.tile_types) - the same answer as
+        get_tile_type(_get_tile_at(x, y), tilestype) for one byte lookup.
+
+        None when the map cannot answer (no board streamed, a probe off the
+        board, or a client without type maps). Callers then take the
+        _get_tile_at path, which owns those edge cases."""
+        tile_types = getattr(self.client, 'tile_types', None)
+        if tile_types is None:
+            return None
+        level_name, tiles = self._level_tiles_at(x, y)
+        if not tiles or len(tiles) < LEVEL_SIZE * LEVEL_SIZE:
+            return None
+        tx, ty = self._world_to_level_local(x, y)
+        if not in_level_bounds(tx, ty):
+            return None
+        if tilestype is None:
+            tilestype = active_tilestype()
+        return tile_types(level_name, tiles, tilestype)[level_index(tx, ty)]
+
     def _world_to_level_local(self, x: float, y: float) -> Tuple[int, int]:
         """Floor (x, y) to the level-local tile frame (0-63) that per-level
         state (tiles, chests, ...) is keyed by. Only GMAP world coords get
@@ -315,6 +340,9 @@ class CollisionMixin:
             except Exception:
                 pass
 
+        ttype = self._board_tile_type(x, y)
+        if ttype is not None:
+            return type_is_blocking(ttype)
         tile_id = self._get_tile_at(x, y)
         return self._is_tile_blocking(tile_id)
     def _chest_blocks(self, x: float, y: float) -> bool:
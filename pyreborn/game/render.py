@@ -463,19 +463,25 @@ class RenderMixin(FrameContextMixin):
 
         # World + entities, optionally through a zoom layer (see _render_scene).
         zoom = self.camera.zoom
-        if zoom == 1.0:
-            self.screen.fill((0, 0, 0))
-            self._render_scene()
+        if zoom == 1.0 and getattr(self, 'dirty_rendering', False):
+            # Incremental scene + GUI band over a cached world layer; also
+            # leaves _transition_scene_frame set (see render_dirty.py).
+            self._render_scene_dirty()
         else:
-            self._render_scene_zoomed(zoom)
-        # Screen-space scripted GUI band, after any zoom scale (see
-        # _render_gui_band).
-        self._render_gui_band()
-
-        # Preserve the world-only portion of the last completed frame. The
-        # ordinary hold still freezes the full framebuffer verbatim; this copy
-        # is used only if that hold later becomes a slide, keeping the HUD fixed.
-        self._transition_scene_frame = self.screen.copy()
+            if zoom == 1.0:
+                self.screen.fill((0, 0, 0))
+                self._render_scene()
+            else:
+                self._render_scene_zoomed(zoom)
+            # Screen-space scripted GUI band, after any zoom scale (see
+            # _render_gui_band).
+            self._render_gui_band()
+
+            # Preserve the world-only portion of the last completed frame. The
+            # ordinary hold still freezes the full framebuffer verbatim; this
+            # copy is used only if that hold later becomes a slide, keeping the
+            # HUD fixed.
+            self._transition_scene_frame = self.screen.copy()
 
         # Screen-space overlays (never zoomed): sign popups, then the HUD.
         self._check_and_render_signs()
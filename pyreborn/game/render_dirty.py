@@ -0,0 +1,167 @@
+"""DirtyRenderMixin — dirty-region scene rendering for a still camera.
+
+Split from render.py; methods operate on the GameClient instance.
+
+The ordinary frame (render.py _render) clears the canvas, re-blits every
+visible world segment, runs every scene pass on top and then copies the whole
+canvas into _transition_scene_frame. With `dirty_rendering` on (zoom 1 only),
+the scene is drawn into a persistent _SceneBuffer instead:
+
+- The visible segments are composited once into a viewport-sized world layer,
+  kept until the camera origin, the visible segment set or any segment's
+  pixels change (_world_layer_key / _world_serial).
+- The _SceneBuffer records the rect of every blit/blits/fill the scene passes
+  and the GUI band make, plus the bounding rects pygame.draw calls report
+  through mark_drawn. Outside those rects it always equals the world layer, so
+  the next frame only has to restore last frame's rects from the layer before
+  the passes draw again.
+- The buffer is blitted onto the canvas before the screen-space UI, and is
+  itself the transition snapshot: the slide consumer copies it before anything
+  draws, so the per-frame full-screen copy is only paid when a slide starts.
+
+Standing still in a quiet level, a frame costs the canvas blit plus whatever
+the moving entities, animated tiles, particles and GUI layers cover.
+"""
+
+from typing import List, Optional
+
+import pygame
+
+# Past this many rects, restoring each one costs more than one blit of their
+# union - the buffer collapses them (see _SceneBuffer.end).
+_MAX_DIRTY_RECTS = 64
+
+
+class _SceneBuffer(pygame.Surface):
+    """A scene surface that remembers which rects were drawn on it.
+
+    Recording only happens between begin() and end(). copy() returns a plain
+    pygame.Surface; subsurface() has to stay this type to share the pixels
+    (pygame builds it without __init__), so it is given an empty `dirty` and
+    never records."""
+
+    _recording: Optional[List[pygame.Rect]] = None
+
+    def __init__(self, size, like: pygame.Surface):
+        super().__init__(size, 0, like)
+        # rects recorded by the previous frame - what restore() puts back
+        self.dirty: List[pygame.Rect] = []
+
+    def begin(self):
+        self._recording = []
+
+    def end(self) -> List[pygame.Rect]:
+        rects = [r for r in self._recording if r.w and r.h]
+        self._recording = None
+        if len(rects) > _MAX_DIRTY_RECTS:
+            rects = [rects[0].unionall(rects[1:])]
+        self.dirty = rects
+        return rects
+
+    def copy(self) -> pygame.Surface:
+        # pygame.Surface.copy would return an uninitialised _SceneBuffer
+        plain = pygame.Surface(self.get_size(), self.get_flags(), self)
+        pygame.Surface.blit(plain, self, (0, 0))
+        return plain
+
+    def subsurface(self, *rect) -> pygame.Surface:
+        sub = super().subsurface(*rect)
+        sub.dirty = []
+        return sub
+
+    def mark(self, rect):
+        if self._recording is not None:
+            self._recording.append(pygame.Rect(rect))
+
+    def restore(self, layer: pygame.Surface):
+        """Put the world layer back under last frame's dirty rects."""
+        if self.dirty:
+            pygame.Surface.blits(self, [(layer, r, r) for r in self.dirty],
+                                 doreturn=False)
+            self.dirty = []
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        rect = super().blit(source, dest, area, special_flags)
+        if self._recording is not None:
+            self._recording.append(rect)
+        return rect
+
+    def blits(self, blit_sequence, doreturn=True):
+        rects = super().blits(blit_sequence, doreturn=True)
+        if self._recording is not None:
+            self._recording.extend(rects)
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        rect = super().fill(color, rect, special_flags)
+        if self._recording is not None:
+            self._recording.append(rect)
+        return rect
+
+
+def mark_drawn(surface: pygame.Surface, rect) -> None:
+    """Report the rect a pygame.draw call returned to a recording scene
+    buffer. Blits and fills are seen by the buffer itself; direct
+    pygame.draw.* calls on self.screen have to go through this."""
+    mark = getattr(surface, 'mark', None)
+    if mark is not None:
+        mark(rect)
+
+
+class DirtyRenderMixin:
+    """Mixin providing the above methods for GameClient."""
+
+    def _scene_buffer(self) -> _SceneBuffer:
+        """The persistent scene buffer, reallocated if the canvas resized."""
+        canvas = self.screen
+        scene = getattr(self, '_dirty_scene', None)
+        if scene is None or scene.get_size() != canvas.get_size():
+            scene = self._dirty_scene = _SceneBuffer(canvas.get_size(), canvas)
+            self._world_layer_key = None
+        return scene
+
+    def _render_scene_dirty(self):
+        """The zoom-1 world + GUI band, drawn incrementally into the scene
+        buffer and then onto the canvas (see module docstring)."""
+        canvas = self.screen
+        scene = self._scene_buffer()
+        self.screen = scene
+        self._dirty_frame = True
+        scene.begin()
+        try:
+            self._render_scene()
+            self._render_gui_band()
+        finally:
+            self._dirty_frame = False
+            self.screen = canvas
+            scene.end()
+        canvas.blit(scene, (0, 0))
+        # Lazy snapshot: the buffer is not touched again until the next frame
+        # has already taken (and copied) it as a slide source.
+        self._transition_scene_frame = scene
+
+    def _present_world_layer(self, segments):
+        """Stand-in for the segment blits during a dirty frame: bring the
+        scene buffer back to the plain world layer, rebuilding the layer only
+        if what it shows changed."""
+        scene = self.screen
+        surfaces = []
+        for (level_name, grid_ox, grid_oy) in segments:
+            surf = self._get_segment_surface(level_name)
+            if surf is not None:
+                surfaces.append((surf, self.camera.world_to_screen(grid_ox, grid_oy)))
+        key = (scene.get_size(), getattr(self, '_world_serial', 0),
+               tuple((id(surf), dest) for surf, dest in surfaces),
+               tuple(segments))
+        layer = getattr(self, '_world_layer', None)
+        if (key == getattr(self, '_world_layer_key', None)
+                and layer is not None):
+            scene.restore(layer)
+            return
+        if layer is None or layer.get_size() != scene.get_size():
+            layer = self._world_layer = pygame.Surface(scene.get_size(), 0, scene)
+        layer.fill((0, 0, 0))
+        layer.blits(surfaces, doreturn=False)
+        pygame.Surface.blit(scene, layer, (0, 0))
+        scene.dirty = []
+        self._world_layer_key = key
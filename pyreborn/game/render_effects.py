@@ -17,6 +17,7 @@ from ..prefs import Prefs
 from ..tiletypes import TileType
 from .constants import TILE_SIZE
 from .frame_context import FrameContext, FrameContextMixin
+from .render_dirty import mark_drawn
 
 
 def _q_dim(v: int) -> int:
@@ -242,18 +243,20 @@ class EffectsRenderMixin(FrameContextMixin):
         if sprite is not None:
             self._render_effect_sprite_image(sprite, screen_x, screen_y)
             # Fuse spark on top - a static image has no animated fuse of its own.
-            pygame.draw.circle(self.screen, (255, 200, 50),
-                               (int(screen_x + 4), int(screen_y - 8)), 3)
+            mark_drawn(self.screen, pygame.draw.circle(
+                self.screen, (255, 200, 50),
+                (int(screen_x + 4), int(screen_y - 8)), 3))
             return
         gani = self._get_effect_gani('bomb')
         if gani is not None:
             self._render_effect_gani_frame(gani, screen_x, screen_y, 2, elapsed)
             return
         # Fallback primitive (unchanged look).
-        pygame.draw.circle(self.screen, (50, 50, 50), (int(screen_x), int(screen_y)), 8)
+        body = pygame.draw.circle(self.screen, (50, 50, 50), (int(screen_x), int(screen_y)), 8)
         pygame.draw.circle(self.screen, (30, 30, 30), (int(screen_x), int(screen_y)), 6)
-        pygame.draw.circle(self.screen, (255, 200, 50),
-                           (int(screen_x + 4), int(screen_y - 8)), 3)
+        spark = pygame.draw.circle(self.screen, (255, 200, 50),
+                                   (int(screen_x + 4), int(screen_y - 8)), 3)
+        mark_drawn(self.screen, body.union(spark))
 
     def _render_explosion_burst(self, screen_x: float, screen_y: float, elapsed: float,
                                  radius: int, alpha: int):
@@ -382,7 +385,7 @@ class EffectsRenderMixin(FrameContextMixin):
         way the reference cuts (TPlayer::slayBushes -> modifyBoard with its
         send flag set).
         """
-        from reborn_protocol.coords import level_index, world_to_local
+        from reborn_protocol.coords import world_to_local
 
         replacement = BUSH_REPLACE[index]
         standing = self.client.get_current_level_from_position()
@@ -395,7 +398,9 @@ class EffectsRenderMixin(FrameContextMixin):
             if level_name == standing:
                 self.client.modify_board(lx, ly, 1, 1, [replacement[i]])
             elif tiles:
-                tiles[level_index(lx, ly)] = replacement[i]
+                self.client._apply_board_modify(level_name, {
+                    'x': lx, 'y': ly, 'width': 1, 'height': 1,
+                    'tiles': [replacement[i]]})
 
     def _break_bushes_in_blast(self, x: float, y: float, power: int):
         """Remove vegetation objects whose tiles overlap the circular blast."""
@@ -454,7 +459,7 @@ class EffectsRenderMixin(FrameContextMixin):
             points = [(screen_x + 8, screen_y), (screen_x - 4, screen_y - 3), (screen_x - 4, screen_y + 3)]
         fill, outline = self._PROJECTILE_FALLBACK_COLORS.get(kind, self._DEFAULT_PROJECTILE_COLORS)
         pygame.draw.polygon(self.screen, fill, points)
-        pygame.draw.polygon(self.screen, outline, points, 1)
+        mark_drawn(self.screen, pygame.draw.polygon(self.screen, outline, points, 1))
 
     def _update_and_render_projectiles(self, dt: float,
                                        frame: Optional[FrameContext] = None):
@@ -513,8 +518,8 @@ class EffectsRenderMixin(FrameContextMixin):
         screen_x, screen_y = self.camera.world_to_screen(proj['x'], proj['y'])
         age = now - proj['hit_time']
         radius = max(1, int(5 * (1.0 - age / 0.12)))
-        pygame.draw.circle(self.screen, (255, 220, 120),
-                           (int(screen_x), int(screen_y)), radius, 1)
+        mark_drawn(self.screen, pygame.draw.circle(
+            self.screen, (255, 220, 120), (int(screen_x), int(screen_y)), radius, 1))
 
     def _add_remote_arrow(self, info: dict, now: Optional[float] = None):
         now = time.time() if now is None else now
@@ -755,7 +760,8 @@ class EffectsRenderMixin(FrameContextMixin):
         (drawn at y - z, TParticleEmitter::fastDraw quattroplay/src/
         TParticleEmitter.cpp:919), GUI-band coords are screen pixels;
         particle `mode` >= 2 is the additive blend family (drawMode
-        premultiply, :956-961)."""
+        premultiply, :956-961). Reads emitter.draw_state() rows and draws
+        them with one Surface.blits call."""
         particles = getattr(emitter, 'particles', None)
         if not particles:
             return
@@ -777,30 +783,36 @@ class EffectsRenderMixin(FrameContextMixin):
         rz = float(rec.get('z', 0.0) or 0.0)
         zoom_base = 1.0 if gui else self.camera.scale / float(TILE_SIZE)
         # firstinfront draws newest on top (default); painter's order
-        ordered = (particles if emitter.get('firstinfront') != 0.0
-                   else list(reversed(particles)))
+        rows = emitter.draw_state()
+        if emitter.get('firstinfront') == 0.0:
+            rows.reverse()
         frame = self._frame_context()
         cache = getattr(self, '_particle_surf_cache', None)
         if cache is None:
             cache = self._particle_surf_cache = {}
-        for p in ordered[:self._PARTICLE_DRAW_CAP]:
-            image = p.image
+        sheets = {}
+        batch = []
+        for (image, x, y, z, zoom, stretchx, stretchy, red, green, blue,
+             alpha, mode, rotation) in rows[:self._PARTICLE_DRAW_CAP]:
             if not image:
                 continue
-            sheet = self.sprite_mgr.load_sheet(image)
+            sheet = sheets.get(image, False)
+            if sheet is False:
+                sheet = sheets[image] = self.sprite_mgr.load_sheet(image)
+                if sheet is None:
+                    self._request_asset(image)
             if sheet is None:
-                self._request_asset(image)
                 continue
             w = _q_dim(max(1, int(sheet.get_width()
-                                  * zoom_base * p.zoom * p.stretchx)))
+                                  * zoom_base * zoom * stretchx)))
             h = _q_dim(max(1, int(sheet.get_height()
-                                  * zoom_base * p.zoom * p.stretchy)))
-            additive = p.mode >= 2
-            rq = min(16, max(0, int(p.red * 16)))
-            gq = min(16, max(0, int(p.green * 16)))
-            bq = min(16, max(0, int(p.blue * 16)))
-            aq = min(16, max(0, int(p.alpha * 16)))
-            rot = int(math.degrees(p.rotation) / 15.0) * 15 if p.rotation else 0
+                                  * zoom_base * zoom * stretchy)))
+            additive = mode >= 2
+            rq = min(16, max(0, int(red * 16)))
+            gq = min(16, max(0, int(green * 16)))
+            bq = min(16, max(0, int(blue * 16)))
+            aq = min(16, max(0, int(alpha * 16)))
+            rot = int(math.degrees(rotation) / 15.0) * 15 if rotation else 0
             key = (image, w, h, rq, gq, bq, aq, additive, rot)
             surf = cache.get(key)
             if surf is None:
@@ -827,22 +839,24 @@ class EffectsRenderMixin(FrameContextMixin):
                 if len(cache) > self._PARTICLE_CACHE_CAP:
                     cache.clear()
                 cache[key] = surf
-            px, py, pz = p.x, p.y, p.z
             if not attach:
-                px -= rx
-                py -= ry
-                pz -= rz
-            sx = base[0] + px * scale
-            sy = base[1] + (py - pz) * scale
+                x -= rx
+                y -= ry
+                z -= rz
+            sx = base[0] + x * scale
+            sy = base[1] + (y - z) * scale
             if rot:
                 sx -= (surf.get_width() - w) / 2.0
                 sy -= (surf.get_height() - h) / 2.0
             if additive:
                 if not frame.defer_light(surf, sx, sy):
-                    self.screen.blit(surf, (int(sx), int(sy)),
-                                     special_flags=pygame.BLEND_ADD)
+                    batch.append((surf, (int(sx), int(sy)), None,
+                                  pygame.BLEND_ADD))
             else:
-                self.screen.blit(surf, (int(sx), int(sy)))
+                batch.append((surf, (int(sx), int(sy))))
+        if batch:
+            # one call for the emitter, still in painter's order
+            self.screen.blits(batch, doreturn=False)
 
     def _render_leaf_particles(self):
         now = time.time()
@@ -856,7 +870,8 @@ class EffectsRenderMixin(FrameContextMixin):
             px, py = self.camera.world_to_screen(wx, wy)
             size = 2 + ((int(t * 12) + leaf['phase']) & 1)
             color = (*colors[leaf['shade']], int(255 * (1.0 - t)))
-            pygame.draw.rect(self.screen, color, (round(px), round(py), size, 2))
+            mark_drawn(self.screen, pygame.draw.rect(
+                self.screen, color, (round(px), round(py), size, 2)))
 
     # -- putleaps bursts ---------------------------------------------------
     #
@@ -12,6 +12,7 @@ from ..npc_handler import CHARACTER_IMAGE
 from ..player import Player
 from ..sprites import palette_name_to_index
 from .frame_context import FrameContext, FrameContextMixin
+from .render_dirty import mark_drawn
 from .constants import (
     TILE_SIZE, parse_npc_visual_effects,
     PLAYER_COLLISION_LEFT, PLAYER_COLLISION_RIGHT,
@@ -270,7 +271,8 @@ class EntityRenderMixin(
             feet_y = y + TILE_SIZE * PLAYER_STAND_Y
 
             # Current position marker (red dot at the ground-sample centre)
-            pygame.draw.circle(self.screen, (255, 0, 0), (int(feet_x), int(feet_y)), 4)
+            mark_drawn(self.screen, pygame.draw.circle(
+                self.screen, (255, 0, 0), (int(feet_x), int(feet_y)), 4))
 
             # True collision box: 2x2 tiles centred above the standing point,
             # spanning x+0.5..x+2.5 by y+1.0..y+3.0 (collision.py's
@@ -283,7 +285,8 @@ class EntityRenderMixin(
                 int(box_left), int(box_top),
                 int(box_right - box_left), int(box_bottom - box_top)
             )
-            pygame.draw.rect(self.screen, (0, 255, 0), collision_rect, 2)
+            mark_drawn(self.screen, pygame.draw.rect(
+                self.screen, (0, 255, 0), collision_rect, 2))
 
             # Tile grid around player feet
             feet_world_x = self.client.x + PLAYER_STAND_X
@@ -295,7 +298,8 @@ class EntityRenderMixin(
                     grid_x = int(feet_x - tile_offset_x + tx * TILE_SIZE)
                     grid_y = int(feet_y - tile_offset_y + ty * TILE_SIZE)
                     grid_rect = pygame.Rect(grid_x, grid_y, TILE_SIZE, TILE_SIZE)
-                    pygame.draw.rect(self.screen, (255, 255, 255, 128), grid_rect, 1)
+                    mark_drawn(self.screen, pygame.draw.rect(
+                        self.screen, (255, 255, 255, 128), grid_rect, 1))
     def _render_carried_object(self, x: float, y: float, player: Player):
         """Render the 2x2 object the player is carrying above their head."""
         if not player.carried_tile_ids:
@@ -441,12 +445,17 @@ class EntityRenderMixin(
                                                    name_surf.get_size(), frame)
             self.screen.blit(name_surf, (name_x, name_y))
     def _request_asset(self, filename: str):
-        """Request a missing image/file from the server exactly once."""
+        """Request a missing image/file from the server exactly once.
+
+        The request goes through self.asset_fetch (pyreborn.asset_fetch),
+        which sends it right away while its in-flight window has room and
+        otherwise queues it by priority. It also retries refusals.
+        """
         if (not filename or filename in self._requested_assets or
                 filename in self.client.failed_files):
             return
         try:
-            if self.client.request_file(filename):
+            if self.asset_fetch.request(filename):
                 self._requested_assets.add(filename)
         except Exception:
             pass
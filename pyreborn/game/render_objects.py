@@ -8,6 +8,7 @@ import pygame
 
 from reborn_protocol.coords import segment_origin
 
+from ..client_state import gmap_cell
 from .constants import TILE_SIZE, PLAYER_STAND_X, PLAYER_STAND_Y
 
 
@@ -64,8 +65,7 @@ class LevelObjectsRenderMixin:
         """Return the current segment's level name and world-tile origin."""
         level_name = self.client._current_level_name
         if self.client.in_gmap_segment:
-            grid = next((cell for cell, name in self.client.gmap_grid.items()
-                         if name == level_name), None)
+            grid = gmap_cell(self.client.gmap_grid, level_name)
             if grid is not None:
                 return (level_name, *segment_origin(*grid))
         return level_name, 0, 0
@@ -8,6 +8,7 @@ import pygame
 
 from .assets import render_outlined_text
 from .frame_context import FrameContext
+from .render_dirty import mark_drawn
 
 
 class RenderTextMixin:
@@ -143,6 +144,8 @@ class RenderTextMixin:
             (pointer_x, bubble_y + bubble_height + 6),
             (pointer_x + 4, bubble_y + bubble_height)
         ], 1)
+        mark_drawn(self.screen, (bubble_x, bubble_y,
+                                 bubble_width, bubble_height + 7))
 
         # Draw text lines
         for i, line in enumerate(lines):
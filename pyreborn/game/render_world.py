@@ -18,12 +18,13 @@ unbounded number of cached segments.
 
 import time
 from collections import OrderedDict
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 import pygame
 
 from reborn_protocol.coords import segment_index, segment_origin
 
+from ..packets import parse_board_packet
 from ..tiletypes import TileType, get_tile_type
 from . import theme
 from .assets import render_outlined_text
@@ -44,6 +45,18 @@ _STANDALONE_KEY = "__standalone__"
 # gigabytes a monolithic whole-GMAP surface would cost.
 _MAX_CACHED_SEGMENTS = 25
 
+# Predictive pre-bake (_prebake_segments): each frame may spend up to this
+# long baking gmap segments the camera is about to reach - about one segment
+# bake, where a diagonal seam crossing used to bake three inside the frame
+# that first showed them. The lookahead is how many frames of the camera's
+# current motion the ranking projects ahead (~half a second at 60 fps).
+_PREBAKE_BUDGET_S = 0.004
+_PREBAKE_LOOKAHEAD_FRAMES = 30
+
+# Segment-local pixel origin of each of a board's 4096 cells, row-major.
+_SEGMENT_DESTS = [(tx * TILE_SIZE, ty * TILE_SIZE)
+                  for ty in range(64) for tx in range(64)]
+
 
 class WorldRenderMixin:
     """Mixin providing the above methods for GameClient."""
@@ -65,6 +78,8 @@ class WorldRenderMixin:
             return
 
         if not c.levels and not c.tiles:
+            if getattr(self, '_dirty_frame', False):
+                self.screen.fill((0, 0, 0))  # no world layer to restore from
             return
 
         self._apply_pending_full_invalidate()
@@ -85,8 +100,13 @@ class WorldRenderMixin:
             level_name = c._current_level_name or c._tiles_level_name or _STANDALONE_KEY
             segments = [(level_name, 0, 0)]
 
-        for (level_name, grid_ox, grid_oy) in segments:
-            self._blit_segment(level_name, grid_ox, grid_oy)
+        if getattr(self, '_dirty_frame', False):
+            self._present_world_layer(segments)  # see render_dirty.py
+        else:
+            for (level_name, grid_ox, grid_oy) in segments:
+                self._blit_segment(level_name, grid_ox, grid_oy)
+        if in_gmap and c.gmap_grid:
+            self._prebake_segments(segments, tile_range)
 
         # Sample the four-step ramp once so this pass and the later animated
         # draw use the same phase even if the clock crosses a cadence boundary.
@@ -160,7 +180,9 @@ class WorldRenderMixin:
     def _segments(self) -> "OrderedDict[str, dict]":
         """Lazily-initialized level_name -> segment cache entry map.
 
-        Each entry: {'surface', 'tiles_id', 'layers_snapshot', 'animated'}.
+        Each entry: {'surface', 'tiles_id', 'layers_snapshot', 'animated',
+        'prebaked'} - prebaked is True from a _prebake_segments bake until
+        the segment is first drawn.
         An OrderedDict so recently-used segments can be pushed to the end and
         stale ones evicted from the front once _MAX_CACHED_SEGMENTS is exceeded.
         """
@@ -170,10 +192,12 @@ class WorldRenderMixin:
         return cache
 
     def _apply_pending_full_invalidate(self):
-        """Several call sites (level warps, tile-editor corrections, lift/throw
-        tile swaps, board-layer streams — setup.py/actions.py/editor/)
-        still poke `self.world_surface = None` as a holdover from the old
-        single-surface design, to force a full redraw. Honor that as "drop
+        """Several call sites (tileset changes, tile-editor corrections,
+        lift/throw tile swaps, bush hits, board-layer streams — setup.py's
+        _invalidate_tile_derived_caches, actions.py, editor/, render_effects.py,
+        client_callbacks.py) still poke `self.world_surface = None` as a
+        holdover from the old single-surface design, to force a full redraw.
+        Level warps no longer do; each segment re-checks its own board. Honor that as "drop
         every cached segment"; segments simply rebuild lazily as they re-enter
         view, so this stays a cheap (if coarser-than-necessary) fallback.
         `self.world_surface` is no longer a real surface - just a sentinel
@@ -183,8 +207,8 @@ class WorldRenderMixin:
             self._segments().clear()
         self.world_surface = True
 
-    def _segment_tiles(self, level_name: str) -> Optional[List[int]]:
-        """The authoritative tile list backing a segment, mirroring how
+    def _segment_tiles(self, level_name: str) -> Optional[Sequence[int]]:
+        """The authoritative tile board (array('H')) backing a segment, mirroring how
         client.py itself resolves "current" tiles vs the per-level cache."""
         c = self.client
         tiles = c.levels.get(level_name)
@@ -196,11 +220,11 @@ class WorldRenderMixin:
         """Get (building/rebuilding only if stale) the cached surface for one
         64x64-tile level segment.
 
-        Cache key: level_name. Invalidation: the tiles list is replaced
+        Cache key: level_name. Invalidation: the tiles board is replaced
         wholesale (new id()) whenever fresh board data streams in for that
-        level (client.py always assigns a new list on PLO_BOARDPACKET), so an
+        level (client.py always assigns a new array on PLO_BOARDPACKET), so an
         identity check is enough to detect that case cheaply; boardmodify
-        deltas patch the same list object in place (see
+        deltas patch the same board object in place (see
         _patch_world_surface_for_modify) and are intentionally invisible to
         this check, since they patch the cached surface directly instead of
         forcing a rebuild. Extra board layers (client.board_layers) are only
@@ -213,17 +237,34 @@ class WorldRenderMixin:
             return None
 
         cache = self._segments()
-        c = self.client
         tiles_id = id(tiles)
-        is_active = (level_name == c._current_level_name)
-        layers_snapshot = dict(c.board_layers) if (is_active and c.board_layers) else None
+        layers_snapshot = self._segment_layers_snapshot(level_name)
 
         entry = cache.get(level_name)
         if (entry is not None and entry['tiles_id'] == tiles_id
                 and entry['layers_snapshot'] == layers_snapshot):
             cache.move_to_end(level_name)
+            if entry['prebaked']:
+                entry['prebaked'] = False
+                self._segment_bake_stats()['prebaked_hits'] += 1
             return entry['surface']
 
+        self._segment_bake_stats()['cold_misses'] += 1
+        return self._bake_segment(level_name, tiles, layers_snapshot)['surface']
+
+    def _segment_layers_snapshot(self, level_name: str) -> Optional[dict]:
+        """The extra board layers a segment's bake composites: a copy of
+        client.board_layers for the active level, None for every other."""
+        c = self.client
+        if level_name == c._current_level_name and c.board_layers:
+            return dict(c.board_layers)
+        return None
+
+    def _bake_segment(self, level_name: str, tiles: Sequence[int],
+                      layers_snapshot: Optional[dict],
+                      prebaked: bool = False) -> dict:
+        """Bake `tiles` (plus any extra board layers) into a fresh segment
+        surface and file it in the LRU as `level_name`'s entry."""
         surf = pygame.Surface((64 * TILE_SIZE, 64 * TILE_SIZE))
         surf.fill((0, 0, 0))
         animated: List[Tuple[int, int, int]] = []
@@ -235,18 +276,120 @@ class WorldRenderMixin:
                     continue
                 self._composite_board_layer(surf, raw, 0, 0)
 
-        cache[level_name] = {
+        cache = self._segments()
+        entry = cache[level_name] = {
             'surface': surf,
-            'tiles_id': tiles_id,
+            'tiles_id': id(tiles),
             'layers_snapshot': layers_snapshot,
             'animated': animated,
+            'prebaked': prebaked,
         }
         cache.move_to_end(level_name)
+        if not prebaked:
+            # a visible segment's pixels changed - render_dirty.py's world
+            # layer is keyed on this as well as on the surface ids
+            self._world_serial = getattr(self, '_world_serial', 0) + 1
         while len(cache) > _MAX_CACHED_SEGMENTS:
-            cache.popitem(last=False)  # evict the least-recently-used segment
-        return surf
+            # evict the least-recently-used segment
+            _, evicted = cache.popitem(last=False)
+            if evicted['prebaked']:
+                self._segment_bake_stats()['prebaked_unused'] += 1
+        return entry
+
+    # -- predictive pre-bake ------------------------------------------------
+
+    def _segment_bake_stats(self) -> dict:
+        stats = getattr(self, '_segment_bake_counts', None)
+        if stats is None:
+            stats = self._segment_bake_counts = {
+                'prebaked': 0, 'prebaked_hits': 0, 'prebaked_unused': 0,
+                'cold_misses': 0,
+            }
+        return stats
+
+    def segment_bake_stats(self) -> dict:
+        """
+        Counters for the segment surface cache.
+
+        Returns:
+            prebaked (segments baked ahead of the camera), prebaked_hits
+            (pre-baked segments later drawn without a bake), prebaked_unused
+            (pre-baked segments evicted before ever being drawn), cold_misses
+            (bakes on the draw path, i.e. inside the frame that shows the
+            segment) and the number of cached segments.
+        """
+        stats = dict(self._segment_bake_stats())
+        stats['cached'] = len(self._segments())
+        return stats
+
+    def _prebake_segments(self, segments, tile_range):
+        """Bake gmap segments the camera is heading into before they become
+        visible, so crossing a seam finds them already cached.
+
+        Candidates are the levels adjacent to the one under the view centre
+        (get_adjacent_levels) whose boards have arrived and whose cached
+        surface is missing or stale. They are ranked by distance from where
+        the view centre will be _PREBAKE_LOOKAHEAD_FRAMES frames on at its
+        current per-frame motion (the camera tracks the player, so that is
+        the player's heading; standing still ranks plain distance). Bakes
+        run until _PREBAKE_BUDGET_S of this frame is spent; the rest wait
+        for later frames.
+        """
+        c = self.client
+        min_tx, min_ty, max_tx, max_ty = tile_range
+        cx, cy = (min_tx + max_tx + 1) / 2, (min_ty + max_ty + 1) / 2
+        last = getattr(self, '_prebake_focus', None)
+        self._prebake_focus = (cx, cy)
+        vx, vy = (cx - last[0], cy - last[1]) if last else (0.0, 0.0)
+        if abs(vx) > 64 or abs(vy) > 64:
+            vx = vy = 0.0                   # a warp, not motion
+        lead_x = cx + vx * _PREBAKE_LOOKAHEAD_FRAMES
+        lead_y = cy + vy * _PREBAKE_LOOKAHEAD_FRAMES
+
+        centre = c.gmap_grid.get((segment_index(int(cx)), segment_index(int(cy))))
+        if not centre:
+            return
+        visible = {level_name for level_name, _, _ in segments}
+        cache = self._segments()
+        queue = []
+        for level_name in c.get_adjacent_levels(centre):
+            if level_name in visible:
+                continue
+            tiles = self._segment_tiles(level_name)
+            origin = c.gmap_grid.origin_of(level_name)
+            if not tiles or origin is None:
+                continue
+            # Same staleness test as _get_segment_surface, so a bake here is
+            # one the draw path would otherwise have to do.
+            layers_snapshot = self._segment_layers_snapshot(level_name)
+            entry = cache.get(level_name)
+            if (entry is not None and entry['tiles_id'] == id(tiles)
+                    and entry['layers_snapshot'] == layers_snapshot):
+                continue
+            ox, oy = origin
+            dx = max(ox - lead_x, 0.0, lead_x - (ox + 64))
+            dy = max(oy - lead_y, 0.0, lead_y - (oy + 64))
+            queue.append((dx * dx + dy * dy, level_name, tiles,
+                          layers_snapshot))
+        if not queue:
+            return
 
-    def _decode_board_layer_tiles(self, raw: bytes) -> List[int]:
+        queue.sort(key=lambda item: item[0])
+        stats = self._segment_bake_stats()
+        start = time.perf_counter()
+        for _, level_name, tiles, layers_snapshot in queue:
+            if time.perf_counter() - start >= _PREBAKE_BUDGET_S:
+                break
+            self._bake_segment(level_name, tiles, layers_snapshot,
+                               prebaked=True)
+            stats['prebaked'] += 1
+            # Keep the on-screen segments most-recently-used so a pre-bake
+            # never pushes one of them out of the LRU.
+            for visible_name in visible:
+                if visible_name in cache:
+                    cache.move_to_end(visible_name)
+
+    def _decode_board_layer_tiles(self, raw: bytes) -> Sequence[int]:
         """Decode a PLO_BOARDLAYER tile blob into 4096 tile ids.
 
         GServer always sends a full 64x64 layer (w=h=64 hardcoded - see
@@ -261,14 +404,7 @@ class WorldRenderMixin:
         data = raw
         if len(data) >= 8192 + 2:
             data = data[2:]
-        tiles = []
-        for i in range(0, min(len(data), 8192), 2):
-            b1 = data[i] if i < len(data) else 0
-            b2 = data[i + 1] if i + 1 < len(data) else 0
-            tiles.append((b1 + (b2 << 8)) & 0xFFF)
-        while len(tiles) < 4096:
-            tiles.append(0)
-        return tiles[:4096]
+        return parse_board_packet(data, as_array=True)
 
     def _composite_board_layer(self, surface: pygame.Surface, raw: bytes,
                                 offset_x: int, offset_y: int):
@@ -350,13 +486,15 @@ class WorldRenderMixin:
         # doesn't change for an in-place patch like this one - force it to
         # re-fold so the animated-index edit above actually reaches the
         # per-frame shimmer list instead of being masked by a stale key hit.
+        # render_dirty.py's cached world layer has the same blind spot.
         self._animated_tiles_key = None
+        self._world_serial = getattr(self, '_world_serial', 0) + 1
 
     # Tier 4a: tile types eligible for the water/lava shimmer.
     _ANIMATED_TILE_TYPES = (TileType.WATER, TileType.NEAR_WATER,
                             TileType.LAVA, TileType.LAVA_SWAMP)
 
-    def _render_single_level(self, surface: pygame.Surface, tiles: List[int],
+    def _render_single_level(self, surface: pygame.Surface, tiles: Sequence[int],
                               animated_out: List[Tuple[int, int, int]]):
         """Render one level's 64x64 tiles onto its own (segment-local, always
         0,0-based) surface, indexing water/lava tiles into animated_out using
@@ -373,26 +511,36 @@ class WorldRenderMixin:
         # with no tiledefs (7.7 -> 3.8 ms/segment), and this bake is the frame
         # cost that shows up as a stutter when a level change drops the
         # segment cache and several segments re-bake in one frame.
-        resolved = {}
-        get_tile = self.tileset_mgr.get_tile_or_color
+        #
+        # Ids are drawn straight off the tileset sheet with their tile rect as
+        # the blit's source area (TilesetManager.get_tile_sources) instead of
+        # through get_tile's per-tile copies, which a level change or tiledef
+        # edit throws away - the next bake then paid a subsurface().copy()
+        # per distinct id before drawing anything. Ids the sheet can't supply
+        # whole (missing sheet, edge tiles) keep the get_tile_or_color surface
+        # so placeholders look the same. See game_tester/segment_bake_bench.
+        tileset_mgr = self.tileset_mgr
+        ids = set(tiles)
+        get_sources = getattr(tileset_mgr, 'get_tile_sources', None)
+        resolved = get_sources(ids) if get_sources is not None else {}
+        get_tile = tileset_mgr.get_tile_or_color
         animated_types = self._ANIMATED_TILE_TYPES
-        blits = []
-        for ty in range(64):
-            row = ty * 64
-            for tx in range(64):
-                tile_id = tiles[row + tx]
-                entry = resolved.get(tile_id)
-                if entry is None:
-                    entry = (get_tile(tile_id),
-                             get_tile_type(tile_id) in animated_types)
-                    resolved[tile_id] = entry
-                blits.append((entry[0], (tx * TILE_SIZE, ty * TILE_SIZE)))
-                # Tier 4a: index water/lava tiles (segment-local coords) for
-                # the per-frame shimmer pass - cheap here since we're already
-                # iterating every tile once for the base composite.
-                if entry[1]:
-                    animated_out.append((tx, ty, tile_id))
-        surface.blits(blits, doreturn=False)
+        animated_ids = set()
+        for tile_id in ids:
+            if tile_id not in resolved:
+                resolved[tile_id] = (get_tile(tile_id), None)
+            if get_tile_type(tile_id) in animated_types:
+                animated_ids.add(tile_id)
+        surface.blits([(source, dest, area) for (source, area), dest
+                       in zip(map(resolved.__getitem__, tiles), _SEGMENT_DESTS)],
+                      doreturn=False)
+        # Tier 4a: index water/lava tiles (segment-local coords) for the
+        # per-frame shimmer pass, in the same row-major order as the bake.
+        if animated_ids:
+            animated_out.extend(
+                (i & 63, i >> 6, tile_id)
+                for i, tile_id in enumerate(tiles[:4096])
+                if tile_id in animated_ids)
 
     def _get_shimmer_tile(self, tile_id: int, step: int) -> pygame.Surface:
         """Tier 4a fallback animation: a subtle brightness-pulsed copy of a
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import List, Optional
 
 from .. import asset_paths
+from ..asset_fetch import PRIORITY_MUSIC, fetch_or_request
 from .callbacks import wire_client_callbacks, wire_gs1_callbacks
 from .callbacks.client_callbacks import SAMPLE_EXTS, append_start_message
 from .constants import PACKAGE_DIR, CHAT_HISTORY_CAP
@@ -18,12 +19,15 @@ from .constants import PACKAGE_DIR, CHAT_HISTORY_CAP
 class SetupMixin:
     """Mixin providing the above methods for GameClient."""
 
-    def _invalidate_tile_derived_caches(self) -> None:
-        """Clear every render cache whose pixels come from the tileset."""
+    def _invalidate_tile_derived_caches(self, clear_tileset: bool = True) -> None:
+        """Clear every render cache whose pixels come from the tileset.
+        clear_tileset=False keeps the tileset manager's own caches, for a
+        level change that only re-selected which tiledefs apply (the manager
+        keys those by the applicable set already)."""
         clear_tiles = getattr(self.tileset_mgr, "clear_cache", None)
-        if clear_tiles is not None:
+        if clear_tileset and clear_tiles is not None:
             clear_tiles()
-        else:
+        elif clear_tileset:
             tile_cache = getattr(self.tileset_mgr, "tile_cache", None)
             if tile_cache is not None:
                 tile_cache.clear()
@@ -86,9 +90,11 @@ class SetupMixin:
             if self.sound_mgr.play_music(name):       # on disk already
                 return
             # Not local — ask the server for it; on_file plays it on arrival.
+            # Music queues behind the sheets and ganis on screen.
             self._pending_music = name
             try:
-                self.client.request_file(name)
+                fetch_or_request(getattr(self, 'asset_fetch', None),
+                                 self.client, name, PRIORITY_MUSIC)
             except Exception:
                 pass
         else:
@@ -236,6 +242,9 @@ class SetupMixin:
         lvl = self.client._current_level_name
         epoch = self.client._plain_level_change_epoch
         if epoch != getattr(self, '_gs1_visual_level_epoch', epoch):
+            fetch = getattr(self, 'asset_fetch', None)
+            if fetch is not None:
+                fetch.begin_warp()
             # NOT a blanket clear: GS2 weapon HUD stores persist across
             # levels (real-client parity — see ClientGS1.drop_level_weapon_
             # layers; the v6 bomber's scripted HUD only repaints on state
@@ -339,9 +348,11 @@ class SetupMixin:
         # per level is which defs APPLY -- each def carries a levelstart
         # prefix the manager re-evaluates here. Levels that want different
         # tiles re-run removetiledefs + addtiledef2 themselves (classic
-        # bomber's arena NPC 162 does).
-        self.tileset_mgr.set_current_level(self.client._current_level_name)
-        self._invalidate_tile_derived_caches()
+        # bomber's arena NPC 162 does). Only a change in which defs apply
+        # makes the baked segments stale; crossing into a gmap neighbour or
+        # any level under the same defs keeps them (and their pre-bakes).
+        if self.tileset_mgr.set_current_level(self.client._current_level_name):
+            self._invalidate_tile_derived_caches(clear_tileset=False)
         self._camera_focus = None   # scripted setfocus dies with its level
         self._load_npc_scripts()
         self._trigger_playerenters()
@@ -362,6 +373,9 @@ class SetupMixin:
             if isinstance(effects, list):
                 effects.clear()
         self.visual_x, self.visual_y = self.client.x, self.client.y
-        self.world_surface = None
+        # No world_surface = None here: each cached segment re-checks its own
+        # board (render_world._get_segment_surface), and a tiledef change was
+        # handled above. Dropping them all threw away the pre-baked
+        # neighbours on every gmap seam crossing, right when they are needed.
         self._gs1_level = lvl
         self._level_change_pending = None
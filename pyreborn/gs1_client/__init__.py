@@ -37,10 +37,11 @@ _export_names = [
     '_num_or_str', '_pcode', '_push_dir', '_report_gs1_error',
     '_version_number', 'annotations', 'ast', 'board_tile_read',
     'board_tile_write', 'board_update_region', 'board_world_dims',
-    'get_tile_type', 'host_value', 'level_index', 'logger', 'logging', 'math',
-    'os', 'register_tiledef', 'remove_tiledefs', 'segment_at', 'sys',
-    'tilestype_for_level', 'to_num', 'to_str', 'tokenize', 'tokens_count',
-    'traceback', 'type_is_blocking', 'world_to_local',
+    'board_write_batch', 'get_tile_type', 'host_value', 'level_index',
+    'logger', 'logging', 'math', 'os', 'register_tiledef', 'remove_tiledefs',
+    'segment_at', 'sys', 'tilestype_for_level', 'to_num', 'to_str',
+    'tokenize', 'tokens_count', 'traceback', 'type_is_blocking',
+    'world_to_local',
 ]
 for _export_name in _export_names:
     for _module in _modules:
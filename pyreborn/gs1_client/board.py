@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import logging
 import math
+from contextlib import contextmanager
+from typing import Iterator
 
 from reborn_protocol.coords import level_index, segment_at, world_to_local
 from reborn_protocol.gs1.values import to_num
@@ -57,11 +59,11 @@ def _board_locate(client, x, y):
 
 
 def _board_list(client, level_name):
-    """Return the 4096-entry tile list for `level_name`, or None.
+    """Return the 4096-entry tile board (array('H')) for `level_name`, or None.
 
     The function uses the renderer's _segment_tiles resolution order. It checks
     the client.levels cache before the active client.tiles.
-    Client._apply_board_modify changes both lists.
+    Client._apply_board_modify changes both boards.
     """
     levels = getattr(client, "levels", None) or {}
     board = levels.get(level_name)
@@ -107,9 +109,10 @@ def board_tile_write(client, x, y, tile_id) -> bool:
     change uses the same path. Thus, the function changes the REAL board in
     client.levels and active client.tiles. The change also affects collision.
     The function then fires the on_board_modify callback. The pygame client
-    connects this callback to the renderer's per-segment surface patcher. The
-    function discards writes outside the world or without a board. This matches
-    a server change for a level that the client does not have.
+    connects this callback to the renderer's per-segment surface patcher.
+    Inside board_write_batch the callback waits for the end of the batch.
+    The function discards writes outside the world or without a board. This
+    matches a server change for a level that the client does not have.
     """
     level, lx, ly, grid = _board_locate(client, x, y)
     if level is None or _board_list(client, level) is None:
@@ -119,12 +122,115 @@ def board_tile_write(client, x, y, tile_id) -> bool:
     if grid is not None:
         info["map_x"], info["map_y"] = grid
     client._apply_board_modify(level, info)
+    batch = getattr(client, "_board_write_batch", None)
+    if batch is not None and batch.depth:
+        batch.cells.setdefault((level, grid), set()).add((lx, ly))
+        return True
     cb = getattr(client, "on_board_modify", None)
     if cb:
         cb(info)
     return True
 
 
+class _BoardWriteBatch:
+    """Cells written by tiles[x,y] while board_write_batch is open, per
+    (level, gmap grid cell). depth counts nested batches."""
+
+    __slots__ = ("depth", "cells")
+
+    def __init__(self):
+        self.depth = 0
+        self.cells = {}
+
+
+# A batch's written cells go out as one bounding rect while they fill at
+# least this share of it; sparser writes go out as merged row runs instead.
+_BATCH_RECT_FILL = 0.25
+
+
+def _dirty_rects(cells):
+    """Cover a set of (x, y) cells with few (x, y, width, height) rects."""
+    xs = [cx for cx, _cy in cells]
+    ys = [cy for _cx, cy in cells]
+    x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+    area = (x1 - x0 + 1) * (y1 - y0 + 1)
+    if len(cells) >= area * _BATCH_RECT_FILL:
+        return [(x0, y0, x1 - x0 + 1, y1 - y0 + 1)]
+    rows = {}
+    for cx, cy in cells:
+        rows.setdefault(cy, []).append(cx)
+    rects = []
+    above = {}  # (first x, last x) -> rect still growing down from last row
+    for cy in sorted(rows):
+        row = sorted(rows[cy])
+        runs = []
+        start = prev = row[0]
+        for cx in row[1:]:
+            if cx != prev + 1:
+                runs.append((start, prev))
+                start = cx
+            prev = cx
+        runs.append((start, prev))
+        below = {}
+        for run in runs:
+            rect = above.get(run)
+            if rect is not None and rect[1] + rect[3] == cy:
+                rect[3] += 1
+            else:
+                rect = [run[0], cy, run[1] - run[0] + 1, 1]
+                rects.append(rect)
+            below[run] = rect
+        above = below
+    return [tuple(rect) for rect in rects]
+
+
+def _flush_board_writes(client, batch) -> None:
+    """Publish a batch's written cells to on_board_modify, one info per
+    dirty rect, with tiles read back from the (already patched) board."""
+    cells, batch.cells = batch.cells, {}
+    cb = getattr(client, "on_board_modify", None)
+    if cb is None:
+        return
+    for (level, grid), written in cells.items():
+        board = _board_list(client, level)
+        if board is None:
+            continue
+        for rx, ry, rw, rh in _dirty_rects(written):
+            tiles = [board[level_index(tx, ty)]
+                     for ty in range(ry, ry + rh) for tx in range(rx, rx + rw)]
+            info = {"layer": 0, "x": rx, "y": ry,
+                    "width": rw, "height": rh, "tiles": tiles}
+            if grid is not None:
+                info["map_x"], info["map_y"] = grid
+            cb(info)
+
+
+@contextmanager
+def board_write_batch(client) -> Iterator[None]:
+    """Combine the renderer patches of tiles[x,y] writes made inside this
+    scope (one script slice).
+
+    Writes still land on the board and the collision type map at once, so
+    the script reads its own writes and onwall sees them. Only the
+    on_board_modify callback is held back: when the outermost batch closes,
+    the written cells go out as a few dirty rects instead of one 1x1 patch
+    per tile. A room fill or clear loop patches the segment surface once
+    instead of thousands of times."""
+    if client is None:
+        yield
+        return
+    batch = getattr(client, "_board_write_batch", None)
+    if batch is None:
+        batch = client._board_write_batch = _BoardWriteBatch()
+    batch.depth += 1
+    try:
+        yield
+    finally:
+        batch.depth -= 1
+        if not batch.depth and batch.cells:
+            _flush_board_writes(client, batch)
+
+
 def board_update_region(client, x, y, w, h) -> None:
     """`updateboard x,y,width,height` -- re-blit the rect from current board
     data. Oracle: GServer-v2 GS1Commands.cpp:3560-3575 (fn_updateboard /
@@ -133,11 +239,15 @@ def board_update_region(client, x, y, w, h) -> None:
     also saves the level server-side, which has no client-side
     meaning, so both spellings redraw here. Scripts edit tiles[] first and
     then call this to publish the change (LTTP's CheckTiles bush slash).
-    board_tile_write already patches the renderer per write, so this is the
-    idempotent region form -- and the only path that repaints edits made
-    behind the callback's back."""
+    board_tile_write already patches the renderer (per write, or per
+    board_write_batch), so this is the idempotent region form -- and the only
+    path that repaints edits made behind the callback's back."""
     if client is None:
         return
+    batch = getattr(client, "_board_write_batch", None)
+    if batch is not None and batch.cells:
+        # Publish the slice's earlier writes first, in script order.
+        _flush_board_writes(client, batch)
     cb = getattr(client, "on_board_modify", None)
     if cb is None:
         return
@@ -4,6 +4,7 @@ import logging
 
 from reborn_protocol.gs1.values import to_num, to_str
 
+from ..asset_fetch import PRIORITY_VISIBLE, fetch_or_request
 from ..tiletypes import register_tiledef, remove_tiledefs
 from .board import board_update_region
 from .objects import _pcode
@@ -159,7 +160,8 @@ class PreCommandsMixin:
             if new not in rt._requested_anis:
                 rt._requested_anis.add(new)
                 try:
-                    rt.client.request_file(new + ".gani")
+                    fetch_or_request(rt.asset_fetch, rt.client,
+                                     new + ".gani", PRIORITY_VISIBLE)
                 except Exception:
                     pass
         else:
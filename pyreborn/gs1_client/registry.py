@@ -109,6 +109,11 @@ _TIMEOUT_CANCEL = 0.0001
 # fallback for an unsized texture (TParticleData::pixelsize,
 # Preagonal/FourPlay/quattroplay/src/TParticleData.cpp:155-163).
 _DEFAULT_IMAGE_PX = 32
+# Side, in tiles, of the uniform-grid buckets ClientGS1 files NPC footprints
+# under (npc_blocks_at), and the most buckets one footprint may span before
+# it is tested on every probe instead.
+_NPC_GRID_TILES = 4
+_NPC_GRID_MAX_BUCKETS = 256
 
 
 
@@ -23,11 +23,13 @@ from reborn_protocol.gs1.lexer import tokenize
 from reborn_protocol.gs1.parser import Parser
 from reborn_protocol.gs1.values import to_num, to_str
 
+from ..client_state import NpcRecord
 from ..particles import ParticleEmitter
 from ..tiletypes import TileType, get_tile_type, tilestype_for_level, type_is_blocking
+from .board import board_write_batch
 from .host import GS1ClientHost
 from .objects import _ClientScopeVarStore, _PlayerFlagScope, _RefNamespaceInterpreter, _ServerFlagScope, _current_baddies
-from .registry import _DEFAULT_IMAGE_PX, _GS1_PREEMPT_BOARD_WAIT_FRAMES, _GS1_STATEMENTS_PER_SLICE, _report_gs1_error
+from .registry import _DEFAULT_IMAGE_PX, _GS1_PREEMPT_BOARD_WAIT_FRAMES, _GS1_STATEMENTS_PER_SLICE, _NPC_GRID_MAX_BUCKETS, _NPC_GRID_TILES, _report_gs1_error
 
 
 
@@ -113,6 +115,10 @@ class ClientGS1:
         # it on playerenters anyway.
         self.ani_replacements: dict = {}
         self._requested_anis: set = set()   # replacement ganis fetched once
+        # optional AssetFetchScheduler the pygame client wires in, so those
+        # fetches share its priority queue and in-flight window; headless
+        # runs leave it unset and call client.request_file directly.
+        self.asset_fetch = None
         # optional callable returning the local player's current logical ani
         # name ("walk"/"idle"/...); the pygame client wires this to its
         # animation state, headless tests can leave it unset.
@@ -122,6 +128,11 @@ class ClientGS1:
         # only knows one 64x64 level, so inside a gmap every probe lands
         # outside 0..63 and answers "not a wall".
         self.tile_source = None
+        # optional (x, y, tilestype) -> tile TYPE or None, wired next to
+        # tile_source (CollisionMixin._board_tile_type). Answers onwall/
+        # onwater/tiletype from the client's per-level type map. None (no
+        # board there) defers to the tile_source path.
+        self.tile_type_source = None
         # optional (image_name) -> (w_px, h_px) or None, wired to the pygame
         # sprite manager. Sizes an image NPC's default blocking/touch
         # footprint; an unset hook or unknown image falls back to
@@ -147,6 +158,14 @@ class ClientGS1:
         self._keys_raw_prev: set = set()  # previous frame, for keydown2 edge
         self._shape_blocks: set = set()   # (tx,ty) cells blocked via setshape2
         self._shape_block_owners: dict = {}  # npc_id -> set of (tx,ty) it contributed
+        self._shape_cell_owners: dict = {}   # (tx,ty) -> npc ids walling it
+        # Uniform grid over NPC image/character footprints, so npc_blocks_at
+        # only tests the NPCs filed under the probed bucket (see
+        # _npc_grid_candidates).
+        self._npc_grid: dict = {}            # (bx, by) -> {npc_id}
+        self._npc_grid_filed: dict = {}      # npc_id -> buckets it is under
+        self._npc_grid_loose: set = set()    # ids tested on every probe
+        self._npc_grid_source = None         # (NpcTable, image_size_source)
         # (tx,ty) -> tile TYPE published by a setshape2 array (see
         # _update_shape_blocks / npc_tile_type).
         self._shape_types: dict = {}
@@ -394,6 +413,7 @@ class ClientGS1:
         self.shapes.clear()
         self._shape_blocks.clear()
         self._shape_block_owners.clear()
+        self._shape_cell_owners.clear()
         self._shape_types.clear()
         self._shape_type_owners.clear()
         self.drop_level_weapon_layers()  # GS1 weapon layers are re-drawn per level
@@ -449,7 +469,7 @@ class ClientGS1:
         self.shapes.pop(npc_id, None)
         cells = self._shape_block_owners.pop(npc_id, None)
         if cells:
-            self._shape_blocks -= cells
+            self._drop_shape_cells(npc_id, cells)
         self._forget_shape_types(npc_id)
 
     def trigger_event(self, event, name=None):
@@ -553,7 +573,7 @@ class ClientGS1:
         other NPCs' contributions."""
         old = self._shape_block_owners.pop(npc_id, None)
         if old:
-            self._shape_blocks -= old
+            self._drop_shape_cells(npc_id, old)
         self._forget_shape_types(npc_id)
         if not flags or w <= 0 or h <= 0:
             return
@@ -581,10 +601,24 @@ class ClientGS1:
         if mine:
             self._shape_blocks |= mine
             self._shape_block_owners[npc_id] = mine
+            for cell in mine:
+                self._shape_cell_owners.setdefault(cell, set()).add(npc_id)
         if types:
             self._shape_types.update(types)
             self._shape_type_owners[npc_id] = types
 
+    def _drop_shape_cells(self, npc_id, cells):
+        """Withdraw one NPC's blocking cells. A cell another shape NPC also
+        walls stays in _shape_blocks."""
+        for cell in cells:
+            owners = self._shape_cell_owners.get(cell)
+            if owners is not None:
+                owners.discard(npc_id)
+                if owners:
+                    continue
+                del self._shape_cell_owners[cell]
+            self._shape_blocks.discard(cell)
+
     def _forget_shape_types(self, npc_id):
         """Drop one NPC's tile-type cells, restoring any cell another NPC also
         publishes (two shape NPCs blanket the same 64x64 room in Bomber, so
@@ -667,13 +701,12 @@ class ClientGS1:
         if cell not in self._shape_blocks:
             return False
         npcs = getattr(self.client, "npcs", {}) if self.client else {}
-        for nid, cells in self._shape_block_owners.items():
+        for nid in self._shape_cell_owners.get(cell, ()):
             if nid == exclude_npc:
                 continue
-            if cell in cells:
-                npc = npcs.get(nid)
-                if not isinstance(npc, dict) or self._npc_solid(npc):
-                    return True
+            npc = npcs.get(nid)
+            if not isinstance(npc, dict) or self._npc_solid(npc):
+                return True
         return False
 
     def npc_image_rect(self, npc):
@@ -734,6 +767,84 @@ class ClientGS1:
             opaque = None
         return opaque is not False
 
+    def _npc_size_known(self, npc) -> bool:
+        """Whether npc_image_rect's answer for this NPC is final, rather than
+        the 2x2 stand-in for an image the size hook cannot measure yet."""
+        if (npc.get("is_character") or npc.get("image") == "#c#"
+                or npc.get("imagepart") or self.image_size_source is None):
+            return True
+        image = npc.get("image") or ""
+        if not image or image == "-":
+            return True
+        try:
+            return bool(self.image_size_source(image))
+        except Exception:
+            return False
+
+    def _npc_grid_file(self, npc_id, npc):
+        """(Re-)file one NPC under the buckets its footprint rect overlaps.
+        Untracked plain-dict records, unmeasured images and huge footprints
+        go to the loose set instead, which every probe tests."""
+        for bucket in self._npc_grid_filed.pop(npc_id, ()):
+            ids = self._npc_grid.get(bucket)
+            if ids is not None:
+                ids.discard(npc_id)
+                if not ids:
+                    del self._npc_grid[bucket]
+        self._npc_grid_loose.discard(npc_id)
+        if npc is None:
+            return
+        if not isinstance(npc, NpcRecord) or not self._npc_size_known(npc):
+            self._npc_grid_loose.add(npc_id)
+            return
+        rect = self.npc_image_rect(npc)
+        if rect is None:
+            return
+        rx, ry, rw, rh = rect
+        if not all(math.isfinite(v) for v in rect):
+            self._npc_grid_loose.add(npc_id)
+            return
+        size = _NPC_GRID_TILES
+        bx0, bx1 = int(rx // size), int((rx + rw) // size)
+        by0, by1 = int(ry // size), int((ry + rh) // size)
+        if (bx1 - bx0 + 1) * (by1 - by0 + 1) > _NPC_GRID_MAX_BUCKETS:
+            self._npc_grid_loose.add(npc_id)
+            return
+        buckets = tuple((bx, by) for bx in range(bx0, bx1 + 1)
+                        for by in range(by0, by1 + 1))
+        for bucket in buckets:
+            self._npc_grid.setdefault(bucket, set()).add(npc_id)
+        self._npc_grid_filed[npc_id] = buckets
+
+    def _npc_grid_candidates(self, npcs, x, y):
+        """NPC ids whose footprint may cover (x, y), or None when npcs is not
+        an NpcTable (tests and tools hand in plain dicts; the caller walks
+        them all). The grid catches up on the table's footprint changes
+        first, and is rebuilt whole for a new table or size hook."""
+        take_changes = getattr(npcs, "take_footprint_changes", None)
+        if take_changes is None:
+            return None
+        source = self._npc_grid_source
+        if (source is None or source[0] is not npcs
+                or source[1] is not self.image_size_source):
+            self._npc_grid.clear()
+            self._npc_grid_filed.clear()
+            self._npc_grid_loose.clear()
+            take_changes()
+            changed = set(npcs)
+            self._npc_grid_source = (npcs, self.image_size_source)
+        else:
+            changed = take_changes()
+            # Unmeasured images move into the grid once their size is known.
+            changed |= self._npc_grid_loose
+        for npc_id in changed:
+            self._npc_grid_file(npc_id, npcs.get(npc_id))
+        size = _NPC_GRID_TILES
+        filed = self._npc_grid.get((int(x // size), int(y // size)))
+        if not self._npc_grid_loose:
+            return filed or ()
+        return filed | self._npc_grid_loose if filed else self._npc_grid_loose
+
     def npc_blocks_at(self, x, y, exclude_npc=None) -> bool:
         """Does any NPC WALL the world point (x, y)? (See the rule derivation
         above.) Consulted by is_wall (script onwall/onwall2 probes and
@@ -744,7 +855,13 @@ class ClientGS1:
         cl = self.client
         if cl is None:
             return False
-        for npc_id, npc in getattr(cl, "npcs", {}).items():
+        npcs = getattr(cl, "npcs", {})
+        candidates = self._npc_grid_candidates(npcs, x, y)
+        if candidates is None:
+            items = npcs.items()
+        else:
+            items = [(npc_id, npcs.get(npc_id)) for npc_id in candidates]
+        for npc_id, npc in items:
             if npc_id == exclude_npc or not isinstance(npc, dict):
                 continue
             geom = self.shapes.get(npc_id)
@@ -790,6 +907,17 @@ class ClientGS1:
             name = getattr(self.client, "_current_level_name", "") or ""
         return tilestype_for_level(name)
 
+    def _board_tile_type(self, x, y):
+        """Board tile TYPE at (x, y) from the host's tile_type_source, or
+        None when it has no answer there and the caller should go through
+        tile_at (off the board, no board streamed, no hook)."""
+        if self.tile_type_source is None:
+            return None
+        try:
+            return self.tile_type_source(x, y, self._tilestype())
+        except Exception:
+            return None
+
     def is_wall(self, x, y, exclude_npc=None):
         """Collision test at world tile (x, y) for onwall(). Checks the level
         board under (x, y) (a blocking tile id), plus NPC footprints — shape
@@ -801,6 +929,11 @@ class ClientGS1:
         probe never collides with its own footprint — the reference marks
         the probing NPC not-blocking for the duration (TServerNPC::isOnWall,
         Preagonal/FourPlay/quattroplay/src/TServerNPC.cpp:2288-2313)."""
+        ttype = self._board_tile_type(x, y)
+        if ttype is not None:
+            if type_is_blocking(ttype):
+                return True
+            return self.npc_blocks_at(x, y, exclude_npc=exclude_npc)
         tile = self.tile_at(x, y)
         if tile is not None:
             try:
@@ -815,6 +948,9 @@ class ClientGS1:
 
     def is_water_at(self, x, y):
         """Water test at world tile (x, y) for onwater() — deep or shallow."""
+        ttype = self._board_tile_type(x, y)
+        if ttype is not None:
+            return ttype in (TileType.WATER, TileType.NEAR_WATER)
         tile = self.tile_at(x, y)
         if tile is None:
             return False
@@ -828,6 +964,9 @@ class ClientGS1:
         """`tiletype(x, y)`: the tile's TYPE code (tiletypes.py, table chosen
         by the level's tilestype), not its tile id. Zelda's movement engine
         reads it for chairs (3), beds (4/5) and jumpable ledges (21)."""
+        ttype = self._board_tile_type(x, y)
+        if ttype is not None:
+            return float(ttype)
         tile = self.tile_at(x, y)
         if tile is None:
             return 0.0
@@ -1093,7 +1232,8 @@ class ClientGS1:
         interp._coro = True                # `sleep` suspends; we pump it below
         interp.statement_budget = _GS1_STATEMENTS_PER_SLICE
         gen = interp.iter_event(entry["prog"], event)
-        self._drive(gen, ctx, key, entry, event)
+        with board_write_batch(self.client):
+            self._drive(gen, ctx, key, entry, event)
 
     def _drive(self, gen, ctx, key, entry, event):
         """Pump one script slice, parking sleep and preemption continuations.
@@ -1128,6 +1268,11 @@ class ClientGS1:
         frame by the game loop (alongside process_timeouts)."""
         if not self._coros:
             return
+        with board_write_batch(self.client):
+            self._process_coroutines(dt)
+
+    def _process_coroutines(self, dt):
+        """One pass over the parked scripts (see process_coroutines)."""
         still = []
         for c in self._coros:
             c["remaining"] -= dt
@@ -1048,10 +1048,17 @@ class HostBareMixin:
         if not fname:
             return 0.0
         client = rt2.client
-        received = getattr(client, "_received_files", {}) or {}
-        if fname in received or fname.lower() in {
-                str(key).lower() for key in received}:
-            return 1.0
+        # get_file (via has_file) also finds a download the file byte budget
+        # pushed out of memory to the disk cache.
+        has_file = getattr(client, "has_file", None)
+        if has_file is not None:
+            if has_file(fname):
+                return 1.0
+        else:
+            received = getattr(client, "_received_files", {}) or {}
+            if fname in received or fname.lower() in {
+                    str(key).lower() for key in received}:
+                return 1.0
         game = getattr(rt2, "game_shell", None)
         sprites = getattr(game, "sprite_mgr", None)
         if sprites is not None and sprites.load_sheet(fname) is not None:
@@ -4,6 +4,11 @@ from __future__ import annotations
 
 from typing import Any
 from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from collections.abc import MutableMapping
+import heapq
 from ..gs1_client import PLAYER_ATTR
 from reborn_protocol.gs2 import casefold as gs2_casefold
 import logging
@@ -331,6 +336,221 @@ class _GlobalsStore(dict):
         return super().get(key, default)
 
 
+class _VmTable(dict):
+    """One kind's key -> GS2VM map in ClientGS2.vms. version changes on every
+    add, replace or removal, which is what invalidates the runtime's event
+    subscriber lists (ClientGS2._subscribers_of)."""
+
+    __slots__ = ("version",)
+    _versions = 0
+
+    def __init__(self):
+        super().__init__()
+        self._bump()
+
+    def _bump(self) -> None:
+        # Drawn from one class-wide counter, so a table never repeats a
+        # version another table (or its own earlier self) handed out.
+        _VmTable._versions += 1
+        self.version = _VmTable._versions
+
+    def __setitem__(self, key, vm) -> None:
+        super().__setitem__(key, vm)
+        self._bump()
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self._bump()
+
+    def pop(self, key, *default):
+        value = super().pop(key, *default)
+        self._bump()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._bump()
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self._bump()
+
+    def clear(self) -> None:
+        super().clear()
+        self._bump()
+
+
+# A timer is due once its deadline is within this of the timer clock. The old
+# countdowns subtracted dt from each entry; the clock adds it instead, and the
+# two round differently by an ulp or so at exact multiples of the quantum.
+_TIMER_DUE_EPSILON = 1e-9
+
+
+class _TimeoutTable(MutableMapping):
+    """settimer()/this.timeout arms: (kind, key) -> seconds left, read and
+    written like the plain dict it replaces.
+
+    Entries hold an absolute deadline on the table's own timer clock and sit
+    in a min-heap, so a step costs O(log n) per timer that is actually due
+    instead of a decrement of every armed one. Re-arming or cancelling only
+    touches the dict; the superseded heap entry is skipped when it surfaces.
+    """
+
+    __slots__ = ("_entries", "_heap", "_now", "_seq", "_order")
+
+    def __init__(self):
+        # key -> (deadline, seq, order). order is the dict insertion rank the
+        # old per-step walk fired in; seq identifies this particular arm.
+        self._entries: Dict[tuple, Tuple[float, int, int]] = {}
+        self._heap: List[Tuple[float, int, tuple]] = []
+        self._now = 0.0
+        self._seq = 0
+        self._order = 0
+
+    def __getitem__(self, key) -> float:
+        return self._entries[key][0] - self._now
+
+    def __setitem__(self, key, left) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._order += 1
+            order = self._order
+        else:
+            order = entry[2]
+        self._seq += 1
+        deadline = self._now + left
+        self._entries[key] = (deadline, self._seq, order)
+        heap = self._heap
+        heapq.heappush(heap, (deadline, self._seq, key))
+        if len(heap) > 2 * len(self._entries) + 64:
+            self._compact()
+
+    def __delitem__(self, key) -> None:
+        del self._entries[key]
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def __repr__(self) -> str:
+        return "_TimeoutTable(%r)" % dict(self.items())
+
+    def _compact(self) -> None:
+        self._heap = [(deadline, seq, key)
+                      for key, (deadline, seq, _) in self._entries.items()]
+        heapq.heapify(self._heap)
+
+    def advance(self, dt: float) -> List[Tuple[tuple, int]]:
+        """Move the clock on by dt. Returns the (key, seq) arms now due, in
+        the order the old walk over the dict fired them."""
+        self._now += dt
+        limit = self._now + _TIMER_DUE_EPSILON
+        heap = self._heap
+        entries = self._entries
+        due = []
+        while heap and heap[0][0] <= limit:
+            _, seq, key = heapq.heappop(heap)
+            entry = entries.get(key)
+            if entry is not None and entry[1] == seq:
+                due.append((entry[2], key, seq))
+        due.sort()
+        return [(key, seq) for _, key, seq in due]
+
+    def take(self, key, seq: int) -> bool:
+        """Disarm a due timer before its handler runs (which may re-arm it).
+        False if an earlier handler this step already cancelled or re-armed
+        it."""
+        entry = self._entries.get(key)
+        if entry is None or entry[1] != seq:
+            return False
+        del self._entries[key]
+        return True
+
+
+class _ScheduledEvents:
+    """scheduleevent() arms in flight. Iterates (and len()s) like the list of
+    {key, event, params} dicts it replaces.
+
+    Same deadline heap as _TimeoutTable, plus a per-VM index so
+    cancelevents/forget_npc touch only that script's arms. Cancelled arms
+    stay in the heap until they surface.
+    """
+
+    __slots__ = ("_items", "_by_key", "_heap", "_now", "_seq")
+
+    def __init__(self):
+        self._items: Dict[int, dict] = {}             # seq -> arm, in order
+        self._by_key: Dict[tuple, Dict[int, None]] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._now = 0.0
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(list(self._items.values()))
+
+    def add(self, key: tuple, delay: float, event: str,
+            params: List[Any]) -> None:
+        self._seq += 1
+        seq = self._seq
+        deadline = self._now + delay
+        self._items[seq] = {"key": key, "due": deadline, "event": event,
+                            "params": params}
+        self._by_key.setdefault(key, {})[seq] = None
+        heap = self._heap
+        heapq.heappush(heap, (deadline, seq))
+        if len(heap) > 2 * len(self._items) + 64:
+            self._heap = [(item["due"], seq)
+                          for seq, item in self._items.items()]
+            heapq.heapify(self._heap)
+
+    def _drop(self, seq: int) -> dict:
+        item = self._items.pop(seq)
+        seqs = self._by_key[item["key"]]
+        del seqs[seq]
+        if not seqs:
+            del self._by_key[item["key"]]
+        return item
+
+    def cancel(self, key: tuple, event: str = "") -> None:
+        """Drop key's arms (only those named event, case-insensitively, when
+        one is given)."""
+        seqs = self._by_key.get(key)
+        if not seqs:
+            return
+        wanted = event.lower()
+        for seq in list(seqs):
+            if not wanted or self._items[seq]["event"].lower() == wanted:
+                self._drop(seq)
+
+    def advance(self, dt: float) -> List[dict]:
+        """Move the clock on by dt and remove the arms now due. Returns them
+        in the order they were scheduled."""
+        self._now += dt
+        limit = self._now + _TIMER_DUE_EPSILON
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= limit:
+            seq = heapq.heappop(heap)[1]
+            if seq in self._items:
+                due.append(seq)
+        due.sort()
+        return [self._drop(seq) for seq in due]
+
+
 def _gs2_sort_key(value):
     """Key for sort()/sortAscending()/sortDescending(): GS2's ASCII-only case
     fold -- the same policy every case-insensitive compare in the machine uses
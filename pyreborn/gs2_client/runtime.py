@@ -11,7 +11,9 @@ from typing import List
 from typing import Optional
 from pathlib import Path
 from types import SimpleNamespace
+from ..asset_fetch import fetch_or_request
 from ..gs1_client import board_world_dims
+from ..gs1_client import board_write_batch
 import time
 from reborn_protocol.gs2 import to_num
 from reborn_protocol.gs2 import to_str
@@ -19,7 +21,7 @@ from .helpers import _csv_unflatten, _image_size, _is_admin_guild
 from .host import GS2ClientHost
 from .objects import _BoardTilesColumn, _GaniThisObject, _LevelObject, _NpcThisObject, layer_image_get
 from .objects_player import _FlagScopeObject, _NameObject, _PlayerAttrObject, _PlayerColorsObject, _PlayerObject, _ThisObject, _guild_from_nick
-from .registry import GS2GuiManager, GuiControl, PENDING_EVENT_CAP, SAVE_LINES_CACHE_MAX_BYTES, SAVE_LINES_MAX_CHARS_PER_LINE, SAVE_LINES_MAX_LINES, SCHEDULED_EVENT_CAP, TIMER_BACKLOG_CAP, TIMER_RESOLUTION, _GS1_TEXT_ARGS, _GlobalsStore, _REMOTE_PLAYER_EMPTY_STRINGS, _REMOTE_PLAYER_STICKY_NUMBERS, logger
+from .registry import GS2GuiManager, GuiControl, PENDING_EVENT_CAP, SAVE_LINES_CACHE_MAX_BYTES, SAVE_LINES_MAX_CHARS_PER_LINE, SAVE_LINES_MAX_LINES, SCHEDULED_EVENT_CAP, TIMER_BACKLOG_CAP, TIMER_RESOLUTION, _GS1_TEXT_ARGS, _GlobalsStore, _REMOTE_PLAYER_EMPTY_STRINGS, _REMOTE_PLAYER_STICKY_NUMBERS, _ScheduledEvents, _TimeoutTable, _VmTable, logger
 
 CLASS_JOIN_WAIT_SECONDS = 5.0
 CLASS_JOIN_WAIT_PUMPS = 300
@@ -75,8 +77,15 @@ class ClientGS2:
         self.host = GS2ClientHost(self)
         # kind -> {key(lowered str or npc id): GS2VM}
         self.vms: Dict[str, Dict[Any, GS2VM]] = {
-            "weapon": {}, "npc": {}, "class": {}, "gani": {},
+            "weapon": _VmTable(), "npc": _VmTable(), "class": _VmTable(),
+            "gani": _VmTable(),
         }
+        # (kind, event) -> ((table version, joins version), [(key, vm)]):
+        # the VMs that define event -- see _subscribers_of.
+        self._subscribers: Dict[tuple, tuple] = {}
+        # Bumped whenever a VM's joined classes change (has_function sees
+        # functions of joined classes too).
+        self._joins_version = 0
         self.globals_store: Dict[str, Any] = _GlobalsStore(self)
         #: selectedsword's backing store: pyReborn has one sword, so the
         #: reference's separate weapon-array index has nowhere else to live.
@@ -149,10 +158,11 @@ class ClientGS2:
         self._volume_settings: Dict[str, float] = {}
         self._update_packages: Dict[str, GS2Object] = {}
         self.echo_log: List[str] = []
-        self._timeouts: Dict[tuple, float] = {}   # (kind, key) -> seconds left
-        # scheduleevent() arms: [{key, left, event, params}] -- see
+        # (kind, key) -> seconds left, on a deadline heap (_TimeoutTable)
+        self._timeouts = _TimeoutTable()
+        # scheduleevent() arms: {key, due, event, params} -- see
         # schedule_event/_process_scheduled_events
-        self._scheduled: List[dict] = []
+        self._scheduled = _ScheduledEvents()
         self._pending_joins: Dict[str, List[GS2VM]] = {}
         self._join_timeout_warned: set = set()
         self._prev_bytecode_cb = None
@@ -635,6 +645,8 @@ class ClientGS2:
                      if getattr(joined, "_gs2_key", None) != cname]
         left = len(remaining) != len(owner.joined)
         owner.joined = remaining
+        if left:
+            self._joins_version += 1
         waiting = self._pending_joins.get(cname)
         if waiting:
             self._pending_joins[cname] = [joiner for joiner in waiting
@@ -1143,6 +1155,24 @@ class ClientGS2:
         inst._gs2_key = cname
         inst._gs2_owner = self._timeout_key(joiner)
         joiner.joined.append(inst)
+        self._joins_version += 1
+
+    def _subscribers_of(self, kind: str, event: str) -> list:
+        """(key, vm) for every `kind` VM that defines event, in self.vms
+        order. Kept until a VM of that kind is loaded, replaced or dropped
+        (forget_npc, gani detach) or any class is joined or left, so the
+        per-frame onUpdate pass and broadcast events visit only the handful
+        of scripts that handle them instead of asking every VM. Callers
+        iterate the returned list as a snapshot: a rebuild makes a new one."""
+        table = self.vms[kind]
+        stamp = (table.version, self._joins_version)
+        cached = self._subscribers.get((kind, event))
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        found = [(key, vm) for key, vm in list(table.items())
+                 if vm.has_function(event)]
+        self._subscribers[(kind, event)] = (stamp, found)
+        return found
 
     def _has_pending_joins(self, vm: GS2VM) -> bool:
         """Whether the script object owning *vm* still awaits any class."""
@@ -1213,7 +1243,8 @@ class ClientGS2:
             pending.append((event, args))
             return
         with script_origin(getattr(vm, "_gs2_kind", "gs2"),
-                           getattr(vm, "_gs2_key", vm.name), event):
+                           getattr(vm, "_gs2_key", vm.name), event), \
+                board_write_batch(self.client):
             gen = vm.iter_call(event, *args)
             self._drive(gen, vm, key, event)
 
@@ -1303,10 +1334,11 @@ class ClientGS2:
             return
         self._processing_coroutines = True
         try:
-            self._process_coroutines(dt)
-            while self._coroutine_wake_pending:
-                self._coroutine_wake_pending = False
-                self._process_coroutines(0.0)
+            with board_write_batch(self.client):
+                self._process_coroutines(dt)
+                while self._coroutine_wake_pending:
+                    self._coroutine_wake_pending = False
+                    self._process_coroutines(0.0)
         finally:
             self._processing_coroutines = False
 
@@ -1379,12 +1411,17 @@ class ClientGS2:
         number of VMs that handled it."""
         n = 0
         for kind in ("weapon", "npc"):
-            for vm in list(self.vms[kind].values()):
-                # A not-yet-attached class may be the code that defines the
-                # event, so pending joins take precedence over lookup.
-                if self._has_pending_joins(vm) or vm.has_function(event):
-                    self._run(vm, event, *args)
-                    n += 1
+            if self._pending_joins:
+                for vm in list(self.vms[kind].values()):
+                    # A not-yet-attached class may be the code that defines
+                    # the event, so pending joins take precedence over lookup.
+                    if self._has_pending_joins(vm) or vm.has_function(event):
+                        self._run(vm, event, *args)
+                        n += 1
+                continue
+            for _, vm in self._subscribers_of(kind, event):
+                self._run(vm, event, *args)
+                n += 1
         return n
 
     def trigger_weapon_event(self, weapon: str, event: str, *args) -> bool:
@@ -1490,7 +1527,9 @@ class ClientGS2:
             if (fname not in client._pending_files
                     and fname not in client._failed_files):
                 try:
-                    client.request_file(fname)
+                    fetch_or_request(
+                        getattr(self.game_shell, 'asset_fetch', None),
+                        client, fname)
                 except Exception:
                     pass
             return None
@@ -1517,9 +1556,10 @@ class ClientGS2:
                 continue
             self._entered_vms.discard(id(vm))
             tkey = ("npc", key)
+            # stale subscriber lists would keep the dead VM alive
+            self._subscribers.clear()
             self._timeouts.pop(tkey, None)
-            self._scheduled = [item for item in self._scheduled
-                               if item["key"] != tkey]
+            self._scheduled.cancel(tkey)
             self._cancel_vm_coroutines(vm)
 
     def pump_level_events(self):
@@ -1595,9 +1635,8 @@ class ClientGS2:
         self.sync_gani_wearers()
         self.pump_level_events()
         for kind in ("weapon", "npc", "gani"):
-            for key, vm in list(self.vms[kind].items()):
-                if (vm.has_function("onUpdate")
-                        and not self._npc_timer_suppressed(kind, key, vm)):
+            for key, vm in self._subscribers_of(kind, "onUpdate"):
+                if not self._npc_timer_suppressed(kind, key, vm):
                     self._run(vm, "onUpdate")
         self._timer_accumulator = min(
             self._timer_accumulator + max(0.0, dt), TIMER_BACKLOG_CAP)
@@ -1612,7 +1651,7 @@ class ClientGS2:
         """scheduleevent(delay, name, params...): arm a one-shot call of the
         script's own `name` function. Distinct from settimer/onTimeout --
         a script may have many in flight at once, each with its own
-        arguments -- so they live in their own list, keyed by the same
+        arguments -- so they live in their own queue, keyed by the same
         (kind, key) VM identity settimer uses (joined classes file under
         their joiner, see _timeout_key)."""
         if not event:
@@ -1624,8 +1663,7 @@ class ClientGS2:
             # a script looping scheduleevent() must not grow this without
             # bound; drop the newest rather than starve the armed ones
             return
-        self._scheduled.append({"key": key, "left": max(0.0, to_num(delay)),
-                                "event": event, "params": list(params)})
+        self._scheduled.add(key, max(0.0, to_num(delay)), event, list(params))
 
     def cancel_events(self, vm: GS2VM, event: str = "") -> None:
         """cancelevents([name]): drop this script's pending scheduled events
@@ -1633,24 +1671,13 @@ class ClientGS2:
         key = self._timeout_key(vm)
         if key is None:
             return
-        wanted = event.lower()
-        self._scheduled = [
-            item for item in self._scheduled
-            if item["key"] != key or (wanted and item["event"].lower() != wanted)
-        ]
+        self._scheduled.cancel(key, event)
 
     def _process_scheduled_events(self, dt: float) -> None:
-        due = []
-        for item in self._scheduled:
-            item["left"] -= dt
-            if item["left"] <= 0:
-                due.append(item)
-        if not due:
-            return
-        fired = {id(item) for item in due}
-        self._scheduled = [item for item in self._scheduled
-                           if id(item) not in fired]
-        for item in due:
+        # Everything due this step is dequeued before the first handler
+        # runs, so a handler's cancelevents() cannot unschedule a sibling
+        # that is already due (nor can its new arms fire this step).
+        for item in self._scheduled.advance(dt):
             kind, key = item["key"]
             vm = self.vms.get(kind, {}).get(key)
             if vm is not None and not self._npc_timer_suppressed(kind, key, vm):
@@ -1659,18 +1686,12 @@ class ClientGS2:
     def _process_timeout_step(self, dt: float):
         """Advance script timers by one fixed update quantum."""
         self._process_scheduled_events(dt)
-        for vm_key in list(self._timeouts):
-            left = self._timeouts.get(vm_key)
-            if left is None:
+        for vm_key, seq in self._timeouts.advance(dt):
+            if not self._timeouts.take(vm_key, seq):   # handler may re-arm
                 # an earlier handler this step tore the VM down (e.g. an
                 # onTimeout changed the player's gani -> _free_gani_vm
-                # popped that gani VM's entry from under the snapshot)
-                continue
-            t = left - dt
-            if t > 0:
-                self._timeouts[vm_key] = t
+                # popped that gani VM's entry) or re-armed this timer
                 continue
-            del self._timeouts[vm_key]      # handler may re-arm
             kind, key = vm_key
             vm = self.vms.get(kind, {}).get(key)
             if vm is None:
@@ -1776,9 +1797,9 @@ class ClientGS2:
 
     def _free_gani_vm(self, vm: GS2VM) -> None:
         key = self._timeout_key(vm)
+        self._subscribers.clear()
         self._timeouts.pop(key, None)
-        self._scheduled = [item for item in self._scheduled
-                           if item["key"] != key]
+        self._scheduled.cancel(key)
         self._cancel_vm_coroutines(vm)
         if self.gs1 is not None:
             self.gs1._weapon_imgs.pop(f"gs2_gani_{key[1]}", None)
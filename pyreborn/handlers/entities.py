@@ -6,6 +6,7 @@ baddies, and ground items.
 
 from reborn_protocol.coords import LEVEL_SIZE, local_coord, segment_origin
 
+from ..client_state import NpcRecord, gmap_cell
 from ..packets import (
     PacketID,
     parse_baddy_props,
@@ -108,7 +109,7 @@ def _update_global_roster(client, player_id, props):
 def handle_player_props(client, data):
     # Player properties (our player data)
     props = parse_player_props(
-        data, client._colors_len, client.prop_parse_diagnostics)
+        data, client._player_colors, client.prop_parse_diagnostics)
 
     # Silent warp rejection (gs2emu): msgPLI_LEVELWARP with an
     # unloadable level sends NO PLO_WARPFAILED - it "resolves" by
@@ -135,8 +136,7 @@ def handle_player_props(client, data):
     if 'x' in props or 'y' in props:
         grid = None
         if client.gmap_width > 0:
-            grid = next((cell for cell, name in client.gmap_grid.items()
-                         if name == client._current_level_name), None)
+            grid = gmap_cell(client.gmap_grid, client._current_level_name)
         if grid:
             # Rebuild world coords: world = local + segment origin. Localizing
             # first makes this correct whether the server sent local or world.
@@ -170,6 +170,11 @@ def handle_player_props(client, data):
                 if req_key not in client._gs2_requested:
                     if client.request_weapon_bytecode(wname):
                         client._gs2_requested.add(req_key)
+        # This first packet also says which look fields the server holds;
+        # restore the saved ones it left out.
+        apply_appearance = getattr(client, '_apply_login_appearance', None)
+        if apply_appearance is not None:
+            apply_appearance(props)
 
 
 @handles(PacketID.PLO_ITEMADD)
@@ -257,7 +262,7 @@ def handle_baddy_props(client, data):
 def handle_npc_props(client, data):
     # NPC properties
     props = parse_npc_props(
-        data, client._colors_len, client.prop_parse_diagnostics)
+        data, client._npc_colors, client.prop_parse_diagnostics)
     if props and 'id' in props:
         npc_id = props['id']
         # Associate the NPC with a level. Preference order:
@@ -285,9 +290,7 @@ def handle_npc_props(client, data):
                     and gx is None and gy is None):
                 npc_level = known['_level']
             if client.gmap_grid and npc_level:
-                grid_cell = next(
-                    (cell for cell, name in client.gmap_grid.items()
-                     if name == npc_level), None)
+                grid_cell = gmap_cell(client.gmap_grid, npc_level)
         props['_level'] = npc_level
 
         # Convert NPC local coords to world coords if in GMAP.
@@ -326,7 +329,7 @@ def handle_npc_props(client, data):
             # renderer snaps its visual position rather than lerping
             # in from wherever a stale same-id visual entry sits.
             client._mark_npc_pos_snap(props)
-            client.npcs[npc_id] = props
+            client.npcs[npc_id] = NpcRecord(props)
         if 'gani' in props:
             host = getattr(client, 'gs2_host', None)
             if host is not None:
@@ -340,7 +343,7 @@ def handle_npc_showimgs(client, data):
     info = parse_npc_showimgs(data)
     npc_id = info.get('npc_id')
     if npc_id is not None:
-        npc = client.npcs.setdefault(npc_id, {})
+        npc = client.npcs.setdefault(npc_id, NpcRecord())
         imgs = npc.setdefault('imgs', {})
         if info['clear']:
             imgs.clear()
@@ -391,7 +394,7 @@ def handle_npc_del2(client, data):
 def handle_other_player_props(client, data):
     # Other player properties
     props = parse_other_player(
-        data, client._colors_len, client.prop_parse_diagnostics)
+        data, client._player_colors, client.prop_parse_diagnostics)
     if props and 'id' in props:
         player_id = props['id']
         # Session-global roster + universe events first: the level-roster
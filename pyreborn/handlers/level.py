@@ -168,14 +168,15 @@ def handle_level_name(client, data):
     if level_name.endswith('.gmap') and level_name != client._requested_gmap:
         client._requested_gmap = level_name
         # Walking out of an interior cleared the grid (_exit_gmap), so this
-        # fires again on every return to the overworld. The file itself is
-        # already in _received_files from the first entry and cannot have
-        # changed mid-session, so re-parse it here instead of paying another
-        # PLI_WANTFILE round trip: measured on hastur, waiting for the server
-        # left the camera in the interim standalone coordinate frame for
-        # ~330 ms after the destination board had already arrived, and the
-        # world frame then snapped in.
-        cached_gmap = client._received_files.get(level_name)
+        # fires again on every return to the overworld. The file itself was
+        # downloaded on the first entry and cannot have changed mid-session,
+        # so re-parse it here instead of paying another PLI_WANTFILE round
+        # trip: measured on hastur, waiting for the server left the camera in
+        # the interim standalone coordinate frame for ~330 ms after the
+        # destination board had already arrived, and the world frame then
+        # snapped in. get_file, not _received_files: the file byte budget may
+        # have pushed it out to the disk cache since.
+        cached_gmap = client.get_file(level_name)
         if cached_gmap:
             _load_cached_gmap(client, level_name, cached_gmap)
         else:
@@ -227,7 +228,7 @@ def handle_board_packet(client, data):
     # Level board tiles (uncompressed, 8192 bytes; also reached for the
     # compressed/raw path - PLO_RAWDATA's payload is re-emitted with this
     # same packet_id once its byte count is satisfied, see protocol.py).
-    tiles = parse_board_packet(data)
+    tiles = parse_board_packet(data, as_array=True)
     # Store in levels dict using the pending level name
     level_for_tiles = (client._pending_board_level_name
                        or client._pending_level_name
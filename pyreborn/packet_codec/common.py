@@ -147,7 +147,30 @@ def _read_gbyte(data: bytes, pos: int, count: int):
     return value, pos + count
 
 
-def _parse_with_colors_retry(run_once, colors_len: int,
+class ColorsWidth:
+    """PLPROP_COLORS width learned from one connection's props streams.
+
+    Starts at the per-version guess. Passed as `colors_len`, it is the width
+    _parse_with_colors_retry tries first, and it moves to whichever width had
+    to take over from it. A server whose mode differs from the guess then
+    costs one double parse per connection instead of one per packet, and a
+    later switch is still picked up by the next packet that carries COLORS.
+    """
+
+    __slots__ = ('width', 'switches')
+
+    def __init__(self, width: int = COLORS_CLASSIC):
+        self.width = width
+        self.switches = 0
+
+    def __int__(self) -> int:
+        return self.width
+
+    def __repr__(self) -> str:
+        return f"ColorsWidth({self.width})"
+
+
+def _parse_with_colors_retry(run_once, colors_len,
                              diagnostics: Optional[Dict[str, int]] = None):
     """Try `colors_len`, then fall back to the other known PLPROP_COLORS
     width, keeping whichever cleanly parses the whole props stream.
@@ -170,8 +193,12 @@ def _parse_with_colors_retry(run_once, colors_len: int,
     packet without hitting that failure mode is therefore a reliable,
     self-correcting signal for which width the server actually used.
 
-    `run_once(cl)` must return (props_dict, clean_bool).
+    `run_once(cl)` must return (props_dict, clean_bool). `colors_len` is an
+    int guess or a ColorsWidth, which is updated to the width that won.
     """
+    learned = colors_len if isinstance(colors_len, ColorsWidth) else None
+    if learned is not None:
+        colors_len = learned.width
     candidates = [colors_len] + [c for c in (5, 8) if c != colors_len]
     fallback = None
     failed_attempts = 0
@@ -181,6 +208,9 @@ def _parse_with_colors_retry(run_once, colors_len: int,
             if diagnostics is not None and failed_attempts:
                 diagnostics['warnings'] = diagnostics.get('warnings', 0) + 1
                 diagnostics['width_fallbacks'] = diagnostics.get('width_fallbacks', 0) + 1
+            if learned is not None and failed_attempts:
+                learned.width = cl
+                learned.switches += 1
             return props
         failed_attempts += 1
         if fallback is None:
@@ -254,7 +284,8 @@ def parse_player_props(data: bytes, colors_len: int = COLORS_CLASSIC,
     colors_len: preferred byte width of PLPROP_COLORS (5 classic / 8 v6
     extended) to try first. Wrong value misaligns everything after COLORS,
     so if this guess doesn't let the rest of the packet parse cleanly, the
-    other known width is tried instead (see _parse_with_colors_retry).
+    other known width is tried instead (see _parse_with_colors_retry). A
+    ColorsWidth instead of an int remembers the width that won.
     """
     def _run(width):
         props, clean, _ = parse_prop_stream(
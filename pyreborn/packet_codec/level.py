@@ -1,3 +1,6 @@
+import sys
+from array import array
+
 from .common import *
 
 def parse_npc_showimgs(data: bytes) -> dict:
@@ -432,34 +435,44 @@ def parse_player_movement(data: bytes) -> dict:
     return None
 
 
-def parse_board_packet(data: bytes) -> list:
+BOARD_TILES = 4096
+BOARD_BYTES = BOARD_TILES * 2
+
+# Applied to the high byte of every little-endian tile word: keeps the 12-bit
+# tile index and drops the 4 flag bits above it.
+_HIGH_BYTE_MASK = bytes(b & 0x0F for b in range(256))
+
+
+def parse_board_packet(data: bytes, as_array: bool = False):
     """
     Parse PLO_BOARDPACKET (packet 101) - 8192 bytes of raw tile data.
-    Returns list of 4096 tile IDs (64x64 grid).
-    """
-    tiles = []
-    for i in range(0, min(len(data), 8192), 2):
-        byte1 = data[i] if i < len(data) else 0
-        byte2 = data[i + 1] if i + 1 < len(data) else 0
-        tile_id = byte1 + (byte2 << 8)  # Little-endian
-        tiles.append(tile_id & 0xFFF)   # Clamp to 12-bit
+    Returns list of 4096 tile IDs (64x64 grid), or the array('H') itself
+    when as_array is set (8 KB instead of 4096 boxed ints).
 
-    # Pad to 4096 tiles if needed
-    while len(tiles) < 4096:
-        tiles.append(0)
+    Short payloads are zero-padded, anything past 8192 bytes is ignored.
+    """
+    raw = bytearray(BOARD_BYTES)
+    chunk = data[:BOARD_BYTES]
+    raw[:len(chunk)] = chunk
+    raw[1::2] = raw[1::2].translate(_HIGH_BYTE_MASK)  # Clamp to 12-bit
 
-    return tiles[:4096]
+    tiles = array('H')
+    tiles.frombytes(raw)
+    if sys.byteorder == 'big':
+        tiles.byteswap()  # Wire order is little-endian
+    return tiles if as_array else tiles.tolist()
 
 
-def parse_level_board(data: bytes) -> list:
+def parse_level_board(data: bytes, as_array: bool = False):
     """
     Parse PLO_LEVELBOARD (packet 0) - compressed tile data.
-    Returns list of 4096 tile IDs (64x64 grid).
+    Returns list of 4096 tile IDs (64x64 grid), or an array('H') when
+    as_array is set.
     """
     import zlib
 
     if len(data) < 2:
-        return [0] * 4096
+        return parse_board_packet(b'', as_array)
 
     # First 2 bytes might be length prefix
     try:
@@ -470,9 +483,9 @@ def parse_level_board(data: bytes) -> list:
             # Skip first 2 bytes (length prefix) and try again
             decompressed = zlib.decompress(data[2:])
         except:
-            return [0] * 4096
+            return parse_board_packet(b'', as_array)
 
-    return parse_board_packet(decompressed)
+    return parse_board_packet(decompressed, as_array)
 
 
 def parse_bigmap(data: bytes) -> dict:
@@ -100,7 +100,8 @@ def parse_other_player(data: bytes, colors_len: int = COLORS_CLASSIC,
     colors_len: preferred byte width of PLPROP_COLORS (5 classic / 8 v6
     extended) to try first. Wrong value misaligns every prop after COLORS,
     so if this guess doesn't let the rest of the packet parse cleanly, the
-    other known width is tried instead (see _parse_with_colors_retry).
+    other known width is tried instead (see _parse_with_colors_retry). A
+    ColorsWidth instead of an int remembers the width that won.
     """
     if len(data) < 2:
         return {}
@@ -0,0 +1,140 @@
+"""
+pyreborn - Packet timing
+Per-packet-id handler latency and per-frame cost breakdown for Client.update.
+
+Off by default (Client.enable_packet_timing turns it on), because it adds a
+few perf_counter() calls per packet. Latencies go into fixed power-of-two
+microsecond buckets, so recording is O(1) and memory stays constant however
+long the session runs; percentiles are read back as the upper edge of the
+bucket they fall in, i.e. accurate to within a factor of two.
+
+Usage:
+    client.enable_packet_timing()
+    ... play ...
+    report = client.packet_timing_report()
+    report["packets"]["PLO_NPCPROPS"]["p99_us"]
+    client.dump_packet_timing("timing.json")
+"""
+
+from typing import Dict, List, Optional
+
+# Bucket i holds samples in [2**(i-1), 2**i) microseconds (bucket 0: < 1us).
+# 27 buckets reach 2**26 us, about 67 s; anything longer lands in the last.
+HISTOGRAM_BUCKETS = 27
+
+
+class LatencyHistogram:
+    """Count, total, max and a log2-bucketed distribution of durations."""
+
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets: List[int] = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        index = int(seconds * 1e6).bit_length()
+        self.buckets[min(index, HISTOGRAM_BUCKETS - 1)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound, in seconds, of the bucket holding the given fraction
+        of samples (0.5 = p50)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(fraction * self.count + 0.5))
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                return min((1 << index) / 1e6, self.max)
+        return self.max
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'total_ms': round(self.total * 1e3, 3),
+            'mean_us': round(self.total / self.count * 1e6, 1) if self.count else 0.0,
+            'max_us': round(self.max * 1e6, 1),
+            'p50_us': round(self.percentile(0.50) * 1e6, 1),
+            'p99_us': round(self.percentile(0.99) * 1e6, 1),
+        }
+
+
+class PacketTiming:
+    """What Client.update records while timing is on."""
+
+    def __init__(self):
+        # packet_id -> handler latency (the @handles handler only)
+        self.handlers: Dict[int, LatencyHistogram] = {}
+        # packet_id -> packets and bytes of body received, handled or not
+        self.received: Dict[int, int] = {}
+        self.bytes: Dict[int, int] = {}
+        # Per update() call: socket drain + decrypt + bundle split, handler
+        # dispatch, on_packet hooks, and the whole frame minus idle waiting.
+        self.frames = 0
+        self.recv = LatencyHistogram()
+        self.dispatch = LatencyHistogram()
+        self.hooks = LatencyHistogram()
+        self.frame = LatencyHistogram()
+        # Accumulated during the current frame, folded in by end_frame().
+        self._frame_dispatch = 0.0
+        self._frame_hooks = 0.0
+
+    def record_packet(self, packet_id: int, size: int) -> None:
+        self.received[packet_id] = self.received.get(packet_id, 0) + 1
+        self.bytes[packet_id] = self.bytes.get(packet_id, 0) + size
+
+    def record_handler(self, packet_id: int, seconds: float) -> None:
+        histogram = self.handlers.get(packet_id)
+        if histogram is None:
+            histogram = self.handlers[packet_id] = LatencyHistogram()
+        histogram.add(seconds)
+        self._frame_dispatch += seconds
+
+    def record_hook(self, seconds: float) -> None:
+        self._frame_hooks += seconds
+
+    def end_frame(self, recv_seconds: float, frame_seconds: float) -> None:
+        self.frames += 1
+        self.recv.add(recv_seconds)
+        self.dispatch.add(self._frame_dispatch)
+        self.hooks.add(self._frame_hooks)
+        self.frame.add(frame_seconds)
+        self._frame_dispatch = 0.0
+        self._frame_hooks = 0.0
+
+    def report(self, names: Optional[Dict[int, str]] = None) -> dict:
+        """JSON-ready summary. names maps packet ids to display names; the
+        packets table is ordered by total handler time, largest first, then
+        the ids no handler ran for (on_packet hooks only, or nothing) by
+        bytes received."""
+        names = names or {}
+        packets = {}
+        idle = LatencyHistogram()
+        ranked = sorted(
+            self.received.keys() | self.handlers.keys(),
+            key=lambda packet_id: (
+                -self.handlers.get(packet_id, idle).total,
+                -self.bytes.get(packet_id, 0), packet_id))
+        for packet_id in ranked:
+            entry = self.handlers.get(packet_id, idle).as_dict()
+            entry['id'] = packet_id
+            entry['received'] = self.received.get(packet_id, 0)
+            entry['bytes'] = self.bytes.get(packet_id, 0)
+            packets[names.get(packet_id, str(packet_id))] = entry
+        return {
+            'frames': {
+                'count': self.frames,
+                'recv': self.recv.as_dict(),
+                'dispatch': self.dispatch.as_dict(),
+                'hooks': self.hooks.as_dict(),
+                'frame': self.frame.as_dict(),
+            },
+            'packets': packets,
+        }
@@ -9,7 +9,7 @@ from .packet_codec import rc as _rc
 from .packet_codec import nc as _nc
 
 _modules = (_common, _level, _player, _gameplay, _files, _rc, _nc)
-_export_names = ['Any', 'BADDY_PROPS', 'BDPROP', 'COLORS_CLASSIC', 'Dict', 'LEVEL_ITEM_NAMES', 'NPC_PROPS', 'Optional', 'PLAYER_PROPS', 'PLI', 'PLO', 'PLPROP', 'PacketBuilder', 'PacketID', 'PacketReader', 'StreamPolicy', '_ADDPLAYER_BYTE_PROPS', '_ADDPLAYER_STR_PROPS', '_BADDY_PROP_HANDLERS', '_BADDY_STREAM', '_GATTRIB_IDS', '_GATTRIB_PROP', '_NPC_PROP_HANDLERS', '_NPC_STREAM', '_NPC_TEXT_KEYS', '_OTHER_PROP_HANDLERS', '_OTHER_STREAM', '_PLAYER_STREAM', '_SELF_PROP_HANDLERS', '_SIGN_ALPHABET', '_SIGN_CTAB', '_SIGN_CTABINDEX', '_SIGN_SYMBOLS', '_build_rc_props_tail', '_gattrib_handlers', '_gint3', '_gtokenize', '_guntokenize', '_parse_npc_props_once', '_parse_reborn_csv', '_parse_script_header', '_parse_weapon_add_structured', '_parse_weapon_add_text', '_parse_with_colors_retry', '_raw', '_read_gbyte', '_read_string', '_round_position', '_set', '_set_head_image', '_set_power_image', '_set_scaled', '_set_sprite', '_set_text', '_untokenize_csv_fields', 'build_animation', 'build_arrow_add', 'build_arrow_count', 'build_attack_player', 'build_baddy_add', 'build_baddy_hurt', 'build_baddy_props', 'build_board_modify', 'build_bomb_add', 'build_bomb_count', 'build_bomb_del', 'build_chat', 'build_explosion_add', 'build_firespy', 'build_flag_del', 'build_flag_set', 'build_hearts', 'build_hit_objects', 'build_horse_add', 'build_horse_del', 'build_hurt_response', 'build_item_add', 'build_item_take', 'build_level_warp', 'build_movement', 'build_nc_classadd', 'build_nc_classdelete', 'build_nc_classedit', 'build_nc_levellistget', 'build_nc_localnpcsget', 'build_nc_npcadd', 'build_nc_npcdelete', 'build_nc_npcflagsget', 'build_nc_npcflagsset', 'build_nc_npcget', 'build_nc_npcreset', 'build_nc_npcscriptget', 'build_nc_npcscriptset', 'build_nc_npcwarp', 'build_nc_weaponadd', 'build_nc_weapondelete', 'build_nc_weaponget', 'build_nc_weaponlistget', 'build_npc_props', 'build_open_chest', 'build_player_chat', 'build_player_gattrib', 'build_player_props', 'build_private_message', 'build_profile_get', 'build_profile_set', 'build_putnpc', 'build_rc_account_add', 'build_rc_account_del', 'build_rc_account_get', 'build_rc_account_list_get', 'build_rc_account_set', 'build_rc_admin_message', 'build_rc_apincrement_set', 'build_rc_apply_reason', 'build_rc_baddyrespawn_set', 'build_rc_chat', 'build_rc_disconnect_player', 'build_rc_disconnect_rc', 'build_rc_filebrowser_cd', 'build_rc_filebrowser_delete', 'build_rc_filebrowser_download', 'build_rc_filebrowser_end', 'build_rc_filebrowser_move', 'build_rc_filebrowser_rename', 'build_rc_filebrowser_start', 'build_rc_filebrowser_up', 'build_rc_folder_config_get', 'build_rc_folder_delete', 'build_rc_folderconfig_set', 'build_rc_horselife_set', 'build_rc_largefile_end', 'build_rc_largefile_start', 'build_rc_listrcs', 'build_rc_npcserverquery', 'build_rc_player_ban_get', 'build_rc_player_ban_set', 'build_rc_player_comments_get', 'build_rc_player_comments_set', 'build_rc_player_props_get', 'build_rc_player_props_get_by_name', 'build_rc_player_rights_get', 'build_rc_playerprops_reset', 'build_rc_playerprops_set', 'build_rc_playerprops_set2', 'build_rc_playerrights_set', 'build_rc_priv_admin_message', 'build_rc_respawn_set', 'build_rc_server_flags_get', 'build_rc_server_options_get', 'build_rc_serverflags_set', 'build_rc_serveroptions_set', 'build_rc_update_levels', 'build_rc_warp_player', 'build_shoot', 'build_shoot_v1', 'build_sword_attack', 'build_throwcarried', 'build_triggeraction', 'build_update_class', 'build_update_file', 'build_update_gani', 'build_update_script', 'build_wantfile', 'build_weapon_add', 'decode_sign_text', 'math', 'parse_arrow_add', 'parse_baddy_hurt', 'parse_baddy_props', 'parse_bigmap', 'parse_board_heights', 'parse_board_layer', 'parse_board_modify', 'parse_board_modify2', 'parse_board_packet', 'parse_bomb_add', 'parse_bomb_del', 'parse_chat', 'parse_default_weapon', 'parse_explosion', 'parse_file', 'parse_file_uptodate', 'parse_filesendfailed', 'parse_firespy', 'parse_flag_del', 'parse_flag_set', 'parse_fullstop', 'parse_fullstop2', 'parse_gani_script', 'parse_ghost_icon', 'parse_hit_objects', 'parse_horse_add', 'parse_horse_del', 'parse_hurt_player', 'parse_item_add', 'parse_item_del', 'parse_large_file_marker', 'parse_large_file_size', 'parse_level_board', 'parse_level_chest', 'parse_level_link', 'parse_level_modtime', 'parse_level_name', 'parse_level_sign', 'parse_loadgani', 'parse_loadscript', 'parse_minimap', 'parse_move', 'parse_move2', 'parse_nc_class_add', 'parse_nc_class_delete', 'parse_nc_class_get', 'parse_nc_level_dump', 'parse_nc_level_list', 'parse_nc_npc_add', 'parse_nc_npc_attributes', 'parse_nc_npc_delete', 'parse_nc_npc_flags', 'parse_nc_npc_script', 'parse_nc_weapon_get', 'parse_nc_weapon_list', 'parse_newworldtime', 'parse_npc_bytecode', 'parse_npc_props', 'parse_npc_showimgs', 'parse_npcdel2', 'parse_npcmoved', 'parse_npcserveraddr', 'parse_npcweapondel', 'parse_npcweaponscript', 'parse_other_player', 'parse_player_movement', 'parse_player_props', 'parse_playerwarp', 'parse_playerwarp2', 'parse_private_message', 'parse_profile', 'parse_prop_stream', 'parse_push_away', 'parse_rawdata', 'parse_rc_account_get', 'parse_rc_account_list', 'parse_rc_add_player', 'parse_rc_admin_message', 'parse_rc_chat', 'parse_rc_del_player', 'parse_rc_filebrowser_dir', 'parse_rc_filebrowser_dirlist', 'parse_rc_filebrowser_message', 'parse_rc_folder_config', 'parse_rc_max_upload_size', 'parse_rc_player_ban', 'parse_rc_player_comments', 'parse_rc_player_props', 'parse_rc_player_rights', 'parse_rc_server_flags', 'parse_rc_server_options', 'parse_rpg_window', 'parse_say2', 'parse_server_text', 'parse_server_warp', 'parse_set_active_level', 'parse_setnetcookie', 'parse_shoot', 'parse_signature', 'parse_staff_guilds', 'parse_start_message', 'parse_status_list', 'parse_throwcarried', 'parse_triggeraction_in', 'parse_weapon_add']
+_export_names = ['Any', 'BADDY_PROPS', 'BDPROP', 'COLORS_CLASSIC', 'ColorsWidth', 'Dict', 'LEVEL_ITEM_NAMES', 'NPC_PROPS', 'Optional', 'PLAYER_PROPS', 'PLI', 'PLO', 'PLPROP', 'PacketBuilder', 'PacketID', 'PacketReader', 'StreamPolicy', '_ADDPLAYER_BYTE_PROPS', '_ADDPLAYER_STR_PROPS', '_BADDY_PROP_HANDLERS', '_BADDY_STREAM', '_GATTRIB_IDS', '_GATTRIB_PROP', '_NPC_PROP_HANDLERS', '_NPC_STREAM', '_NPC_TEXT_KEYS', '_OTHER_PROP_HANDLERS', '_OTHER_STREAM', '_PLAYER_STREAM', '_SELF_PROP_HANDLERS', '_SIGN_ALPHABET', '_SIGN_CTAB', '_SIGN_CTABINDEX', '_SIGN_SYMBOLS', '_build_rc_props_tail', '_gattrib_handlers', '_gint3', '_gtokenize', '_guntokenize', '_parse_npc_props_once', '_parse_reborn_csv', '_parse_script_header', '_parse_weapon_add_structured', '_parse_weapon_add_text', '_parse_with_colors_retry', '_raw', '_read_gbyte', '_read_string', '_round_position', '_set', '_set_head_image', '_set_power_image', '_set_scaled', '_set_sprite', '_set_text', '_untokenize_csv_fields', 'build_animation', 'build_arrow_add', 'build_arrow_count', 'build_attack_player', 'build_baddy_add', 'build_baddy_hurt', 'build_baddy_props', 'build_board_modify', 'build_bomb_add', 'build_bomb_count', 'build_bomb_del', 'build_chat', 'build_explosion_add', 'build_firespy', 'build_flag_del', 'build_flag_set', 'build_hearts', 'build_hit_objects', 'build_horse_add', 'build_horse_del', 'build_hurt_response', 'build_item_add', 'build_item_take', 'build_level_warp', 'build_movement', 'build_nc_classadd', 'build_nc_classdelete', 'build_nc_classedit', 'build_nc_levellistget', 'build_nc_localnpcsget', 'build_nc_npcadd', 'build_nc_npcdelete', 'build_nc_npcflagsget', 'build_nc_npcflagsset', 'build_nc_npcget', 'build_nc_npcreset', 'build_nc_npcscriptget', 'build_nc_npcscriptset', 'build_nc_npcwarp', 'build_nc_weaponadd', 'build_nc_weapondelete', 'build_nc_weaponget', 'build_nc_weaponlistget', 'build_npc_props', 'build_open_chest', 'build_player_chat', 'build_player_gattrib', 'build_player_props', 'build_private_message', 'build_profile_get', 'build_profile_set', 'build_putnpc', 'build_rc_account_add', 'build_rc_account_del', 'build_rc_account_get', 'build_rc_account_list_get', 'build_rc_account_set', 'build_rc_admin_message', 'build_rc_apincrement_set', 'build_rc_apply_reason', 'build_rc_baddyrespawn_set', 'build_rc_chat', 'build_rc_disconnect_player', 'build_rc_disconnect_rc', 'build_rc_filebrowser_cd', 'build_rc_filebrowser_delete', 'build_rc_filebrowser_download', 'build_rc_filebrowser_end', 'build_rc_filebrowser_move', 'build_rc_filebrowser_rename', 'build_rc_filebrowser_start', 'build_rc_filebrowser_up', 'build_rc_folder_config_get', 'build_rc_folder_delete', 'build_rc_folderconfig_set', 'build_rc_horselife_set', 'build_rc_largefile_end', 'build_rc_largefile_start', 'build_rc_listrcs', 'build_rc_npcserverquery', 'build_rc_player_ban_get', 'build_rc_player_ban_set', 'build_rc_player_comments_get', 'build_rc_player_comments_set', 'build_rc_player_props_get', 'build_rc_player_props_get_by_name', 'build_rc_player_rights_get', 'build_rc_playerprops_reset', 'build_rc_playerprops_set', 'build_rc_playerprops_set2', 'build_rc_playerrights_set', 'build_rc_priv_admin_message', 'build_rc_respawn_set', 'build_rc_server_flags_get', 'build_rc_server_options_get', 'build_rc_serverflags_set', 'build_rc_serveroptions_set', 'build_rc_update_levels', 'build_rc_warp_player', 'build_shoot', 'build_shoot_v1', 'build_sword_attack', 'build_throwcarried', 'build_triggeraction', 'build_update_class', 'build_update_file', 'build_update_gani', 'build_update_script', 'build_wantfile', 'build_weapon_add', 'decode_sign_text', 'math', 'parse_arrow_add', 'parse_baddy_hurt', 'parse_baddy_props', 'parse_bigmap', 'parse_board_heights', 'parse_board_layer', 'parse_board_modify', 'parse_board_modify2', 'parse_board_packet', 'parse_bomb_add', 'parse_bomb_del', 'parse_chat', 'parse_default_weapon', 'parse_explosion', 'parse_file', 'parse_file_uptodate', 'parse_filesendfailed', 'parse_firespy', 'parse_flag_del', 'parse_flag_set', 'parse_fullstop', 'parse_fullstop2', 'parse_gani_script', 'parse_ghost_icon', 'parse_hit_objects', 'parse_horse_add', 'parse_horse_del', 'parse_hurt_player', 'parse_item_add', 'parse_item_del', 'parse_large_file_marker', 'parse_large_file_size', 'parse_level_board', 'parse_level_chest', 'parse_level_link', 'parse_level_modtime', 'parse_level_name', 'parse_level_sign', 'parse_loadgani', 'parse_loadscript', 'parse_minimap', 'parse_move', 'parse_move2', 'parse_nc_class_add', 'parse_nc_class_delete', 'parse_nc_class_get', 'parse_nc_level_dump', 'parse_nc_level_list', 'parse_nc_npc_add', 'parse_nc_npc_attributes', 'parse_nc_npc_delete', 'parse_nc_npc_flags', 'parse_nc_npc_script', 'parse_nc_weapon_get', 'parse_nc_weapon_list', 'parse_newworldtime', 'parse_npc_bytecode', 'parse_npc_props', 'parse_npc_showimgs', 'parse_npcdel2', 'parse_npcmoved', 'parse_npcserveraddr', 'parse_npcweapondel', 'parse_npcweaponscript', 'parse_other_player', 'parse_player_movement', 'parse_player_props', 'parse_playerwarp', 'parse_playerwarp2', 'parse_private_message', 'parse_profile', 'parse_prop_stream', 'parse_push_away', 'parse_rawdata', 'parse_rc_account_get', 'parse_rc_account_list', 'parse_rc_add_player', 'parse_rc_admin_message', 'parse_rc_chat', 'parse_rc_del_player', 'parse_rc_filebrowser_dir', 'parse_rc_filebrowser_dirlist', 'parse_rc_filebrowser_message', 'parse_rc_folder_config', 'parse_rc_max_upload_size', 'parse_rc_player_ban', 'parse_rc_player_comments', 'parse_rc_player_props', 'parse_rc_player_rights', 'parse_rc_server_flags', 'parse_rc_server_options', 'parse_rpg_window', 'parse_say2', 'parse_server_text', 'parse_server_warp', 'parse_set_active_level', 'parse_setnetcookie', 'parse_shoot', 'parse_signature', 'parse_staff_guilds', 'parse_start_message', 'parse_status_list', 'parse_throwcarried', 'parse_triggeraction_in', 'parse_weapon_add']
 for _export_name in _export_names:
     for _module in _modules:
         if hasattr(_module, _export_name):
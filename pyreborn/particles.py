@@ -14,8 +14,11 @@ TParticleData.cpp, TParticleEmitterProperties.cpp, TInitStatics.cpp:4744-4746.
 from __future__ import annotations
 
 import math
+import operator
 import random
-from typing import Any, List, Optional
+from array import array
+from itertools import compress, groupby
+from typing import Any, Dict, List, Optional, Sequence
 
 from reborn_protocol.gs2 import GS2Object, to_num, to_str
 
@@ -41,10 +44,17 @@ PARTICLE_TYPES_CAP = 100
 #: this client simulates in Python and must stay frame-rate-safe.
 SIM_PARTICLE_CAP = 4000
 
+#: what draw_state() yields per particle, in this order
+DRAW_FIELDS = ("image", "x", "y", "z", "zoom", "stretchx", "stretchy", "red",
+               "green", "blue", "alpha", "mode", "rotation")
+
 _TWO_PI = 2.0 * math.pi
 _HALF_PI = math.pi / 2.0
 
 
+_draw_fields = operator.attrgetter(*DRAW_FIELDS)
+
+
 def _f(v) -> float:
     return float(to_num(v))
 
@@ -527,7 +537,7 @@ class ParticleEmitter(GS2Object):
         # .cpp:377-393)
         sub = getattr(self, slot)
         if sub is None:
-            sub = ParticleEmitter(self.rec)
+            sub = type(self)(self.rec)
             sub.set("emitautomatically", 0.0)
             setattr(self, slot, sub)
         return sub
@@ -608,6 +618,7 @@ class ParticleEmitter(GS2Object):
         attach = self._members.get("attachposition", 0.0) != 0.0
         terrain = self._members.get("emitatterrainheight", 0.0) != 0.0
         ox, oy, oz = self._owner_position()
+        emitted = []
         for _ in range(count):
             template = (self.templates[0] if len(self.templates) == 1
                         else random.choice(self.templates))
@@ -641,8 +652,12 @@ class ParticleEmitter(GS2Object):
                 user[1] = user[0].process(p, user[1], False, now, 0.0)
             for mod in self.global_modifiers:
                 mod.process(p, mod.user_time, True, now, 0.0)
-            self.particles.append(p)
-            self.emitted_total += 1
+            emitted.append(p)
+        self._store_emitted(emitted)
+        self.emitted_total += len(emitted)
+
+    def _store_emitted(self, emitted: List[ParticleData]) -> None:
+        self.particles.extend(emitted)
 
     def advance(self, dt: float) -> None:
         """Advance the simulation clock (TParticleEmitter::process, :1138-
@@ -666,11 +681,7 @@ class ParticleEmitter(GS2Object):
         autorotate = self._members.get("autorotation", 0.0) != 0.0
         if len(self.particles) > self._maxparticles:
             del self.particles[:len(self.particles) - self._maxparticles]
-        survivors = []
-        for p in self.particles:
-            if self._process_particle(p, now, dt, autorotate):
-                survivors.append(p)
-        self.particles = survivors
+        self._advance_particles(now, dt, autorotate)
         self._update_global_timers(now)
         if emit_due:
             self.emit_now(now=now)
@@ -692,6 +703,14 @@ class ParticleEmitter(GS2Object):
                 mod.user_time = mod.process(
                     template.data, mod.user_time, False, now, dt)
 
+    def _advance_particles(self, now: float, dt: float,
+                           autorotate: bool) -> None:
+        survivors = []
+        for p in self.particles:
+            if self._process_particle(p, now, dt, autorotate):
+                survivors.append(p)
+        self.particles = survivors
+
     def _process_particle(self, p: ParticleData, now: float, dt: float,
                           autorotate: bool) -> bool:
         """Run one step. False means expired (order per processParticle/
@@ -734,6 +753,12 @@ class ParticleEmitter(GS2Object):
                     mod.user_time = (now + mod.start_time
                                      + random.random() * span)
 
+    def draw_state(self) -> List[tuple]:
+        """One DRAW_FIELDS tuple per live particle, oldest first -- all the
+        renderer reads (game/render_effects.py _render_layer_emitter)."""
+        fields = _draw_fields
+        return [fields(p) for p in self.particles]
+
     # -- script method entry points -----------------------------------------
     def call_method(self, name: str, args: list) -> Any:
         """Dispatch one of the eight funcDefs. Returns the modifier object,
@@ -771,6 +796,376 @@ class ParticleEmitter(GS2Object):
         return 0.0 if result is None or result is NotImplemented else result
 
 
+#: ParticleData's numeric state, one array('d') column each in
+#: VectorParticleEmitter (image and the local-modifier timers live apart)
+_COLUMNS = ("x", "y", "z", "vx", "vy", "vz", "angle", "zangle", "speed",
+            "rotation", "spin", "zoom", "stretchx", "stretchy", "red",
+            "green", "blue", "alpha", "mode", "lifetime", "born")
+
+#: var type index -> (column, clamps at >= 0) for the uncoupled vars of
+#: ParticleData.modify_value; 3-8 are the coupled movement fields
+_VAR_COLUMNS = {
+    0: ("x", False), 1: ("y", False), 2: ("z", False),
+    9: ("rotation", False), 10: ("spin", False), 11: ("stretchx", True),
+    12: ("stretchy", False), 13: ("red", True), 14: ("green", True),
+    15: ("blue", True), 16: ("alpha", True), 17: ("zoom", False),
+}
+_MOVEMENT = ("vx", "vy", "vz", "angle", "zangle", "speed")
+
+
+class _ParticleView:
+    """One VectorParticleEmitter particle read (and written) through
+    ParticleData's field names. It indexes the columns, so it only stays
+    pointed at the same particle until the next advance() drops one.
+    `users` is a read-only tuple of (modifier, timer) pairs built on each
+    read; assigning it, or to it, raises."""
+
+    __slots__ = ("_emitter", "_index")
+
+    def __init__(self, emitter: "VectorParticleEmitter", index: int):
+        object.__setattr__(self, "_emitter", emitter)
+        object.__setattr__(self, "_index", index)
+
+    def __getattr__(self, name: str) -> Any:
+        emitter, index = self._emitter, self._index
+        if name == "image":
+            return emitter._image[index]
+        if name == "users":
+            return tuple((mod, emitter._user_times[slot][index])
+                         for slot, mod in enumerate(emitter._user_mods[index]))
+        column = emitter._columns.get(name)
+        if column is None:
+            raise AttributeError(name)
+        return column[index]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        emitter, index = self._emitter, self._index
+        if name == "image":
+            emitter._image[index] = value
+            return
+        column = emitter._columns.get(name)
+        if column is None:
+            raise AttributeError(name)
+        column[index] = value
+
+
+class _ParticleColumns:
+    """VectorParticleEmitter.particles: the live set as a sequence of
+    _ParticleView, for scripts, tests and the counters."""
+
+    __slots__ = ("_emitter",)
+
+    def __init__(self, emitter: "VectorParticleEmitter"):
+        self._emitter = emitter
+
+    def __len__(self) -> int:
+        return len(self._emitter._image)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [_ParticleView(self._emitter, i)
+                    for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return _ParticleView(self._emitter, index)
+
+    def __iter__(self):
+        return (_ParticleView(self._emitter, i) for i in range(len(self)))
+
+    def __delitem__(self, index) -> None:
+        keep = [True] * len(self)
+        if isinstance(index, slice):
+            for i in range(*index.indices(len(keep))):
+                keep[i] = False
+        else:
+            keep[index] = False
+        self._emitter._compact(keep)
+
+
+class VectorParticleEmitter(ParticleEmitter):
+    """ParticleEmitter with the live particles kept column-wise.
+
+    Same script surface and the same results as the scalar engine above --
+    tests/unit/test_particle_columns.py holds the two to identical state and
+    random-number use -- but advance() works a column at a time: each local
+    or global modifier is one pass over the particles it fires for, expiry
+    compacts the columns, and movement integrates whole columns. Emission
+    still builds every new particle as a ParticleData (templates and the
+    processNow step live there) and appends it. Opt-in: on CPython it
+    advances no faster than the scalar engine, so emitter_for_record keeps
+    handing out that one; both feed the renderer through draw_state()."""
+
+    __slots__ = ("_columns", "_image", "_user_mods", "_user_times")
+
+    def __init__(self, rec: Optional[dict] = None):
+        self._columns: Dict[str, array] = {name: array('d')
+                                           for name in _COLUMNS}
+        self._image: List[str] = []
+        # per particle, the local modifiers snapshotted at emit (one shared
+        # tuple per emission); their timers are _user_times[slot][particle]
+        self._user_mods: List[tuple] = []
+        self._user_times: List[array] = []
+        super().__init__(rec)
+
+    @property
+    def particles(self) -> _ParticleColumns:
+        return _ParticleColumns(self)
+
+    @particles.setter
+    def particles(self, value) -> None:
+        # ParticleEmitter.__init__ and remove_particles assign []
+        keep = [False] * len(self._image)
+        self._compact(keep)
+        self._store_emitted(list(value))
+
+    def _store_emitted(self, emitted: List[ParticleData]) -> None:
+        if not emitted:
+            return
+        for name, column in self._columns.items():
+            column.extend([getattr(p, name) for p in emitted])
+        self._image.extend([p.image for p in emitted])
+        times = self._user_times
+        width = max(len(p.users) for p in emitted)
+        while len(times) < width:
+            times.append(array('d', [0.0]) * len(self._user_mods))
+        for slot, column in enumerate(times):
+            column.extend([p.users[slot][1] if slot < len(p.users) else 0.0
+                           for p in emitted])
+        # consecutive emissions under the same local modifiers share one
+        # tuple, so _process_batch handles them as one group
+        last = self._user_mods[-1] if self._user_mods else ()
+        for p in emitted:
+            mods = tuple(user[0] for user in p.users)
+            if len(mods) == len(last) and all(
+                    a is b for a, b in zip(mods, last)):
+                mods = last
+            last = mods
+            self._user_mods.append(mods)
+
+    def _compact(self, keep: Sequence[bool]) -> None:
+        """Drop every particle whose `keep` entry is false."""
+        columns = self._columns
+        for name, column in columns.items():
+            columns[name] = array('d', compress(column, keep))
+        self._image = list(compress(self._image, keep))
+        self._user_mods = list(compress(self._user_mods, keep))
+        if self._image:
+            self._user_times = [array('d', compress(times, keep))
+                                for times in self._user_times]
+        else:
+            self._user_times = []
+
+    def _advance_particles(self, now: float, dt: float,
+                           autorotate: bool) -> None:
+        columns = self._columns
+        dead = [now - born >= lifetime for born, lifetime
+                in zip(columns["born"], columns["lifetime"])]
+        if True not in dead:
+            self._process_batch(list(range(len(dead))), now, dt)
+        else:
+            sub = self._dropwateremitter or self._dropemitter
+            if sub is None:
+                self._process_batch(
+                    [i for i, gone in enumerate(dead) if not gone], now, dt)
+            else:
+                # an expiring particle's drop emission draws random numbers
+                # between its neighbours' modifier draws -- keep that order
+                x, y, z = columns["x"], columns["y"], columns["z"]
+                batch: List[int] = []
+                for i, gone in enumerate(dead):
+                    if gone:
+                        self._process_batch(batch, now, dt)
+                        batch = []
+                        sub.emit_now(position=(x[i], y[i], z[i]), now=now)
+                    else:
+                        batch.append(i)
+                self._process_batch(batch, now, dt)
+            self._compact([not gone for gone in dead])
+
+        for axis, move in (("x", "vx"), ("y", "vy"), ("z", "vz")):
+            columns[axis] = array('d', [pos + vel * dt for pos, vel
+                                        in zip(columns[axis], columns[move])])
+        if autorotate:
+            columns["rotation"] = array('d', columns["angle"])
+        elif any(columns["spin"]):
+            columns["rotation"] = array('d', [
+                rot + spin * dt if spin != 0.0 else rot
+                for rot, spin in zip(columns["rotation"], columns["spin"])])
+
+    def _process_batch(self, idx: List[int], now: float, dt: float) -> None:
+        """_process_particle's modifier step for the live particles `idx`
+        (ascending), one modifier at a time across all of them: local users
+        slot by slot, then the globals. The random numbers the scalar loop
+        draws particle by particle are drawn up front in that same order and
+        handed out by offset."""
+        user_mods = self._user_mods
+        global_mods = self.global_modifiers
+        if not idx or not (global_mods or any(user_mods)):
+            return
+        # emissions in a row share one mods tuple, so group by runs
+        groups: Dict[int, tuple] = {}
+        start = 0
+        for mods, run in groupby(user_mods[i] for i in idx):
+            end = start + len(list(run))
+            if mods:
+                group = groups.get(id(mods))
+                if group is None:
+                    group = groups[id(mods)] = (mods, [])
+                group[1].extend(range(start, end))
+            start = end
+
+        # which users fire (the decision only reads that user's own timer)
+        # and how many draws each particle takes
+        counts = [0] * len(idx)
+        plan = []
+        for mods, positions in groups.values():
+            for slot, mod in enumerate(mods):
+                times = self._user_times[slot]
+                if mod.mod_type == 0:
+                    fired = [pos for pos in positions
+                             if not (times[idx[pos]] > now
+                                     or times[idx[pos]] == 0.0)]
+                    cost = len(mod.var_mods)
+                elif mod.mod_type == 1:
+                    fired = [pos for pos in positions
+                             if not now < times[idx[pos]]]
+                    cost = len(mod.var_mods) + 1
+                else:
+                    fired, cost = positions, 0
+                if cost:
+                    for pos in fired:
+                        counts[pos] += cost
+                plan.append((slot, mod, fired))
+        global_cost = 0
+        for mod in global_mods:
+            if mod.mod_type == 0:
+                if not (mod.user_time > now or mod.user_time == 0.0):
+                    global_cost += len(mod.var_mods)
+            elif mod.mod_type == 1 and not now < mod.user_time:
+                global_cost += len(mod.var_mods)
+        cursor = []
+        total = 0
+        for count in counts:
+            cursor.append(total)
+            total += count + global_cost
+        rand = random.random
+        draws = [rand() for _ in range(total)]
+
+        # slot order per particle is what the scalar loop runs; different
+        # groups never share a particle
+        plan.sort(key=lambda step: step[0])
+        for slot, mod, fired in plan:
+            if not fired:
+                continue
+            times = self._user_times[slot]
+            if mod.mod_type == 2:
+                self._apply_range(mod, [idx[pos] for pos in fired],
+                                  [now - times[idx[pos]] for pos in fired], dt)
+                continue
+            targets = [idx[pos] for pos in fired]
+            nvars = len(mod.var_mods)
+            for k, vm in enumerate(mod.var_mods):
+                spread = vm.end_value - vm.start_value
+                self._modify(vm.type_index, vm.mode, targets,
+                             [vm.start_value + draws[cursor[pos] + k] * spread
+                              for pos in fired])
+            if mod.mod_type == 0:
+                for i in targets:
+                    times[i] = 0.0
+                used = nvars
+            else:
+                span = mod.end_time - mod.start_time
+                for pos, i in zip(fired, targets):
+                    times[i] = (now + mod.start_time
+                                + draws[cursor[pos] + nvars] * span)
+                used = nvars + 1
+            for pos in fired:
+                cursor[pos] += used
+
+        for mod in global_mods:
+            if mod.mod_type == 2:
+                self._apply_range(mod, idx, [now - mod.user_time] * len(idx),
+                                  dt)
+                continue
+            if mod.mod_type == 0:
+                if mod.user_time > now or mod.user_time == 0.0:
+                    continue
+            elif now < mod.user_time:
+                continue
+            for k, vm in enumerate(mod.var_mods):
+                spread = vm.end_value - vm.start_value
+                self._modify(vm.type_index, vm.mode, idx,
+                             [vm.start_value + draws[cursor[pos] + k] * spread
+                              for pos in range(len(idx))])
+            for pos in range(len(idx)):
+                cursor[pos] += len(mod.var_mods)
+
+    def _apply_range(self, mod: ParticleModifier, targets: List[int],
+                     elapsed: List[float], scale: float) -> None:
+        """The `range` branch of ParticleModifier.process over a batch, each
+        particle with its own elapsed time."""
+        start, end = mod.start_time, mod.end_time
+        active = [n for n, e in enumerate(elapsed)
+                  if not (e < start or e > end + 1e-6)]
+        if not active:
+            return
+        span = end - start
+        for vm in mod.var_mods:
+            rows = active
+            if vm.mode == 1:
+                rows = [n for n in active if not elapsed[n] > end]
+            if span > 0.0:
+                step = vm.end_value - vm.start_value
+                interp = [(elapsed[n] - start) * step / span + vm.start_value
+                          for n in rows]
+            else:
+                interp = [vm.end_value] * len(rows)
+            if vm.mode == 1:
+                values = [value * scale for value in interp]
+            elif vm.mode == 2:
+                values = [vm.end_value] * len(rows)
+            else:
+                values = [value if elapsed[n] < end else vm.end_value
+                          for n, value in zip(rows, interp)]
+            self._modify(vm.type_index, vm.mode,
+                         [targets[n] for n in rows], values)
+
+    def _modify(self, type_index: int, mode: int, targets: List[int],
+                values: List[float]) -> None:
+        """ParticleData.modify_value for every particle in `targets`."""
+        spec = _VAR_COLUMNS.get(type_index)
+        if spec is not None:
+            name, clamp = spec
+            column = self._columns[name]
+            if mode == 1:
+                values = [column[i] + v for i, v in zip(targets, values)]
+            elif mode == 2:
+                values = [column[i] * v for i, v in zip(targets, values)]
+            if clamp:
+                values = [max(0.0, v) for v in values]
+            for i, v in zip(targets, values):
+                column[i] = v
+            return
+        if type_index not in (3, 4, 5, 6, 7, 8):
+            return
+        # the coupled movement fields go through ParticleData's own setters
+        scratch = ParticleData()
+        columns = [self._columns[name] for name in _MOVEMENT]
+        for i, v in zip(targets, values):
+            (scratch.vx, scratch.vy, scratch.vz, scratch.angle,
+             scratch.zangle, scratch.speed) = [c[i] for c in columns]
+            scratch.modify_value(type_index, mode, v)
+            for name, column in zip(_MOVEMENT, columns):
+                column[i] = getattr(scratch, name)
+
+    def draw_state(self) -> List[tuple]:
+        columns = self._columns
+        return list(zip(self._image,
+                        *[columns[name] for name in DRAW_FIELDS[1:]]))
+
+
 def emitter_for_record(rec: dict) -> ParticleEmitter:
     """The lazy, identity-stable `showimg.emitter` getter
     (TShowImg::getParticleEmitter, TShowImg.cpp:180-185)."""
@@ -6,12 +6,15 @@ Supports both TCP sockets (native Python) and WebSocket (browser via Pyodide).
 Uses the shared reborn_protocol library for core encryption and codec.
 """
 
+import asyncio
 import sys
 import struct
 import zlib
 import random
 import json
+import queue
 import threading
+import time
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional, List, Tuple, Callable, Dict
@@ -36,6 +39,24 @@ MAX_DECOMPRESSED_SIZE = 8 * 1024 * 1024
 # bytes left in the kernel buffer are picked up by the next update.
 MAX_SOCKET_DRAIN_BYTES = 4 * 1024 * 1024
 
+# Batched sends (Protocol.batch_sends): flush early once this many encrypted
+# bytes are waiting, so a burst of sends between two update() calls cannot
+# grow one write without limit or hold packets back for long.
+SEND_BATCH_FLUSH_BYTES = 16 * 1024
+
+# ThreadedProtocol's inbound queue, in packets. A full queue blocks the reader
+# thread, which stops reading the socket and lets TCP flow control push back on
+# the server instead of buffering without limit in this process.
+MAX_INBOUND_QUEUE = 8192
+# How long the reader thread waits in select() before re-checking whether it
+# was asked to stop.
+READER_POLL_INTERVAL = 0.05
+
+# recv_into() target size. One scratch buffer of this size is reused for every
+# read; its contents are appended to the receive buffer without an
+# intermediate bytes object.
+RECV_CHUNK_SIZE = 65536
+
 
 class DecompressionLimitError(Exception):
     """Raised when an inbound compressed frame exceeds the size limit."""
@@ -51,6 +72,33 @@ def _decompress_bounded(data: bytes) -> bytes:
         raise zlib.error("incomplete or truncated compressed frame")
     return result
 
+
+def _consume_frames(buf: bytearray, handle_frame: Callable[[bytes], None]) -> None:
+    """Pass every complete length-prefixed frame in buf to handle_frame.
+
+    Frames are located by offset and copied out exactly once. The consumed
+    prefix is dropped with a single del afterwards, even when handle_frame
+    raises. Re-slicing the buffer per frame instead (the old
+    ``buf = buf[2 + length:]``) copied the remaining tail every time, which is
+    quadratic over a multi-megabyte level-entry drain. A trailing partial
+    frame stays in buf for the next call.
+    """
+    view = memoryview(buf)
+    end = len(buf)
+    offset = 0
+    try:
+        while end - offset >= 2:
+            length = (view[offset] << 8) | view[offset + 1]
+            start = offset + 2
+            if end - start < length:
+                break  # Incomplete packet
+            offset = start + length
+            handle_frame(bytes(view[start:offset]))
+    finally:
+        view.release()
+        if offset:
+            del buf[:offset]
+
 # Only import socket/select for non-browser
 if not IS_BROWSER:
     import socket
@@ -175,16 +223,24 @@ class Protocol:
         # Client type override (for RC/NC connections)
         self.client_type_override: Optional[ClientType] = None
 
-        # Receive buffer
-        self.recv_buffer = b""
+        # Receive buffer: framed, still-encrypted bytes. Only ever appended to
+        # and compacted once per recv_packets() call (see _consume_frames).
+        self.recv_buffer = bytearray()
+        self._recv_scratch = bytearray(RECV_CHUNK_SIZE)
 
         # Raw data mode (for level boards)
         self.raw_data_expected = 0
-        self.raw_data_buffer = b""
+        self.raw_data_buffer = bytearray()
 
         # Optional outgoing-packet recorder for the coverage harness:
         # packet_id -> list of payloads sent (after the id byte, before newline).
         self.sent_payloads: Optional[Dict[int, List[bytes]]] = None
+        # Optional inbound recorder (capture.CaptureWriter): every packet
+        # recv_packets() returns is appended to it for later replay.
+        self.capture = None
+        # Seconds the last recv_packets() spent draining and decoding, not
+        # counting the select() wait (Client packet timing reads this).
+        self.last_decode_time = 0.0
         self.outbound_policy = None
         self.last_outbound_policy_result = None
 
@@ -199,6 +255,19 @@ class Protocol:
         # can never corrupt the stream, no matter how many threads call in.
         self._send_lock = threading.Lock()
 
+        # Outbound batching. Off by default: every send_packet() is written
+        # immediately. When on, packets are encrypted in call order into
+        # _send_batch and written with one sendall per flush() (Client.update
+        # flushes once per tick), or as soon as batch_flush_bytes is reached.
+        self.batch_sends = False
+        self.batch_flush_bytes = SEND_BATCH_FLUSH_BYTES
+        self._send_batch = bytearray()
+        self._send_batch_packets = 0
+        self.flush_count = 0
+        self.packets_flushed = 0
+        self.bytes_flushed = 0
+        self.max_packets_per_flush = 0
+
     def connect(self) -> bool:
         """Connect to server"""
         try:
@@ -208,27 +277,7 @@ class Protocol:
                 (self.host, self.port), timeout=self.connect_timeout)
             self.socket.setblocking(False)
             self.connected = True
-
-            # Reset per-session decode state. Without this, reconnecting on
-            # the same Protocol instance (e.g. after disconnect()) resumes
-            # decrypting with a stale codec/iterator, leftover framed bytes
-            # in recv_buffer, and a leftover raw-data deficit from the
-            # previous connection.
-            self.encryption_key = random.randint(0, 127)
-            if self.gen == 2:
-                self.codec = Gen2Codec()
-            elif self.gen == 3:
-                self.codec = Gen3Codec(self.encryption_key)
-            elif self.gen == 4:
-                self.codec = Gen4Codec(self.encryption_key)
-            else:
-                self.codec = Gen5Codec(self.encryption_key)
-            self.first_packet = True
-            self.recv_buffer = b""
-            self.raw_data_expected = 0
-            self.raw_data_buffer = b""
-            self.last_handshake_gen = None
-
+            self._reset_session()
             return True
         except Exception as e:
             print(f"Connection failed: {e}")
@@ -240,6 +289,32 @@ class Protocol:
             self.socket = None
             return False
 
+    def _reset_session(self) -> None:
+        """Reset per-session decode state for a fresh connection.
+
+        Without this, reconnecting on the same Protocol instance (e.g. after
+        disconnect()) resumes decrypting with a stale codec/iterator,
+        leftover framed bytes in recv_buffer, and a leftover raw-data deficit
+        from the previous connection.
+        """
+        self.encryption_key = random.randint(0, 127)
+        if self.gen == 2:
+            self.codec = Gen2Codec()
+        elif self.gen == 3:
+            self.codec = Gen3Codec(self.encryption_key)
+        elif self.gen == 4:
+            self.codec = Gen4Codec(self.encryption_key)
+        else:
+            self.codec = Gen5Codec(self.encryption_key)
+        self.first_packet = True
+        self.recv_buffer = bytearray()
+        self.raw_data_expected = 0
+        self.raw_data_buffer = bytearray()
+        self.last_handshake_gen = None
+        # Encrypted with the previous session's cipher stream.
+        self._send_batch = bytearray()
+        self._send_batch_packets = 0
+
     def use_gen2(self):
         """
         Switch this connection to ENCRYPT_GEN_2 framing (used by NC clients).
@@ -254,6 +329,7 @@ class Protocol:
 
     def disconnect(self):
         """Disconnect from server"""
+        self.flush()
         self.connected = False
         if self.socket:
             try:
@@ -307,9 +383,8 @@ class Protocol:
             compressed = zlib.compress(bytes(packet))
             length = struct.pack('>H', len(compressed))
             with self._send_lock:
-                self.socket.setblocking(True)
-                self.socket.sendall(length + compressed)
-                self.socket.setblocking(False)
+                self._flush_locked()
+                self._sendall(length + compressed)
             return True
 
         except Exception as e:
@@ -352,9 +427,13 @@ class Protocol:
             # stream and desyncs the server - see _send_lock).
             with self._send_lock:
                 encrypted = self.codec.send_packet(packet)
-                self.socket.setblocking(True)
-                self.socket.sendall(encrypted)
-                self.socket.setblocking(False)
+                if not self.batch_sends:
+                    self._sendall(encrypted)
+                    return True
+                self._send_batch += encrypted
+                self._send_batch_packets += 1
+                if len(self._send_batch) >= self.batch_flush_bytes:
+                    self._flush_locked()
             return True
 
         except Exception as e:
@@ -362,13 +441,87 @@ class Protocol:
             self.connected = False
             return False
 
+    def flush(self) -> bool:
+        """Write every batched packet with a single sendall.
+
+        A no-op unless batch_sends queued something. Returns False if the
+        write failed (the connection is then marked disconnected, as for an
+        unbatched send).
+        """
+        if not self._send_batch:
+            return True
+        if not self.socket or not self.connected:
+            self._send_batch = bytearray()
+            self._send_batch_packets = 0
+            return False
+        try:
+            with self._send_lock:
+                self._flush_locked()
+            return True
+        except Exception as e:
+            print(f"Send failed: {e}")
+            self.connected = False
+            return False
+
+    def _flush_locked(self) -> None:
+        """flush() body. Caller holds _send_lock."""
+        if not self._send_batch:
+            return
+        data, count = self._send_batch, self._send_batch_packets
+        # Detach first: a failed write must not be retried with bytes the
+        # cipher stream has already moved past.
+        self._send_batch = bytearray()
+        self._send_batch_packets = 0
+        self._sendall(data)
+        self.flush_count += 1
+        self.packets_flushed += count
+        self.bytes_flushed += len(data)
+        if count > self.max_packets_per_flush:
+            self.max_packets_per_flush = count
+
+    def send_stats(self) -> Dict[str, float]:
+        """Counters for batched sends (all zero while batching is off)."""
+        return {
+            'flushes': self.flush_count,
+            'packets_flushed': self.packets_flushed,
+            'bytes_flushed': self.bytes_flushed,
+            'packets_per_flush': (self.packets_flushed / self.flush_count
+                                  if self.flush_count else 0.0),
+            'max_packets_per_flush': self.max_packets_per_flush,
+            'pending_packets': self._send_batch_packets,
+            'pending_bytes': len(self._send_batch),
+        }
+
+    def _sendall(self, data: bytes) -> None:
+        """Write data in full. Caller holds _send_lock.
+
+        The socket is otherwise non-blocking; it is switched to blocking only
+        for the duration of the write so sendall cannot fail half way through
+        on a full kernel buffer.
+        """
+        self.socket.setblocking(True)
+        self.socket.sendall(data)
+        self.socket.setblocking(False)
+
     def recv_packets(self, timeout: float = 0.01) -> List[Tuple[int, bytes]]:
         """
         Receive and decode packets (non-blocking).
         Returns list of (packet_id, data) tuples.
         """
+        packets, self.last_decode_time = self._read_packets(timeout)
+        if self.capture is not None:
+            self.capture.write(packets)
+        return packets
+
+    def _read_packets(self, timeout: float
+                      ) -> Tuple[List[Tuple[int, bytes]], float]:
+        """recv_packets() without the capture: wait up to timeout, drain the
+        socket and decode what arrived. Returns the packets and the seconds
+        spent draining and decoding. ThreadedProtocol's reader thread calls
+        this and records on the consumer side instead."""
+        decode_time = 0.0
         if not self.socket or not self.connected:
-            return []
+            return [], decode_time
 
         packets = []
 
@@ -376,7 +529,8 @@ class Protocol:
             # Check if data available
             ready, _, _ = select.select([self.socket], [], [], timeout)
             if not ready:
-                return []
+                return [], decode_time
+            decode_start = time.perf_counter()
 
             # Drain the burst already queued by the kernel. Level entry can
             # deliver several MiB before one 60 Hz update, while one recv here
@@ -384,136 +538,471 @@ class Protocol:
             # behind its assets. BlockingIOError ends the burst without a
             # second select syscall; the budget bounds work if the peer keeps
             # filling the socket faster than this client consumes it.
-            self.socket.setblocking(False)
-            received = 0
+            self._drain_socket()
+
+            # NOTE: raw-data (PLO_RAWDATA) continuation is handled entirely
+            # inside _split_bundle on DECRYPTED bundles, not here.
+            # self.recv_buffer at this point still holds length-prefixed,
+            # encrypted/compressed frames - satisfying a raw-data deficit from
+            # it (as a previous version of this method did) would eat frame
+            # headers and ciphertext as if they were the raw payload,
+            # desyncing the whole session the moment a raw block doesn't fit
+            # in one bundle. The deficit (self.raw_data_expected/
+            # self.raw_data_buffer) is only ever satisfied from DECRYPTED
+            # bundles, carrying over across recv_packets() calls if needed.
+            def handle_frame(packet_data: bytes) -> None:
+                decrypted = self._decrypt_frame(packet_data)
+                if decrypted:
+                    self._split_bundle(decrypted, packets)
+
+            _consume_frames(self.recv_buffer, handle_frame)
+            decode_time = time.perf_counter() - decode_start
+
+        except Exception as e:
+            print(f"Recv error: {e}")
+
+        return packets, decode_time
+
+    def _drain_socket(self) -> None:
+        """Append everything the kernel has queued (up to the drain budget)
+        to recv_buffer. Only called once select() reported the socket
+        readable."""
+        self.socket.setblocking(False)
+        if not isinstance(self.recv_buffer, bytearray):
+            self.recv_buffer = bytearray(self.recv_buffer)
+        buf = self.recv_buffer
+        scratch = memoryview(self._recv_scratch)
+        received = 0
+        try:
+            while received < MAX_SOCKET_DRAIN_BYTES:
+                count = self.socket.recv_into(
+                    scratch, min(RECV_CHUNK_SIZE, MAX_SOCKET_DRAIN_BYTES - received))
+                if not count:
+                    self.connected = False
+                    # A draining call can read the peer's final bundle and
+                    # then observe EOF immediately; recv_packets parses those
+                    # bytes because connected=False prevents a later call
+                    # from recovering them.
+                    break
+                buf += scratch[:count]
+                received += count
+        except BlockingIOError:
+            pass
+        except Exception:
+            self.connected = False
+            # Bytes received before this failing iteration remain valid and
+            # must not be stranded behind the disconnected guard above.
+        finally:
+            scratch.release()
+
+    def _decrypt_frame(self, packet_data: bytes) -> Optional[bytes]:
+        """Decrypt/decompress one length-prefixed frame.
+
+        first_packet is cleared unconditionally after this first attempt (even
+        if zlib fails and we fall back to the codec) - otherwise a non-zlib
+        first bundle would make every later packet pay a zlib.decompress
+        exception.
+        """
+        if self.first_packet:
+            self.first_packet = False
             try:
-                while received < MAX_SOCKET_DRAIN_BYTES:
-                    chunk = self.socket.recv(
-                        min(65536, MAX_SOCKET_DRAIN_BYTES - received))
-                    if not chunk:
-                        self.connected = False
-                        # A draining call can read the peer's final bundle and
-                        # then observe EOF immediately; parse those bytes below
-                        # because connected=False prevents a later call from
-                        # recovering them.
-                        break
-                    self.recv_buffer += chunk
-                    received += len(chunk)
-            except BlockingIOError:
-                pass
+                return _decompress_bounded(packet_data)
+            except DecompressionLimitError as e:
+                print(f"Dropping oversized first packet: {e}")
+                return None
             except Exception:
-                self.connected = False
-                # Bytes received before this failing iteration remain valid and
-                # must not be stranded behind the disconnected guard above.
+                return self.codec.recv_packet(packet_data)
+        return self.codec.recv_packet(packet_data)
 
-            # NOTE: raw-data (PLO_RAWDATA) continuation is handled entirely
-            # inside the decrypted-bundle loop below, not here. self.recv_buffer
-            # at this point still holds length-prefixed, encrypted/compressed
-            # frames - satisfying a raw-data deficit from it (as a previous
-            # version of this method did) would eat frame headers and ciphertext
-            # as if they were the raw payload, desyncing the whole session the
-            # moment a raw block doesn't fit in one bundle. The deficit
-            # (self.raw_data_expected/self.raw_data_buffer) is only ever
-            # satisfied from DECRYPTED bundles, carrying over across
-            # recv_packets() calls if needed.
-
-            # Process complete packets from buffer
-            while len(self.recv_buffer) >= 2:
-                # Read length prefix
-                length = struct.unpack('>H', self.recv_buffer[:2])[0]
-
-                if len(self.recv_buffer) < 2 + length:
-                    break  # Incomplete packet
-
-                # Extract packet data
-                packet_data = self.recv_buffer[2:2 + length]
-                self.recv_buffer = self.recv_buffer[2 + length:]
-
-                # Decrypt/decompress. first_packet is cleared unconditionally
-                # after this first attempt (even if zlib fails and we fall
-                # back to the codec) - otherwise a non-zlib first bundle would
-                # make every later packet pay a zlib.decompress exception.
-                if self.first_packet:
-                    self.first_packet = False
-                    try:
-                        decrypted = _decompress_bounded(packet_data)
-                    except DecompressionLimitError as e:
-                        print(f"Dropping oversized first packet: {e}")
-                        continue
-                    except Exception:
-                        decrypted = self.codec.recv_packet(packet_data)
+    def _split_bundle(self, decrypted: bytes,
+                      packets: List[Tuple[int, bytes]]) -> None:
+        """Append the packets of one decrypted bundle to packets.
+
+        Handles PLO_RAWDATA specially - the next N bytes are a raw packet.
+        """
+        pos = 0
+        while pos < len(decrypted):
+            # Check if we're expecting (more) raw data from a previous
+            # PLO_RAWDATA header, possibly carried over from an earlier
+            # decrypted bundle (self.raw_data_buffer holds what we've
+            # collected so far; self.raw_data_expected is the total
+            # size the header declared). The buffer is a bytearray that is
+            # only extended, so a board or file spread over many bundles is
+            # reassembled in linear time.
+            if self.raw_data_expected > 0:
+                needed = self.raw_data_expected - len(self.raw_data_buffer)
+                take = min(needed, len(decrypted) - pos)
+                with memoryview(decrypted) as view:
+                    self.raw_data_buffer += view[pos:pos + take]
+                pos += take
+
+                if len(self.raw_data_buffer) < self.raw_data_expected:
+                    # Still short - wait for the next decrypted bundle.
+                    break
+
+                raw_packet = bytes(self.raw_data_buffer)
+                del self.raw_data_buffer[:]
+                self.raw_data_expected = 0
+
+                # Raw data format: [packet_id+32][data...][newline]
+                # Extract packet_id and strip header/trailer
+                if len(raw_packet) >= 2:
+                    packet_id = raw_packet[0] - 32
+                    # Strip packet ID byte and trailing newline
+                    packet_body = raw_packet[1:]
+                    if packet_body and packet_body[-1:] == b'\n':
+                        packet_body = packet_body[:-1]
+                    packets.append((packet_id, packet_body))
                 else:
-                    decrypted = self.codec.recv_packet(packet_data)
-
-                if not decrypted:
-                    continue
-
-                # Parse packets from decompressed data
-                # Handle PLO_RAWDATA specially - the next N bytes are a raw packet
-                pos = 0
-                while pos < len(decrypted):
-                    # Check if we're expecting (more) raw data from a previous
-                    # PLO_RAWDATA header, possibly carried over from an earlier
-                    # decrypted bundle (self.raw_data_buffer holds what we've
-                    # collected so far; self.raw_data_expected is the total
-                    # size the header declared).
-                    if self.raw_data_expected > 0:
-                        needed = self.raw_data_expected - len(self.raw_data_buffer)
-                        take = min(needed, len(decrypted) - pos)
-                        self.raw_data_buffer += decrypted[pos:pos + take]
-                        pos += take
-
-                        if len(self.raw_data_buffer) < self.raw_data_expected:
-                            # Still short - wait for the next decrypted bundle.
+                    # Emit as PLO_BOARDPACKET (101) with raw tile data
+                    packets.append((101, raw_packet))
+                continue
+
+            # Normal packet: read to newline
+            newline = decrypted.find(b'\n', pos)
+            if newline == -1:
+                break
+
+            packet_bytes = decrypted[pos:newline]
+            pos = newline + 1
+
+            if packet_bytes and len(packet_bytes) >= 1:
+                packet_id = packet_bytes[0] - 32
+                packet_body = packet_bytes[1:] if len(packet_bytes) > 1 else b""
+
+                # Check for PLO_RAWDATA (100) - next packet is raw bytes
+                if packet_id == 100 and len(packet_body) >= 3:
+                    b1 = packet_body[0] - 32
+                    b2 = packet_body[1] - 32
+                    b3 = packet_body[2] - 32
+                    raw_size = (b1 << 14) | (b2 << 7) | b3
+                    raw_size = max(0, raw_size)
+                    self.raw_data_expected = raw_size
+                    del self.raw_data_buffer[:]
+
+                packets.append((packet_id, packet_body))
+
+
+# =============================================================================
+# Threaded Protocol - socket reads on a background thread
+# =============================================================================
+
+class ThreadedProtocol(Protocol):
+    """Protocol whose socket draining, decryption and decompression run on a
+    background reader thread.
+
+    The reader splits bundles into (packet_id, data) tuples and hands them over
+    through a bounded queue, so recv_packets() on the caller's thread only
+    dequeues already-decoded packets: a slow render frame no longer delays
+    reading the socket, and a multi-megabyte level-entry burst no longer
+    stalls the frame that happens to drain it.
+
+    Sending is unchanged and stays on the caller's thread under _send_lock.
+    The socket is kept in blocking mode for the whole session instead of being
+    toggled around each send, because the reader thread reads from it
+    concurrently: a send flipping it to blocking mid-drain would stall the
+    reader, and the reader flipping it back mid-sendall would make the write
+    fail on a full buffer.
+
+    Opt in with Client(..., threaded_io=True).
+    """
+
+    def __init__(self, host: str, port: int, version: str = "2.22",
+                 max_queue: int = MAX_INBOUND_QUEUE):
+        super().__init__(host, port, version)
+        self.max_queue = max_queue
+        # (enqueue monotonic time, packet_id, data)
+        self._inbound: "queue.Queue[Tuple[float, int, bytes]]" = queue.Queue(max_queue)
+        self._reader: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._reset_transport_stats()
+
+    def _reset_transport_stats(self) -> None:
+        self.packets_queued = 0
+        self.packets_dispatched = 0
+        self.peak_queue_depth = 0
+        # Seconds a packet sat in the queue between decode and dispatch.
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        # Total seconds the reader spent blocked on a full queue.
+        self.reader_blocked_time = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Decoded packets waiting for the next recv_packets() call."""
+        return self._inbound.qsize()
+
+    def transport_stats(self) -> Dict[str, float]:
+        """Snapshot of the queue depth and lag metrics."""
+        return {
+            'queue_depth': self.queue_depth,
+            'peak_queue_depth': self.peak_queue_depth,
+            'max_queue': self.max_queue,
+            'packets_queued': self.packets_queued,
+            'packets_dispatched': self.packets_dispatched,
+            'last_lag': self.last_lag,
+            'max_lag': self.max_lag,
+            'reader_blocked_time': self.reader_blocked_time,
+        }
+
+    def connect(self) -> bool:
+        """Connect, then start the reader thread."""
+        self._stop_reader()
+        if not super().connect():
+            return False
+        self._start_reader()
+        return True
+
+    def _start_reader(self) -> None:
+        self.socket.setblocking(True)
+        self._inbound = queue.Queue(self.max_queue)
+        self._reset_transport_stats()
+        stop_event = threading.Event()
+        self._stop = stop_event
+        self._reader = threading.Thread(target=self._run_reader, args=(stop_event,),
+                                        name="pyreborn-net", daemon=True)
+        self._reader.start()
+
+    def disconnect(self):
+        """Stop the reader thread, then close the socket."""
+        self._stop_reader()
+        super().disconnect()
+
+    def _stop_reader(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        reader = self._reader
+        if (reader is not None and reader.is_alive()
+                and reader is not threading.current_thread()):
+            reader.join(timeout=timeout)
+        self._reader = None
+
+    def _sendall(self, data: bytes) -> None:
+        # Blocking for the whole session - see the class docstring.
+        self.socket.sendall(data)
+
+    def _drain_socket(self) -> None:
+        """Blocking-socket drain: select() decides whether another recv_into
+        would return immediately, since BlockingIOError never ends the burst
+        here."""
+        if not isinstance(self.recv_buffer, bytearray):
+            self.recv_buffer = bytearray(self.recv_buffer)
+        buf = self.recv_buffer
+        sock = self.socket
+        scratch = memoryview(self._recv_scratch)
+        received = 0
+        try:
+            while received < MAX_SOCKET_DRAIN_BYTES:
+                count = sock.recv_into(
+                    scratch, min(RECV_CHUNK_SIZE, MAX_SOCKET_DRAIN_BYTES - received))
+                if not count:
+                    self.connected = False
+                    break
+                buf += scratch[:count]
+                received += count
+                ready, _, _ = select.select([sock], [], [], 0)
+                if not ready:
+                    break
+        except Exception:
+            self.connected = False
+        finally:
+            scratch.release()
+
+    def _run_reader(self, stop_event: threading.Event) -> None:
+        inbound = self._inbound
+        while not stop_event.is_set() and self.connected:
+            packets, _ = self._read_packets(READER_POLL_INTERVAL)
+            for packet_id, data in packets:
+                item = (time.monotonic(), packet_id, data)
+                try:
+                    inbound.put_nowait(item)
+                except queue.Full:
+                    blocked_at = time.monotonic()
+                    while not stop_event.is_set():
+                        try:
+                            inbound.put(item, timeout=READER_POLL_INTERVAL)
                             break
+                        except queue.Full:
+                            continue
+                    self.reader_blocked_time += time.monotonic() - blocked_at
+                    if stop_event.is_set():
+                        return
+                self.packets_queued += 1
+            depth = inbound.qsize()
+            if depth > self.peak_queue_depth:
+                self.peak_queue_depth = depth
+
+    def recv_packets(self, timeout: float = 0.01) -> List[Tuple[int, bytes]]:
+        """
+        Dequeue the packets the reader thread has decoded so far.
+
+        Waits up to timeout for the first one. Still returns whatever was
+        queued before the connection dropped, so the server's final bundle
+        (e.g. a PLO_DISCMESSAGE) is dispatched like on the unthreaded path.
+
+        last_decode_time is this call's own drain of the queue, not counting
+        the wait: decoding already happened on the reader thread.
+        """
+        inbound = self._inbound
+        self.last_decode_time = 0.0
+        try:
+            if timeout > 0:
+                items = [inbound.get(timeout=timeout)]
+            else:
+                items = [inbound.get_nowait()]
+        except queue.Empty:
+            return []
+        drain_start = time.perf_counter()
+        while True:
+            try:
+                items.append(inbound.get_nowait())
+            except queue.Empty:
+                break
+
+        now = time.monotonic()
+        lag = now - items[0][0]
+        self.last_lag = lag
+        if lag > self.max_lag:
+            self.max_lag = lag
+        self.packets_dispatched += len(items)
+        packets = [(packet_id, data) for _, packet_id, data in items]
+        self.last_decode_time = time.perf_counter() - drain_start
+        if self.capture is not None:
+            self.capture.write(packets, timestamp=items[0][0])
+        return packets
+
 
-                        raw_packet = self.raw_data_buffer
-                        self.raw_data_buffer = b""
-                        self.raw_data_expected = 0
-
-                        # Raw data format: [packet_id+32][data...][newline]
-                        # Extract packet_id and strip header/trailer
-                        if len(raw_packet) >= 2:
-                            packet_id = raw_packet[0] - 32
-                            # Strip packet ID byte and trailing newline
-                            packet_body = raw_packet[1:]
-                            if packet_body and packet_body[-1:] == b'\n':
-                                packet_body = packet_body[:-1]
-                            packets.append((packet_id, packet_body))
-                        else:
-                            # Emit as PLO_BOARDPACKET (101) with raw tile data
-                            packets.append((101, raw_packet))
-                        continue
-
-                    # Normal packet: read to newline
-                    newline = decrypted.find(b'\n', pos)
-                    if newline == -1:
-                        break
-
-                    packet_bytes = decrypted[pos:newline]
-                    pos = newline + 1
-
-                    if packet_bytes and len(packet_bytes) >= 1:
-                        packet_id = packet_bytes[0] - 32
-                        packet_body = packet_bytes[1:] if len(packet_bytes) > 1 else b""
-
-                        # Check for PLO_RAWDATA (100) - next packet is raw bytes
-                        if packet_id == 100 and len(packet_body) >= 3:
-                            b1 = packet_body[0] - 32
-                            b2 = packet_body[1] - 32
-                            b3 = packet_body[2] - 32
-                            raw_size = (b1 << 14) | (b2 << 7) | b3
-                            raw_size = max(0, raw_size)
-                            self.raw_data_expected = raw_size
-                            self.raw_data_buffer = b""
-
-                        packets.append((packet_id, packet_body))
+# =============================================================================
+# asyncio Protocol - one event loop, many connections
+# =============================================================================
+
+class AsyncProtocol(Protocol, asyncio.Protocol):
+    """Protocol driven by an asyncio event loop instead of select().
+
+    Same codecs, framing and PLO_RAWDATA reassembly as Protocol; the event
+    loop pushes bytes in through data_received() and they are decoded there,
+    so one loop can serve hundreds of connections without a socket poll per
+    client. recv_packets() just hands over what has been decoded, and
+    wait_packets() lets a coroutine sleep until something arrives.
+
+    Used by AsyncClient (see async_client.py); connect with
+    ``await connect_async()``.
+    """
 
+    def __init__(self, host: str, port: int, version: str = "2.22"):
+        Protocol.__init__(self, host, port, version)
+        self.transport: Optional[asyncio.Transport] = None
+        self.pending_packets: List[Tuple[int, bytes]] = []
+        self._packets_ready: Optional[asyncio.Event] = None
+        self._reading_paused = False
+        # Decode time accumulated by data_received until recv_packets.
+        self._pending_decode_time = 0.0
+
+    def connect(self) -> bool:
+        raise RuntimeError("AsyncProtocol connects with 'await connect_async()'")
+
+    async def connect_async(self) -> bool:
+        """Open the connection on the running event loop."""
+        loop = asyncio.get_running_loop()
+        self._packets_ready = asyncio.Event()
+        try:
+            await asyncio.wait_for(
+                loop.create_connection(lambda: self, self.host, self.port),
+                self.connect_timeout)
+            return True
+        except Exception as e:
+            print(f"Connection failed: {e}")
+            if self.transport is not None:
+                self.transport.close()
+            self.transport = None
+            self.socket = None
+            self.connected = False
+            return False
+
+    # -- asyncio.Protocol callbacks ---------------------------------------
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+        # Only consulted by the "is there a connection" guards in
+        # send_login/send_packet; all I/O goes through the transport.
+        self.socket = transport.get_extra_info('socket')
+        self.connected = True
+        self._reset_session()
+        self.pending_packets = []
+        self._reading_paused = False
+        self._pending_decode_time = 0.0
+
+    def data_received(self, data: bytes) -> None:
+        decode_start = time.perf_counter()
+        self.recv_buffer += data
+        try:
+            _consume_frames(self.recv_buffer, self._handle_frame)
         except Exception as e:
             print(f"Recv error: {e}")
+        self._pending_decode_time += time.perf_counter() - decode_start
+        if self.pending_packets:
+            if (len(self.pending_packets) >= MAX_INBOUND_QUEUE
+                    and not self._reading_paused):
+                # Nobody is dispatching; let TCP push back on the server.
+                self._reading_paused = True
+                self.transport.pause_reading()
+            self._packets_ready.set()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.connected = False
+        self.transport = None
+        self.socket = None
+        if self._packets_ready is not None:
+            self._packets_ready.set()
+
+    # -- Protocol overrides -----------------------------------------------
+
+    def _handle_frame(self, packet_data: bytes) -> None:
+        decrypted = self._decrypt_frame(packet_data)
+        if decrypted:
+            self._split_bundle(decrypted, self.pending_packets)
+
+    def _sendall(self, data: bytes) -> None:
+        self.transport.write(data)
 
+    def disconnect(self):
+        """Flush batched sends and close the transport."""
+        self.flush()
+        self.connected = False
+        if self.transport is not None:
+            self.transport.close()
+        self.transport = None
+        self.socket = None
+
+    def recv_packets(self, timeout: float = 0.0) -> List[Tuple[int, bytes]]:
+        """Hand over the packets decoded so far (never blocks).
+
+        last_decode_time is what data_received spent decoding them, summed
+        over every chunk since the previous call.
+        """
+        packets = self.pending_packets
+        self.pending_packets = []
+        self.last_decode_time = self._pending_decode_time
+        self._pending_decode_time = 0.0
+        if self._packets_ready is not None:
+            self._packets_ready.clear()
+        if self._reading_paused and self.transport is not None:
+            self._reading_paused = False
+            self.transport.resume_reading()
+        if self.capture is not None:
+            self.capture.write(packets)
         return packets
 
+    async def wait_packets(self, timeout: float) -> bool:
+        """Wait up to timeout for decoded packets (or the connection to
+        drop). Returns True if packets are pending."""
+        if self.pending_packets or not self.connected:
+            return bool(self.pending_packets)
+        try:
+            await asyncio.wait_for(self._packets_ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return bool(self.pending_packets)
+
 
 # =============================================================================
 # WebSocket Protocol (for browser/Pyodide)
@@ -563,9 +1052,9 @@ class WebSocketProtocol:
         self.client_type_override: Optional[ClientType] = None
 
         # Receive buffer and packet queue
-        self.recv_buffer = b""
+        self.recv_buffer = bytearray()
         self.raw_data_expected = 0
-        self.raw_data_buffer = b""
+        self.raw_data_buffer = bytearray()
         self.pending_packets: List[Tuple[int, bytes]] = []
         self.outbound_policy = None
         self.last_outbound_policy_result = None
@@ -596,9 +1085,9 @@ class WebSocketProtocol:
         self.encryption_key = random.randint(0, 127)
         self.codec = Gen5Codec(self.encryption_key)
         self.first_packet = True
-        self.recv_buffer = b""
+        self.recv_buffer = bytearray()
         self.raw_data_expected = 0
-        self.raw_data_buffer = b""
+        self.raw_data_buffer = bytearray()
         self.pending_packets = []
         self._tcp_connected = False
         self.last_handshake_gen = None
@@ -688,35 +1177,30 @@ class WebSocketProtocol:
         # frames (mirrors the fix in Protocol.recv_packets; see that method's
         # comment for why consuming from the pre-decryption buffer desyncs
         # the session).
-
-        # Process framed packets
-        while len(self.recv_buffer) >= 2:
-            length = struct.unpack('>H', self.recv_buffer[:2])[0]
-
-            if len(self.recv_buffer) < 2 + length:
-                break
-
-            packet_data = self.recv_buffer[2:2 + length]
-            self.recv_buffer = self.recv_buffer[2 + length:]
-
-            # Decrypt/decompress. first_packet is cleared unconditionally
-            # after this first attempt - see Protocol.recv_packets.
-            if self.first_packet:
-                self.first_packet = False
-                try:
-                    decrypted = _decompress_bounded(packet_data)
-                except DecompressionLimitError as e:
-                    print(f"Dropping oversized first packet: {e}")
-                    continue
-                except Exception:
-                    decrypted = self.codec.recv_packet(packet_data)
-            else:
+        if not isinstance(self.recv_buffer, bytearray):
+            self.recv_buffer = bytearray(self.recv_buffer)
+        _consume_frames(self.recv_buffer, self._handle_frame)
+
+    def _handle_frame(self, packet_data: bytes):
+        """Decrypt one framed bundle and queue the packets it carries."""
+        # Decrypt/decompress. first_packet is cleared unconditionally
+        # after this first attempt - see Protocol._decrypt_frame.
+        if self.first_packet:
+            self.first_packet = False
+            try:
+                decrypted = _decompress_bounded(packet_data)
+            except DecompressionLimitError as e:
+                print(f"Dropping oversized first packet: {e}")
+                return
+            except Exception:
                 decrypted = self.codec.recv_packet(packet_data)
+        else:
+            decrypted = self.codec.recv_packet(packet_data)
 
-            if not decrypted:
-                continue
+        if not decrypted:
+            return
 
-            self._parse_packets(decrypted)
+        self._parse_packets(decrypted)
 
     def _parse_packets(self, decrypted: bytes):
         """Parse packets from decrypted data."""
@@ -729,15 +1213,16 @@ class WebSocketProtocol:
             if self.raw_data_expected > 0:
                 needed = self.raw_data_expected - len(self.raw_data_buffer)
                 take = min(needed, len(decrypted) - pos)
-                self.raw_data_buffer += decrypted[pos:pos + take]
+                with memoryview(decrypted) as view:
+                    self.raw_data_buffer += view[pos:pos + take]
                 pos += take
 
                 if len(self.raw_data_buffer) < self.raw_data_expected:
                     # Still short - wait for the next decrypted bundle.
                     break
 
-                raw_packet = self.raw_data_buffer
-                self.raw_data_buffer = b""
+                raw_packet = bytes(self.raw_data_buffer)
+                del self.raw_data_buffer[:]
                 self.raw_data_expected = 0
 
                 # Raw data format: [packet_id+32][data...][newline] - strip
@@ -771,7 +1256,7 @@ class WebSocketProtocol:
                     raw_size = (b1 << 14) | (b2 << 7) | b3
                     raw_size = max(0, raw_size)
                     self.raw_data_expected = raw_size
-                    self.raw_data_buffer = b""
+                    del self.raw_data_buffer[:]
 
                 self.pending_packets.append((packet_id, packet_body))
 
@@ -842,6 +1327,10 @@ class WebSocketProtocol:
             print(f"Send failed: {e}")
             return False
 
+    def flush(self) -> bool:
+        """Sends are never batched here; present for interface parity."""
+        return True
+
     def _send_bytes(self, data: bytes):
         """Send bytes over WebSocket."""
         try:
@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Tuple
 import pygame
 
 from . import Client
+from .asset_fetch import PRIORITY_VISIBLE, AssetFetchScheduler
 from .gani import GaniParser, AnimationState
 from .sprites import SpriteManager, TilesetManager, create_placeholder_sprite, create_shadow_sprite
 from .sounds import SoundManager, preload_common_sounds
@@ -36,6 +37,7 @@ from .game.input import InputMixin
 from .game.actions import ActionsMixin
 from .game.render import RenderMixin
 from .game.render_world import WorldRenderMixin
+from .game.render_dirty import DirtyRenderMixin
 from .game.render_entities import EntityRenderMixin, BaddySheet
 from .game.render_effects import EffectsRenderMixin
 from .game.render_objects import LevelObjectsRenderMixin
@@ -49,6 +51,7 @@ class GameClient(
     ActionsMixin,
     RenderMixin,
     WorldRenderMixin,
+    DirtyRenderMixin,
     EntityRenderMixin,
     EffectsRenderMixin,
     # The three render mixins that touch a frame inherit FrameContextMixin
@@ -143,6 +146,9 @@ class GameClient(
         self.sprite_mgr = SpriteManager(
             self.asset_paths, fetch_bytes=self.client.get_file)
         self.tileset_mgr = TilesetManager(self.sprite_mgr)
+        # Orders and windows file requests (visible sheets/ganis before
+        # sounds and music) and times warp -> first complete frame.
+        self.asset_fetch = AssetFetchScheduler(self.client)
         # Classic (2.x) servers assume the classic client's BUILT-IN default
         # tileset, pics1.png — their scripts only issue addtiledef to RESET
         # back to it after area tilesets (GTA's `addtiledef pics1.png,,0`).
@@ -154,7 +160,7 @@ class GameClient(
             self.tileset_mgr.default_tileset = "pics1.png"
             try:
                 if not self.sprite_mgr.load_sheet("pics1.png"):
-                    self.client.request_file("pics1.png")
+                    self.asset_fetch.request("pics1.png", PRIORITY_VISIBLE)
             except Exception:
                 pass
         # Tiledef applicability is scoped by level-name prefix; seed the
@@ -199,6 +205,7 @@ class GameClient(
 
         # GS1 interpreter for NPC scripts (shared engine, client-side host)
         self.gs1 = ClientGS1(self.client)
+        self.gs1.asset_fetch = self.asset_fetch
         # Seed the script engines' screen size with the REAL window size
         # before any server script runs. It used to stay at the 800x600
         # default until _feed_gs1_input's per-frame sync -- which never runs
@@ -350,6 +357,10 @@ class GameClient(
 
         # Debug/tile editing mode
         self.debug_mode = False
+        # Dirty-region rendering (render_dirty.py): redraw only what moved
+        # over a cached world layer while the camera holds still. Off by
+        # default; cuts CPU for idle clients and multi-client bot hosts.
+        self.dirty_rendering = False
         # Noclip: ignore client-side collision so the player can walk through
         # walls. Mainly an escape hatch for bad server spawns (e.g. classic 2.22
         # servers that warp you into a border-wall tile and leave you stuck).
@@ -490,6 +501,8 @@ class GameClient(
             # latency without changing the frame rate.
             self.client.update(timeout=0)
             self._update_low_hearts_warning()
+            # Retire answered asset requests and refill the request window.
+            self.asset_fetch.pump()
 
             # Load + run NPCs that streamed in after startup (slow server).
             self._load_new_npcs()
@@ -542,12 +555,15 @@ class GameClient(
 
             # Render
             self._render()
+            self.asset_fetch.frame_rendered(self.gs1.board_ready())
 
             # Cap framerate
             self.clock.tick(60)
 
         # Cleanup
         print(f"Game loop exited after {frame_count} frames. running={self.running}, connected={self.client.connected}")
+        if self._dbg:
+            print(f"[assets] {self.asset_fetch.report()}")
         # Remember whatever size the WM/player left the window at, mirroring
         # pygame_screens.py's _Screen._finish, so the next launch (login
         # screen, then this game) opens at it instead of snapping back to
@@ -147,6 +147,10 @@ _MAX_CACHED_SHEETS = 300
 _MAX_CACHED_SPRITES = 4000
 _MAX_CACHED_RECOLOR_SHEETS = 150
 _MAX_CACHED_RECOLOR_SPRITES = 4000
+# TilesetManager keeps tile/composed-sheet caches for this many recent
+# tiledef fingerprints: enough for the overworld plus an interior or two
+# with their own defs, each bucket being at most one composed sheet.
+_MAX_TILESET_FINGERPRINTS = 4
 
 # Representative full equipment frames for UI previews. Keeping the rects
 # here lets non-animation renderers use the same sheet geometry and crop path
@@ -544,6 +548,18 @@ class SpriteManager:
         self._recolor_sprite_cache.clear()
         self._colors_key_cache.clear()
 
+class _TilesetCache:
+    """Extracted tiles and the composed sheet for one tiledef fingerprint."""
+
+    __slots__ = ("composed_path", "tiles", "composed", "composed_valid")
+
+    def __init__(self, composed_path: bool):
+        self.composed_path = composed_path
+        self.tiles: Dict[Tuple[str, int], pygame.Surface] = {}
+        self.composed: Optional[pygame.Surface] = None
+        self.composed_valid = False
+
+
 class TilesetManager:
     """
     Specialized manager for Reborn tilesets.
@@ -556,7 +572,6 @@ class TilesetManager:
     def __init__(self, sprite_manager: SpriteManager):
         """Create the tileset manager with a sprite manager."""
         self.sprite_mgr = sprite_manager
-        self.tile_cache: Dict[Tuple[str, int], pygame.Surface] = {}
         # get_tile_or_color()'s colored fallback for a missing tile, cached per
         # tile_id so a level full of undownloaded tiles doesn't allocate a new
         # placeholder Surface on every miss every frame.
@@ -585,19 +600,29 @@ class TilesetManager:
         # truecolor tileset has no indices to remap (documented limitation;
         # every classic sheet incl. pics1.png is indexed).
         self.backpal = ""
-        self._composed_sheet: Optional[pygame.Surface] = None
-        self._composed_sheet_valid = False
+        # Extracted tiles and the composed sheet, one _TilesetCache per
+        # fingerprint of the defs that apply to the current level plus the
+        # backpal (_fingerprint). A level change only re-selects a bucket:
+        # warping between levels under the same defs keeps the current one,
+        # and returning to a recent area finds its sheet still composed.
+        # Changing a def or the backpal still drops every bucket (clear_cache).
+        self._tileset_caches: "OrderedDict[tuple, _TilesetCache]" = OrderedDict()
+        self._tileset_cache_current: Optional[_TilesetCache] = None
 
     def _applies(self, prefix: str) -> bool:
         return not prefix or self.current_level.startswith(prefix)
 
-    def set_current_level(self, level_name: str):
+    def set_current_level(self, level_name: str) -> bool:
         """Level change: re-evaluate which tiledefs apply (defs themselves
-        persist -- see class comment)."""
+        persist -- see class comment). Returns whether that changed the
+        tiles, i.e. whether tile-derived caches elsewhere are stale."""
         name = (level_name or "").lower()
-        if name != self.current_level:
-            self.current_level = name
-            self.clear_cache()
+        if name == self.current_level:
+            return False
+        before = self._fingerprint()
+        self.current_level = name
+        self._tileset_cache_current = None
+        return self._fingerprint() != before
 
     def set_tiledef(self, image: str, levelstart: str, x: int, y: int):
         """addtiledef2: paste `image` at sheet pixel (`x`, `y`) in levels
@@ -683,11 +708,10 @@ class TilesetManager:
         except Exception:
             return None
 
-    def _get_composed_sheet(self) -> Optional[pygame.Surface]:
-        """Build the active sheet from its base and applicable pastes."""
-        if self._composed_sheet_valid:
-            return self._composed_sheet
-
+    def _base_tileset(self) -> str:
+        """The sheet the applicable full tiledef selects: longest matching
+        prefix among loaded images, ties to the earlier def, else the
+        default tileset."""
         base_name = self.default_tileset
         best_prefix_length = -1
         for image, prefix, m_type in self.full_tiledefs:
@@ -700,13 +724,67 @@ class TilesetManager:
                     and self.sprite_mgr.has_sheet(image)):
                 base_name = image
                 best_prefix_length = len(prefix)
+        return base_name
+
+    def _fingerprint(self) -> tuple:
+        """Everything the current level's tile pixels depend on besides the
+        sheets themselves: the applicable full defs and pastes, in order,
+        and the backpal."""
+        return (
+            tuple(entry for entry in self.full_tiledefs
+                  if self._applies(entry[1])),
+            tuple(entry for entry in self.tiledefs if self._applies(entry[1])),
+            self.backpal,
+        )
 
+    def _tileset_cache(self) -> "_TilesetCache":
+        """The cache bucket for the current level's fingerprint."""
+        bucket = self._tileset_cache_current
+        if bucket is not None:
+            return bucket
+        key = self._fingerprint()
+        caches = self._tileset_caches
+        bucket = caches.get(key)
+        if bucket is None:
+            # backpal routes through the composed-sheet path too: the
+            # palette swap happens on the whole sheet, not per extracted tile.
+            bucket = caches[key] = _TilesetCache(bool(key[1] or key[2]))
+            while len(caches) > _MAX_TILESET_FINGERPRINTS:
+                caches.popitem(last=False)
+        else:
+            caches.move_to_end(key)
+        self._tileset_cache_current = bucket
+        return bucket
+
+    @property
+    def tile_cache(self) -> Dict[Tuple[str, int], pygame.Surface]:
+        """Extracted tiles for the current level's tiledef fingerprint."""
+        return self._tileset_cache().tiles
+
+    def _uses_composed_sheet(self) -> bool:
+        return self._tileset_cache().composed_path
+
+    def _tile_rect(self, tile_id: int) -> Tuple[int, int, int, int]:
+        """Sheet pixel rect of `tile_id`. Reborn's tile ids are non-linear:
+        the sheet is laid out in 16-column blocks of 32 rows each."""
+        tx = (tile_id // 512) * 16 + (tile_id % 16)
+        ty = (tile_id // 16) % 32
+        return (tx * self.TILE_SIZE, ty * self.TILE_SIZE,
+                self.TILE_SIZE, self.TILE_SIZE)
+
+    def _get_composed_sheet(self) -> Optional[pygame.Surface]:
+        """Build the active sheet from its base and applicable pastes."""
+        bucket = self._tileset_cache()
+        if bucket.composed_valid:
+            return bucket.composed
+
+        base_name = self._base_tileset()
         base = self._palettized_base(base_name) if self.backpal else None
         if base is None:
             base = self.sprite_mgr.load_sheet(base_name)
         if base is None:
-            self._composed_sheet = None
-            self._composed_sheet_valid = True
+            bucket.composed = None
+            bucket.composed_valid = True
             return None
 
         composed = base.copy()
@@ -717,8 +795,8 @@ class TilesetManager:
             if paste is not None:
                 composed.blit(paste, (x, y))
 
-        self._composed_sheet = composed
-        self._composed_sheet_valid = True
+        bucket.composed = composed
+        bucket.composed_valid = True
         return composed
 
     def get_tile(self, tile_id: int, tileset: Optional[str] = None) -> Optional[pygame.Surface]:
@@ -735,10 +813,7 @@ class TilesetManager:
         if tileset is not None:
             tileset = normalize_asset_name(tileset)
         if tileset is None:
-            # backpal routes through the composed-sheet path too: the palette
-            # swap happens on the whole sheet, not per extracted tile.
-            if self.backpal or any(self._applies(prefix)
-                                   for _, prefix, _, _ in self.tiledefs):
+            if self._uses_composed_sheet():
                 cache_key = ("<composed>", tile_id)
                 if cache_key in self.tile_cache:
                     return self.tile_cache[cache_key]
@@ -746,44 +821,47 @@ class TilesetManager:
                 sheet = self._get_composed_sheet()
                 if sheet is None:
                     return None
-                tx = (tile_id // 512) * 16 + (tile_id % 16)
-                ty = (tile_id // 16) % 32
-                rect = (tx * self.TILE_SIZE, ty * self.TILE_SIZE,
-                        self.TILE_SIZE, self.TILE_SIZE)
+                rect = self._tile_rect(tile_id)
                 if sheet.get_rect().contains(rect):
                     tile = sheet.subsurface(rect).copy()
                     self.tile_cache[cache_key] = tile
                     return tile
-            best_prefix_length = -1
-            for image, prefix, m_type in self.full_tiledefs:
-                if m_type >= 3 and m_type != 5:
-                    continue
-                if (self._applies(prefix)
-                        and len(prefix) > best_prefix_length
-                        and self.sprite_mgr.has_sheet(image)):
-                    tileset = image
-                    best_prefix_length = len(prefix)
-            if best_prefix_length < 0:
-                tileset = self.default_tileset
+            tileset = self._base_tileset()
 
         tileset = normalize_asset_name(tileset)
         cache_key = (tileset, tile_id)
         if cache_key in self.tile_cache:
             return self.tile_cache[cache_key]
 
-        # Calculate tileset coordinates using Reborn's formula
-        # The tileset is organized in 16-column blocks, 32 rows each
-        tx = (tile_id // 512) * 16 + (tile_id % 16)
-        ty = (tile_id // 16) % 32
-        px = tx * self.TILE_SIZE
-        py = ty * self.TILE_SIZE
-
+        px, py = self._tile_rect(tile_id)[:2]
         tile = self.sprite_mgr.get_sprite(tileset, px, py,
                                           self.TILE_SIZE, self.TILE_SIZE)
         if tile:
             self.tile_cache[cache_key] = tile
         return tile
 
+    def get_tile_sources(self, tile_ids) -> Dict[
+            int, Tuple[pygame.Surface, pygame.Rect]]:
+        """Map each of `tile_ids` to the (sheet, rect) get_tile() would copy
+        it out of, without copying, for bakes that blit thousands of tiles
+        straight from the sheet with `rect` as the source area. The sheet is
+        resolved once for the whole batch. Ids get_tile() would not cut whole
+        from that sheet (sheet missing, rect off its edge) are left out;
+        callers draw those through get_tile_or_color() as before."""
+        if self._uses_composed_sheet():
+            sheet = self._get_composed_sheet()
+        else:
+            sheet = self.sprite_mgr.load_sheet(self._base_tileset())
+        if sheet is None:
+            return {}
+        bounds = sheet.get_rect()
+        sources = {}
+        for tile_id in tile_ids:
+            rect = pygame.Rect(self._tile_rect(tile_id))
+            if bounds.contains(rect):
+                sources[tile_id] = (sheet, rect)
+        return sources
+
     def get_tile_or_color(self, tile_id: int, tileset: Optional[str] = None) -> pygame.Surface:
         """
         Get a tile, or generate a colored placeholder based on tile ID.
@@ -823,9 +901,8 @@ class TilesetManager:
 
     def clear_cache(self):
         """Clear extracted tiles and the lazily composed sheet."""
-        self.tile_cache.clear()
-        self._composed_sheet = None
-        self._composed_sheet_valid = False
+        self._tileset_caches.clear()
+        self._tileset_cache_current = None
 
 
 def create_placeholder_sprite(width: int = 32, height: int = 32,
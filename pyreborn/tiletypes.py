@@ -245,6 +245,23 @@ def get_tile_type(tile_id: int, tilestype: Optional[int] = None) -> int:
     return TileType.NONBLOCK
 
 
+def tile_type_map(tiles, tilestype: Optional[int] = None) -> bytearray:
+    """get_tile_type for every tile of a board, as one byte per tile in board
+    order (so ``types[level_index(x, y)]`` is the type at (x, y)). Built once
+    per board and patched cell by cell, it turns the per-probe type lookup
+    into a single index (see Client.tile_types).
+    """
+    if tilestype is None:
+        tilestype = _active_tilestype
+    if tilestype == TILESTYPE_NONE:
+        return bytearray(get_tile_type(tile, tilestype) for tile in tiles)
+    table = _table_for(tilestype)
+    size = len(table)
+    return bytearray(
+        table[tile] if 0 <= tile < size else get_tile_type(tile, tilestype)
+        for tile in tiles)
+
+
 def type_is_blocking(tile_type: int) -> bool:
     """Return True if a tile *type* blocks walking.
 
@@ -2,6 +2,7 @@
 
 import hashlib
 import json
+import os
 
 from pyreborn import Client
 from pyreborn.asset_paths import normalize_asset_name, server_cache_dir
@@ -52,13 +53,21 @@ def test_completed_download_is_cached_with_verified_metadata(
 
     directory = server_cache_dir(client.host, client.port)
     assert (directory / "example.png").read_bytes() == b"asset bytes"
-    assert json.loads((directory / "index.json").read_text()) == {
-        "example.png": {
-            "modtime": 123456,
-            "size": 11,
-            "sha256": hashlib.sha256(b"asset bytes").hexdigest(),
-        }
+    expected = {
+        "modtime": 123456,
+        "size": 11,
+        "sha256": hashlib.sha256(b"asset bytes").hexdigest(),
     }
+    stat = (directory / "example.png").stat()
+    expected["mtime_ns"] = stat.st_mtime_ns
+    expected["inode"] = stat.st_ino
+    (record,) = [
+        json.loads(line)
+        for line in (directory / "index.journal").read_text().splitlines()
+    ]
+    expected["checked_ns"] = record["checked_ns"]
+    assert record == dict(expected, key="example.png")
+    assert _client()._load_cache_index() == {"example.png": expected}
 
 
 def test_second_session_reads_cached_file_without_network(
@@ -240,6 +249,256 @@ def test_disk_verification_runs_once_per_name(tmp_path, monkeypatch):
     assert calls == 1
 
 
+def test_journal_is_compacted_into_the_index_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYREBORN_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        "pyreborn.client_files._CACHE_JOURNAL_COMPACT_MIN", 3
+    )
+    client = _client()
+    for number in range(5):
+        client._store_cached_file(f"file{number}.png", b"x" * number + b"!", 1)
+    client._invalidate_cached_file("file0.png")
+
+    directory = server_cache_dir(client.host, client.port)
+    snapshot = json.loads((directory / "index.json").read_text())
+    journal = (directory / "index.journal").read_text().splitlines()
+    assert sorted(snapshot) == ["file0.png", "file1.png", "file2.png",
+                                "file3.png"]
+    assert [json.loads(line)["key"] for line in journal] == [
+        "file4.png", "file0.png"
+    ]
+    assert json.loads(journal[1]) == {"key": "file0.png", "deleted": True}
+    assert sorted(_client()._load_cache_index()) == [
+        "file1.png", "file2.png", "file3.png", "file4.png"
+    ]
+
+
+def test_compaction_keeps_records_appended_during_the_snapshot(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setenv("PYREBORN_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        "pyreborn.client_files._CACHE_JOURNAL_COMPACT_MIN", 3
+    )
+    client = _client()
+    directory = server_cache_dir(client.host, client.port)
+    real_write = client._atomic_cache_write
+    raced = []
+
+    def write_then_race(path, data):
+        real_write(path, data)
+        if path.name == "index.json" and not raced:
+            # another client stores a file between replay and truncation
+            raced.append(True)
+            record = {"key": "other.png", "modtime": 9, "size": 6,
+                      "sha256": hashlib.sha256(b"theirs").hexdigest()}
+            with open(directory / "index.journal", "ab") as journal:
+                journal.write(json.dumps(record).encode() + b"\n")
+
+    monkeypatch.setattr(client, "_atomic_cache_write", write_then_race)
+    for number in range(4):
+        client._store_cached_file(f"file{number}.png", b"x" * number + b"!", 1)
+
+    assert raced
+    snapshot = json.loads((directory / "index.json").read_text())
+    assert "other.png" in snapshot
+    assert sorted(_client()._load_cache_index()) == [
+        "file0.png", "file1.png", "file2.png", "file3.png", "other.png"
+    ]
+
+
+def test_journal_ignores_torn_tail_and_sees_other_clients_appends(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setenv("PYREBORN_CACHE_DIR", str(tmp_path))
+    reader = _client()
+    writer = _client()
+    assert reader._load_cache_index() == {}
+
+    writer._store_cached_file("image.png", b"shared", 3)
+    directory = server_cache_dir(writer.host, writer.port)
+    with open(directory / "index.journal", "ab") as journal:
+        journal.write(b'{"key": "torn.png", "mod')
+
+    assert reader.get_file("image.png") == b"shared"
+    assert sorted(_client()._load_cache_index()) == ["image.png"]
+
+
+def test_journal_compacted_and_regrown_elsewhere_is_replayed_in_full(
+    tmp_path, monkeypatch
+):
+    """A journal replaced by another client's compaction is read from byte 0.
+
+    Once that journal grew past this client's offset, the size check alone
+    took it for the old file, seeked into the middle of a record, and
+    silently dropped everything written before that point.
+    """
+    monkeypatch.setenv("PYREBORN_CACHE_DIR", str(tmp_path))
+    reader = _client()
+    writer = _client()
+    directory = server_cache_dir(writer.host, writer.port)
+    for number in range(3):
+        writer._store_cached_file(f"old{number}.png", b"old!", 1)
+    assert sorted(reader._load_cache_index()) == [
+        "old0.png", "old1.png", "old2.png"
+    ]
+    old_offset = reader._cache_journal_offset
+
+    writer._compact_cache_index(directory)
+    assert (directory / "index.journal").stat().st_size == 0
+    names = []
+    while (directory / "index.journal").stat().st_size <= old_offset:
+        names.append(f"new{len(names)}.png")
+        writer._store_cached_file(names[-1], b"new!", 2)
+
+    reader._replay_cache_journal(directory)
+
+    assert sorted(reader._cache_index) == sorted(
+        ["old0.png", "old1.png", "old2.png"] + names
+    )
+
+
+def _age_cached_file(directory, key, seconds=60):
+    """Backdate a cached file so its recorded stat is no longer racy."""
+    path = directory / key
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 10**9))
+
+
+def _count_sha256(monkeypatch):
+    real_sha256 = hashlib.sha256
+    calls = []
+
+    def counted_sha256(data):
+        calls.append(len(data))
+        return real_sha256(data)
+
+    monkeypatch.setattr("pyreborn.client_files.hashlib.sha256", counted_sha256)
+    return calls
+
+
+def test_verified_stat_skips_rehash_until_the_file_changes(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setenv("PYREBORN_CACHE_DIR", str(tmp_path))
+    _client()._store_cached_file("image.png", b"cached", 5)
+    directory = server_cache_dir("example.test", 14900)
+    _age_cached_file(directory, "image.png")
+
+    calls = _count_sha256(monkeypatch)
+    # Stamped at download time, so still racy: hash once, then stamp.
+    assert _client().get_file("image.png") == b"cached"
+    assert len(calls) == 1
+    assert _client().get_file("image.png") == b"cached"
+    assert len(calls) == 1
+
+    hashing = _client()
+    hashing.cache_verify = "hash"
+    assert hashing.get_file("image.png") == b"cached"
+    assert len(calls) == 2
+
+    (directory / "image.png").write_bytes(b"CACHED")
+    assert _client().get_file("image.png") is None
+    assert len(calls) == 3
+
+
+def test_background_verification_invalidates_corrupt_entries(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setenv("PYREBORN_CACHE_DIR", str(tmp_path))
+    first = _client()
+    first._store_cached_file("good.png", b"intact", 1)
+    first._store_cached_file("bad.png", b"secret", 2)
+    directory = server_cache_dir(first.host, first.port)
+    (directory / "bad.png").write_bytes(b"broken")
+    _age_cached_file(directory, "good.png")
+    _age_cached_file(directory, "bad.png")
+
+    client = _client()
+    worker = client.start_cache_verification()
+    worker.join(5)
+    assert len(client._cache_verify_results) == 2
+
+    calls = _count_sha256(monkeypatch)
+    assert client.get_file("good.png") == b"intact"
+    assert calls == []
+    assert not (directory / "bad.png").exists()
+    assert "bad.png" not in client._load_cache_index()
+    assert client.request_file("bad.png")
+    assert client._protocol.sent[-1][0] == PacketID.PLI_WANTFILE
+
+
+def test_file_byte_budget_evicts_to_disk_and_rereads(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYREBORN_CACHE_DIR", str(tmp_path))
+    client = Client("example.test", 14900, file_cache_bytes=16)
+    client._protocol = _Protocol()
+    client._authenticated = True
+
+    client._handle_packet(
+        PacketID.PLO_FILE, _file_packet("first.png", b"A" * 10, 1)
+    )
+    client._handle_packet(
+        PacketID.PLO_FILE, _file_packet("second.png", b"B" * 10, 2)
+    )
+
+    assert "first.png" not in client._received_files
+    assert client._received_files.total_bytes == 10
+    assert client.get_file("first.png") == b"A" * 10
+    assert client.get_file("first.png") == b"A" * 10
+    assert client.get_file("missing.png") is None
+    assert client._protocol.sent == []
+
+    stats = client.file_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["disk_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["max_bytes"] == 16
+    assert stats["evictions"] == 2
+    assert stats["evicted_bytes"] == 20
+    assert stats["bytes"] == 10
+
+
+def test_byte_budget_is_lifted_when_downloads_are_not_persisted(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setenv("PYREBORN_CACHE_DIR", str(tmp_path))
+    client = Client("example.test", 14900, file_cache_bytes=16)
+    client.persist_downloads = False  # as RCClient/NCClient do
+    client._protocol = _Protocol()
+    client._authenticated = True
+
+    names = ["first.png", "second.png", "third.png"]
+    for n, name in enumerate(names):
+        client._handle_packet(
+            PacketID.PLO_FILE, _file_packet(name, bytes([65 + n]) * 10, n)
+        )
+
+    assert not os.listdir(tmp_path)
+    for n, name in enumerate(names):
+        assert client.get_file(name) == bytes([65 + n]) * 10
+    stats = client.file_cache_stats()
+    assert stats["evictions"] == 0
+    assert stats["max_bytes"] == 0
+
+    client.persist_downloads = True
+    assert client.file_cache_stats()["max_bytes"] == 16
+
+
+def test_disk_reread_is_stored_once_under_the_normalized_name(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setenv("PYREBORN_CACHE_DIR", str(tmp_path))
+    first = _client()
+    first._handle_packet(
+        PacketID.PLO_FILE, _file_packet("image.png", b"cached", 5)
+    )
+    second = _client()
+
+    assert second.get_file("Levels/IMAGE.PNG") == b"cached"
+    assert list(second._received_files) == ["image.png"]
+    assert second._received_files.total_bytes == 6
+
+
 _GMAP = (
     "GRMAP001\n"
     "WIDTH 2\nHEIGHT 1\n"
@@ -276,3 +535,35 @@ def test_uptodate_gmap_still_builds_the_world_grid(tmp_path, monkeypatch):
     assert any(packet_id == PacketID.PLI_ADJACENTLEVEL
                for packet_id, _ in second._protocol.sent), \
         "the neighbours have to be requested, or the world stays one segment"
+
+
+def test_gmap_reentry_rereads_a_file_evicted_to_disk(tmp_path, monkeypatch):
+    """Walking back onto the overworld re-parses the gmap without a refetch.
+
+    The re-entry path read _received_files directly, so once the byte budget
+    had pushed the .gmap out to the disk cache it found nothing and paid a
+    PLI_WANTFILE round trip for a file already on disk.
+    """
+    from pyreborn.handlers.level import handle_level_name
+
+    monkeypatch.setenv("PYREBORN_CACHE_DIR", str(tmp_path))
+    client = Client("example.test", 14900, file_cache_bytes=len(_GMAP))
+    client._protocol = _Protocol()
+    client._authenticated = True
+    client._handle_packet(
+        PacketID.PLO_FILE, _file_packet("world.gmap", _GMAP.encode(), 7)
+    )
+    client._handle_packet(
+        PacketID.PLO_FILE, _file_packet("filler.png", b"F" * len(_GMAP), 8)
+    )
+    assert "world.gmap" not in client._received_files, \
+        "sanity: the budget evicted the gmap"
+    client._exit_gmap("house.nw")
+    client._protocol.sent.clear()
+
+    handle_level_name(client, b"world.gmap")
+
+    assert (client.gmap_width, client.gmap_height) == (2, 1)
+    assert sorted(client.gmap_grid.values()) == ["a.nw", "b.nw"]
+    assert not any(packet_id == PacketID.PLI_WANTFILE
+                   for packet_id, _ in client._protocol.sent)
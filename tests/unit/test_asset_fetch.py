@@ -0,0 +1,202 @@
+"""Asset fetch scheduler: priority, window, dedup, retry and warp timing."""
+
+from pyreborn.asset_fetch import (
+    PRIORITY_MUSIC,
+    PRIORITY_VISIBLE,
+    AssetFetchScheduler,
+    asset_priority,
+    fetch_or_request,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Client:
+    """Just the file-request surface the scheduler touches."""
+
+    def __init__(self):
+        self.sent = []
+        self.online = True
+        self._pending_files = set()
+        self._failed_files = set()
+        self._file_attempts = {}
+
+    def request_file(self, filename):
+        if not self.online:
+            return False
+        self.sent.append(filename)
+        self._pending_files.add(filename)
+        return True
+
+    def is_file_pending(self, filename):
+        return filename in self._pending_files
+
+    def did_file_fail(self, filename):
+        return filename in self._failed_files
+
+    def file_attempts(self, filename):
+        return self._file_attempts.get(filename, 0)
+
+    # What handlers/files.py does on each answer.
+    def arrive(self, filename):
+        self._pending_files.discard(filename)
+        self._file_attempts.pop(filename, None)
+
+    def refuse(self, filename, give_up_at=3):
+        self._pending_files.discard(filename)
+        attempts = self._file_attempts.get(filename, 0) + 1
+        self._file_attempts[filename] = attempts
+        if attempts >= give_up_at:
+            self._failed_files.add(filename)
+
+
+def _scheduler(window=2):
+    client = _Client()
+    clock = _Clock()
+    return client, clock, AssetFetchScheduler(
+        client, window=window, retry_delay=1.0, clock=clock)
+
+
+def test_default_priorities_put_visible_assets_before_audio():
+    assert asset_priority("npc.PNG") == PRIORITY_VISIBLE
+    assert asset_priority("walk.gani") == PRIORITY_VISIBLE
+    assert asset_priority("theme.mid") == PRIORITY_MUSIC
+    assert asset_priority("hit.wav") < asset_priority("theme.ogg")
+
+
+def test_window_bounds_in_flight_and_queue_drains_by_priority():
+    client, _, fetch = _scheduler(window=2)
+    for name in ("theme.mid", "hit.wav", "a.png", "b.png", "walk.gani"):
+        fetch.request(name)
+
+    # The first two fill the window on arrival; the rest wait by priority.
+    assert client.sent == ["theme.mid", "hit.wav"]
+    client.arrive("theme.mid")
+    client.arrive("hit.wav")
+    fetch.pump()
+    assert client.sent[2:] == ["a.png", "b.png"]
+    assert fetch.report()["in_flight"] == 2
+    assert fetch.report()["peak_in_flight"] == 2
+
+
+def test_names_are_deduped_by_normalized_key():
+    client, _, fetch = _scheduler()
+    fetch.request("Levels/Body.PNG")
+    fetch.request("body.png")
+
+    assert client.sent == ["Levels/Body.PNG"]
+    assert fetch.stats["requested"] == 1
+    assert fetch.stats["deduped"] == 1
+
+
+def test_offline_requests_stay_queued_until_a_pump_can_send_them():
+    client, _, fetch = _scheduler()
+    client.online = False
+    assert fetch.request("a.png")
+    assert client.sent == []
+
+    client.online = True
+    fetch.pump()
+    assert client.sent == ["a.png"]
+
+
+def test_refusals_back_off_exponentially_until_written_off():
+    client, clock, fetch = _scheduler()
+    fetch.request("npc.png")
+
+    client.refuse("npc.png")
+    fetch.pump()
+    assert client.sent == ["npc.png"]
+    clock.now += 1.0
+    fetch.pump()
+    assert client.sent == ["npc.png"] * 2
+
+    client.refuse("npc.png")
+    fetch.pump()
+    clock.now += 1.0
+    fetch.pump()
+    assert len(client.sent) == 2    # second backoff is 2 s
+    clock.now += 1.0
+    fetch.pump()
+    assert len(client.sent) == 3
+
+    client.refuse("npc.png")
+    fetch.pump()
+    clock.now += 60.0
+    fetch.pump()
+    assert len(client.sent) == 3
+    assert fetch.stats["retried"] == 2
+    assert fetch.stats["abandoned"] == 1
+    assert not fetch.request("npc.png")
+
+
+def test_time_to_first_complete_frame_waits_for_visible_assets():
+    client, clock, fetch = _scheduler()
+    fetch.begin_warp()
+    fetch.request("theme.mid")
+    fetch.request("npc.png")
+
+    clock.now += 0.1
+    fetch.frame_rendered(board_ready=False)
+    fetch.frame_rendered()
+    assert fetch.last_warp_complete is None
+
+    client.arrive("npc.png")
+    clock.now += 0.15
+    fetch.pump()
+    fetch.frame_rendered()
+    # Music still downloading does not hold the frame back.
+    assert fetch.last_warp_complete == 0.25
+    assert fetch.report()["warp_complete"]["count"] == 1
+
+
+def test_client_exposes_its_strike_count():
+    from pyreborn import Client
+
+    client = Client("example.test", 14900)
+    assert client.file_attempts("npc.png") == 0
+    client._file_attempts["npc.png"] = 2
+    assert client.file_attempts("npc.png") == 2
+
+
+class _Sounds:
+    def is_music(self, name):
+        return name.endswith(".mid")
+
+    def play_music(self, name):
+        return False    # not on disk yet
+
+
+def test_script_music_queues_behind_visible_assets():
+    from pyreborn.game.setup import SetupMixin
+
+    client, _, fetch = _scheduler(window=1)
+    game = SetupMixin()
+    game.client = client
+    game.sound_mgr = _Sounds()
+    game.asset_fetch = fetch
+
+    fetch.request("a.png")
+    game._play_audio("theme.mid")
+    game._play_audio("theme.mid")
+    fetch.request("b.png")
+    client.arrive("a.png")
+    fetch.pump()
+
+    assert client.sent == ["a.png", "b.png"]
+    assert game._pending_music == "theme.mid"
+    client.arrive("b.png")
+    fetch.pump()
+    assert client.sent[2:] == ["theme.mid"]
+
+
+def test_requests_without_a_scheduler_go_straight_to_the_client():
+    client = _Client()
+    assert fetch_or_request(None, client, "npc.png")
+    assert client.sent == ["npc.png"]
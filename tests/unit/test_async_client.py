@@ -0,0 +1,137 @@
+"""AsyncProtocol/AsyncClient: asyncio transport feeding the same dispatch."""
+
+import asyncio
+import struct
+import zlib
+
+from pyreborn import AsyncClient
+from pyreborn.packets import PacketID
+from pyreborn.protocol import AsyncProtocol
+
+
+def _first_bundle(*lines: bytes) -> bytes:
+    """The server's first bundle is plain zlib (see Protocol._decrypt_frame)."""
+    compressed = zlib.compress(b"".join(lines))
+    return struct.pack(">H", len(compressed)) + compressed
+
+
+def _line(packet_id: int, body: bytes) -> bytes:
+    return bytes([packet_id + 32]) + body + b"\n"
+
+
+def _serve(reply: bytes):
+    """Start a loopback server that waits for the login frame, then replies."""
+    received = []
+
+    async def on_connect(reader, writer):
+        header = await reader.readexactly(2)
+        received.append(await reader.readexactly(struct.unpack(">H", header)[0]))
+        writer.write(reply)
+        await writer.drain()
+        await asyncio.sleep(0.2)
+        writer.close()
+
+    return received, asyncio.start_server(on_connect, "127.0.0.1", 0)
+
+
+def test_async_client_dispatches_through_packet_handlers():
+    async def scenario():
+        received, starting = _serve(_first_bundle(
+            _line(PacketID.PLO_SIGNATURE, b"i")))
+        server = await starting
+        port = server.sockets[0].getsockname()[1]
+        client = AsyncClient("127.0.0.1", port)
+        seen = []
+        client.on_packet[PacketID.PLO_SIGNATURE] = seen.append
+        try:
+            assert await client.connect()
+            assert client._begin_login("asyncbot", "pw")
+            for _ in range(20):
+                if await client.poll(0.1):
+                    break
+        finally:
+            client.disconnect()
+            server.close()
+            await server.wait_closed()
+        return client, received, seen
+
+    client, received, seen = asyncio.run(scenario())
+
+    assert b"asyncbot" in zlib.decompress(received[0])
+    assert seen == [b"i"]
+    assert client.server_signature == 73
+    assert client.packet_stats[PacketID.PLO_SIGNATURE]['handled'] == 1
+
+
+def test_async_login_stops_on_disconnect_message():
+    async def scenario():
+        _, starting = _serve(_first_bundle(
+            _line(PacketID.PLO_DISCMESSAGE, b"Wrong password")))
+        server = await starting
+        port = server.sockets[0].getsockname()[1]
+        client = AsyncClient("127.0.0.1", port)
+        try:
+            assert await client.connect()
+            ok = await client.login("asyncbot", "bad", timeout=3.0)
+        finally:
+            server.close()
+            await server.wait_closed()
+        return client, ok
+
+    client, ok = asyncio.run(scenario())
+
+    assert ok is False
+    assert client.disconnect_reason == "Wrong password"
+    assert client.connected is False
+
+
+def test_async_protocol_reassembles_raw_data_across_chunks():
+    proto = AsyncProtocol("127.0.0.1", 0)
+    proto._packets_ready = asyncio.Event()
+    proto.connected = True
+    proto.first_packet = False
+    proto.codec.recv_packet = lambda data: data
+    board = bytes([101 + 32]) + b"\x01\x02" * 4096 + b"\n"
+    size = len(board)
+    header = _line(100, bytes([32 + ((size >> 14) & 0x7F),
+                               32 + ((size >> 7) & 0x7F), 32 + (size & 0x7F)]))
+    frame = header + board
+    wire = struct.pack(">H", len(frame)) + frame
+
+    proto.data_received(wire[:1000])
+    assert proto.recv_packets() == []
+    proto.data_received(wire[1000:])
+
+    assert proto.recv_packets() == [(100, header[1:-1]), (101, board[1:-1])]
+    assert proto.last_decode_time > 0.0
+    assert proto.recv_packets() == []
+    assert proto.last_decode_time == 0.0
+
+
+class _RecordingTransport:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+
+
+def test_async_client_accepts_client_options_and_flushes_per_update():
+    client = AsyncClient("127.0.0.1", 0, batch_sends=True,
+                         level_cache_bytes=1 << 20)
+    proto = client._protocol
+    proto.transport = _RecordingTransport()
+    proto.socket = object()
+    proto.connected = True
+
+    assert isinstance(proto, AsyncProtocol)
+    assert client.batch_sends is True
+    assert client.levels.max_bytes == 1 << 20
+    proto.send_packet(6, b"a")
+    proto.send_packet(6, b"b")
+    assert proto.transport.writes == []
+
+    client.update(timeout=0)
+
+    assert len(proto.transport.writes) == 1
+    assert proto.send_stats()['max_packets_per_flush'] == 2
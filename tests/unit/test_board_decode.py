@@ -0,0 +1,48 @@
+"""Board decoding must match the per-tile reference loop exactly."""
+
+import random
+import zlib
+from array import array
+
+from pyreborn.packet_codec.level import parse_board_packet, parse_level_board
+
+
+def _reference(data: bytes) -> list:
+    tiles = []
+    for i in range(0, min(len(data), 8192), 2):
+        byte1 = data[i]
+        byte2 = data[i + 1] if i + 1 < len(data) else 0
+        tiles.append((byte1 + (byte2 << 8)) & 0xFFF)
+    return (tiles + [0] * 4096)[:4096]
+
+
+def test_full_board_matches_reference_and_masks_flag_bits():
+    rng = random.Random(5)
+    data = bytes(rng.randrange(256) for _ in range(8192))
+    tiles = parse_board_packet(data)
+    assert isinstance(tiles, list)
+    assert tiles == _reference(data)
+    assert max(tiles) <= 0xFFF
+
+
+def test_short_odd_and_oversized_payloads():
+    rng = random.Random(9)
+    for size in (0, 1, 3, 511, 8191, 8200):
+        data = bytes(rng.randrange(256) for _ in range(size))
+        assert parse_board_packet(data) == _reference(data), size
+
+
+def test_as_array_returns_compact_board():
+    data = bytes([0x34, 0xF2]) * 4096
+    tiles = parse_board_packet(data, as_array=True)
+    assert isinstance(tiles, array) and tiles.typecode == 'H'
+    assert len(tiles) == 4096 and set(tiles) == {0x234}
+
+
+def test_level_board_decompresses_and_forwards_as_array():
+    data = bytes(range(256)) * 32
+    compressed = zlib.compress(data)
+    assert parse_level_board(compressed) == _reference(data)
+    assert parse_level_board(b"\x00\x10" + compressed, as_array=True) == \
+        array('H', _reference(data))
+    assert parse_level_board(b"junk", as_array=True) == array('H', [0] * 4096)
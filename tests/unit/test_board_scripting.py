@@ -34,7 +34,7 @@ import pytest
 from pyreborn import Client
 from pyreborn.gs1_client import (
     ClientGS1, board_tile_read, board_tile_write, board_update_region,
-    board_world_dims,
+    board_world_dims, board_write_batch,
 )
 from pyreborn.gs2_client import ClientGS2, _BoardTilesColumn
 
@@ -312,5 +312,59 @@ def test_gs2_column_multidim_shapes():
     assert c.tiles[5 * 64 + 10] == 684
 
 
+# =============================================================================
+# 2e. board_write_batch: one script slice's writes reach the renderer as rects
+# =============================================================================
+
+def test_batched_writes_land_at_once_and_publish_as_one_rect():
+    c = _client(board_tile=7)
+    infos = _record_modifies(c)
+    with board_write_batch(c):
+        for y in range(4, 8):
+            for x in range(10, 20):
+                assert board_tile_write(c, x, y, 684) is True
+        assert board_tile_read(c, 12, 5) == 684.0   # read-your-write
+        assert infos == []
+    assert [(i["x"], i["y"], i["width"], i["height"]) for i in infos] == [
+        (10, 4, 10, 4)]
+    assert infos[0]["tiles"] == [684] * 40
+
+
+def test_sparse_batched_writes_split_into_row_runs():
+    c = _client(board_tile=7)
+    infos = _record_modifies(c)
+    with board_write_batch(c):
+        with board_write_batch(c):                  # nested slices
+            board_tile_write(c, 0, 0, 1)
+            board_tile_write(c, 1, 0, 1)
+            board_tile_write(c, 0, 1, 1)
+            board_tile_write(c, 1, 1, 1)
+        board_tile_write(c, 60, 60, 2)
+        assert infos == []
+    assert sorted((i["x"], i["y"], i["width"], i["height"]) for i in infos) == [
+        (0, 0, 2, 2), (60, 60, 1, 1)]
+
+
+def test_batched_writes_publish_per_gmap_segment():
+    c = _gmap_client()
+    infos = _record_modifies(c)
+    with board_write_batch(c):
+        for x in range(62, 66):
+            board_tile_write(c, x, 3, 9)
+    by_map = {i["map_x"]: i for i in infos}
+    assert (by_map[0]["x"], by_map[0]["width"]) == (62, 2)
+    assert (by_map[1]["x"], by_map[1]["width"]) == (0, 2)
+    assert c.levels["zb.nw"][3 * 64 + 1] == 9
+
+
+def test_gs1_event_is_one_batch():
+    c = _client(board_tile=7)
+    infos = _record_modifies(c)
+    gs1 = ClientGS1(c)
+    _run_weapon(gs1, "tiles[10,5] = 1; tiles[11,5] = 1; tiles[12,5] = 1;")
+    assert [(i["x"], i["y"], i["width"], i["height"]) for i in infos] == [
+        (10, 5, 3, 1)]
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,120 @@
+"""Inbound capture files and their replay into a socketless Client."""
+
+import os
+import socket
+import struct
+
+from pyreborn import Client
+from pyreborn.capture import (
+    CaptureWriter, ReplayProtocol, iter_capture, read_capture_version,
+)
+from pyreborn.packets import PacketID
+from pyreborn.protocol import Protocol, ThreadedProtocol
+
+# COLORS (five classic bytes), then X=10, Y=11: authenticates the client.
+_PLAYER_PROPS = bytes([13 + 32, 32, 33, 34, 35, 36, 15 + 32, 52, 16 + 32, 54])
+
+
+def test_capture_round_trips_and_tolerates_a_torn_tail(tmp_path):
+    path = str(tmp_path / "s.rcap")
+    writer = CaptureWriter(path, "6.037")
+    writer.write([(9, b"abc"), (101, bytes(8192))])
+    writer.write([(13, b"")])
+    writer.close()
+    with open(path, "ab") as f:
+        f.write(b"\x00\x01\x02")  # a record header cut off mid-write
+
+    records = list(iter_capture(path))
+    assert read_capture_version(path) == "6.037"
+    assert [(pid, data) for _, pid, data in records] == [
+        (9, b"abc"), (101, bytes(8192)), (13, b"")]
+    assert records[0][0] <= records[2][0]
+    assert writer.packets == 3
+
+
+def test_protocol_recv_packets_feeds_the_capture(tmp_path):
+    receiver, sender = socket.socketpair()
+    try:
+        proto = Protocol("127.0.0.1", 0)
+        proto.socket = receiver
+        proto.connected = True
+        proto.first_packet = False
+        proto.codec.recv_packet = lambda data: data + b"\n"
+        proto.capture = CaptureWriter(str(tmp_path / "s.rcap"))
+        wire = b"".join(struct.pack(">H", 2) + bytes([32 + i, 65])
+                        for i in range(3))
+        os.write(sender.fileno(), wire)
+
+        packets = proto.recv_packets(timeout=1.0)
+        proto.capture.close()
+    finally:
+        receiver.close()
+        sender.close()
+
+    assert packets == [(0, b"A"), (1, b"A"), (2, b"A")]
+    assert [(pid, data) for _, pid, data in iter_capture(
+        str(tmp_path / "s.rcap"))] == packets
+
+
+def test_threaded_capture_records_each_packet_once(tmp_path):
+    path = str(tmp_path / "s.rcap")
+    receiver, sender = socket.socketpair()
+    proto = ThreadedProtocol("127.0.0.1", 0)
+    try:
+        proto.socket = receiver
+        proto.connected = True
+        proto.first_packet = False
+        proto.codec.recv_packet = lambda data: data + b"\n"
+        proto.capture = CaptureWriter(path)
+        proto._start_reader()
+        wire = b"".join(struct.pack(">H", 2) + bytes([32 + i, 65])
+                        for i in range(5))
+        os.write(sender.fileno(), wire[:9])
+        packets = proto.recv_packets(timeout=1.0)
+        os.write(sender.fileno(), wire[9:])
+        while len(packets) < 5:
+            batch = proto.recv_packets(timeout=1.0)
+            assert batch
+            packets += batch
+        proto._stop_reader()
+        proto.capture.close()
+    finally:
+        proto._stop_reader()
+        receiver.close()
+        sender.close()
+
+    expected = [(i, b"A") for i in range(5)]
+    assert packets == expected
+    replay = ReplayProtocol.open(path, speed=0)
+    replay.connect()
+    assert replay.recv_packets(timeout=0) == expected
+    assert replay.recv_packets(timeout=0) == []
+
+
+def test_replayed_capture_logs_the_client_in_without_a_server(tmp_path):
+    path = str(tmp_path / "s.rcap")
+    writer = CaptureWriter(path, "2.22")
+    writer.write([(PacketID.PLO_PLAYERPROPS, _PLAYER_PROPS)])
+    writer.close()
+
+    client = Client(version=read_capture_version(path))
+    replay = client.replay(path, speed=0)
+    replay.sent_payloads = {}
+    assert client.connect()
+    assert client.login("acct", "pw", timeout=1.0)
+    assert (client.player.x, client.player.y) == (10.0, 11.0)
+
+    client.say("hello")
+    assert replay.sent_payloads
+    client.update(timeout=0)
+    assert not client.connected  # capture exhausted
+
+
+def test_replay_paces_by_recorded_time_and_per_call_limit():
+    records = [(0.0, 1, b"a"), (0.0, 2, b"b"), (0.0, 3, b"c"), (60.0, 4, b"d")]
+    proto = ReplayProtocol(records, speed=1.0, max_per_call=2)
+    proto.connect()
+    assert proto.recv_packets(timeout=0) == [(1, b"a"), (2, b"b")]
+    assert proto.recv_packets(timeout=0) == [(3, b"c")]
+    assert proto.recv_packets(timeout=0) == []  # a minute of capture time away
+    assert proto.connected
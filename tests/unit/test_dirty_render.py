@@ -0,0 +1,123 @@
+"""Dirty-region rendering (render_dirty.py): a frame drawn over the cached
+world layer matches the ordinary full redraw pixel for pixel, while only
+restoring what last frame's passes touched."""
+
+import os
+import sys
+from array import array
+from types import SimpleNamespace
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../reborn-protocol'))
+
+import pygame
+
+from pyreborn.game.camera import Camera2D
+from pyreborn.game.render import RenderMixin
+from pyreborn.game.render_dirty import DirtyRenderMixin, mark_drawn
+from pyreborn.game.render_world import WorldRenderMixin
+from pyreborn.sprites import SpriteManager, TilesetManager
+
+
+class _ViewportStub:
+    def present(self):
+        pass
+
+
+class _Harness(RenderMixin, WorldRenderMixin, DirtyRenderMixin):
+    def __init__(self, dirty):
+        tiles = array('H', (n % 512 for n in range(4096)))
+        self.client = SimpleNamespace(
+            gmap_grid={}, board_layers={}, tiles=tiles,
+            levels={"a.nw": tiles},
+            _current_level_name="a.nw", _tiles_level_name="a.nw",
+            _local_level_transition='',
+            _local_level_transition_direction=None)
+        self.tileset_mgr = TilesetManager(SpriteManager([]))
+        self.world_surface = None
+        self._animated_tiles_key = None
+        self.screen = pygame.Surface((320, 240))
+        self.camera = Camera2D(320, 240)
+        self.camera.set_center(30, 30)
+        self.viewport = _ViewportStub()
+        self.dirty_rendering = dirty
+        self.sprite = pygame.Surface((20, 30))
+        self.sprite.fill((200, 40, 40))
+        self.sprite_x = 40
+
+    def _sync_camera(self):
+        pass
+
+    def _render_scene(self):
+        self._render_world()
+        self.screen.blit(self.sprite, (self.sprite_x, 100))
+        mark_drawn(self.screen, pygame.draw.circle(
+            self.screen, (255, 255, 0), (self.sprite_x, 90), 4))
+
+    def _render_gui_layers(self):
+        self.screen.fill((0, 0, 90), (8, 8, 60, 12))
+
+    def _check_and_render_signs(self):
+        pass
+
+    def _render_ui(self):
+        pass
+
+    def _render_combat_presentation(self):
+        pass
+
+
+def _frames(view):
+    """Each frame's pixels across a walk, a board edit and a camera move."""
+    out = []
+    for step in range(4):
+        view.sprite_x = 40 + step * 7
+        view._render()
+        out.append(pygame.image.tobytes(view.screen, "RGB"))
+    tiles = view.client.tiles
+    tiles[30 * 64 + 28] = 700
+    view._patch_world_surface_for_modify(
+        {'x': 28, 'y': 30, 'width': 1, 'height': 1})
+    view._render()
+    out.append(pygame.image.tobytes(view.screen, "RGB"))
+    view.camera.set_center(31.5, 30)
+    view._render()
+    out.append(pygame.image.tobytes(view.screen, "RGB"))
+    return out
+
+
+def test_dirty_frames_match_full_redraw():
+    assert _frames(_Harness(dirty=True)) == _frames(_Harness(dirty=False))
+
+
+def test_still_camera_reuses_the_world_layer():
+    view = _Harness(dirty=True)
+    view._render()
+    layer, key = view._world_layer, view._world_layer_key
+    view.sprite_x += 5
+    view._render()
+    assert view._world_layer is layer and view._world_layer_key == key
+    scene = view._dirty_scene
+    # only the sprite, its marker and the GUI box need restoring next frame
+    assert sum(r.w * r.h for r in scene.dirty) < 2000
+    # the slide snapshot is the scene buffer itself, copied only on use
+    assert view._transition_scene_frame is scene
+    assert pygame.image.tobytes(scene.copy(), "RGB") == pygame.image.tobytes(
+        view.screen, "RGB")
+
+
+def test_scene_buffer_copies_are_usable_surfaces():
+    view = _Harness(dirty=True)
+    view._render()
+    scene = view._dirty_scene
+    copy = scene.copy()
+    assert type(copy) is pygame.Surface
+    assert pygame.image.tobytes(copy, "RGB") == pygame.image.tobytes(
+        scene, "RGB")
+    sub = scene.subsurface((0, 0, 16, 16))
+    sub.blit(view.sprite, (0, 0))
+    sub.fill((0, 0, 0), (0, 0, 4, 4))
+    assert sub.dirty == []
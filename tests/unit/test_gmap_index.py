@@ -0,0 +1,63 @@
+"""GmapIndex: the gmap grid's reverse and neighbour lookups stay in step with
+the cells however they are written."""
+
+from pyreborn.client_state import GmapIndex, GmapState, gmap_cell
+
+
+def _grid():
+    return GmapIndex({
+        (0, 0): "a0", (1, 0): "b0", (2, 0): "c0",
+        (0, 1): "a1", (1, 1): "b1", (2, 1): "c1",
+        (0, 2): "a2", (1, 2): "b2", (2, 2): "c2",
+    })
+
+
+def test_cell_of_and_values_membership():
+    grid = _grid()
+    assert grid.cell_of("b1") == (1, 1)
+    assert grid.cell_of("inside.nw") is None
+    assert "c2" in grid.values()
+    assert "inside.nw" not in grid.values()
+    assert list(grid.values()) == list(dict(grid).values())
+
+
+def test_neighbours_keep_get_adjacent_levels_order():
+    grid = _grid()
+    assert grid.neighbours("b1") == (
+        "a0", "a1", "a2", "b0", "b2", "c0", "c1", "c2")
+    assert grid.neighbours("a0") == ("a1", "b0", "b1")
+    assert grid.neighbours("inside.nw") == ()
+
+
+def test_overwrite_and_delete_reindex():
+    grid = _grid()
+    assert grid.neighbours("a0") == ("a1", "b0", "b1")
+    grid[(1, 1)] = "hole"
+    assert grid.cell_of("b1") is None
+    assert grid.cell_of("hole") == (1, 1)
+    assert grid.neighbours("a0") == ("a1", "b0", "hole")
+    del grid[(0, 1)]
+    assert "a1" not in grid.values()
+    assert grid.neighbours("a0") == ("b0", "hole")
+    grid.clear()
+    assert grid.cell_of("a0") is None
+    assert grid.neighbours("a0") == ()
+
+
+def test_duplicate_name_keeps_first_cell():
+    grid = GmapIndex()
+    grid[(3, 0)] = "dup"
+    grid[(0, 0)] = "dup"
+    assert grid.cell_of("dup") == (3, 0)
+    del grid[(3, 0)]
+    assert grid.cell_of("dup") == (0, 0)
+
+
+def test_state_wraps_assigned_dicts():
+    state = GmapState()
+    state.gmap_grid = {(0, 0): "a", (1, 0): "b"}
+    assert isinstance(state.gmap_grid, GmapIndex)
+    assert state.gmap_grid.cell_of("b") == (1, 0)
+    assert gmap_cell(state.gmap_grid, "a") == (0, 0)
+    assert gmap_cell({(4, 5): "plain"}, "plain") == (4, 5)
+    assert gmap_cell({}, "plain") is None
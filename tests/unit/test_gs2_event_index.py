@@ -0,0 +1,69 @@
+"""ClientGS2 dispatches onUpdate and broadcast events through a per-event
+subscriber index instead of asking every VM on every call."""
+
+from pyreborn.gs2_client import ClientGS2
+
+
+class _CountingVM:
+    def __init__(self, *functions):
+        self.functions = {name.lower() for name in functions}
+        self.asked = 0
+        self.calls = []
+        self.joined = []
+
+    def has_function(self, name):
+        self.asked += 1
+        return name.lower() in self.functions or any(
+            joined.has_function(name) for joined in self.joined)
+
+
+def _runtime(**vms):
+    rt = ClientGS2()
+    rt._run = lambda vm, event, *args: vm.calls.append((event, args))
+    for key, vm in vms.items():
+        rt.vms["weapon"][key] = vm
+    return rt
+
+
+def test_trigger_event_asks_each_vm_once_then_uses_the_index():
+    idle = [_CountingVM() for _ in range(50)]
+    handler = _CountingVM("onPing")
+    rt = _runtime(**{f"idle{n}": vm for n, vm in enumerate(idle)},
+                  handler=handler)
+
+    assert rt.trigger_event("onPing", 1) == 1
+    assert rt.trigger_event("onPing", 2) == 1
+    assert handler.calls == [("onPing", (1,)), ("onPing", (2,))]
+    assert all(vm.asked == 1 for vm in idle)
+
+
+def test_loading_or_dropping_a_vm_refreshes_subscribers():
+    first = _CountingVM("onPing")
+    rt = _runtime(first=first)
+    rt.trigger_event("onPing")
+    second = _CountingVM("onPing")
+    rt.vms["weapon"]["second"] = second
+    assert rt.trigger_event("onPing") == 2
+    rt.vms["weapon"].pop("first")
+    assert rt.trigger_event("onPing") == 1
+    assert len(first.calls) == 2 and len(second.calls) == 2
+
+
+def test_joining_a_class_adds_its_handlers():
+    joiner = _CountingVM()
+    rt = _runtime(joiner=joiner)
+    assert rt.trigger_event("onPing") == 0
+    class_vm = _CountingVM("onPing")
+    class_vm.container = None
+    joiner.joined.append(class_vm)
+    rt._joins_version += 1            # what _attach_class/leave_class do
+    assert rt.trigger_event("onPing") == 1
+
+
+def test_onupdate_runs_only_on_definers_in_load_order():
+    a, b, c = _CountingVM("onUpdate"), _CountingVM(), _CountingVM("onUpdate")
+    rt = _runtime(a=a, b=b, c=c)
+    for _ in range(3):
+        rt.process_timeouts(0.0)
+    assert a.calls == c.calls == [("onUpdate", ())] * 3
+    assert b.calls == [] and b.asked <= 2
@@ -75,7 +75,7 @@ def _client(**over):
         # staff_guilds None = PLO_STAFFGUILDS never sent (client_state's
         # default) -> the built-in staff-guild defaults apply
         players={}, all_players={}, staff_guilds=None, server_name="login",
-        connected=False, weapons={}, _colors_len=5,
+        connected=False, weapons={}, _colors_len=5, _player_colors=5,
         prop_parse_diagnostics=None, _current_level_name="",
         gmap_width=0, gmap_grid={}, on_player_left=None, on_chat=None,
         on_del_player=None, player_list={},
@@ -0,0 +1,94 @@
+"""ClientGS2's settimer/scheduleevent deadline heaps keep the firing order and
+dict/list surface of the per-step countdowns they replaced."""
+
+import pytest
+
+from pyreborn.gs2_client.registry import (
+    TIMER_RESOLUTION,
+    _ScheduledEvents,
+    _TimeoutTable,
+)
+
+
+def _fire(table, dt=TIMER_RESOLUTION):
+    return [key for key, seq in table.advance(dt) if table.take(key, seq)]
+
+
+def test_timeout_table_reads_like_seconds_left():
+    table = _TimeoutTable()
+    table[("weapon", "a")] = 0.5
+    table.advance(0.2)
+    assert table[("weapon", "a")] == pytest.approx(0.3)
+    assert dict(table) == {("weapon", "a"): pytest.approx(0.3)}
+    table[("weapon", "a")] = 1.0
+    assert table[("weapon", "a")] == pytest.approx(1.0)
+    assert table.pop(("weapon", "a")) == pytest.approx(1.0)
+    assert table == {}
+
+
+def test_due_timers_fire_in_arming_order_not_deadline_order():
+    table = _TimeoutTable()
+    table[("npc", 1)] = 0.006
+    table[("npc", 2)] = 0.001
+    table[("npc", 3)] = 0.004
+    table[("npc", 1)] = 0.005          # re-arm keeps its place, like a dict
+    assert _fire(table) == [("npc", 1), ("npc", 2), ("npc", 3)]
+    assert len(table) == 0
+
+
+def test_exact_multiples_of_the_step_fire_on_time():
+    table = _TimeoutTable()
+    table[("weapon", "w")] = 3 * TIMER_RESOLUTION
+    fired_at = []
+    for step in range(1, 2000):
+        if _fire(table):
+            fired_at.append(step)
+            table[("weapon", "w")] = 3 * TIMER_RESOLUTION
+    assert fired_at == list(range(3, 2000, 3))
+
+
+def test_cancelled_or_rearmed_timers_are_skipped_lazily():
+    table = _TimeoutTable()
+    table[("weapon", "a")] = 0.001
+    table[("weapon", "b")] = 0.001
+    table[("weapon", "c")] = 0.001
+    due = table.advance(TIMER_RESOLUTION)
+    assert table.take(*due[0])
+    del table[("weapon", "b")]         # an earlier handler's teardown
+    table[("weapon", "c")] = 0.5       # ...or re-arm
+    assert not table.take(*due[1])
+    assert not table.take(*due[2])
+    assert dict(table) == {("weapon", "c"): pytest.approx(0.5)}
+
+
+def test_heap_garbage_is_bounded():
+    table = _TimeoutTable()
+    for _ in range(10000):
+        table[("weapon", "busy")] = 1.0
+    assert len(table._heap) <= 2 * len(table) + 64
+
+
+def test_scheduled_events_fire_once_in_scheduling_order():
+    events = _ScheduledEvents()
+    events.add(("weapon", "w"), 0.05, "Late", [])
+    events.add(("weapon", "w"), 0.0, "First", [1])
+    events.add(("npc", 3), 0.0, "Second", [])
+    assert len(events) == 3
+    assert [item["event"] for item in events.advance(0.01)] == [
+        "First", "Second"]
+    assert [item["event"] for item in events] == ["Late"]
+    assert [item["event"] for item in events.advance(0.05)] == ["Late"]
+    assert events.advance(1.0) == []
+
+
+def test_scheduled_cancel_touches_only_that_script():
+    events = _ScheduledEvents()
+    events.add(("weapon", "w"), 0.1, "A", [])
+    events.add(("weapon", "w"), 0.1, "B", [])
+    events.add(("weapon", "other"), 0.1, "A", [])
+    events.cancel(("weapon", "w"), "a")
+    assert [(item["key"][1], item["event"]) for item in events] == [
+        ("w", "B"), ("other", "A")]
+    events.cancel(("weapon", "w"))
+    assert [item["key"] for item in events.advance(0.2)] == [
+        ("weapon", "other")]
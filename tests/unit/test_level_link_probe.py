@@ -47,3 +47,56 @@ def test_near_door_facing_away_does_not_trigger():
     client.player.direction = 2
 
     assert client.check_link_collision() is None
+
+
+def _scan(links, adjacent, tile_x, tile_y):
+    """The per-link scan check_link_collision did before the trigger grid."""
+    for link in links:
+        lx, ly = link["x"], link["y"]
+        lw, lh = link["width"], link["height"]
+        is_edge = (lx <= 1 or lx + lw >= 63 or ly <= 1 or ly + lh >= 63)
+        if is_edge and link["dest_level"] in adjacent:
+            continue
+        if lx <= tile_x <= lx + lw and ly <= tile_y <= ly + lh:
+            return link
+    return None
+
+
+def test_trigger_grid_matches_linear_scan():
+    import random
+
+    rng = random.Random(15)
+    client = Client("localhost", 14900)
+    client.gmap_grid = {(0, 0): "room.nw", (1, 0): "east.nw"}
+    client._current_level_name = "room.nw"
+    links = [{"x": rng.randint(-2, 63), "y": rng.randint(-2, 63),
+              "width": rng.randint(0, 6), "height": rng.randint(0, 6),
+              "dest_level": rng.choice(("east.nw", "inside.nw"))}
+             for _ in range(40)]
+    client.links = {"room.nw": links}
+    client.player.direction = 1      # left probe: (0, 2) from the player
+
+    for tile_y in range(64):
+        for tile_x in range(64):
+            client.player.x, client.player.y = tile_x, tile_y - 2
+            assert client.check_link_collision() is _scan(
+                links, ("east.nw",), tile_x, tile_y)
+
+
+def test_trigger_grid_follows_new_links_and_gmap_changes():
+    edge = {"x": 62, "y": 20, "width": 1, "height": 2,
+            "dest_level": "east.nw"}
+    client = _client_with_link(edge)
+    client.player.x, client.player.y = 59.0, 19.0
+    client.player.direction = 3
+    assert client.check_link_collision() is edge
+
+    # east.nw becomes a gmap neighbour: the edge link is seamless walking.
+    client.gmap_grid[(0, 0)] = "room.nw"
+    client.gmap_grid[(1, 0)] = "east.nw"
+    assert client.check_link_collision() is None
+
+    door = {"x": 62, "y": 21, "width": 0, "height": 0,
+            "dest_level": "inside.nw"}
+    client.links["room.nw"].append(door)
+    assert client.check_link_collision() is door
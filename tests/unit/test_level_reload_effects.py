@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../reborn-prot
 import pytest
 
 from pyreborn import Client
+from pyreborn.game.render_world import WorldRenderMixin
 from pyreborn.game.setup import SetupMixin
 
 
@@ -80,5 +81,32 @@ class TestReloadClearsServerBombSeen:
         assert h.active_projectiles == []
 
 
+class _SegmentReloadHarness(_ReloadHarness, WorldRenderMixin):
+    def __init__(self, client, defs_changed):
+        super().__init__(client)
+        self.tileset_mgr = SimpleNamespace(
+            set_current_level=lambda name: defs_changed)
+        self.world_surface = True
+        self._segments()["level1.nw"] = {'surface': object(), 'prebaked': True}
+
+
+class TestReloadKeepsBakedSegments:
+    def test_segments_survive_a_reload_under_the_same_tiledefs(self):
+        h = _SegmentReloadHarness(_fake_connected_client(), defs_changed=False)
+
+        h._reload_level_scripts("level2.nw")
+        h._apply_pending_full_invalidate()
+
+        assert h._segments()["level1.nw"]['prebaked']
+
+    def test_changed_tiledefs_drop_the_segments(self):
+        h = _SegmentReloadHarness(_fake_connected_client(), defs_changed=True)
+
+        h._reload_level_scripts("level2.nw")
+        h._apply_pending_full_invalidate()
+
+        assert not h._segments()
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
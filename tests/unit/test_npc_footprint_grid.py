@@ -0,0 +1,110 @@
+"""ClientGS1.npc_blocks_at files NPC footprints in a uniform grid when
+client.npcs is the client's NpcTable, and answers exactly as the linear walk
+over every NPC does for plain dicts."""
+
+import os
+import random
+import sys
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../reborn-protocol'))
+
+from pyreborn.client_state import NpcRecord, NpcTable
+from pyreborn.gs1_client import ClientGS1
+
+
+def _gs1(npcs, sizes=None):
+    client = types.SimpleNamespace(
+        npcs=npcs, x=30.0, y=30.0, tiles=[0] * 4096,
+        _current_level_name='level1.nw',
+        player=types.SimpleNamespace(direction=0, x=30.0, y=30.0, hearts=3),
+        global_flags={})
+    gs1 = ClientGS1(client)
+    if sizes is not None:
+        gs1.image_size_source = sizes.get
+    return gs1
+
+
+def _table(plain):
+    table = NpcTable()
+    for npc_id, props in plain.items():
+        table[npc_id] = NpcRecord(props)
+    return table
+
+
+def test_grid_matches_linear_walk():
+    rng = random.Random(7)
+    sizes = {'crate.png': (32, 32), 'tree.png': (64, 96), 'wide.png': (400, 16)}
+    plain = {}
+    for npc_id in range(200):
+        props = {'x': rng.uniform(0, 62), 'y': rng.uniform(0, 62)}
+        kind = rng.randrange(5)
+        if kind == 0:
+            props['is_character'] = True
+        elif kind == 1:
+            props['image'] = 'block.png'
+            props['imagepart'] = [0, 0, 48, 16]
+        elif kind == 2:
+            props['image'] = 'unknown.png'
+        else:
+            props['image'] = rng.choice(sorted(sizes))
+        if rng.random() < 0.1:
+            props['dontblock'] = True
+        plain[npc_id] = props
+    linear = _gs1(plain, sizes)
+    grid = _gs1(_table(plain), sizes)
+    for _ in range(2000):
+        x, y = rng.uniform(-2, 66), rng.uniform(-2, 66)
+        assert grid.npc_blocks_at(x, y) == linear.npc_blocks_at(x, y), (x, y)
+    assert not grid._npc_grid_loose or grid._npc_grid_loose == {
+        npc_id for npc_id, props in plain.items()
+        if props.get('image') == 'unknown.png'}
+
+
+def test_moves_and_deletes_refile():
+    npcs = _table({1: {'x': 10.0, 'y': 10.0, 'image': 'crate.png'}})
+    gs1 = _gs1(npcs, {'crate.png': (32, 32)})
+    assert gs1.npc_blocks_at(10.5, 10.5) is True
+    npcs[1]['x'] = 40.0                 # a script moving the NPC in place
+    assert gs1.npc_blocks_at(10.5, 10.5) is False
+    assert gs1.npc_blocks_at(40.5, 10.5) is True
+    npcs[1].update(y=50.0)
+    assert gs1.npc_blocks_at(40.5, 50.5) is True
+    del npcs[1]
+    assert gs1.npc_blocks_at(40.5, 50.5) is False
+    assert gs1._npc_grid == {}
+
+
+def test_unmeasured_image_is_filed_once_sized():
+    sizes = {}
+    npcs = _table({1: {'x': 10.0, 'y': 10.0, 'image': 'big.png'}})
+    gs1 = _gs1(npcs, sizes)
+    assert gs1.npc_blocks_at(11.5, 11.5) is True    # 2x2 stand-in
+    assert gs1.npc_blocks_at(15.5, 10.5) is False
+    assert gs1._npc_grid_loose == {1}
+    sizes['big.png'] = (128, 32)                    # download lands
+    assert gs1.npc_blocks_at(15.5, 10.5) is True
+    assert gs1._npc_grid_loose == set()
+
+
+def test_plain_dict_npcs_keep_the_linear_walk():
+    npcs = {1: {'x': 10.0, 'y': 10.0, 'is_character': True}}
+    gs1 = _gs1(npcs)
+    assert gs1.npc_blocks_at(11.0, 11.5) is True
+    npcs[1]['x'] = 30.0
+    assert gs1.npc_blocks_at(31.0, 11.5) is True
+    assert gs1._npc_grid == {}
+
+
+def test_overlapping_shapes_keep_shared_cells():
+    npcs = _table({1: {'x': 20.0, 'y': 20.0}, 2: {'x': 21.0, 'y': 20.0}})
+    gs1 = _gs1(npcs)
+    gs1._update_shape_blocks(1, npcs[1], 2, 1, [22, 22])
+    gs1._update_shape_blocks(2, npcs[2], 2, 1, [22, 22])
+    gs1.forget_npc(1)
+    assert gs1.npc_blocks_at(20.5, 20.5) is False
+    assert gs1.npc_blocks_at(21.5, 20.5) is True    # still walled by NPC 2
+    gs1._update_shape_blocks(2, npcs[2], 0, 0, [])
+    assert gs1.npc_blocks_at(21.5, 20.5) is False
+    assert gs1._shape_blocks == set() and gs1._shape_cell_owners == {}
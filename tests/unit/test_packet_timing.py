@@ -0,0 +1,108 @@
+"""Opt-in handler latency histograms and the per-frame cost breakdown."""
+
+import json
+import time
+
+from pyreborn import Client
+from pyreborn.handlers import PACKET_HANDLERS, STOP
+from pyreborn.packet_timing import LatencyHistogram
+from pyreborn.packets import PacketID
+from pyreborn.protocol import ThreadedProtocol
+
+
+class _FeedProtocol:
+    connected = True
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.last_decode_time = 0.002
+
+    def recv_packets(self, timeout=0.01):
+        return self.batches.pop(0) if self.batches else []
+
+
+def test_histogram_percentiles_are_bucket_upper_bounds():
+    histogram = LatencyHistogram()
+    for _ in range(98):
+        histogram.add(3e-6)        # [2, 4) us bucket
+    histogram.add(100e-6)          # [64, 128) us
+    histogram.add(0.5)
+    assert histogram.count == 100
+    assert histogram.percentile(0.50) == 4e-6
+    assert histogram.percentile(0.99) == 128e-6
+    assert histogram.percentile(1.0) == 0.5
+    assert histogram.as_dict()['max_us'] == 500000.0
+
+
+def test_timing_is_off_by_default():
+    client = Client()
+    client._protocol = _FeedProtocol([[(PacketID.PLO_ISLEADER, b"")]])
+    client.update()
+    assert client.packet_timing is None
+    assert client.packet_timing_report() == {}
+
+
+def test_update_records_handlers_hooks_and_frames(monkeypatch, tmp_path):
+    client = Client()
+    leader = int(PacketID.PLO_ISLEADER)
+    stopped = int(PacketID.PLO_NPCPROPS)
+    monkeypatch.setitem(PACKET_HANDLERS, stopped, lambda c, d: STOP)
+    hooked = []
+    client.on_packet[leader] = hooked.append
+    client._protocol = _FeedProtocol([
+        [(leader, b"abc"), (stopped, b"12345")],
+        [],
+        [(leader, b"")],
+    ])
+    client.enable_packet_timing()
+    for _ in range(3):
+        client.update()
+
+    report = client.packet_timing_report()
+    assert report['frames']['count'] == 3
+    assert report['frames']['recv']['total_ms'] == 6.0
+    packets = report['packets']
+    assert packets['PLO_ISLEADER']['count'] == 2
+    assert packets['PLO_ISLEADER']['bytes'] == 3
+    assert packets['PLO_NPCPROPS']['bytes'] == 5
+    assert hooked == [b"abc", b""]
+    assert client.packet_timing.hooks.count == 3
+
+    path = tmp_path / "timing.json"
+    client.dump_packet_timing(str(path))
+    assert json.loads(path.read_text())['packets']['PLO_ISLEADER']['id'] == leader
+
+    client.enable_packet_timing(False)
+    assert client.packet_timing_report() == {}
+
+
+def test_packets_without_a_handler_still_count_bytes(monkeypatch):
+    client = Client()
+    leader = int(PacketID.PLO_ISLEADER)
+    monkeypatch.delitem(PACKET_HANDLERS, leader, raising=False)
+    client.on_packet[leader] = lambda data: None
+    client._protocol = _FeedProtocol([[(leader, b"abcd"), (leader, b"ef")]])
+    client.enable_packet_timing()
+    client.update()
+
+    entry = client.packet_timing_report()['packets']['PLO_ISLEADER']
+    assert entry['received'] == 2
+    assert entry['bytes'] == 6
+    assert entry['count'] == 0
+
+
+def test_threaded_recv_time_is_this_updates_drain():
+    client = Client(threaded_io=True)
+    proto = client._protocol
+    assert isinstance(proto, ThreadedProtocol)
+    for n in range(3):
+        proto._inbound.put((time.monotonic(), int(PacketID.PLO_ISLEADER),
+                            bytes([n])))
+    # what the reader thread last measured for some other batch
+    proto.last_decode_time = 5.0
+    client.enable_packet_timing()
+    client.update(timeout=0)
+
+    assert proto.last_decode_time < 1.0
+    recv = client.packet_timing_report()['frames']['recv']
+    assert recv['count'] == 1 and recv['max_us'] < 1e6
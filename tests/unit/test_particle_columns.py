@@ -0,0 +1,181 @@
+"""VectorParticleEmitter (pyreborn/particles.py) against the scalar
+ParticleEmitter it replaces: same seed, same script calls -> the same
+particles, field for field, the same modifier/template timers, and the same
+amount of the random stream consumed."""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../reborn-protocol'))
+
+import pytest
+
+from pyreborn.particles import (
+    DRAW_FIELDS, ParticleEmitter, VectorParticleEmitter, emitter_for_record,
+)
+
+_FIELDS = ("x", "y", "z", "vx", "vy", "vz", "angle", "zangle", "speed",
+           "rotation", "spin", "zoom", "stretchx", "stretchy", "red", "green",
+           "blue", "alpha", "mode", "image", "lifetime", "born")
+
+
+def _index(mods, mod):
+    return next(n for n, other in enumerate(mods) if other is mod)
+
+
+def _snapshot(emitter):
+    mods = (emitter.local_modifiers + emitter.global_modifiers
+            + emitter.template_modifiers)
+    return {
+        "particles": [
+            tuple(getattr(p, name) for name in _FIELDS)
+            + tuple((_index(mods, mod), t) for mod, t in p.users)
+            for p in emitter.particles],
+        "draw": emitter.draw_state(),
+        "timers": [mod.user_time for mod in mods],
+        "templates": [tuple(getattr(t.data, name) for name in _FIELDS[:-1])
+                      for t in emitter.templates],
+        "emitted": emitter.emitted_total,
+        "drops": [_snapshot(sub) for sub in (emitter._dropemitter,
+                                             emitter._dropwateremitter)
+                  if sub is not None],
+    }
+
+
+def _aura(cls):
+    """global_aura.gani shape: tinted additive template, once spread."""
+    emitter = cls({"x": 10.0, "y": 12.0})
+    emitter.set("delaymin", 0.05)
+    emitter.set("delaymax", 0.2)
+    emitter.set("nrofparticles", 12)
+    particle = emitter.get("particle")
+    particle.set("lifetime", 1.2)
+    particle.set("image", "light2.png")
+    particle.set("speed", 0)
+    particle.set("mode", 2)
+    particle.set("alpha", 0.9)
+    emitter.add_local_modifier(["once", 0, 0, "movex", "add", -2, 2])
+    emitter.add_local_modifier(["once", 0, 0, "movey", "add", -2, 2])
+    emitter.add_local_modifier(["range", 0.2, 1.2, "alpha", "add", 0, -2])
+    emitter.add_global_modifier(
+        ["impulse", 0.1, 0.3, "zoom", "multiply", 0.9, 1.1])
+    return emitter
+
+
+def _smoke(cls):
+    """particle_smoke shape: two templates, spin, coupled movement vars,
+    impulse users re-arming per particle, clamped colour adds."""
+    emitter = cls({"x": 3.0, "y": 4.0, "z": 1.0})
+    emitter.set("delaymin", 0.0)
+    emitter.set("delaymax", 0.1)
+    emitter.set("nrofparticles", 6)
+    emitter.set("particletypes", 2)
+    first, second = emitter.get("particles")
+    first.set("image", "smoke3.png")
+    first.set("lifetime", 2.0)
+    first.set("spin", 1.5)
+    second.set("image", "smoke4.png")
+    second.set("lifetime", 1.0)
+    second.set("zangle", 0.3)
+    spin = emitter.add_local_modifier(
+        ["impulse", 0.1, 0.4, "spin", "add", -2, 2])
+    spin.add_var_modifier("zangle", "add", -0.2, 0.2)
+    emitter.add_local_modifier(["range", 0, 0.5, "speed", "add", 1, 3])
+    emitter.add_local_modifier(["once", 0, 0, "angle", "replace", 0, 6.3])
+    emitter.add_local_modifier(["range", 0.3, 0.3, "red", "add", -5, -5])
+    emitter.add_global_modifier(["once", 0, 0, "movez", "add", -1, 1])
+    emitter.add_global_modifier(["range", 0, 1, "stretchx", "replace", 1, 3])
+    emitter.add_template_modifier(["range", 0, 3, "green", "add", 0, -0.5])
+    return emitter
+
+
+def _drops(cls):
+    """Expiring particles feed a drop emitter between their neighbours'
+    random draws; maxparticles trims the oldest; autorotation."""
+    emitter = cls({"x": 0.0, "y": 0.0})
+    emitter.set("delaymin", 0.0)
+    emitter.set("delaymax", 0.0)
+    emitter.set("nrofparticles", 5)
+    emitter.set("maxparticles", 14)
+    emitter.set("autorotation", 1)
+    emitter.get("particle").set("image", "drop.png")
+    emitter.get("particle").set("lifetime", 0.3)
+    emitter.add_local_modifier(["impulse", 0.0, 0.1, "lifetime", "add", 0, 1])
+    emitter.add_local_modifier(["impulse", 0.05, 0.1, "movey", "add", -1, 1])
+    sub = emitter.get("dropemitter")
+    sub.set("nrofparticles", 2)
+    sub.get("particle").set("lifetime", 0.4)
+    sub.add_local_modifier(["once", 0, 0, "x", "add", -1, 1])
+    return emitter
+
+
+@pytest.mark.parametrize("build", [_aura, _smoke, _drops])
+@pytest.mark.parametrize("seed", [1, 7, 2024])
+def test_vector_engine_matches_scalar(build, seed):
+    def run(cls):
+        random.seed(seed)
+        emitter = build(cls)
+        snapshots = []
+        for step in range(60):
+            emitter.advance(0.016 + (step % 5) * 0.01)
+            if step == 20:
+                # modifiers added mid-run only reach later emissions
+                emitter.add_local_modifier(
+                    ["once", 0, 0, "blue", "multiply", 0.2, 0.8])
+            if step == 35:
+                emitter.emit_now(position=(5.0, 6.0, 0.5))
+            if step % 10 == 0:
+                snapshots.append(_snapshot(emitter))
+        snapshots.append(_snapshot(emitter))
+        return snapshots, random.random()
+
+    scalar = run(ParticleEmitter)
+    vector = run(VectorParticleEmitter)
+    assert scalar[0][-1]["particles"], "scenario must keep particles alive"
+    assert vector == scalar
+
+
+def test_removeparticles_and_views_write_through():
+    emitter = VectorParticleEmitter({})
+    emitter.set("emitautomatically", 0)
+    emitter.set("nrofparticles", 3)
+    emitter.get("particle").set("lifetime", 5)
+    emitter.get("particle").set("image", "dot.png")
+    emitter.emit_now()
+    p = emitter.particles[-1]
+    p.alpha = 0.5
+    p.image = "other.png"
+    assert emitter.draw_state()[2][DRAW_FIELDS.index("alpha")] == 0.5
+    assert [q.image for q in emitter.particles] == ["dot.png"] * 2 + [
+        "other.png"]
+    del emitter.particles[:2]
+    assert emitter.get("currentparticlecount") == 1.0
+    assert emitter.particles[0].alpha == 0.5
+    emitter.remove_particles()
+    assert not emitter.particles and emitter.draw_state() == []
+
+
+def test_views_refuse_writes_to_users():
+    emitter = VectorParticleEmitter({})
+    emitter.set("emitautomatically", 0)
+    emitter.set("nrofparticles", 1)
+    emitter.get("particle").set("lifetime", 5)
+    emitter.add_local_modifier(["once", 0, 0, "alpha", "add", 0, 0])
+    emitter.emit_now()
+    p = emitter.particles[0]
+    assert isinstance(p.users, tuple)
+    with pytest.raises(AttributeError):
+        p.users.append((None, 0.0))
+    with pytest.raises(AttributeError):
+        p.users = ()
+
+
+def test_layer_records_get_the_scalar_engine():
+    rec = {}
+    emitter = emitter_for_record(rec)
+    assert type(emitter) is ParticleEmitter
+    assert emitter_for_record(rec) is emitter
+    assert isinstance(emitter.get("dropemitter"), ParticleEmitter)
+    assert isinstance(emitter_for_record({}).draw_state(), list)
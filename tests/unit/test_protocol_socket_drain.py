@@ -23,6 +23,11 @@ class _CountingSocket:
         self.received += len(chunk)
         return chunk
 
+    def recv_into(self, buffer, nbytes=0):
+        count = self.sock.recv_into(buffer, nbytes)
+        self.received += count
+        return count
+
     def fileno(self):
         return self.sock.fileno()
 
@@ -99,3 +104,52 @@ def test_clean_eof_marks_protocol_disconnected():
         assert proto.connected is False
     finally:
         receiver.close()
+
+
+def test_partial_frame_is_compacted_and_completed_next_call():
+    receiver, sender = socket.socketpair()
+    try:
+        proto = _connected_protocol(receiver)
+        wire = _framed_payload(3) + struct.pack(">H", 4) + b"ab"
+        _preload(sender, wire)
+
+        assert len(proto.recv_packets(timeout=0)) == 3
+        # Only the unfinished frame survives the single compaction.
+        assert bytes(proto.recv_buffer) == struct.pack(">H", 4) + b"ab"
+
+        _preload(sender, b"cd")
+
+        assert proto.recv_packets(timeout=0) == [(0, b"abcd")]
+        assert len(proto.recv_buffer) == 0
+    finally:
+        receiver.close()
+        sender.close()
+
+
+def test_raw_data_reassembles_across_bundles_and_calls():
+    receiver, sender = socket.socketpair()
+    try:
+        proto = _connected_protocol(receiver)
+        proto.codec.recv_packet = lambda data: data
+        board = bytes([101 + 32]) + bytes(range(256)) * 32 + b"\n"
+        size = len(board)
+        header = bytes([100 + 32, 32 + ((size >> 14) & 0x7F),
+                        32 + ((size >> 7) & 0x7F), 32 + (size & 0x7F)]) + b"\n"
+        first = header + board[:5000]
+        second = board[5000:] + b"(hi\n"
+        wire = (struct.pack(">H", len(first)) + first
+                + struct.pack(">H", len(second)) + second)
+        _preload(sender, wire[:7000])
+
+        assert [pid for pid, _ in proto.recv_packets(timeout=0)] == [100]
+        assert len(proto.raw_data_buffer) == 5000
+
+        _preload(sender, wire[7000:])
+        packets = proto.recv_packets(timeout=0)
+
+        assert packets == [(101, board[1:-1]), (8, b"hi")]
+        assert len(proto.raw_data_buffer) == 0
+        assert len(proto.recv_buffer) == 0
+    finally:
+        receiver.close()
+        sender.close()
@@ -166,3 +166,37 @@ def test_bounded_lru_refreshes_reads_and_evicts_oldest():
     assert "first" in cache
     assert "second" not in cache
     assert cache["third"] == 3
+
+
+def test_bounded_lru_byte_budget_evicts_oldest_and_keeps_newest():
+    cache = client_module.BoundedLRU(10, max_bytes=10, sizeof=len)
+    cache["a"] = b"1234"
+    cache["b"] = b"5678"
+    cache["a"] = b"12"          # replacing re-counts, does not double count
+    assert cache.total_bytes == 6
+    cache["c"] = b"abcdef"      # 12 > 10: "b" is now the oldest
+    assert list(cache) == ["a", "c"] and cache.total_bytes == 8
+    del cache["a"]
+    assert cache.pop("c") == b"abcdef" and cache.total_bytes == 0
+    cache["huge"] = bytes(64)   # alone over budget: still kept
+    assert list(cache) == ["huge"]
+
+
+def test_boards_are_arrays_and_level_cache_honours_byte_ceiling():
+    from array import array
+
+    client = Client(level_cache_bytes=3 * 8192)
+    assert isinstance(client.tiles, array) and len(client.tiles) == 0
+    board = bytes([1, 0]) * 4096
+    for name in ("a.nw", "b.nw", "c.nw", "d.nw"):
+        client._pending_level_name = name
+        client._current_level_name = name
+        client._handle_packet(PacketID.PLO_BOARDPACKET, board)
+    assert list(client.levels) == ["b.nw", "c.nw", "d.nw"]
+    assert client.levels.total_bytes == 3 * 8192
+    assert client.tiles is client.levels["d.nw"]
+    assert client.tiles.typecode == "H" and client.get_tile(5, 5) == 1
+
+    client._apply_board_modify("d.nw", {"x": 5, "y": 5, "width": 1,
+                                        "height": 1, "tiles": [77]})
+    assert client.get_tile(5, 5) == 77
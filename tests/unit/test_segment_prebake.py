@@ -0,0 +1,165 @@
+"""WorldRenderMixin pre-bakes the gmap segments the camera is heading into,
+so the frame that first shows them finds a cached surface, and counts those
+hits against bakes that still land on the draw path."""
+
+import os
+import sys
+from array import array
+from types import SimpleNamespace
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../reborn-protocol'))
+
+import pygame
+
+from pyreborn import Client
+from pyreborn.client_state import GmapIndex
+from pyreborn.game.camera import Camera2D
+from pyreborn.game.render_world import WorldRenderMixin
+from pyreborn.game.setup import SetupMixin
+from pyreborn.sprites import SpriteManager, TilesetManager
+
+
+class _Harness(WorldRenderMixin):
+    def __init__(self, width=3, height=3):
+        grid = GmapIndex({(gx, gy): f"w{gx}{gy}.nw"
+                          for gx in range(width) for gy in range(height)})
+        self.client = SimpleNamespace(
+            gmap_grid=grid, board_layers={}, tiles=None,
+            _current_level_name="w11.nw", _tiles_level_name="w11.nw",
+            levels={name: array('H', [n] * 4096)
+                    for n, name in enumerate(grid.values())},
+            get_adjacent_levels=lambda name: list(grid.neighbours(name)))
+        self.tileset_mgr = TilesetManager(SpriteManager([]))
+        self.world_surface = True
+
+    def frame(self, tile_range):
+        """The visible segments for `tile_range`, drawn, then the pre-bake
+        step _render_world runs after them."""
+        min_tx, min_ty, max_tx, max_ty = tile_range
+        segments = [
+            (self.client.gmap_grid[(gx, gy)], gx * 64, gy * 64)
+            for gy in range(min_ty // 64, max_ty // 64 + 1)
+            for gx in range(min_tx // 64, max_tx // 64 + 1)]
+        for level_name, _, _ in segments:
+            self._get_segment_surface(level_name)
+        self._prebake_segments(segments, tile_range)
+
+
+def _view(cx, cy):
+    return (cx - 10, cy - 7, cx + 10, cy + 7)
+
+
+def test_walking_east_prebakes_the_next_segment_first():
+    h = _Harness()
+    h.frame(_view(96, 96))
+    h._segments().clear()
+    h.frame(_view(100, 96))
+    h.frame(_view(104, 96))           # moving east, 4 tiles a frame
+    assert h._segments()["w21.nw"]["prebaked"]
+    first = next(name for name, entry in h._segments().items()
+                 if entry["prebaked"])
+    assert first == "w21.nw"
+
+    cold = h.segment_bake_stats()["cold_misses"]
+    h.frame(_view(180, 96))            # across the seam
+    stats = h.segment_bake_stats()
+    assert stats["cold_misses"] == cold
+    assert stats["prebaked_hits"] == 1
+    assert not h._segments()["w21.nw"]["prebaked"]
+
+
+def test_standing_still_fills_every_loaded_neighbour():
+    h = _Harness()
+    del h.client.levels["w00.nw"]      # board not streamed in yet
+    for _ in range(20):
+        h.frame(_view(96, 96))
+    cache = h._segments()
+    assert set(cache) == set(h.client.levels)
+    assert not cache["w11.nw"]["prebaked"]
+    assert h.segment_bake_stats()["prebaked"] == 7
+
+
+def test_replaced_board_is_prebaked_again():
+    h = _Harness()
+    for _ in range(20):
+        h.frame(_view(96, 96))
+    old = h._segments()["w21.nw"]["surface"]
+    h.client.levels["w21.nw"] = array('H', [99] * 4096)
+    h.frame(_view(96, 96))
+    entry = h._segments()["w21.nw"]
+    assert entry["prebaked"] and entry["surface"] is not old
+
+
+
+def test_cached_segment_with_board_layers_is_not_rebaked():
+    h = _Harness()
+    h.client._current_level_name = "w21.nw"
+    h.client.board_layers = {1: bytes(8192)}
+    h._get_segment_surface("w21.nw")
+    baked = h._segments()["w21.nw"]
+
+    for _ in range(20):
+        h.frame(_view(96, 96))          # w21 is a neighbour, off screen
+
+    assert h._segments()["w21.nw"] is baked
+    assert baked["layers_snapshot"] == {1: bytes(8192)}
+    cold = h.segment_bake_stats()["cold_misses"]
+    assert h._get_segment_surface("w21.nw") is baked["surface"]
+    assert h.segment_bake_stats()["cold_misses"] == cold
+
+class _SeamHarness(SetupMixin, WorldRenderMixin):
+    """A real Client on a 3x3 gmap, plus the GameClient slices a seam
+    crossing runs through: the level-change reload and the world render."""
+
+    def __init__(self):
+        c = Client("localhost", 14900)
+        c._authenticated = True
+        c._protocol = SimpleNamespace(
+            connected=True, send_packet=lambda *a, **k: True)
+        c.gmap_grid = GmapIndex({(gx, gy): f"w{gx}{gy}.nw"
+                                 for gx in range(3) for gy in range(3)})
+        for n, name in enumerate(c.gmap_grid.values()):
+            c.levels[name] = array('H', [n] * 4096)
+        c._current_level_name = c._tiles_level_name = "w11.nw"
+        c.tiles = c.levels["w11.nw"]
+        c.npcs[1] = {'x': 0.0, 'y': 0.0}   # the level's NPCs have arrived
+        self.client = c
+        self.tileset_mgr = TilesetManager(SpriteManager([]))
+        self.world_surface = None
+        self._animated_tiles_key = None
+        self.gs1 = SimpleNamespace(clear=lambda: None, board_ready=lambda: True,
+                                   drop_level_weapon_layers=lambda: None)
+        self.npc_handler = SimpleNamespace(update_npcs=lambda: None)
+        self.screen = pygame.Surface((320, 240))
+        self.camera = Camera2D(320, 240)
+        self._gs1_level = "w11.nw"
+        self._gs1_visual_level_epoch = c._plain_level_change_epoch
+
+    def _load_npc_scripts(self):
+        pass
+
+    def _trigger_playerenters(self):
+        pass
+
+
+def test_seam_crossing_draws_the_prebaked_segment():
+    h = _SeamHarness()
+    h.camera.set_center(100, 96)        # inside w11, short of the east seam
+    for _ in range(20):
+        h._render_world()
+    assert h._segments()["w21.nw"]["prebaked"]
+    cold = h.segment_bake_stats()["cold_misses"]
+
+    assert h.client.enter_gmap_segment("w21.nw", 2.0, 32.0)
+    h._check_level_change()
+    assert h._gs1_level == "w21.nw"
+    h.camera.set_center(140, 96)        # only w21 in view
+    h._render_world()
+
+    stats = h.segment_bake_stats()
+    assert stats["prebaked_hits"] > 0
+    assert stats["cold_misses"] == cold
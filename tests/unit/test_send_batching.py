@@ -0,0 +1,107 @@
+"""Batched outbound sends: encrypt in call order, one sendall per flush."""
+
+from reborn_protocol import Gen5Codec
+
+from pyreborn import Client
+from pyreborn.protocol import Protocol
+
+
+class _RecordingSocket:
+    def __init__(self):
+        self.writes = []
+
+    def setblocking(self, _flag):
+        pass
+
+    def sendall(self, data):
+        self.writes.append(bytes(data))
+
+
+def _batching_protocol():
+    proto = Protocol("127.0.0.1", 0, version="6.037")
+    proto.socket = _RecordingSocket()
+    proto.connected = True
+    proto.batch_sends = True
+    return proto
+
+
+def _decode(wire: bytes, key: int):
+    codec = Gen5Codec(key)
+    out, i = [], 0
+    while i + 2 <= len(wire):
+        length = (wire[i] << 8) | wire[i + 1]
+        out.append(codec.recv_packet(bytes(wire[i + 2:i + 2 + length])))
+        i += 2 + length
+    assert i == len(wire)
+    return out
+
+
+def test_batched_packets_are_written_once_in_call_order():
+    proto = _batching_protocol()
+    for seq in range(5):
+        assert proto.send_packet(6, bytes([33 + seq]) * 4)
+
+    assert proto.socket.writes == []
+
+    assert proto.flush() is True
+
+    assert len(proto.socket.writes) == 1
+    assert _decode(proto.socket.writes[0], proto.encryption_key) == [
+        bytes([6 + 32]) + bytes([33 + seq]) * 4 + b"\n" for seq in range(5)]
+    stats = proto.send_stats()
+    assert stats['flushes'] == 1
+    assert stats['packets_flushed'] == 5
+    assert stats['packets_per_flush'] == 5.0
+    assert stats['pending_packets'] == 0
+
+
+def test_size_threshold_flushes_early():
+    proto = _batching_protocol()
+    proto.batch_flush_bytes = 200
+
+    for _ in range(10):
+        proto.send_packet(6, b"x" * 60)
+
+    assert proto.socket.writes
+    assert all(len(write) >= 200 for write in proto.socket.writes)
+    proto.flush()
+    assert proto.send_stats()['packets_flushed'] == 10
+
+
+def test_empty_flush_does_not_write():
+    proto = _batching_protocol()
+
+    assert proto.flush() is True
+    assert proto.socket.writes == []
+    assert proto.send_stats()['flushes'] == 0
+
+
+def test_unbatched_sends_write_immediately():
+    proto = _batching_protocol()
+    proto.batch_sends = False
+
+    proto.send_packet(6, b"a")
+    proto.send_packet(6, b"b")
+
+    assert len(proto.socket.writes) == 2
+
+
+def test_client_update_flushes_once_per_tick(monkeypatch):
+    client = Client("localhost", 14900, version="6.037", batch_sends=True)
+    proto = client._protocol
+    proto.socket = _RecordingSocket()
+    proto.connected = True
+    monkeypatch.setattr(proto, "recv_packets", lambda _timeout=0.01: [])
+
+    proto.send_packet(6, b"a")
+    proto.send_packet(6, b"b")
+    assert proto.socket.writes == []
+
+    client.update(timeout=0)
+
+    assert len(proto.socket.writes) == 1
+    assert proto.send_stats()['max_packets_per_flush'] == 2
+
+    client.batch_sends = False
+    proto.send_packet(6, b"c")
+    assert len(proto.socket.writes) == 2
@@ -348,6 +348,39 @@ def test_client_counts_player_prop_width_fallbacks_and_parse_errors():
     assert client.prop_parse_diagnostics["errors"] == 1
 
 
+def test_client_learns_colors_width_once_per_connection():
+    client = Client(version="6.037")
+    classic_props = bytes([13 + 32, 32, 33, 34, 35, 36,
+                           15 + 32, 52, 16 + 32, 54])
+    for _ in range(3):
+        client._handle_packet(PacketID.PLO_PLAYERPROPS, classic_props)
+    # Only the first packet paid for the wrong v6 guess.
+    assert client.prop_parse_diagnostics["width_fallbacks"] == 1
+    assert client._player_colors.width == 5
+
+    client._reset_for_connect()
+    assert client._player_colors.width == 8
+
+
+def test_learned_colors_width_follows_a_server_switch():
+    from pyreborn.packets import ColorsWidth, _parse_with_colors_retry
+
+    learned = ColorsWidth(8)
+    tried = []
+
+    def run_once(server_width):
+        def _run(width):
+            tried.append(width)
+            return {"width": width}, width == server_width
+        return _run
+
+    assert _parse_with_colors_retry(run_once(5), learned) == {"width": 5}
+    assert _parse_with_colors_retry(run_once(5), learned) == {"width": 5}
+    assert _parse_with_colors_retry(run_once(8), learned) == {"width": 8}
+    assert tried == [8, 5, 5, 5, 8]
+    assert (learned.width, learned.switches) == (8, 2)
+
+
 class _SendingProtocol:
     def __init__(self):
         self.calls = []
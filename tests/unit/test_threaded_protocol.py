@@ -0,0 +1,140 @@
+"""ThreadedProtocol: socket reads and decoding on a background reader thread."""
+
+import socket
+import struct
+import threading
+import time
+
+from pyreborn.protocol import ThreadedProtocol
+
+
+def _started_protocol(sock, max_queue=8192):
+    proto = ThreadedProtocol("127.0.0.1", 0, max_queue=max_queue)
+    proto.socket = sock
+    proto.connected = True
+    proto.first_packet = False
+    proto.codec.recv_packet = lambda data: b" " + data + b"\n"
+    proto._start_reader()
+    return proto
+
+
+def _framed_payload(frame_count):
+    return b"".join(struct.pack(">H", 1) + bytes([33 + i % 90])
+                    for i in range(frame_count))
+
+
+def _collect(proto, count, deadline=5.0):
+    packets = []
+    end = time.monotonic() + deadline
+    while len(packets) < count and time.monotonic() < end:
+        packets += proto.recv_packets(timeout=0.05)
+    return packets
+
+
+def test_reader_thread_decodes_into_queue():
+    receiver, sender = socket.socketpair()
+    proto = _started_protocol(receiver)
+    try:
+        sender.sendall(_framed_payload(500))
+
+        packets = _collect(proto, 500)
+
+        assert packets == [(0, bytes([33 + i % 90])) for i in range(500)]
+        stats = proto.transport_stats()
+        assert stats['packets_queued'] == 500
+        assert stats['packets_dispatched'] == 500
+        assert stats['queue_depth'] == 0
+        assert stats['max_lag'] >= 0.0
+    finally:
+        proto.disconnect()
+        sender.close()
+
+
+def test_full_queue_blocks_reader_without_dropping_packets():
+    receiver, sender = socket.socketpair()
+    proto = _started_protocol(receiver, max_queue=16)
+    try:
+        sender.sendall(_framed_payload(100))
+        end = time.monotonic() + 5.0
+        while proto.queue_depth < 16 and time.monotonic() < end:
+            time.sleep(0.01)
+
+        assert proto.queue_depth == 16
+        assert proto.peak_queue_depth <= 16
+
+        packets = _collect(proto, 100)
+
+        assert len(packets) == 100
+        assert proto.reader_blocked_time > 0.0
+    finally:
+        proto.disconnect()
+        sender.close()
+
+
+def test_packets_before_eof_are_still_dispatched():
+    receiver, sender = socket.socketpair()
+    proto = _started_protocol(receiver)
+    try:
+        sender.sendall(_framed_payload(3))
+        sender.close()
+        end = time.monotonic() + 5.0
+        while proto.connected and time.monotonic() < end:
+            time.sleep(0.01)
+
+        assert proto.connected is False
+        assert proto.recv_packets(timeout=0) == [(0, b"!"), (0, b'"'),
+                                                 (0, b"#")]
+    finally:
+        proto.disconnect()
+
+
+class _WireSocket:
+    """Records sendall() and reports whether the socket was ever made
+    non-blocking during a send."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.wire = bytearray()
+        self.blocking_changes = []
+
+    def setblocking(self, flag):
+        self.blocking_changes.append(flag)
+        self.sock.setblocking(flag)
+
+    def sendall(self, data):
+        self.wire.extend(data)
+
+    def recv_into(self, buffer, nbytes=0):
+        return self.sock.recv_into(buffer, nbytes)
+
+    def fileno(self):
+        return self.sock.fileno()
+
+
+def test_sends_keep_order_and_never_toggle_blocking():
+    receiver, sender = socket.socketpair()
+    wrapped = _WireSocket(receiver)
+    proto = _started_protocol(wrapped)
+    proto.codec.send_packet = lambda packet: packet
+    try:
+        wrapped.blocking_changes.clear()
+
+        def worker(tid):
+            for seq in range(50):
+                assert proto.send_packet(6, bytes([33 + tid, 33 + seq]))
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        lines = bytes(wrapped.wire).split(b"\n")[:-1]
+        assert len(lines) == 200
+        for tid in range(4):
+            seqs = [line[2] for line in lines if line[1] == 33 + tid]
+            assert seqs == sorted(seqs)
+        assert wrapped.blocking_changes == []
+    finally:
+        proto.disconnect()
+        sender.close()
@@ -0,0 +1,98 @@
+"""Per-level tile type maps (tiletypes.tile_type_map, Client.tile_types):
+collision and script probes read one byte per sample and get the same answer
+as get_tile_type on the board tile, across board edits, board replacement
+and tilestype changes."""
+
+import os
+import random
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../reborn-protocol'))
+
+from array import array
+
+import pytest
+
+from pyreborn import Client
+from pyreborn.game.collision import CollisionMixin
+from pyreborn.tiletypes import (
+    TILESTYPE_NONE, TileType, get_tile_type, reset_tiledefs, tile_type_map,
+)
+
+
+class _Harness(CollisionMixin):
+    def __init__(self, client):
+        self.client = client
+
+
+@pytest.fixture(autouse=True)
+def _no_tiledefs():
+    reset_tiledefs()
+    yield
+    reset_tiledefs()
+
+
+def _board(seed):
+    rng = random.Random(seed)
+    return array('H', (rng.randrange(0, 8192) for _ in range(4096)))
+
+
+def _first_tile_of_type(ttype):
+    return next(t for t in range(4096) if get_tile_type(t) == ttype)
+
+
+@pytest.mark.parametrize("tilestype", [0, 1, TILESTYPE_NONE])
+def test_map_matches_get_tile_type(tilestype):
+    tiles = list(_board(1)) + [-1]
+    types = tile_type_map(tiles, tilestype)
+    assert list(types) == [get_tile_type(t, tilestype) for t in tiles]
+
+
+def test_board_modify_patches_the_cached_map():
+    c = Client("localhost", 14900)
+    c._current_level_name = c._tiles_level_name = "a.nw"
+    c.levels["a.nw"] = c.tiles = _board(2)
+    types = c.tile_types("a.nw", c.tiles, 0)
+    wall = _first_tile_of_type(TileType.BLOCKING)
+    c._apply_board_modify("a.nw", {"x": 62, "y": 3, "width": 4, "height": 1,
+                                   "tiles": [wall] * 4})
+    assert c.tile_types("a.nw", c.tiles, 0) is types
+    assert list(types) == list(tile_type_map(c.tiles, 0))
+
+
+def test_new_board_or_tilestype_rebuilds():
+    c = Client("localhost", 14900)
+    c.levels["a.nw"] = first = _board(3)
+    types = c.tile_types("a.nw", first, 0)
+    assert c.tile_types("a.nw", first, TILESTYPE_NONE) == bytearray(4096)
+    c.levels["a.nw"] = second = _board(4)
+    assert list(c.tile_types("a.nw", second, 0)) == list(
+        tile_type_map(second, 0))
+    # An edit to a board the map no longer describes drops the stale map.
+    c.tile_types("a.nw", first, 0)
+    c._apply_board_modify("a.nw", {"x": 0, "y": 0, "width": 1, "height": 1,
+                                   "tiles": [0]})
+    assert "a.nw" not in c._tile_type_maps
+    assert types is not c.tile_types("a.nw", second, 0)
+
+
+def test_collision_probes_match_the_tile_lookup():
+    c = Client("localhost", 14900)
+    c.gmap_width, c.gmap_height = 2, 1
+    c.gmap_grid[(0, 0)] = "w0.nw"
+    c.gmap_grid[(1, 0)] = "w1.nw"
+    c._current_level_name = c._tiles_level_name = "w0.nw"
+    c.levels["w0.nw"] = c.tiles = _board(5)
+    c.levels["w1.nw"] = _board(6)
+    h = _Harness(c)
+    rng = random.Random(7)
+    for _ in range(3000):
+        x, y = rng.uniform(-2, 130), rng.uniform(-2, 66)
+        expected = get_tile_type(h._get_tile_at(x, y))
+        ttype = h._board_tile_type(x, y)
+        assert ttype is None or ttype == expected, (x, y)
+        assert h._effective_tile_type(x, y) == expected
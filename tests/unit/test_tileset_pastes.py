@@ -142,3 +142,75 @@ def test_aligned_column_pastes_preserve_legacy_layout():
             block * 20, block * 20 + 1, block * 20 + 2, 255)
         assert _pixel(manager, block * 16 + 15, 31) == (
             block * 20, block * 20 + 1, block * 20 + 2, 255)
+
+
+def _cut(source):
+    sheet, rect = source
+    return pygame.image.tobytes(sheet.subsurface(rect), "RGBA")
+
+
+def test_tile_sources_cut_what_get_tile_copies():
+    sprites = SpriteManager([])
+    sprites.sheet_cache["dustynewpics1.png"] = _sheet((10, 20, 30, 255))
+    paste = pygame.Surface((48, 16), pygame.SRCALPHA)
+    paste.fill((200, 0, 0, 255))
+    sprites.sheet_cache["paste.png"] = paste
+    manager = TilesetManager(sprites)
+    manager.set_tiledef("paste.png", "pasted", 16, 0)
+    ids = [_tile_id_at(tx, ty) for tx, ty in ((0, 0), (1, 0), (3, 0), (127, 31))]
+
+    for level in ("plain.nw", "pasted.nw"):
+        manager.set_current_level(level)
+        sources = manager.get_tile_sources(ids)
+        assert sorted(sources) == sorted(ids)
+        for tile_id in ids:
+            assert _cut(sources[tile_id]) == pygame.image.tobytes(
+                manager.get_tile(tile_id), "RGBA")
+
+
+def test_tile_sources_leave_out_what_get_tile_cannot_cut_whole():
+    sprites = SpriteManager([])
+    manager = TilesetManager(sprites)
+    assert manager.get_tile_sources([0, 1]) == {}      # sheet not loaded yet
+
+    sprites.sheet_cache["dustynewpics1.png"] = pygame.Surface((40, 512))
+    assert sorted(manager.get_tile_sources([0, 1, 2, 3])) == [0, 1]
+
+
+def test_level_change_under_the_same_defs_keeps_extracted_tiles():
+    sprites = SpriteManager([])
+    sprites.sheet_cache["dustynewpics1.png"] = _sheet((10, 20, 30, 255))
+    manager = TilesetManager(sprites)
+    manager.set_tiledef("castle.png", "castle", 0, 0)
+    manager.set_current_level("field1.nw")
+    tile = manager.get_tile(5)
+
+    assert manager.set_current_level("field2.nw") is False
+    assert manager.get_tile(5) is tile
+    assert manager.set_current_level("castle_hall.nw") is True
+
+
+def test_returning_to_an_area_reuses_its_composed_sheet():
+    sprites = SpriteManager([])
+    sprites.sheet_cache["dustynewpics1.png"] = _sheet((10, 20, 30, 255))
+    manager = TilesetManager(sprites)
+    for area in ("castle", "cave", "area0", "area1", "area2", "area3"):
+        manager.set_tiledef(f"{area}.png", area, 0, 0)
+
+    manager.set_current_level("castle1.nw")
+    castle = manager._get_composed_sheet()
+    manager.set_current_level("cave1.nw")
+    cave = manager._get_composed_sheet()
+    assert cave is not castle
+    manager.set_current_level("castle2.nw")
+    assert manager._get_composed_sheet() is castle
+
+    for area in ("area0", "area1", "area2", "area3"):   # castle ages out
+        manager.set_current_level(f"{area}_1.nw")
+        manager._get_composed_sheet()
+    manager.set_current_level("castle3.nw")
+    assert manager._get_composed_sheet() is not castle
+    manager.set_current_level("area3_2.nw")
+    area3 = manager._get_composed_sheet()
+    manager.clear_cache()
+    assert manager._get_composed_sheet() is not area3